@@ -0,0 +1,150 @@
+# auth_v2/cache.py — per-process caches for the auth hot path.
+#
+# resolve_principal() runs on EVERY API call. For a Clerk JWT that was a full RS256
+# verification plus a core.app_user lookup (and a last_login_at write) per request,
+# even though an SPA session re-sends the same token for its whole lifetime. Three
+# layers now short-circuit the repeats:
+#
+#   TOKENS      sha256(token + issuer allowlist + audience) -> verified claims.
+#               Entry lives until min(exp, now + AUTH_TOKEN_CACHE_TTL_S) — never past
+#               the token's own expiry. Only SUCCESSFUL verifications are cached; the
+#               config is part of the key, so changing AUTH_ISSUER(S)/AUTH_AUDIENCE
+#               can never serve a token verified under the old trust set.
+#   PRINCIPALS  (provider, sub) -> (email, account_id, user_id), AUTH_PRINCIPAL_CACHE_TTL_S.
+#               A hit skips the DB entirely (so last_login_at is touched at most once
+#               per TTL per user). Staleness bound: a relink/delete shows up within
+#               the TTL.
+#   per-request memo of the resolved Principal on the request object, so handlers
+#               that resolve twice (guard + email lookup, support_bot) pay once —
+#               this is also what covers the legacy CLIENT_API_KEY path, which has no
+#               DB work to cache.
+#
+# Both caches are bounded LRUs (AUTH_*_CACHE_MAX). AUTH_CACHE_ENABLED=0 bypasses all of
+# it (read per call, like the rest of auth_v2's env). stats() returns hit/miss counters;
+# a summary is logged every AUTH_CACHE_LOG_EVERY lookups.
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+log = logging.getLogger("auth_v2.cache")
+
+
+def _env_int(name, default):
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def enabled():
+    return os.getenv("AUTH_CACHE_ENABLED", "1") != "0"
+
+
+class TTLCache:
+    """Bounded LRU whose entries carry an absolute (wall-clock) expiry."""
+
+    def __init__(self, name, max_env, default_max):
+        self.name = name
+        self._max_env = max_env
+        self._default_max = default_max
+        self._data = OrderedDict()   # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and item[0] > now:
+                self._data.move_to_end(key)
+                self.hits += 1
+                value = item[1]
+            else:
+                if item is not None:
+                    del self._data[key]
+                self.misses += 1
+                value = None
+        _maybe_log()
+        return value
+
+    def put(self, key, value, expires_at):
+        if expires_at <= time.time():
+            return
+        cap = max(1, _env_int(self._max_env, self._default_max))
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > cap:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            return {"size": len(self._data), "hits": self.hits,
+                    "misses": self.misses, "evictions": self.evictions}
+
+
+TOKENS = TTLCache("tokens", "AUTH_TOKEN_CACHE_MAX", 10000)
+PRINCIPALS = TTLCache("principals", "AUTH_PRINCIPAL_CACHE_MAX", 10000)
+
+_memo = {"hits": 0, "legacy": 0, "jwt": 0, "rejected": 0}
+_memo_lock = threading.Lock()
+_lookups = [0]
+
+
+def token_ttl():
+    return _env_int("AUTH_TOKEN_CACHE_TTL_S", 300)
+
+
+def principal_ttl():
+    return _env_int("AUTH_PRINCIPAL_CACHE_TTL_S", 60)
+
+
+def token_key(token, issuers, audience):
+    """Cache key for a verified token under the CURRENT trust configuration."""
+    h = hashlib.sha256()
+    h.update(token.encode())
+    h.update(b"\0")
+    h.update(repr(sorted(issuers.items())).encode())
+    h.update(b"\0")
+    h.update((audience or "").encode())
+    return h.hexdigest()
+
+
+def count(kind):
+    """Record a per-request outcome: 'hits' (memo), 'legacy', 'jwt', 'rejected'."""
+    with _memo_lock:
+        _memo[kind] += 1
+
+
+def clear():
+    TOKENS.clear()
+    PRINCIPALS.clear()
+
+
+def stats():
+    with _memo_lock:
+        memo = dict(_memo)
+    return {"enabled": enabled(), "tokens": TOKENS.stats(),
+            "principals": PRINCIPALS.stats(), "requests": memo}
+
+
+def _maybe_log():
+    every = _env_int("AUTH_CACHE_LOG_EVERY", 1000)
+    if every <= 0:
+        return
+    with _memo_lock:
+        _lookups[0] += 1
+        due = _lookups[0] % every == 0
+    if due:
+        log.info("auth_v2 cache: %s", stats())
@@ -12,16 +12,23 @@
 # a Bearer value that is the shared key falls through to the legacy path. With
 # AUTH_V2_ENABLED=0 the JWT branch is skipped entirely → behaviour is exactly as
 # it is in production today.
+#
+# Caching (auth_v2/cache.py): the resolved Principal is memoised on the request object,
+# verified claims are cached per token until exp (verifier), and (provider, sub) ->
+# user/account/email is cached for AUTH_PRINCIPAL_CACHE_TTL_S so repeat requests from
+# one session skip the DB.
 
 import hmac
 import logging
 import os
+import time
 from dataclasses import dataclass
 from typing import Optional
 
 from core_db.db import norm_email, session_scope
 from core_db.repositories import accounts
 
+from auth_v2 import cache as _cache
 from auth_v2 import verifier
 
 log = logging.getLogger("auth_v2.principal")
@@ -57,9 +64,29 @@ def _bearer(request) -> str:
     return ""
 
 
+_MEMO_ATTR = "_auth_v2_principal"
+_UNSET = object()
+
+
 def resolve_principal(request) -> Optional[Principal]:
     """Return an authenticated Principal, or None if the request is unauthorized.
-    Never raises — DB/verify failures fail CLOSED (None → caller returns 403)."""
+    Never raises — DB/verify failures fail CLOSED (None → caller returns 403).
+    Memoised per request (the result, including None, is stored on `request`)."""
+    if _cache.enabled():
+        memo = getattr(request, _MEMO_ATTR, _UNSET)
+        if memo is not _UNSET:
+            _cache.count("hits")
+            return memo
+    p = _resolve(request)
+    _cache.count("rejected" if p is None else p.method)
+    try:
+        setattr(request, _MEMO_ATTR, p)
+    except Exception:
+        pass
+    return p
+
+
+def _resolve(request) -> Optional[Principal]:
     # 1) JWT path — only when explicitly enabled.
     if verifier.is_enabled():
         token = _bearer(request)
@@ -99,6 +126,12 @@ def _principal_from_claims(claims) -> Optional[Principal]:
     if not uid:
         return None
 
+    use_cache = _cache.enabled()
+    if use_cache:
+        hit = _cache.PRINCIPALS.get((prov, uid))
+        if hit is not None:
+            return _principal(*hit)
+
     # Resolve (and, on first login, provision) the core identity. Capture
     # primitives inside the txn — ORM attributes expire after commit.
     with session_scope() as s:
@@ -118,12 +151,19 @@ def _principal_from_claims(claims) -> Optional[Principal]:
         account_id = user.account_id
         user_id = user.id
 
+    if use_cache:
+        _cache.PRINCIPALS.put((prov, uid), (resolved_email, account_id, user_id),
+                              time.time() + _cache.principal_ttl())
+    return _principal(resolved_email, account_id, user_id)
+
+
+def _principal(email, account_id, user_id) -> Principal:
     return Principal(
-        email=resolved_email,
+        email=email,
         method="jwt",
         account_id=account_id,
         user_id=user_id,
-        is_admin=(resolved_email in ADMIN_EMAILS) if resolved_email else False,
+        is_admin=(email in ADMIN_EMAILS) if email else False,
     )
 
 
@@ -8,6 +8,8 @@
 # Run:
 #   .venv/Scripts/python -m auth_v2.selftest          # crypto + legacy checks (NO DB)
 #   .venv/Scripts/python -m auth_v2.selftest --db      # also the DB provision/link path
+#   .venv/Scripts/python -m auth_v2.selftest --bench   # per-request auth overhead, caches off vs on
+#                                                      # (with --db the bench includes the DB lookup)
 #
 # CAUTION: --db writes to whatever DATABASE_URL points at (on the dev box that is
 # the LIVE Render Postgres). It uses a @seed.ten-fifty5.test email and PURGES every
@@ -145,6 +147,23 @@ def run_crypto_and_legacy():
     os.environ.pop("AUTH_ISSUERS", None)
     os.environ.pop("AUTH_JWKS_URLS", None)
 
+    print("token cache:")
+    from auth_v2 import cache
+    cache.clear()
+    before = cache.TOKENS.stats()["hits"]
+    verifier.verify_jwt(good)
+    again = verifier.verify_jwt(good)
+    _check("repeat verify served from cache",
+           cache.TOKENS.stats()["hits"] == before + 1 and (again or {}).get("sub") == "user_abc")
+    os.environ["AUTH_ISSUER"] = "https://another.clerk.example"
+    _check("issuer allowlist change bypasses cached verification", verifier.verify_jwt(good) is None)
+    os.environ["AUTH_ISSUER"] = iss
+    short = _make_token(priv, iss=iss, sub="user_short", email="a@b.com", exp_delta=1)
+    verifier.verify_jwt(short)
+    _check("cached entry never outlives token exp",
+           all(exp <= time.time() + 1 for exp, claims in cache.TOKENS._data.values()
+               if claims.get("sub") == "user_short"))
+
     # disabled → inert
     os.environ["AUTH_V2_ENABLED"] = "0"
     _check("AUTH_V2_ENABLED=0 -> verify_jwt is a no-op", verifier.verify_jwt(good) is None)
@@ -171,9 +190,68 @@ def run_crypto_and_legacy():
                               "X-Client-Key": "legacy-test-key-123"}))
     _check("invalid JWT is rejected (not downgraded to shared key)", rej is None)
 
+    memo_req = _FakeRequest(headers={"X-Client-Key": "legacy-test-key-123"}, args={"email": "m@x.com"})
+    first = principal.resolve_principal(memo_req)
+    _check("principal memoised per request", principal.resolve_principal(memo_req) is first)
+
     return priv, pub, iss
 
 
+def _per_call_us(fn, n):
+    t0 = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - t0) / n * 1e6
+
+
+def run_bench(priv, pub, iss, with_db=False, n=500):
+    """Per-request auth overhead with AUTH_CACHE_ENABLED=0 (before) vs 1 (after).
+    Each "request" is a fresh request object resolved twice, the way guard + email
+    lookup (and support_bot) resolve it."""
+    from auth_v2 import cache, principal, verifier
+
+    os.environ["AUTH_V2_ENABLED"] = "1"
+    os.environ["AUTH_ISSUER"] = iss
+    os.environ["CLIENT_API_KEY"] = "legacy-test-key-123"
+    verifier._client_for = lambda *_a, **_k: _StubJWKS(pub)
+    tok = _make_token(priv, iss=iss, sub=f"user_bench_{uuid.uuid4().hex[:8]}", email=SEED_EMAIL)
+
+    def _legacy():
+        r = _FakeRequest(headers={"X-Client-Key": "legacy-test-key-123"}, args={"email": "b@x.com"})
+        principal.resolve_principal(r)
+        principal.resolve_principal(r)
+
+    def _jwt_verify():
+        verifier.verify_jwt(tok)
+
+    def _jwt_request():
+        r = _FakeRequest(headers={"Authorization": f"Bearer {tok}"})
+        principal.resolve_principal(r)
+        principal.resolve_principal(r)
+
+    cases = [("legacy key (2 resolves/request)", _legacy, n * 10),
+             ("jwt verify_jwt", _jwt_verify, n)]
+    if with_db:
+        cases.append(("jwt request incl. DB (2 resolves/request)", _jwt_request, max(20, n // 10)))
+
+    print("bench (us per call, caches off -> on):")
+    try:
+        for name, fn, iters in cases:
+            os.environ["AUTH_CACHE_ENABLED"] = "0"
+            fn()                                  # warm imports / first-login provisioning
+            off = _per_call_us(fn, iters)
+            os.environ["AUTH_CACHE_ENABLED"] = "1"
+            cache.clear()
+            fn()
+            on = _per_call_us(fn, iters)
+            print(f"  {name:<44} {off:10.1f} -> {on:8.1f}  ({off / on if on else float('inf'):.1f}x)")
+        print(f"  cache stats: {cache.stats()}")
+    finally:
+        os.environ.pop("AUTH_CACHE_ENABLED", None)
+        if with_db:
+            _purge_seed()
+
+
 def run_db(priv, pub, iss):
     """Exercise the provision + link path, then purge. Opt-in (--db)."""
     from auth_v2 import verifier, principal
@@ -231,6 +309,8 @@ def main():
         run_db(priv, pub, iss)
     else:
         print("db: skipped (pass --db to exercise the provision/link path against DATABASE_URL)")
+    if "--bench" in sys.argv:
+        run_bench(priv, pub, iss, with_db=do_db)
 
     print(f"\n{_passed} passed, {_failed} failed")
     sys.exit(1 if _failed else 0)
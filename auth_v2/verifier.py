@@ -34,9 +34,16 @@
 # still full: the token's `iss` only SELECTS which JWKS/issuer to check against; the
 # signature + iss are then verified against that issuer's public keys, so a forged
 # `iss` cannot pass (the attacker would need that issuer's private signing key).
+#
+# Verified claims are cached per token (auth_v2/cache.py TOKENS) until the token's exp,
+# keyed on the token AND the trust configuration, so a repeat request from the same
+# session skips the signature math.
 
 import logging
 import os
+import time
+
+from auth_v2 import cache as _cache
 
 log = logging.getLogger("auth_v2.verifier")
 
@@ -129,6 +136,13 @@ def verify_jwt(token):
         log.warning("auth_v2: no issuer/JWKS configured; cannot verify JWT")
         return None
 
+    use_cache = _cache.enabled()
+    if use_cache:
+        ck = _cache.token_key(token, issuers, audience)
+        hit = _cache.TOKENS.get(ck)
+        if hit is not None:
+            return dict(hit)
+
     try:
         import jwt  # lazy import (PyJWT)
         # Read the token's (unverified) `iss` purely to SELECT which trusted issuer +
@@ -162,6 +176,10 @@ def verify_jwt(token):
             leeway=_leeway(),
             options=options,
         )
+        if use_cache:
+            exp = claims.get("exp")
+            if isinstance(exp, (int, float)):
+                _cache.TOKENS.put(ck, dict(claims), min(float(exp), time.time() + _cache.token_ttl()))
         return claims
     except Exception as e:  # InvalidTokenError, JWKS fetch failure, etc.
         log.info("auth_v2: JWT verification failed: %s: %s", e.__class__.__name__, e)
@@ -54,10 +54,18 @@
 #   - Aggression: Aggressive/Neutral/Defensive from volley and shot_phase
 #   - Depth: Deep/Middle/Short from bounce y-coordinate relative to service lines
 #
+# Engine (SILVER_ENGINE): 'legacy' runs passes 2-6 as in-place UPDATEs on
+# silver.point_detail; 'staged' runs the same SQL against an indexed TEMP copy
+# of the task's rows and writes the final rows once. Per-pass timings land in
+# out["pass_seconds"] (and silver.build_profile with SILVER_PROFILE/EXPLAIN).
+#
 # Court geometry constants are in SPORT_CONFIG dict (currently tennis_singles only).
 # Quality gate: skips ingest if tracking_confidence < 0.5 (from bronze.session_confidences).
 
 import os
+import re
+import json
+import time
 import logging
 from typing import Dict, Optional
 from collections import OrderedDict
@@ -190,6 +198,25 @@ SERVE_FP_GAP_S = float(os.getenv("SILVER_SERVE_FP_GAP_S") or "3")
 # below 1.0 to re-arm if the resumed-rally case ever shows up in real data.
 RALLY_IIR_MIN_COVERAGE = float(os.getenv("SILVER_RALLY_IIR_MIN_COVERAGE") or 1.01)
 
+# Build engine for passes 2-6 (and the T5 builder's shared passes 3-5).
+#   legacy — every pass UPDATEs silver.point_detail in place. Each pass rewrites
+#            every row of the task, so one build leaves ~6 dead tuples per row
+#            (MVCC churn + index maintenance) and each pass re-scans the bloat.
+#   staged — the task's rows are copied into an indexed, ANALYZEd session TEMP
+#            table (no WAL, no shared-buffer contention, real planner stats),
+#            the SAME pass SQL runs against it, and the final rows are written
+#            to silver.point_detail ONCE (DELETE + INSERT ... SELECT).
+# Output is identical by construction (same statements, same row set); verify
+# on the fixtures with `python -m ml_pipeline.diag.bench_silver
+# --compare-engines` before flipping the default.
+SILVER_ENGINE = (os.getenv("SILVER_ENGINE") or "legacy").strip().lower()
+# Per-pass wall time is always returned as out["pass_seconds"]. SILVER_PROFILE=1
+# also records it in silver.build_profile; SILVER_EXPLAIN=1 additionally runs
+# every pass UPDATE/INSERT as EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) — which
+# still executes it — and stores the plans alongside (implies SILVER_PROFILE).
+SILVER_EXPLAIN = (os.getenv("SILVER_EXPLAIN") or "0").strip().lower() in ("1", "true", "yes")
+SILVER_PROFILE = SILVER_EXPLAIN or (os.getenv("SILVER_PROFILE") or "0").strip().lower() in ("1", "true", "yes")
+
 SPORT_CONFIG: Dict[str, Dict[str, float]] = {
     "tennis_singles": {
         "court_length_m":      23.77,
@@ -310,6 +337,144 @@ def _columns_types(conn: Connection, schema: str, name: str) -> Dict[str, str]:
     return {r[0].lower(): r[1].lower() for r in rows}
 
 
+# ============================================================
+# STAGED ENGINE + BUILD PROFILE
+# ============================================================
+
+STAGE_TABLE = "_silver_stage"
+
+_DML_LINE = re.compile(r"^\s*(UPDATE|INSERT\s+INTO)\s", re.IGNORECASE | re.MULTILINE)
+
+
+def stage_open(conn: Connection, task_id: str) -> str:
+    """Copy the task's point_detail rows into the staging TEMP table.
+
+    Same columns and defaults as silver.point_detail; the unique index keeps
+    pass 1's ON CONFLICT (task_id, id, model) semantics and (task_id,
+    ball_hit_s) serves the per-task ordered scans every pass does. Dropped at
+    commit. Returns the table name to pass as `target=` to the passes.
+    """
+    _exec(conn, f"DROP TABLE IF EXISTS {STAGE_TABLE}")
+    _exec(conn, f"""
+        CREATE TEMP TABLE {STAGE_TABLE}
+        (LIKE {SILVER_SCHEMA}.{TABLE} INCLUDING DEFAULTS) ON COMMIT DROP
+    """)
+    _exec(conn, f"INSERT INTO {STAGE_TABLE} SELECT * FROM {SILVER_SCHEMA}.{TABLE} WHERE task_id = :tid",
+          {"tid": task_id})
+    _exec(conn, f"CREATE UNIQUE INDEX ON {STAGE_TABLE} (task_id, id, model)")
+    _exec(conn, f"CREATE INDEX ON {STAGE_TABLE} (task_id, ball_hit_s)")
+    _exec(conn, f"ANALYZE {STAGE_TABLE}")
+    return STAGE_TABLE
+
+
+def stage_flush(conn: Connection, task_id: str) -> int:
+    """Replace the task's point_detail rows with the staged ones (one write)."""
+    _exec(conn, f"DELETE FROM {SILVER_SCHEMA}.{TABLE} WHERE task_id = :tid", {"tid": task_id})
+    return conn.execute(text(f"""
+        INSERT INTO {SILVER_SCHEMA}.{TABLE} SELECT * FROM {STAGE_TABLE}
+    """)).rowcount or 0
+
+
+class _ExplainResult:
+    def __init__(self, rowcount: int):
+        self.rowcount = rowcount
+
+
+class _ExplainConnection:
+    """Connection stand-in for SILVER_EXPLAIN.
+
+    Statements containing an UPDATE / INSERT INTO line (every pass's write)
+    run as EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) — executed for real — and
+    the plan is kept; rowcount comes from the plan. Everything else (SELECTs,
+    temp-table DDL) goes straight through.
+    """
+
+    def __init__(self, conn: Connection, plans: list):
+        self._conn = conn
+        self._plans = plans
+
+    def execute(self, statement, parameters=None):
+        sql = getattr(statement, "text", None)
+        if sql is None or not _DML_LINE.search(sql):
+            return self._conn.execute(statement, parameters or {})
+        plan = self._conn.execute(
+            text("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + sql), parameters or {},
+        ).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        self._plans.append(plan[0])
+        return _ExplainResult(_plan_rowcount(plan[0]["Plan"]))
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+def _plan_rowcount(node: dict) -> int:
+    """Rows written by an EXPLAIN ANALYZE'd ModifyTable (0 if not DML)."""
+    if node.get("Node Type") != "ModifyTable":
+        return 0
+    if "Tuples Inserted" in node:               # INSERT ... ON CONFLICT
+        return int(node["Tuples Inserted"])
+    child = (node.get("Plans") or [{}])[0]
+    return int(child.get("Actual Rows", 0) * child.get("Actual Loops", 1))
+
+
+class BuildProfile:
+    """Per-pass wall time (and optional EXPLAIN plans) for one silver build."""
+
+    def __init__(self, task_id: str, engine_name: str, model: str):
+        self.task_id = task_id
+        self.engine_name = engine_name
+        self.model = model
+        self.entries: list = []
+
+    def run(self, name: str, fn, conn: Connection, *args, explain: bool = True, **kwargs):
+        """Time fn(conn, *args, **kwargs). explain=False keeps SILVER_EXPLAIN
+        away from callers that executemany or consume DML results."""
+        plans: list = []
+        c = _ExplainConnection(conn, plans) if SILVER_EXPLAIN and explain else conn
+        t0 = time.perf_counter()
+        try:
+            return fn(c, *args, **kwargs)
+        finally:
+            self.entries.append((name, time.perf_counter() - t0, plans or None))
+
+    def seconds(self) -> Dict[str, float]:
+        return {name: round(sec, 4) for name, sec, _ in self.entries}
+
+    def write(self, conn: Connection) -> None:
+        """Append this build's rows to silver.build_profile (SILVER_PROFILE)."""
+        if not SILVER_PROFILE or not self.entries:
+            return
+        _exec(conn, f"""
+            CREATE TABLE IF NOT EXISTS {SILVER_SCHEMA}.build_profile (
+              id          bigserial PRIMARY KEY,
+              task_id     text NOT NULL,
+              model       text,
+              engine      text NOT NULL,
+              pass        text NOT NULL,
+              seconds     double precision NOT NULL,
+              plan        jsonb,
+              created_at  timestamptz NOT NULL DEFAULT now()
+            );
+        """)
+        _exec(conn, f"CREATE INDEX IF NOT EXISTS ix_build_profile_task ON {SILVER_SCHEMA}.build_profile (task_id, created_at)")
+        for name, sec, plans in self.entries:
+            _exec(conn, f"""
+                INSERT INTO {SILVER_SCHEMA}.build_profile (task_id, model, engine, pass, seconds, plan)
+                VALUES (:tid, :model, :engine, :pass, :sec, CAST(:plan AS jsonb))
+            """, {"tid": str(self.task_id), "model": self.model, "engine": self.engine_name,
+                  "pass": name, "sec": float(sec),
+                  "plan": None if plans is None else json.dumps(plans)})
+
+
+def resolve_engine(silver_engine: Optional[str] = None) -> str:
+    name = (silver_engine or SILVER_ENGINE).strip().lower()
+    if name not in ("legacy", "staged"):
+        raise ValueError(f"unknown silver engine {name!r} (legacy | staged)")
+    return name
+
+
 def ensure_schema(conn: Connection):
     _exec(conn, f"CREATE SCHEMA IF NOT EXISTS {SILVER_SCHEMA};")
 
@@ -321,6 +486,9 @@ def ensure_schema(conn: Connection):
         _exec(conn, f"CREATE INDEX IF NOT EXISTS ix_pd_task ON {SILVER_SCHEMA}.{TABLE}(task_id);")
         _exec(conn, f"CREATE INDEX IF NOT EXISTS ix_pd_task_id ON {SILVER_SCHEMA}.{TABLE}(task_id, id);")
 
+    # Per-task ordered scans (every pass windows over ball_hit_s within a task)
+    _exec(conn, f"CREATE INDEX IF NOT EXISTS ix_pd_task_hit ON {SILVER_SCHEMA}.{TABLE}(task_id, ball_hit_s);")
+
     # Ensure all columns exist FIRST (idempotent) — must come before constraint migration
     existing = _columns_types(conn, SILVER_SCHEMA, TABLE)
     for col, typ in ALL_COLS.items():
@@ -456,7 +624,9 @@ def _resolve_two_players(conn: Connection, task_id: str) -> dict:
 #   - Uses ON CONFLICT DO NOTHING for idempotent re-runs
 # ============================================================
 
-def pass1_load(conn: Connection, task_id: str, cfg: dict, start_time_s: Optional[float] = None) -> int:
+def pass1_load(conn: Connection, task_id: str, cfg: dict, start_time_s: Optional[float] = None,
+               target: Optional[str] = None) -> int:
+    tgt = target or f"{SILVER_SCHEMA}.{TABLE}"
     pf = _resolve_two_players(conn, task_id)
 
     # Build CASE for player de-ghosting
@@ -476,7 +646,7 @@ def pass1_load(conn: Connection, task_id: str, cfg: dict, start_time_s: Optional
         params["start_time_s"] = start_time_s
 
     sql = f"""
-    INSERT INTO {SILVER_SCHEMA}.{TABLE} (
+    INSERT INTO {tgt} (
       id, task_id, player_id, valid, serve, swing_type, volley, is_in_rally,
       ball_player_distance, ball_speed, ball_impact_type,
       ball_hit_s, ball_hit_location_x, ball_hit_location_y,
@@ -526,14 +696,15 @@ def pass1_load(conn: Connection, task_id: str, cfg: dict, start_time_s: Optional
 #   - Missing hit coords or bounce coords → guard is bypassed (allow through)
 # ============================================================
 
-def pass2_bounce(conn: Connection, task_id: str, cfg: dict) -> int:
+def pass2_bounce(conn: Connection, task_id: str, cfg: dict, target: Optional[str] = None) -> int:
+    tgt = target or f"{SILVER_SCHEMA}.{TABLE}"
     half_y = cfg["half_y"]
     sql = f"""
     WITH p AS (
       SELECT id, task_id, ball_hit_s, ball_hit_location_y,
              COALESCE(serve, FALSE) AS serve,
              COALESCE(volley, FALSE) AS volley
-      FROM {SILVER_SCHEMA}.{TABLE}
+      FROM {tgt}
       WHERE task_id = :tid
     ),
     p_lead AS (
@@ -582,7 +753,7 @@ def pass2_bounce(conn: Connection, task_id: str, cfg: dict) -> int:
         LIMIT 1
       ) b ON TRUE
     )
-    UPDATE {SILVER_SCHEMA}.{TABLE} p
+    UPDATE {tgt} p
     SET type = c.type, timestamp = c.timestamp, court_x = c.court_x, court_y = c.court_y
     FROM chosen c
     WHERE p.task_id = :tid AND p.id = c.id;
@@ -626,7 +797,7 @@ def pass2_bounce(conn: Connection, task_id: str, cfg: dict) -> int:
 #  17. SERVE LOCATION (1-8): service box divided into 4 quadrants per side.
 # ============================================================
 
-def _resolve_serve_source(conn: Connection, task_id: str, eps: float, court_len: float) -> str:
+def _resolve_serve_source(conn: Connection, task_id: str, eps: float, court_len: float, target: Optional[str] = None) -> str:
     """Resolve SERVE_SOURCE, applying the 'auto' plausibility guard.
 
     SportAI's bronze `serve` flag is the better source on healthy footage — it
@@ -640,6 +811,7 @@ def _resolve_serve_source(conn: Connection, task_id: str, eps: float, court_len:
     the pathological one — the populations are three orders apart, so the
     threshold is not delicate.
     """
+    tgt = target or f"{SILVER_SCHEMA}.{TABLE}"
     if SERVE_SOURCE != "auto":
         return SERVE_SOURCE
 
@@ -651,7 +823,7 @@ def _resolve_serve_source(conn: Connection, task_id: str, eps: float, court_len:
                              AND ball_hit_location_y IS NOT NULL
                              AND (ball_hit_location_y < :eps
                                   OR ball_hit_location_y > (:y_max - :eps)))    AS geom_serves
-        FROM {SILVER_SCHEMA}.{TABLE}
+        FROM {tgt}
         WHERE task_id = :tid
     """), {"tid": task_id, "eps": float(eps), "y_max": float(court_len)}).fetchone()
 
@@ -671,7 +843,8 @@ def _resolve_serve_source(conn: Connection, task_id: str, eps: float, court_len:
     return "sa"
 
 
-def pass3_point_context(conn: Connection, task_id: str, cfg: dict) -> int:
+def pass3_point_context(conn: Connection, task_id: str, cfg: dict, target: Optional[str] = None) -> int:
+    tgt = target or f"{SILVER_SCHEMA}.{TABLE}"
     pf = _resolve_two_players(conn, task_id)
     p1, p2 = pf["p1"], pf["p2"]
 
@@ -736,7 +909,7 @@ def pass3_point_context(conn: Connection, task_id: str, cfg: dict) -> int:
     else:
         mid_x_row = conn.execute(text(f"""
             SELECT COALESCE(AVG(ball_hit_location_x), :mid_default)
-            FROM {SILVER_SCHEMA}.{TABLE}
+            FROM {tgt}
             WHERE task_id = :tid
               AND ball_hit_location_x IS NOT NULL
               AND ball_hit_location_y IS NOT NULL
@@ -764,7 +937,7 @@ def pass3_point_context(conn: Connection, task_id: str, cfg: dict) -> int:
         p.ball_hit_location_x AS x,
         p.ball_hit_location_y AS y,
         p.court_x, p.court_y
-      FROM {SILVER_SCHEMA}.{TABLE} p
+      FROM {tgt} p
       WHERE p.task_id = :tid AND p.ball_hit_s IS NOT NULL
     ),
 
@@ -1050,7 +1223,7 @@ def pass3_point_context(conn: Connection, task_id: str, cfg: dict) -> int:
     iir_cov AS (
       SELECT (COUNT(*) FILTER (WHERE p.is_in_rally))::double precision
              / NULLIF(COUNT(*), 0) AS frac
-      FROM {SILVER_SCHEMA}.{TABLE} p
+      FROM {tgt} p
       WHERE p.task_id = :tid
     ),
 
@@ -1074,7 +1247,7 @@ def pass3_point_context(conn: Connection, task_id: str, cfg: dict) -> int:
       FROM excl_base e
       LEFT JOIN last_connected_per_point lc
         ON lc.task_id = e.task_id AND lc.point_number = e.point_number
-      LEFT JOIN {SILVER_SCHEMA}.{TABLE} pd
+      LEFT JOIN {tgt} pd
         ON pd.task_id = e.task_id AND pd.id = e.id
       CROSS JOIN iir_cov cov
     ),
@@ -1711,7 +1884,7 @@ def pass3_point_context(conn: Connection, task_id: str, cfg: dict) -> int:
       LEFT JOIN in_rally_flag irf ON irf.id = so.id
     )
 
-    UPDATE {SILVER_SCHEMA}.{TABLE} p
+    UPDATE {tgt} p
     SET
       serve_d = f.serve_d,
       server_end_d = f.server_end_d,
@@ -1750,7 +1923,7 @@ def pass3_point_context(conn: Connection, task_id: str, cfg: dict) -> int:
         # absolutes (audit P1: the Net-phase band was ~0.9m too narrow each side).
         "svc": float(HALF_Y - SVC_LINE), "far_svc": float(HALF_Y + SVC_LINE),
         "b1": float(B1), "b2": float(B2), "b3": float(B3),
-        "serve_src": _resolve_serve_source(conn, task_id, EPS, COURT_LEN),
+        "serve_src": _resolve_serve_source(conn, task_id, EPS, COURT_LEN, target=tgt),
         "serve_gap_s": float(SERVE_GAP_ANCHOR_S),
         "serve_fp_gap": float(SERVE_FP_GAP_S),
     }
@@ -1826,7 +1999,8 @@ def pass3_point_context(conn: Connection, task_id: str, cfg: dict) -> int:
 #     when invert flag is set, producing a canonical view.
 # ============================================================
 
-def pass4_zones_and_normalize(conn: Connection, task_id: str, cfg: dict) -> int:
+def pass4_zones_and_normalize(conn: Connection, task_id: str, cfg: dict, target: Optional[str] = None) -> int:
+    tgt = target or f"{SILVER_SCHEMA}.{TABLE}"
     SX_LEFT  = cfg["singles_left_x"]
     SX_RIGHT = cfg["singles_right_x"]
     HALF_Y   = cfg["half_y"]
@@ -1839,7 +2013,7 @@ def pass4_zones_and_normalize(conn: Connection, task_id: str, cfg: dict) -> int:
     z4 = SX_LEFT + 3.0 * cfg["singles_width"] / 4.0  # 7.5425
 
     sql = f"""
-    UPDATE {SILVER_SCHEMA}.{TABLE} p
+    UPDATE {tgt} p
     SET
       -- Rally location (hit): A-D based on hitter side
       rally_location_hit =
@@ -1933,7 +2107,8 @@ def pass4_zones_and_normalize(conn: Connection, task_id: str, cfg: dict) -> int:
 #   - Depth: Deep/Middle/Short based on bounce y relative to service lines.
 # ============================================================
 
-def pass5_analytics(conn: Connection, task_id: str, cfg: dict) -> int:
+def pass5_analytics(conn: Connection, task_id: str, cfg: dict, target: Optional[str] = None) -> int:
+    tgt = target or f"{SILVER_SCHEMA}.{TABLE}"
     sql = f"""
     WITH rl AS (
       SELECT p.id,
@@ -1944,10 +2119,10 @@ def pass5_analytics(conn: Connection, task_id: str, cfg: dict) -> int:
           OVER (PARTITION BY p.task_id, p.point_key) AS rally_length_point
         -- (shot_q / shot_key_q dropped 2026-07-23 — external PowerBI join keys
         --  with 0 consumers anywhere.)
-      FROM {SILVER_SCHEMA}.{TABLE} p
+      FROM {tgt} p
       WHERE p.task_id = :tid
     )
-    UPDATE {SILVER_SCHEMA}.{TABLE} p
+    UPDATE {tgt} p
     SET
       serve_bucket_d = CASE
         WHEN p.serve_location IN (1, 8) THEN 'wide'
@@ -2007,7 +2182,7 @@ def pass5_analytics(conn: Connection, task_id: str, cfg: dict) -> int:
 # PASS 6: Bounce plausibility (UPDATE)
 # ============================================================
 
-def pass6_bounce_plausibility(conn: Connection, task_id: str, cfg: dict) -> int:
+def pass6_bounce_plausibility(conn: Connection, task_id: str, cfg: dict, target: Optional[str] = None) -> int:
     """Flag bounce coordinates that contradict what actually happened.
 
     Motivation (owner, 2026-07-19): serves appear OUTSIDE the court on the
@@ -2031,6 +2206,7 @@ def pass6_bounce_plausibility(conn: Connection, task_id: str, cfg: dict) -> int:
     outside the box, and `shot_ix_in_point` is NULL for them, so they cannot
     satisfy the "was returned" test.
     """
+    tgt = target or f"{SILVER_SCHEMA}.{TABLE}"
     half_y = float(cfg["half_y"])
     svc = float(cfg["service_line_m"])          # 6.40m from the net
     sx_left, sx_right = float(cfg["singles_left_x"]), float(cfg["singles_right_x"])
@@ -2048,16 +2224,16 @@ def pass6_bounce_plausibility(conn: Connection, task_id: str, cfg: dict) -> int:
              (COALESCE(p.ace_d, FALSE) OR COALESCE(p.service_winner_d, FALSE))
                AND p.shot_ix_in_point IS NOT NULL AS won_outright,
              EXISTS (
-               SELECT 1 FROM {SILVER_SCHEMA}.{TABLE} q
+               SELECT 1 FROM {tgt} q
                WHERE q.task_id = p.task_id
                  AND q.point_key = p.point_key
                  AND COALESCE(q.serve_d, FALSE) = FALSE
                  AND q.shot_ix_in_point > p.shot_ix_in_point
              ) AS was_returned
-      FROM {SILVER_SCHEMA}.{TABLE} p
+      FROM {tgt} p
       WHERE p.task_id = :tid
     )
-    UPDATE {SILVER_SCHEMA}.{TABLE} p
+    UPDATE {tgt} p
     SET bounce_plausible_d = CASE
       WHEN c.court_x IS NULL OR c.court_y IS NULL THEN NULL
       -- (1) nowhere near a tennis court
@@ -2135,11 +2311,19 @@ def _validate_rally_count(conn: Connection, task_id: str) -> Dict:
 # ORCHESTRATOR
 # ============================================================
 
-def build_silver_v2(task_id: str, replace: bool = False) -> Dict:
+def build_silver_v2(task_id: str, replace: bool = False,
+                    silver_engine: Optional[str] = None) -> Dict:
+    """Build silver.point_detail for one SportAI task.
+
+    silver_engine: 'legacy' (in-place UPDATE passes) or 'staged' (passes run
+    on a TEMP copy, final rows written once); default SILVER_ENGINE.
+    """
     if not task_id:
         raise ValueError("task_id is required")
+    engine_name = resolve_engine(silver_engine)
 
-    out: Dict = {"ok": True, "task_id": task_id}
+    out: Dict = {"ok": True, "task_id": task_id, "silver_engine": engine_name}
+    profile = BuildProfile(task_id, engine_name, "sportai")
 
     with engine.begin() as conn:
         ensure_schema(conn)
@@ -2181,14 +2365,26 @@ def build_silver_v2(task_id: str, replace: bool = False) -> Dict:
         if replace:
             _exec(conn, f"DELETE FROM {SILVER_SCHEMA}.{TABLE} WHERE task_id=:tid AND COALESCE(model,'sportai')='sportai'", {"tid": task_id})
 
-        out["pass1_rows"] = pass1_load(conn, task_id, cfg, start_time_s=start_time_s)
-        out["pass2_rows"] = pass2_bounce(conn, task_id, cfg)
-        out["pass3_rows"] = pass3_point_context(conn, task_id, cfg)
-        out["pass4_rows"] = pass4_zones_and_normalize(conn, task_id, cfg)
-        out["pass5_rows"] = pass5_analytics(conn, task_id, cfg)
-        out["pass6_rows"] = pass6_bounce_plausibility(conn, task_id, cfg)
+        tgt = None
+        if engine_name == "staged":
+            tgt = profile.run("stage_open", stage_open, conn, task_id)
+
+        out["pass1_rows"] = profile.run("pass1", pass1_load, conn, task_id, cfg,
+                                        start_time_s=start_time_s, target=tgt)
+        if tgt is not None:
+            _exec(conn, f"ANALYZE {tgt}")
+        out["pass2_rows"] = profile.run("pass2", pass2_bounce, conn, task_id, cfg, target=tgt)
+        out["pass3_rows"] = profile.run("pass3", pass3_point_context, conn, task_id, cfg, target=tgt)
+        out["pass4_rows"] = profile.run("pass4", pass4_zones_and_normalize, conn, task_id, cfg, target=tgt)
+        out["pass5_rows"] = profile.run("pass5", pass5_analytics, conn, task_id, cfg, target=tgt)
+        out["pass6_rows"] = profile.run("pass6", pass6_bounce_plausibility, conn, task_id, cfg, target=tgt)
+
+        if tgt is not None:
+            out["staged_rows_written"] = profile.run("stage_flush", stage_flush, conn, task_id)
 
         out.update(_validate_rally_count(conn, task_id))
+        out["pass_seconds"] = profile.seconds()
+        profile.write(conn)
 
     return out
 
@@ -2203,8 +2399,10 @@ if __name__ == "__main__":
     p = argparse.ArgumentParser(description="Silver point_detail v2 — 5-pass rewrite")
     p.add_argument("--task-id", required=True, help="task UUID")
     p.add_argument("--replace", action="store_true", help="delete existing rows before rebuild")
+    p.add_argument("--engine", choices=("legacy", "staged"), default=None,
+                   help="pass engine (default: SILVER_ENGINE env, else legacy)")
     args = p.parse_args()
 
-    result = build_silver_v2(args.task_id, replace=args.replace)
+    result = build_silver_v2(args.task_id, replace=args.replace, silver_engine=args.engine)
     print(json.dumps(result, indent=2, default=str))
 
@@ -27,6 +27,7 @@ from flask import Blueprint, jsonify, request, Response
 from sqlalchemy import text as sql_text
 
 from db_init import engine
+from ml_pipeline.detection_partitions import drop_jobs
 
 log = logging.getLogger(__name__)
 
@@ -155,12 +156,12 @@ def _sweep_soft_deleted(conn, dry_run: bool) -> dict:
                         "WHERE task_id::text = ANY(:ids))"
                     ), {"ids": kill_ids}).scalar() or 0
                 else:
-                    res = conn.execute(sql_text(
-                        f"DELETE FROM ml_analysis.{det} WHERE job_id IN ("
+                    # Partitioned tables drop the job's partition instead of DELETE.
+                    job_ids = [r[0] for r in conn.execute(sql_text(
                         "SELECT job_id FROM ml_analysis.video_analysis_jobs "
-                        "WHERE task_id::text = ANY(:ids))"
-                    ), {"ids": kill_ids})
-                    n = res.rowcount or 0
+                        "WHERE task_id::text = ANY(:ids)"
+                    ), {"ids": kill_ids})]
+                    n = drop_jobs(conn, det, job_ids)
                 if n:
                     counts[f"ml_analysis.{det}"] = n
             except Exception as e:
@@ -5,6 +5,7 @@
 #
 # Endpoints:
 #   GET    /api/client/matches              — list matches with stats, scores, trim status
+#                                             (streamed; ?limit/&cursor keyset pages, ?fields=sidebar)
 #   GET    /api/client/matches/<task_id>    — point-level detail from silver.point_detail
 #   GET    /api/client/match-analysis/<task_id> — full silver.point_detail with coordinates [LEGACY]
 #
@@ -15,6 +16,7 @@
 #   GET    /api/client/match/rally-breakdown/<task_id>  — gold.match_rally_breakdown (rally stats)
 #   GET    /api/client/match/rally-length/<task_id>     — gold.match_rally_length (length distribution)
 #   GET    /api/client/match/shot-placement/<task_id>   — gold.match_shot_placement (heatmap data)
+#   GET    /api/client/match/<task_id>/dashboard        — all of the above + technique, one ETag'd response
 #   PATCH  /api/client/matches/<task_id>    — update match metadata (whitelisted fields only)
 #   POST   /api/client/matches/<task_id>/reprocess — rebuild silver via build_silver_v2
 #   GET    /api/client/players              — distinct player names for autocomplete
@@ -33,8 +35,8 @@
 #   GET    /api/client/coaches              — list coach permissions for the account
 #   POST   /api/client/coach-invite         — invite a coach (creates permission + token + SES email)
 #   POST   /api/client/coach-revoke         — revoke a coach permission
-#   GET    /api/client/backoffice/pipeline   — admin: pipeline status table
-#   GET    /api/client/backoffice/customers  — admin: customer list with usage stats
+#   GET    /api/client/backoffice/pipeline   — admin: pipeline status table (streamed, keyset pages)
+#   GET    /api/client/backoffice/customers  — admin: customer list with usage stats (streamed, keyset pages)
 #   GET    /api/client/backoffice/kpis       — admin: KPI cards
 #
 # Business rules:
@@ -47,13 +49,18 @@
 
 from __future__ import annotations
 
+import base64
+import hashlib
 import hmac
+import json
 import logging
 import os
+import threading
+from collections import OrderedDict
 from datetime import datetime
 from typing import Optional
 
-from flask import Blueprint, g, jsonify, request
+from flask import Blueprint, Response, g, jsonify, request, stream_with_context
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
@@ -232,6 +239,207 @@ def _can_view_task(owner_email, requester_email) -> bool:
         or _is_admin_email(requester_email)
 
 
+# ----------------------------
+# Keyset pagination + streamed JSON lists
+# ----------------------------
+#
+# The list endpoints (matches, backoffice pipeline / customers) used to build
+# the whole result set as Python dicts and jsonify it in one go — for an admin's
+# show_all match list that is every client's history × 40 columns. They now:
+#   - page on request: ?limit=N (capped at LIST_PAGE_MAX) and ?cursor=<opaque>
+#     from the previous response's next_cursor. Keyset, not OFFSET: the cursor
+#     is the last row's sort key, so page N costs the same as page 1 and rows
+#     inserted meanwhile never shift a page.
+#   - stream the JSON body row by row off a server-side cursor (stream_results),
+#     so neither the DB driver nor Python holds the full list.
+# Without ?limit / ?cursor the response is the full list, same shape as before
+# (plus "next_cursor": null) — existing SPAs keep working unchanged.
+#
+# A failure mid-stream cannot change the 200 status; the body then ends with
+# "ok": false + "error" (the later duplicate key wins in JSON.parse).
+
+LIST_PAGE_MAX = int(os.environ.get("LIST_PAGE_MAX", "500"))
+LIST_STREAM_CHUNK = int(os.environ.get("LIST_STREAM_CHUNK", "200"))
+
+
+def _encode_cursor(values: list) -> str:
+    raw = json.dumps(values, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(raw: Optional[str], n: int) -> Optional[list]:
+    """Cursor -> list of n sort-key values; None when absent. ValueError if bad."""
+    if not raw:
+        return None
+    try:
+        values = json.loads(base64.urlsafe_b64decode(raw + "=" * (-len(raw) % 4)))
+    except Exception:
+        raise ValueError("bad cursor")
+    if not isinstance(values, list) or len(values) != n:
+        raise ValueError("bad cursor")
+    return values
+
+
+def _page_args(n_keys: int):
+    """(limit or None, cursor values or None) from ?limit / ?cursor. ValueError if bad."""
+    cursor = _decode_cursor(request.args.get("cursor"), n_keys)
+    raw_limit = request.args.get("limit")
+    if raw_limit in (None, ""):
+        return (LIST_PAGE_MAX if cursor is not None else None), cursor
+    limit = int(raw_limit)
+    if limit < 1:
+        raise ValueError("limit must be >= 1")
+    return min(limit, LIST_PAGE_MAX), cursor
+
+
+def _stream_list(list_key: str, head: dict, sql: str, params: dict, shape,
+                 limit: Optional[int], cursor_of) -> Response:
+    """Stream {**head, list_key: [shape(row)...], "next_cursor": ...}.
+
+    `sql` must already carry the keyset predicate and ORDER BY; it gets
+    LIMIT limit+1 here (the extra row only says whether a next page exists).
+    cursor_of(row) -> the row's sort-key values.
+    """
+    if limit is not None:
+        sql = f"{sql}\nLIMIT :_limit"
+        params = {**params, "_limit": limit + 1}
+
+    def _gen():
+        yield json.dumps(head)[:-1] + f', "{list_key}": ['
+        n = 0
+        last = None
+        more = False
+        try:
+            with engine.connect() as conn:
+                result = conn.execution_options(
+                    stream_results=True, yield_per=LIST_STREAM_CHUNK,
+                ).execute(text(sql), params).mappings()
+                for r in result:
+                    if limit is not None and n >= limit:
+                        more = True
+                        break
+                    yield ("," if n else "") + json.dumps(shape(r), default=str)
+                    last = r
+                    n += 1
+        except Exception:
+            log.exception("streamed list %s failed after %d rows", list_key, n)
+            yield '], "ok": false, "error": "internal_error"}'
+            return
+        tail = {"next_cursor": _encode_cursor(cursor_of(last)) if more else None, "count": n}
+        yield "], " + json.dumps(tail, default=str)[1:]
+
+    return Response(stream_with_context(_gen()), mimetype="application/json")
+
+
+def _ts(v):
+    return v.isoformat() if v else None
+
+
+# ----------------------------
+# GET /api/client/matches
+# ----------------------------
+#
+# ?fields=sidebar trims each row to what the Locker Room sidebar renders (no
+# stats join columns, no utr/trim detail); the default is the full card.
+# Order + keyset:
+#   one client (default): match_date ASC NULLS LAST, created_at, task_id
+#   admin show_all:       created_at DESC, task_id DESC
+# Both are served by indexes on bronze.submission_context created in
+# db_init.gold_init (ix_submission_context_client_list covers the sidebar
+# projection; ix_submission_context_created the admin order).
+
+_MATCH_SIDEBAR_COLS = """
+    g.task_id, g.match_date, g.location,
+    g.player_a_name, g.player_b_name, g.sport_type,
+    g.email, g.last_status, g.created_at,
+    g.player_a_set1_games, g.player_b_set1_games,
+    g.player_a_set2_games, g.player_b_set2_games,
+    g.player_a_set3_games, g.player_b_set3_games
+"""
+
+_MATCH_FULL_COLS = """
+    g.task_id, g.match_date, g.location,
+    g.player_a_name, g.player_b_name, g.sport_type,
+    g.video_url, g.share_url, g.email, g.last_status, g.created_at,
+    g.total_points, g.total_games, g.total_sets,
+    g.player_a_points_won, g.player_b_points_won,
+    g.player_a_games_won, g.player_b_games_won,
+    g.total_aces, g.total_double_faults,
+    g.avg_rally_length, g.max_rally_length,
+    g.player_a_first_serve_pct, g.player_b_first_serve_pct,
+    g.player_a_winners, g.player_b_winners,
+    g.player_a_set1_games, g.player_b_set1_games,
+    g.player_a_set2_games, g.player_b_set2_games,
+    g.player_a_set3_games, g.player_b_set3_games,
+    sc.player_a_utr, sc.player_b_utr,
+    sc.first_server, sc.start_time,
+    sc.trim_status, sc.trim_output_s3_key,
+    sc.trim_duration_s
+"""
+
+_MATCH_DATE_KEY = "COALESCE(g.match_date, 'infinity'::date)"
+
+
+def _match_row_sidebar(r) -> dict:
+    return {
+        "task_id": r["task_id"],
+        "client_email": r["email"],
+        "match_date": str(r["match_date"]) if r["match_date"] else None,
+        "location": r["location"],
+        "player_a_name": r["player_a_name"],
+        "player_b_name": r["player_b_name"],
+        "sport_type": r["sport_type"],
+        "last_status": r["last_status"],
+        "created_at": _ts(r["created_at"]),
+        "score": _format_score(r),
+    }
+
+
+def _match_row_full(r) -> dict:
+    return {
+        "task_id": r["task_id"],
+        "client_email": r["email"],  # whose account this match belongs to (admin view)
+        "match_date": str(r["match_date"]) if r["match_date"] else None,
+        "location": r["location"],
+        "player_a_name": r["player_a_name"],
+        "player_b_name": r["player_b_name"],
+        "player_a_utr": r["player_a_utr"],
+        "player_b_utr": r["player_b_utr"],
+        "first_server": r["first_server"],
+        "start_time": r["start_time"],
+        "sport_type": r["sport_type"],
+        "video_url": r["video_url"],
+        "share_url": r["share_url"],
+        "last_status": r["last_status"],
+        "created_at": _ts(r["created_at"]),
+        "total_points": int(r["total_points"] or 0),
+        "total_games": int(r["total_games"] or 0),
+        "total_sets": int(r["total_sets"] or 0),
+        "player_a_points_won": int(r["player_a_points_won"] or 0),
+        "player_b_points_won": int(r["player_b_points_won"] or 0),
+        "player_a_games_won": int(r["player_a_games_won"] or 0),
+        "player_b_games_won": int(r["player_b_games_won"] or 0),
+        "total_aces": int(r["total_aces"] or 0),
+        "total_double_faults": int(r["total_double_faults"] or 0),
+        "avg_rally_length": float(r["avg_rally_length"] or 0),
+        "max_rally_length": int(r["max_rally_length"] or 0),
+        "player_a_first_serve_pct": float(r["player_a_first_serve_pct"] or 0),
+        "player_b_first_serve_pct": float(r["player_b_first_serve_pct"] or 0),
+        "player_a_winners": int(r["player_a_winners"] or 0),
+        "player_b_winners": int(r["player_b_winners"] or 0),
+        "score": _format_score(r),
+        "player_a_set1_games": r["player_a_set1_games"],
+        "player_b_set1_games": r["player_b_set1_games"],
+        "player_a_set2_games": r["player_a_set2_games"],
+        "player_b_set2_games": r["player_b_set2_games"],
+        "player_a_set3_games": r["player_a_set3_games"],
+        "player_b_set3_games": r["player_b_set3_games"],
+        "trim_status": r["trim_status"],
+        "trim_output_s3_key": r["trim_output_s3_key"],
+        "trim_duration_s": float(r["trim_duration_s"]) if r["trim_duration_s"] else None,
+    }
+
+
 @client_bp.route("/api/client/matches", methods=["GET", "OPTIONS"])
 def list_matches():
     if not _guard():
@@ -248,87 +456,46 @@ def list_matches():
     client_filter = _norm_email(request.args.get("client_email")) if is_admin else email
     show_all = is_admin and not client_filter
 
-    where = "" if show_all else "WHERE g.email = :email"
-    order = "g.created_at DESC NULLS LAST" if show_all \
-        else "g.match_date ASC NULLS LAST, g.created_at ASC"
-    params = {} if show_all else {"email": client_filter}
-
-    with engine.connect() as conn:
-        rows = conn.execute(
-            text(f"""
-                SELECT
-                    g.task_id, g.match_date, g.location,
-                    g.player_a_name, g.player_b_name, g.sport_type,
-                    g.video_url, g.share_url, g.email, g.last_status, g.created_at,
-                    g.total_points, g.total_games, g.total_sets,
-                    g.player_a_points_won, g.player_b_points_won,
-                    g.player_a_games_won, g.player_b_games_won,
-                    g.total_aces, g.total_double_faults,
-                    g.avg_rally_length, g.max_rally_length,
-                    g.player_a_first_serve_pct, g.player_b_first_serve_pct,
-                    g.player_a_winners, g.player_b_winners,
-                    g.player_a_set1_games, g.player_b_set1_games,
-                    g.player_a_set2_games, g.player_b_set2_games,
-                    g.player_a_set3_games, g.player_b_set3_games,
-                    sc.player_a_utr, sc.player_b_utr,
-                    sc.first_server, sc.start_time,
-                    sc.trim_status, sc.trim_output_s3_key,
-                    sc.trim_duration_s
-                FROM gold.vw_client_match_summary g
-                JOIN bronze.submission_context sc ON sc.task_id = g.task_id
-                {where}
-                ORDER BY {order}
-            """),
-            params,
-        ).mappings().all()
-
-    matches = []
-    for r in rows:
-        matches.append({
-            "task_id": r["task_id"],
-            "client_email": r["email"],  # whose account this match belongs to (admin view)
-            "match_date": str(r["match_date"]) if r["match_date"] else None,
-            "location": r["location"],
-            "player_a_name": r["player_a_name"],
-            "player_b_name": r["player_b_name"],
-            "player_a_utr": r["player_a_utr"],
-            "player_b_utr": r["player_b_utr"],
-            "first_server": r["first_server"],
-            "start_time": r["start_time"],
-            "sport_type": r["sport_type"],
-            "video_url": r["video_url"],
-            "share_url": r["share_url"],
-            "last_status": r["last_status"],
-            "created_at": r["created_at"].isoformat() if r["created_at"] else None,
-            "total_points": int(r["total_points"] or 0),
-            "total_games": int(r["total_games"] or 0),
-            "total_sets": int(r["total_sets"] or 0),
-            "player_a_points_won": int(r["player_a_points_won"] or 0),
-            "player_b_points_won": int(r["player_b_points_won"] or 0),
-            "player_a_games_won": int(r["player_a_games_won"] or 0),
-            "player_b_games_won": int(r["player_b_games_won"] or 0),
-            "total_aces": int(r["total_aces"] or 0),
-            "total_double_faults": int(r["total_double_faults"] or 0),
-            "avg_rally_length": float(r["avg_rally_length"] or 0),
-            "max_rally_length": int(r["max_rally_length"] or 0),
-            "player_a_first_serve_pct": float(r["player_a_first_serve_pct"] or 0),
-            "player_b_first_serve_pct": float(r["player_b_first_serve_pct"] or 0),
-            "player_a_winners": int(r["player_a_winners"] or 0),
-            "player_b_winners": int(r["player_b_winners"] or 0),
-            "score": _format_score(r),
-            "player_a_set1_games": r["player_a_set1_games"],
-            "player_b_set1_games": r["player_b_set1_games"],
-            "player_a_set2_games": r["player_a_set2_games"],
-            "player_b_set2_games": r["player_b_set2_games"],
-            "player_a_set3_games": r["player_a_set3_games"],
-            "player_b_set3_games": r["player_b_set3_games"],
-            "trim_status": r["trim_status"],
-            "trim_output_s3_key": r["trim_output_s3_key"],
-            "trim_duration_s": float(r["trim_duration_s"]) if r["trim_duration_s"] else None,
-        })
-
-    return jsonify({"ok": True, "matches": matches,
-                    "is_admin": is_admin, "all_clients": show_all})
+    sidebar = request.args.get("fields") == "sidebar"
+    try:
+        limit, cursor = _page_args(2 if show_all else 3)
+    except ValueError as e:
+        return jsonify({"ok": False, "error": str(e)}), 400
+
+    conds = []
+    params = {}
+    if not show_all:
+        conds.append("g.email = :email")
+        params["email"] = client_filter
+    if show_all:
+        order = "g.created_at DESC, g.task_id DESC"
+        if cursor is not None:
+            conds.append("(g.created_at, g.task_id) < (CAST(:c_created AS timestamptz), :c_task)")
+            params.update(c_created=cursor[0], c_task=cursor[1])
+        cursor_of = lambda r: [_ts(r["created_at"]), r["task_id"]]
+    else:
+        order = f"{_MATCH_DATE_KEY}, g.created_at, g.task_id"
+        if cursor is not None:
+            conds.append(f"({_MATCH_DATE_KEY}, g.created_at, g.task_id) "
+                         "> (CAST(:c_date AS date), CAST(:c_created AS timestamptz), :c_task)")
+            params.update(c_date=cursor[0], c_created=cursor[1], c_task=cursor[2])
+        cursor_of = lambda r: [str(r["match_date"]) if r["match_date"] else "infinity",
+                               _ts(r["created_at"]), r["task_id"]]
+
+    where = ("WHERE " + " AND ".join(conds)) if conds else ""
+    join = "" if sidebar else "JOIN bronze.submission_context sc ON sc.task_id = g.task_id"
+    sql = f"""
+        SELECT {_MATCH_SIDEBAR_COLS if sidebar else _MATCH_FULL_COLS}
+        FROM gold.vw_client_match_summary g
+        {join}
+        {where}
+        ORDER BY {order}
+    """
+    return _stream_list(
+        "matches", {"ok": True, "is_admin": is_admin, "all_clients": show_all},
+        sql, params, _match_row_sidebar if sidebar else _match_row_full,
+        limit, cursor_of,
+    )
 
 
 def _format_score(r) -> str:
@@ -534,6 +701,10 @@ def update_match(task_id: str):
         session.execute(text(sql), params)
         session.commit()
 
+    # Names / first_server / match_date feed gold.vw_player → re-materialise.
+    from gold_materialize import refresh_task as refresh_gold_task
+    refresh_gold_task(task_id)
+
     return jsonify({"ok": True, "updated": list(updates.keys())})
 
 
@@ -566,6 +737,9 @@ def reprocess_match(task_id: str):
         log.exception("reprocess failed task_id=%s", task_id)
         return jsonify({"ok": False, "error": "reprocess_failed"}), 500
 
+    from gold_materialize import refresh_task as refresh_gold_task
+    refresh_gold_task(task_id)
+
     # Invalidate cached AI Coach responses — silver may now have a different
     # player A/B mapping (eg. first_server flipped), so cached coaching that
     # named the wrong player is now wrong. Best-effort; missing table is fine.
@@ -676,14 +850,13 @@ def delete_match(task_id: str):
 
             # ml_analysis: detection rows are keyed on job_id, so resolve via task_id
             if _exists("ml_analysis", "video_analysis_jobs"):
-                conn.execute(text(
-                    "DELETE FROM ml_analysis.ball_detections WHERE job_id IN "
-                    "(SELECT job_id FROM ml_analysis.video_analysis_jobs WHERE task_id = :tid)"
-                ), {"tid": task_id})
-                conn.execute(text(
-                    "DELETE FROM ml_analysis.player_detections WHERE job_id IN "
-                    "(SELECT job_id FROM ml_analysis.video_analysis_jobs WHERE task_id = :tid)"
-                ), {"tid": task_id})
+                from ml_pipeline.detection_partitions import DETECTION_TABLES, drop_jobs
+                job_ids = [r[0] for r in conn.execute(text(
+                    "SELECT job_id FROM ml_analysis.video_analysis_jobs WHERE task_id = :tid"
+                ), {"tid": task_id})]
+                for det in DETECTION_TABLES:
+                    if _exists("ml_analysis", det):
+                        drop_jobs(conn, det, job_ids)
             for tbl in ("match_analytics", "serve_events"):
                 _del("ml_analysis", tbl)
             _del("ml_analysis", "video_analysis_jobs")
@@ -712,6 +885,10 @@ def delete_match(task_id: str):
         log.exception("delete_match: DB cascade failed task_id=%s", task_id)
         return jsonify({"ok": False, "error": "delete_failed"}), 500
 
+    # Silver rows are gone — drop this match from the player's rolling KPIs.
+    from gold_materialize import refresh_task as refresh_gold_task
+    refresh_gold_task(task_id)
+
     # 4. S3 cleanup. Best-effort: DB is the source of truth for "is this match
     #    visible to the user?", so a stuck S3 object isn't user-facing.
     s3_warnings: list[str] = []
@@ -2038,6 +2215,148 @@ def gold_technique_progression():
         return jsonify({"ok": False, "error": "internal_error"}), 500
 
 
+# ----------------------------
+# GET /api/client/match/<task_id>/dashboard — every gold view in one response
+# ----------------------------
+# The match analysis page used to make ~9 requests (kpi + 5 breakdowns + 3
+# technique), each with its own ownership check and connection. The bundle does
+# ONE ownership + version query, then fetches every view on one connection —
+# psycopg 3 pipeline mode sends them in a single round trip.
+#
+# Responses are cached per worker in a bounded LRU keyed by (task_id, task
+# version, rebuild generation) from gold.task_version, which refresh_task /
+# bump_task_version increment on every silver build, reprocess, edit and delete
+# (any process). The ownership check still runs on every request, so a cached
+# body is only served to someone allowed to see it. A strong ETag (hash of the
+# body) lets the browser revalidate with If-None-Match → 304.
+
+DASHBOARD_CACHE_SIZE = int(os.environ.get("DASHBOARD_CACHE_SIZE", "256"))
+DASHBOARD_PIPELINE = os.environ.get("DASHBOARD_PIPELINE", "1").strip().lower() in ("1", "true", "yes")
+
+# (response key, view, task_id is uuid)
+_DASHBOARD_VIEWS = (
+    ("match_kpi", "gold.match_kpi", True),
+    ("serve_breakdown", "gold.match_serve_breakdown", True),
+    ("return_breakdown", "gold.match_return_breakdown", True),
+    ("rally_breakdown", "gold.match_rally_breakdown", True),
+    ("rally_length", "gold.match_rally_length", True),
+    ("shot_placement", "gold.match_shot_placement", True),
+    ("technique_report", "gold.technique_report", False),
+    ("technique_comparison", "gold.technique_comparison", False),
+    ("technique_kinetic_chain", "gold.technique_kinetic_chain_summary", False),
+)
+
+
+class _DashboardCache:
+    """Thread-safe bounded LRU: (task_id, version, generation) → (etag, body bytes)."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = max(0, maxsize)
+        self._data: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            hit = self._data.get(key)
+            if hit is not None:
+                self._data.move_to_end(key)
+            return hit
+
+    def put(self, key, value) -> None:
+        if not self.maxsize:
+            return
+        with self._lock:
+            # Older versions of this task can never be served again — drop them.
+            for k in [k for k in self._data if k[0] == key[0] and k != key]:
+                del self._data[k]
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+_dashboard_cache = _DashboardCache(DASHBOARD_CACHE_SIZE)
+
+
+def _dashboard_fetch(conn, task_id: str, present: set) -> dict:
+    """Fetch every present dashboard view for task_id on one connection."""
+    queries = [(key, view, is_uuid) for key, view, is_uuid in _DASHBOARD_VIEWS if view in present]
+    out = {key: [] for key, _, _ in _DASHBOARD_VIEWS}
+
+    raw = conn.connection.dbapi_connection
+    if DASHBOARD_PIPELINE and hasattr(raw, "pipeline"):
+        cursors = []
+        with raw.pipeline():
+            for key, view, is_uuid in queries:
+                where = "task_id = CAST(%(tid)s AS uuid)" if is_uuid else "task_id = %(tid)s"
+                cur = raw.cursor()
+                cur.execute(f"SELECT * FROM {view} WHERE {where}", {"tid": task_id})
+                cursors.append((key, cur))
+        for key, cur in cursors:
+            cols = [d.name for d in cur.description]
+            out[key] = [{c: _serialize(v) for c, v in zip(cols, r)} for r in cur.fetchall()]
+            cur.close()
+        return out
+
+    for key, view, is_uuid in queries:
+        where = "task_id = CAST(:tid AS uuid)" if is_uuid else "task_id = :tid"
+        rows = conn.execute(text(f"SELECT * FROM {view} WHERE {where}"), {"tid": task_id}).mappings().all()
+        out[key] = [{k: _serialize(v) for k, v in r.items()} for r in rows]
+    return out
+
+
+@client_bp.route("/api/client/match/<task_id>/dashboard", methods=["GET", "OPTIONS"])
+def gold_match_dashboard(task_id):
+    """Every gold view the match analysis page needs, one request, ETag-cached."""
+    if not _guard():
+        return _forbid()
+    email = _client_email()
+    if not email:
+        return jsonify({"ok": False, "error": "email required"}), 400
+    try:
+        with engine.connect() as conn:
+            head = conn.execute(text("""
+                SELECT sc.email,
+                       COALESCE(tv.version, 0) AS version,
+                       COALESCE((SELECT version FROM gold.task_version WHERE task_id = '*'), 0) AS generation,
+                       ARRAY(SELECT v FROM unnest(CAST(:views AS text[])) AS v
+                             WHERE to_regclass(v) IS NOT NULL) AS present
+                FROM bronze.submission_context sc
+                LEFT JOIN gold.task_version tv ON tv.task_id = sc.task_id
+                WHERE sc.task_id = :tid
+            """), {"tid": task_id, "views": [v for _, v, _ in _DASHBOARD_VIEWS]}).mappings().first()
+            if not head or not _can_view_task(head["email"], email):
+                return jsonify({"ok": False, "error": "not_found"}), 404
+
+            key = (task_id, int(head["version"]), int(head["generation"]))
+            cached = _dashboard_cache.get(key)
+            if cached is None:
+                views = _dashboard_fetch(conn, task_id, set(head["present"] or ()))
+                body = json.dumps(
+                    {"ok": True, "task_id": task_id, "version": key[1], "views": views},
+                    separators=(",", ":"),
+                ).encode()
+                cached = ('"' + hashlib.sha256(body).hexdigest()[:32] + '"', body)
+                _dashboard_cache.put(key, cached)
+    except Exception:
+        log.exception("dashboard endpoint failed task_id=%s", task_id)
+        return jsonify({"ok": False, "error": "internal_error"}), 500
+
+    # "report viewed" signal — replaces the one the KPI card fired (fire-and-forget)
+    try:
+        from marketing_crm.tracking import track
+        from marketing_crm.tracking.events import REPORT_VIEWED
+        track(REPORT_VIEWED, email=email, ref_type="match", ref_id=task_id)
+    except Exception:
+        pass
+
+    etag, body = cached
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag in (request.headers.get("If-None-Match") or ""):
+        return Response(status=304, headers=headers)
+    return Response(body, status=200, mimetype="application/json", headers=headers)
+
+
 # ----------------------------
 # GET /api/client/match-analysis/<task_id>  [LEGACY — to be retired]
 # ----------------------------
@@ -2138,59 +2457,62 @@ def backoffice_pipeline():
 
     date_from = request.args.get("date_from")
     date_to = request.args.get("date_to")
-
-    with engine.connect() as conn:
-        rows = conn.execute(
-            text("""
-                SELECT
-                    sc.task_id,
-                    sc.email,
-                    sc.customer_name,
-                    sc.created_at,
-                    sc.match_date,
-                    sc.location,
-                    sc.player_a_name,
-                    sc.player_b_name,
-                    sc.s3_key,
-                    -- SportAI stage
-                    sc.last_status,
-                    sc.last_status_at,
-                    -- Bronze ingest stage
-                    sc.ingest_started_at,
-                    sc.ingest_finished_at,
-                    sc.ingest_error,
-                    sc.session_id,
-                    -- Silver (session_id not null = silver built)
-                    -- Video trim stage
-                    sc.trim_status,
-                    sc.trim_requested_at,
-                    sc.trim_finished_at,
-                    sc.trim_error,
-                    sc.trim_output_s3_key,
-                    sc.trim_duration_s,
-                    sc.trim_source_duration_s,
-                    sc.trim_segment_count,
-                    -- SES notify stage
-                    sc.ses_notified_at,
-                    sc.ses_notify_error,
-                    -- Score
-                    sc.player_a_set1_games, sc.player_b_set1_games,
-                    sc.player_a_set2_games, sc.player_b_set2_games,
-                    sc.player_a_set3_games, sc.player_b_set3_games
-                FROM bronze.submission_context sc
-                WHERE sc.created_at >= COALESCE(:d_from, CURRENT_DATE)::timestamptz
-                  AND sc.created_at < (COALESCE(:d_to, CURRENT_DATE)::date + 1)::timestamptz
-                ORDER BY sc.created_at DESC
-            """),
-            {"d_from": date_from, "d_to": date_to},
-        ).mappings().all()
-
-    def _ts(v):
-        return v.isoformat() if v else None
-
-    tasks = []
-    for r in rows:
-        tasks.append({
+    try:
+        limit, cursor = _page_args(2)
+    except ValueError as e:
+        return jsonify({"ok": False, "error": str(e)}), 400
+
+    params = {"d_from": date_from, "d_to": date_to}
+    keyset = ""
+    if cursor is not None:
+        keyset = "AND (sc.created_at, sc.task_id) < (CAST(:c_created AS timestamptz), :c_task)"
+        params.update(c_created=cursor[0], c_task=cursor[1])
+
+    sql = f"""
+        SELECT
+            sc.task_id,
+            sc.email,
+            sc.customer_name,
+            sc.created_at,
+            sc.match_date,
+            sc.location,
+            sc.player_a_name,
+            sc.player_b_name,
+            sc.s3_key,
+            -- SportAI stage
+            sc.last_status,
+            sc.last_status_at,
+            -- Bronze ingest stage
+            sc.ingest_started_at,
+            sc.ingest_finished_at,
+            sc.ingest_error,
+            sc.session_id,
+            -- Silver (session_id not null = silver built)
+            -- Video trim stage
+            sc.trim_status,
+            sc.trim_requested_at,
+            sc.trim_finished_at,
+            sc.trim_error,
+            sc.trim_output_s3_key,
+            sc.trim_duration_s,
+            sc.trim_source_duration_s,
+            sc.trim_segment_count,
+            -- SES notify stage
+            sc.ses_notified_at,
+            sc.ses_notify_error,
+            -- Score
+            sc.player_a_set1_games, sc.player_b_set1_games,
+            sc.player_a_set2_games, sc.player_b_set2_games,
+            sc.player_a_set3_games, sc.player_b_set3_games
+        FROM bronze.submission_context sc
+        WHERE sc.created_at >= COALESCE(:d_from, CURRENT_DATE)::timestamptz
+          AND sc.created_at < (COALESCE(:d_to, CURRENT_DATE)::date + 1)::timestamptz
+          {keyset}
+        ORDER BY sc.created_at DESC, sc.task_id DESC
+    """
+
+    def _shape(r) -> dict:
+        return {
             "task_id": r["task_id"],
             "email": r["email"],
             "customer_name": r["customer_name"],
@@ -2218,9 +2540,12 @@ def backoffice_pipeline():
             "ses_notified_at": _ts(r["ses_notified_at"]),
             "ses_notify_error": r["ses_notify_error"],
             "score": _format_score(r),
-        })
+        }
 
-    return jsonify({"ok": True, "tasks": tasks})
+    return _stream_list(
+        "tasks", {"ok": True}, sql, params, _shape, limit,
+        lambda r: [_ts(r["created_at"]), r["task_id"]],
+    )
 
 
 # ----------------------------
@@ -2232,6 +2557,11 @@ def backoffice_customers():
     if not _admin_guard():
         return _forbid()
 
+    try:
+        limit, cursor = _page_args(2)
+    except ValueError as e:
+        return jsonify({"ok": False, "error": str(e)}), 400
+
     with engine.connect() as conn:
         # subscription_state is created lazily — check before joining
         has_sub = conn.execute(
@@ -2243,62 +2573,69 @@ def backoffice_customers():
             """)
         ).scalar()
 
-        sub_join = "LEFT JOIN billing.subscription_state s ON s.account_id = a.id" if has_sub else ""
-        sub_cols = """
-                    s.plan_code,
-                    s.plan_type,
-                    s.status AS subscription_status,
-                    s.matches_granted AS plan_allowance,
-                    s.current_period_start,
-                    s.current_period_end,
-                    s.cancelled_at,""" if has_sub else """
-                    NULL AS plan_code,
-                    NULL AS plan_type,
-                    NULL AS subscription_status,
-                    NULL AS plan_allowance,
-                    NULL AS current_period_start,
-                    NULL AS current_period_end,
-                    NULL AS cancelled_at,"""
-
-        rows = conn.execute(
-            text(f"""
-                SELECT
-                    a.id AS account_id,
-                    a.email,
-                    a.primary_full_name,
-                    a.active AS account_active,
-                    a.created_at AS account_created_at,
-                    -- Usage
-                    COALESCE(v.matches_granted, 0)    AS matches_granted,
-                    COALESCE(v.matches_consumed, 0)    AS matches_consumed,
-                    COALESCE(v.matches_remaining, 0)   AS matches_remaining,
-                    -- Subscription
-                    {sub_cols}
-                    -- Members
-                    (SELECT count(*) FROM billing.member m
-                     WHERE m.account_id = a.id AND m.active = true) AS member_count,
-                    -- Match stats
-                    (SELECT count(*) FROM bronze.submission_context sc
-                     WHERE sc.email = a.email) AS total_tasks,
-                    (SELECT count(*) FROM bronze.submission_context sc
-                     WHERE sc.email = a.email AND sc.last_status = 'completed') AS completed_tasks,
-                    (SELECT count(*) FROM bronze.submission_context sc
-                     WHERE sc.email = a.email AND sc.last_status = 'failed') AS failed_tasks,
-                    (SELECT max(sc.created_at) FROM bronze.submission_context sc
-                     WHERE sc.email = a.email) AS last_upload_at
-                FROM billing.account a
-                LEFT JOIN billing.vw_customer_usage v ON v.account_id = a.id
-                {sub_join}
-                ORDER BY a.created_at DESC
-            """)
-        ).mappings().all()
-
-    def _ts(v):
-        return v.isoformat() if v else None
-
-    customers = []
-    for r in rows:
-        customers.append({
+    sub_join = "LEFT JOIN billing.subscription_state s ON s.account_id = a.id" if has_sub else ""
+    sub_cols = """
+                s.plan_code,
+                s.plan_type,
+                s.status AS subscription_status,
+                s.matches_granted AS plan_allowance,
+                s.current_period_start,
+                s.current_period_end,
+                s.cancelled_at,""" if has_sub else """
+                NULL AS plan_code,
+                NULL AS plan_type,
+                NULL AS subscription_status,
+                NULL AS plan_allowance,
+                NULL AS current_period_start,
+                NULL AS current_period_end,
+                NULL AS cancelled_at,"""
+
+    params = {}
+    keyset = ""
+    if cursor is not None:
+        keyset = "WHERE (a.created_at, a.id) < (CAST(:c_created AS timestamptz), CAST(:c_id AS bigint))"
+        params.update(c_created=cursor[0], c_id=cursor[1])
+
+    # Task counts: one pass over the customer's submissions (LATERAL, served
+    # by ix_submission_context_email) instead of four correlated subqueries.
+    sql = f"""
+        SELECT
+            a.id AS account_id,
+            a.email,
+            a.primary_full_name,
+            a.active AS account_active,
+            a.created_at AS account_created_at,
+            -- Usage
+            COALESCE(v.matches_granted, 0)    AS matches_granted,
+            COALESCE(v.matches_consumed, 0)    AS matches_consumed,
+            COALESCE(v.matches_remaining, 0)   AS matches_remaining,
+            -- Subscription
+            {sub_cols}
+            -- Members
+            (SELECT count(*) FROM billing.member m
+             WHERE m.account_id = a.id AND m.active = true) AS member_count,
+            -- Match stats
+            t.total_tasks,
+            t.completed_tasks,
+            t.failed_tasks,
+            t.last_upload_at
+        FROM billing.account a
+        LEFT JOIN billing.vw_customer_usage v ON v.account_id = a.id
+        {sub_join}
+        CROSS JOIN LATERAL (
+            SELECT count(*)                                            AS total_tasks,
+                   count(*) FILTER (WHERE sc.last_status = 'completed') AS completed_tasks,
+                   count(*) FILTER (WHERE sc.last_status = 'failed')    AS failed_tasks,
+                   max(sc.created_at)                                  AS last_upload_at
+            FROM bronze.submission_context sc
+            WHERE sc.email = a.email
+        ) t
+        {keyset}
+        ORDER BY a.created_at DESC, a.id DESC
+    """
+
+    def _shape(r) -> dict:
+        return {
             "account_id": int(r["account_id"]),
             "email": r["email"],
             "name": r["primary_full_name"],
@@ -2319,9 +2656,12 @@ def backoffice_customers():
             "completed_tasks": int(r["completed_tasks"]),
             "failed_tasks": int(r["failed_tasks"]),
             "last_upload_at": _ts(r["last_upload_at"]),
-        })
+        }
 
-    return jsonify({"ok": True, "customers": customers})
+    return _stream_list(
+        "customers", {"ok": True}, sql, params, _shape, limit,
+        lambda r: [_ts(r["account_created_at"]), int(r["account_id"])],
+    )
 
 
 # ----------------------------
@@ -48,18 +48,13 @@ def sweep_stale_states():
         return
 
     try:
-        from sqlalchemy import create_engine, text as sql_text
+        from sqlalchemy import text as sql_text
+        from db_engine import make_engine
     except ImportError:
         print("SWEEP: sqlalchemy not available — skipping stale state sweep")
         return
 
-    db_url = DATABASE_URL
-    if db_url.startswith("postgres://"):
-        db_url = db_url.replace("postgres://", "postgresql://", 1)
-    if db_url.startswith("postgresql://") and "+psycopg" not in db_url:
-        db_url = db_url.replace("postgresql://", "postgresql+psycopg://", 1)
-
-    engine = create_engine(db_url, pool_pre_ping=True)
+    engine = make_engine(DATABASE_URL, name="cron_capacity_sweep", role_name="cron")
 
     with engine.begin() as conn:
         # --- Stuck ingests ---
@@ -22,9 +22,13 @@
 #
 # Required env vars:
 #   DATABASE_URL — read by db_init.engine (imported transitively).
+#   DB_ROLE      — defaults to "cron" here (small pool, see db_engine.py).
 # ============================================================
+import os
 import sys
 
+os.environ.setdefault("DB_ROLE", "cron")
+
 
 def main() -> int:
     try:
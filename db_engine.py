@@ -0,0 +1,290 @@
+# db_engine.py — Central SQLAlchemy engine factory + connection-pool telemetry.
+#
+# db_init.engine used to be create_engine() with SQLAlchemy's default pool (5 + 10
+# overflow, 30s checkout timeout) in every service, shared by the gunicorn threads,
+# the background ingest threads (_start_ingest_background), the tracking flusher and
+# the technique pipeline threads. Pool exhaustion under concurrent ingests showed up
+# only as random latency spikes. Every engine is now built here:
+#
+#   make_engine(url, name=..., role=None)
+#
+# Pool sizing is per PROCESS ROLE (DB_ROLE env, set per service in render.yaml):
+#
+#   role     pool_size  max_overflow  pool_timeout   who
+#   web          8           8           15s        webhook-server / locker-room (threads + bg ingests)
+#   ingest       4           4           30s        ingest-worker (2 threads + ingest threads)
+#   video        2           2           30s        video-worker (trim callbacks only)
+#   cron         1           2           30s        cron_* scripts (one-shot)
+#
+# Any value can be overridden: DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT_S,
+# DB_POOL_RECYCLE_S (default 1800 — Render's connection lifecycle).
+#
+# Server-side timeouts (off unless set; milliseconds): DB_STATEMENT_TIMEOUT_MS,
+# DB_LOCK_TIMEOUT_MS, DB_IDLE_TX_TIMEOUT_MS (idle_in_transaction_session_timeout).
+# Sent as libpq startup options, with application_name "<name>:<role>" so
+# pg_stat_activity shows which service/engine holds a connection.
+#
+# PgBouncer transaction mode (DB_PGBOUNCER=1):
+#   - psycopg server-side prepared statements off (prepare_threshold=None) — a
+#     prepared statement would live on a server connection the next transaction
+#     may not get;
+#   - no startup options (PgBouncer rejects unknown startup parameters): set the
+#     timeouts on the database role instead (ALTER ROLE … SET statement_timeout);
+#   - session-level state does not survive a transaction. Session advisory locks
+#     (ddl_registry's boot lock) need a session-mode pool — keep DB_PGBOUNCER=0 for
+#     the service that runs boot DDL, or point it at a session-mode port.
+#
+# Telemetry (pool_stats(), GET /ops/db-pool-stats on the web + ingest services):
+# per engine — size, checked out, overflow, checked in; checkout count, timeouts,
+# checkout latency histogram (time spent getting a connection: queue wait + connect),
+# hold-time histogram (checkout → checkin). A checkout slower than
+# DB_POOL_SLOW_CHECKOUT_MS (default 1000) is logged with the pool status, at most
+# once per 30s per engine — exhaustion now shows up in the logs by name.
+
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+_log = logging.getLogger(__name__)
+
+ROLE_DEFAULTS: Dict[str, Dict[str, int]] = {
+    "web":    {"pool_size": 8, "max_overflow": 8, "pool_timeout": 15},
+    "ingest": {"pool_size": 4, "max_overflow": 4, "pool_timeout": 30},
+    "video":  {"pool_size": 2, "max_overflow": 2, "pool_timeout": 30},
+    "cron":   {"pool_size": 1, "max_overflow": 2, "pool_timeout": 30},
+}
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is +inf.
+BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+DB_PGBOUNCER = os.getenv("DB_PGBOUNCER", "0").strip().lower() in ("1", "true", "yes")
+DB_POOL_SLOW_CHECKOUT_MS = int(os.getenv("DB_POOL_SLOW_CHECKOUT_MS", "1000"))
+_SLOW_LOG_INTERVAL_S = 30.0
+
+_ENGINES: Dict[str, object] = {}
+_ENGINES_LOCK = threading.Lock()
+
+
+def role() -> str:
+    r = (os.getenv("DB_ROLE") or "web").strip().lower()
+    return r if r in ROLE_DEFAULTS else "web"
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        _log.warning("db_engine: %s=%r is not an integer — using %d", name, raw, default)
+        return default
+
+
+def normalize_url(url: str) -> str:
+    """postgres:// → postgresql+psycopg:// (psycopg v3)."""
+    if url.startswith("postgres://"):
+        url = url.replace("postgres://", "postgresql://", 1)
+    if url.startswith("postgresql://") and "+psycopg" not in url:
+        url = url.replace("postgresql://", "postgresql+psycopg://", 1)
+    return url
+
+
+# ---------------------------------------------------------------------------
+# Telemetry
+# ---------------------------------------------------------------------------
+
+class _Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.n = 0
+
+    def observe(self, ms: float) -> None:
+        i = 0
+        while i < len(BUCKETS_MS) and ms > BUCKETS_MS[i]:
+            i += 1
+        self.counts[i] += 1
+        self.total_ms += ms
+        self.n += 1
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def snapshot(self) -> dict:
+        labels = [f"le_{b}" for b in BUCKETS_MS] + ["le_inf"]
+        return {
+            "count": self.n,
+            "avg_ms": round(self.total_ms / self.n, 2) if self.n else 0.0,
+            "max_ms": round(self.max_ms, 2),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class PoolTelemetry:
+    def __init__(self, name: str):
+        self.name = name
+        self.lock = threading.Lock()
+        self.checkout = _Histogram()
+        self.hold = _Histogram()
+        self.timeouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self._last_slow_log = 0.0
+
+    def observe_checkout(self, ms: float, pool) -> None:
+        with self.lock:
+            self.checkout.observe(ms)
+            log_it = ms >= DB_POOL_SLOW_CHECKOUT_MS and \
+                time.monotonic() - self._last_slow_log >= _SLOW_LOG_INTERVAL_S
+            if log_it:
+                self._last_slow_log = time.monotonic()
+        if log_it:
+            _log.warning("db_engine[%s]: slow pool checkout %.0fms — %s",
+                         self.name, ms, pool.status())
+
+    def observe_timeout(self, pool) -> None:
+        with self.lock:
+            self.timeouts += 1
+        _log.error("db_engine[%s]: pool checkout TIMED OUT — %s", self.name, pool.status())
+
+    def observe_hold(self, ms: float) -> None:
+        with self.lock:
+            self.hold.observe(ms)
+
+    def bump(self, attr: str) -> None:
+        with self.lock:
+            setattr(self, attr, getattr(self, attr) + 1)
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            return {
+                "checkout_latency": self.checkout.snapshot(),
+                "hold_time": self.hold.snapshot(),
+                "timeouts": self.timeouts,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+            }
+
+
+class _TimedQueuePool(QueuePool):
+    """QueuePool that times every checkout. Subclassed per engine (see make_engine)
+    so the telemetry survives pool.recreate() on dispose / invalidation."""
+    _telemetry: Optional[PoolTelemetry] = None
+
+    def _do_get(self):
+        t0 = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            if self._telemetry is not None:
+                self._telemetry.observe_timeout(self)
+            raise
+        if self._telemetry is not None:
+            self._telemetry.observe_checkout((time.perf_counter() - t0) * 1000.0, self)
+        return conn
+
+
+def _install_hold_timer(engine, tel: PoolTelemetry) -> None:
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_conn, record, proxy):
+        record.info["_db_engine_out"] = time.perf_counter()
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_conn, record):
+        t0 = record.info.pop("_db_engine_out", None)
+        if t0 is not None:
+            tel.observe_hold((time.perf_counter() - t0) * 1000.0)
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_conn, record):
+        tel.bump("connects")
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(dbapi_conn, record, exc):
+        tel.bump("invalidations")
+
+
+# ---------------------------------------------------------------------------
+# Factory
+# ---------------------------------------------------------------------------
+
+def pool_settings(role_name: Optional[str] = None) -> Dict[str, int]:
+    r = role_name if role_name in ROLE_DEFAULTS else role()
+    d = ROLE_DEFAULTS[r]
+    return {
+        "pool_size": _env_int("DB_POOL_SIZE", d["pool_size"]),
+        "max_overflow": _env_int("DB_MAX_OVERFLOW", d["max_overflow"]),
+        "pool_timeout": _env_int("DB_POOL_TIMEOUT_S", d["pool_timeout"]),
+        "pool_recycle": _env_int("DB_POOL_RECYCLE_S", 1800),
+    }
+
+
+def _connect_args(name: str, role_name: str) -> dict:
+    args: dict = {"application_name": f"{name}:{role_name}"[:63]}
+    timeouts = [
+        ("statement_timeout", _env_int("DB_STATEMENT_TIMEOUT_MS", 0)),
+        ("lock_timeout", _env_int("DB_LOCK_TIMEOUT_MS", 0)),
+        ("idle_in_transaction_session_timeout", _env_int("DB_IDLE_TX_TIMEOUT_MS", 0)),
+    ]
+    if DB_PGBOUNCER:
+        args["prepare_threshold"] = None
+        if any(ms for _, ms in timeouts):
+            _log.warning("db_engine[%s]: DB_PGBOUNCER=1 — statement/lock/idle timeouts are not "
+                         "sent as startup options; set them on the database role", name)
+        return args
+    opts = " ".join(f"-c {k}={ms}" for k, ms in timeouts if ms > 0)
+    if opts:
+        args["options"] = opts
+    return args
+
+
+def make_engine(url: str, *, name: str = "app", role_name: Optional[str] = None, **kwargs):
+    """Create (and register for telemetry) a pooled engine for this process role.
+    Extra kwargs go straight to create_engine and win over the role defaults."""
+    r = role_name if role_name in ROLE_DEFAULTS else role()
+    settings = pool_settings(r)
+    tel = PoolTelemetry(name)
+    poolclass = type(f"_TimedQueuePool_{name}", (_TimedQueuePool,), {"_telemetry": tel})
+    connect_args = {**_connect_args(name, r), **kwargs.pop("connect_args", {})}
+    engine = create_engine(
+        normalize_url(url),
+        poolclass=poolclass,
+        pool_pre_ping=True,
+        connect_args=connect_args,
+        future=True,
+        **{**settings, **kwargs},
+    )
+    _install_hold_timer(engine, tel)
+    engine._db_engine_telemetry = tel
+    with _ENGINES_LOCK:
+        _ENGINES[name] = engine
+    _log.info("db_engine[%s]: role=%s pool_size=%d max_overflow=%d timeout=%ds pgbouncer=%s",
+              name, r, settings["pool_size"], settings["max_overflow"],
+              settings["pool_timeout"], DB_PGBOUNCER)
+    return engine
+
+
+def pool_stats() -> dict:
+    """Live pool status + telemetry for every engine made in this process."""
+    with _ENGINES_LOCK:
+        engines = dict(_ENGINES)
+    out = {"pid": os.getpid(), "role": role(), "pgbouncer": DB_PGBOUNCER, "engines": {}}
+    for name, eng in engines.items():
+        pool = eng.pool
+        entry = {"status": pool.status()}
+        for attr in ("size", "checkedout", "overflow", "checkedin"):
+            fn = getattr(pool, attr, None)
+            if callable(fn):
+                entry[attr] = fn()
+        tel = getattr(eng, "_db_engine_telemetry", None)
+        if tel is not None:
+            entry.update(tel.snapshot())
+        out["engines"][name] = entry
+    return out
@@ -16,16 +16,21 @@
 # bronze.submission_context with silver.point_detail to produce per-match aggregate stats
 # (points/games/sets won, aces, double faults, rally length, serve %, winners, scores).
 # Player mapping uses first_server to resolve internal player_id → player_a/player_b.
+# The silver aggregate is gold.vw_client_match_stats_live, materialised per task into
+# gold.client_match_stats (gold_materialize.py); the summary view joins that table.
 #
 # Business rules:
 #   - DATABASE_URL is required (falls back to POSTGRES_URL or DB_URL)
 #   - Connection string is normalized to postgresql+psycopg:// for psycopg v3
 #   - All DDL is idempotent (IF NOT EXISTS / ADD COLUMN IF NOT EXISTS)
-#   - Pool uses pre_ping=True and recycle=1800 for Render's connection lifecycle
+#   - Engine comes from db_engine.make_engine: pre_ping=True, recycle=1800 for Render's
+#     connection lifecycle, pool sized per DB_ROLE, checkout telemetry (/ops/db-pool-stats)
 
 import os
 import logging
-from sqlalchemy import create_engine, text as sql_text
+from sqlalchemy import text as sql_text
+
+from db_engine import make_engine, normalize_url
 
 _log = logging.getLogger(__name__)
 
@@ -38,18 +43,11 @@ if not DATABASE_URL:
     raise RuntimeError("DATABASE_URL (or POSTGRES_URL / DB_URL) env var is required.")
 
 # Normalize scheme + force psycopg v3 driver
-if DATABASE_URL.startswith("postgres://"):
-    DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
-
-if DATABASE_URL.startswith("postgresql://") and "+psycopg" not in DATABASE_URL:
-    DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+psycopg://", 1)
+DATABASE_URL = normalize_url(DATABASE_URL)
 
-engine = create_engine(
-    DATABASE_URL,
-    pool_pre_ping=True,
-    pool_recycle=1800,      # keep connections fresh on Render
-    future=True,
-)
+# Pool size / overflow / timeout come from DB_ROLE (+ DB_POOL_* overrides) and every
+# checkout is timed — see db_engine.py. pool_recycle=1800 keeps connections fresh on Render.
+engine = make_engine(DATABASE_URL, name="app")
 
 # -----------------------------------------------------------------------------
 # Append-only per-step task event log
@@ -375,6 +373,149 @@ def bronze_init():
 # Gold Init (idempotent)
 # -----------------------------------------------------------------------------
 
+# Per-task silver aggregate behind the match list. Materialised per task into
+# gold.client_match_stats by gold_materialize (which also fingerprints this SQL).
+CLIENT_MATCH_STATS_LIVE_SQL = """
+    CREATE VIEW gold.vw_client_match_stats_live AS
+    WITH mapped AS (
+        -- Use gold.vw_player as the single source of truth for player A/B
+        -- mapping so the matches list, dashboards, and heatmaps never disagree.
+        -- vw_player respects submission_context.first_server (user-editable
+        -- via Wix: 'S'/'R'/'player_a'/'player_b') and falls back to the
+        -- first detected server in silver when first_server is unset.
+        SELECT
+            pl.task_id,
+            pl.player_a_id AS player_a_pid,
+            pl.player_b_id AS player_b_pid
+        FROM gold.vw_player pl
+    )
+    SELECT
+            pd.task_id,
+            m.player_a_pid,
+            m.player_b_pid,
+
+            -- Points
+            MAX(pd.point_number) FILTER (WHERE pd.exclude_d IS NOT TRUE) AS total_points,
+            MAX(pd.game_number)  FILTER (WHERE pd.exclude_d IS NOT TRUE) AS total_games,
+            MAX(pd.set_number)   FILTER (WHERE pd.exclude_d IS NOT TRUE) AS total_sets,
+
+            COUNT(DISTINCT pd.point_number)
+                FILTER (WHERE pd.point_winner_player_id = m.player_a_pid
+                          AND pd.exclude_d IS NOT TRUE)
+                AS player_a_points_won,
+            COUNT(DISTINCT pd.point_number)
+                FILTER (WHERE pd.point_winner_player_id = m.player_b_pid
+                          AND pd.exclude_d IS NOT TRUE)
+                AS player_b_points_won,
+
+            -- Games
+            COUNT(DISTINCT pd.game_number)
+                FILTER (WHERE pd.game_winner_player_id = m.player_a_pid
+                          AND pd.exclude_d IS NOT TRUE)
+                AS player_a_games_won,
+            COUNT(DISTINCT pd.game_number)
+                FILTER (WHERE pd.game_winner_player_id = m.player_b_pid
+                          AND pd.exclude_d IS NOT TRUE)
+                AS player_b_games_won,
+
+            -- Aces & double faults — count DISTINCT points because silver
+            -- stamps ace_d on every shot row of the point (EXISTS semantics)
+            -- and a DF point reclassifies BOTH its serve rows to 'Double'.
+            COUNT(DISTINCT pd.point_number)
+                FILTER (WHERE pd.ace_d = TRUE AND pd.exclude_d IS NOT TRUE) AS total_aces,
+            COUNT(DISTINCT pd.point_number)
+                FILTER (WHERE pd.serve_try_ix_in_point = 'Double' AND pd.exclude_d IS NOT TRUE) AS total_double_faults,
+
+            -- Rally length
+            AVG(pd.rally_length_point) FILTER (WHERE pd.shot_ix_in_point = 1 AND pd.exclude_d IS NOT TRUE) AS avg_rally_length,
+            MAX(pd.rally_length_point) FILTER (WHERE pd.shot_ix_in_point = 1 AND pd.exclude_d IS NOT TRUE) AS max_rally_length,
+
+            -- First serve %  (numerator: 1st-serve attempts that went in;
+            -- denominator: distinct service points). Silver writes
+            -- '1st'/'2nd'/'Double'; a DF point has both serve rows = 'Double'.
+            COUNT(*) FILTER (WHERE pd.serve_d = TRUE AND pd.serve_try_ix_in_point = '1st'
+                               AND pd.shot_outcome_d <> 'Error'
+                               AND pd.player_id = m.player_a_pid AND pd.exclude_d IS NOT TRUE)
+                AS player_a_first_serves,
+            COUNT(DISTINCT pd.point_key) FILTER (WHERE pd.serve_d = TRUE
+                               AND pd.player_id = m.player_a_pid AND pd.exclude_d IS NOT TRUE)
+                AS player_a_total_serves,
+            COUNT(*) FILTER (WHERE pd.serve_d = TRUE AND pd.serve_try_ix_in_point = '1st'
+                               AND pd.shot_outcome_d <> 'Error'
+                               AND pd.player_id = m.player_b_pid AND pd.exclude_d IS NOT TRUE)
+                AS player_b_first_serves,
+            COUNT(DISTINCT pd.point_key) FILTER (WHERE pd.serve_d = TRUE
+                               AND pd.player_id = m.player_b_pid AND pd.exclude_d IS NOT TRUE)
+                AS player_b_total_serves,
+
+            -- Winners
+            COUNT(*) FILTER (WHERE pd.shot_outcome_d = 'Winner'
+                               AND pd.player_id = m.player_a_pid AND pd.exclude_d IS NOT TRUE)
+                AS player_a_winners,
+            COUNT(*) FILTER (WHERE pd.shot_outcome_d = 'Winner'
+                               AND pd.player_id = m.player_b_pid AND pd.exclude_d IS NOT TRUE)
+                AS player_b_winners
+
+    FROM silver.point_detail pd
+    JOIN mapped m ON m.task_id = pd.task_id
+    GROUP BY pd.task_id, m.player_a_pid, m.player_b_pid;
+"""
+
+
+def client_match_summary_sql(stats_src: str) -> str:
+    """CREATE OR REPLACE for the gold.vw_client_match_summary facade over
+    `stats_src` (gold.client_match_stats, or the live view while the table
+    is disabled or awaiting a rebuild — gold_materialize.source_for)."""
+    return f"""
+    CREATE OR REPLACE VIEW gold.vw_client_match_summary AS
+    SELECT
+        sc.task_id,
+        sc.match_date,
+        sc.location,
+        sc.player_a_name,
+        sc.player_b_name,
+        sc.sport_type,
+        sc.video_url,
+        sc.share_url,
+        sc.email,
+        sc.last_status,
+        sc.created_at,
+
+        COALESCE(s.total_points, 0)   AS total_points,
+        COALESCE(s.total_games, 0)    AS total_games,
+        COALESCE(s.total_sets, 0)     AS total_sets,
+        COALESCE(s.player_a_points_won, 0) AS player_a_points_won,
+        COALESCE(s.player_b_points_won, 0) AS player_b_points_won,
+        COALESCE(s.player_a_games_won, 0)  AS player_a_games_won,
+        COALESCE(s.player_b_games_won, 0)  AS player_b_games_won,
+        COALESCE(s.total_aces, 0)     AS total_aces,
+        COALESCE(s.total_double_faults, 0) AS total_double_faults,
+        ROUND(COALESCE(s.avg_rally_length, 0)::numeric, 1) AS avg_rally_length,
+        COALESCE(s.max_rally_length, 0) AS max_rally_length,
+        CASE WHEN s.player_a_total_serves > 0
+             THEN ROUND(100.0 * s.player_a_first_serves / s.player_a_total_serves, 1)
+             ELSE 0 END AS player_a_first_serve_pct,
+        CASE WHEN s.player_b_total_serves > 0
+             THEN ROUND(100.0 * s.player_b_first_serves / s.player_b_total_serves, 1)
+             ELSE 0 END AS player_b_first_serve_pct,
+        COALESCE(s.player_a_winners, 0) AS player_a_winners,
+        COALESCE(s.player_b_winners, 0) AS player_b_winners,
+
+        -- Score (from submission_context typed columns)
+        sc.player_a_set1_games, sc.player_b_set1_games,
+        sc.player_a_set2_games, sc.player_b_set2_games,
+        sc.player_a_set3_games, sc.player_b_set3_games
+
+    FROM bronze.submission_context sc
+    LEFT JOIN {stats_src} s ON s.task_id = sc.task_id::uuid
+    WHERE sc.email IS NOT NULL
+      -- legacy rows (pre-sport_type column) had NULL — treat as singles,
+      -- otherwise the historical match list silently drops them
+      AND (sc.sport_type IS NULL OR sc.sport_type = 'tennis_singles')
+      AND sc.deleted_at IS NULL;
+"""
+
+
 def gold_init():
     """
     Create the gold schema and client-facing views.
@@ -388,135 +529,41 @@ def gold_init():
             "ALTER TABLE bronze.submission_context "
             "ADD COLUMN IF NOT EXISTS deleted_at TIMESTAMPTZ"
         ))
+        # Keyset indexes for the streamed list endpoints (client_api):
+        #   client_list — /api/client/matches per client, in the facade's order
+        #     (match_date NULLS LAST via COALESCE, created_at, task_id); partial
+        #     on the facade's filter and INCLUDEs the ?fields=sidebar columns so
+        #     a sidebar page never visits the submission_context heap.
+        #   created     — admin show_all + backoffice pipeline (created_at DESC).
+        #   email       — backoffice customers' per-account task counts.
         conn.execute(sql_text("""
-            CREATE OR REPLACE VIEW gold.vw_client_match_summary AS
-            WITH mapped AS (
-                -- Use gold.vw_player as the single source of truth for player A/B
-                -- mapping so the matches list, dashboards, and heatmaps never disagree.
-                -- vw_player respects submission_context.first_server (user-editable
-                -- via Wix: 'S'/'R'/'player_a'/'player_b') and falls back to the
-                -- first detected server in silver when first_server is unset.
-                SELECT
-                    pl.task_id,
-                    pl.player_a_id AS player_a_pid,
-                    pl.player_b_id AS player_b_pid
-                FROM gold.vw_player pl
-            ),
-            stats AS (
-                SELECT
-                    pd.task_id,
-                    m.player_a_pid,
-                    m.player_b_pid,
-
-                    -- Points
-                    MAX(pd.point_number) FILTER (WHERE pd.exclude_d IS NOT TRUE) AS total_points,
-                    MAX(pd.game_number)  FILTER (WHERE pd.exclude_d IS NOT TRUE) AS total_games,
-                    MAX(pd.set_number)   FILTER (WHERE pd.exclude_d IS NOT TRUE) AS total_sets,
-
-                    COUNT(DISTINCT pd.point_number)
-                        FILTER (WHERE pd.point_winner_player_id = m.player_a_pid
-                                  AND pd.exclude_d IS NOT TRUE)
-                        AS player_a_points_won,
-                    COUNT(DISTINCT pd.point_number)
-                        FILTER (WHERE pd.point_winner_player_id = m.player_b_pid
-                                  AND pd.exclude_d IS NOT TRUE)
-                        AS player_b_points_won,
-
-                    -- Games
-                    COUNT(DISTINCT pd.game_number)
-                        FILTER (WHERE pd.game_winner_player_id = m.player_a_pid
-                                  AND pd.exclude_d IS NOT TRUE)
-                        AS player_a_games_won,
-                    COUNT(DISTINCT pd.game_number)
-                        FILTER (WHERE pd.game_winner_player_id = m.player_b_pid
-                                  AND pd.exclude_d IS NOT TRUE)
-                        AS player_b_games_won,
-
-                    -- Aces & double faults — count DISTINCT points because silver
-                    -- stamps ace_d on every shot row of the point (EXISTS semantics)
-                    -- and a DF point reclassifies BOTH its serve rows to 'Double'.
-                    COUNT(DISTINCT pd.point_number)
-                        FILTER (WHERE pd.ace_d = TRUE AND pd.exclude_d IS NOT TRUE) AS total_aces,
-                    COUNT(DISTINCT pd.point_number)
-                        FILTER (WHERE pd.serve_try_ix_in_point = 'Double' AND pd.exclude_d IS NOT TRUE) AS total_double_faults,
-
-                    -- Rally length
-                    AVG(pd.rally_length_point) FILTER (WHERE pd.shot_ix_in_point = 1 AND pd.exclude_d IS NOT TRUE) AS avg_rally_length,
-                    MAX(pd.rally_length_point) FILTER (WHERE pd.shot_ix_in_point = 1 AND pd.exclude_d IS NOT TRUE) AS max_rally_length,
-
-                    -- First serve %  (numerator: 1st-serve attempts that went in;
-                    -- denominator: distinct service points). Silver writes
-                    -- '1st'/'2nd'/'Double'; a DF point has both serve rows = 'Double'.
-                    COUNT(*) FILTER (WHERE pd.serve_d = TRUE AND pd.serve_try_ix_in_point = '1st'
-                                       AND pd.shot_outcome_d <> 'Error'
-                                       AND pd.player_id = m.player_a_pid AND pd.exclude_d IS NOT TRUE)
-                        AS player_a_first_serves,
-                    COUNT(DISTINCT pd.point_key) FILTER (WHERE pd.serve_d = TRUE
-                                       AND pd.player_id = m.player_a_pid AND pd.exclude_d IS NOT TRUE)
-                        AS player_a_total_serves,
-                    COUNT(*) FILTER (WHERE pd.serve_d = TRUE AND pd.serve_try_ix_in_point = '1st'
-                                       AND pd.shot_outcome_d <> 'Error'
-                                       AND pd.player_id = m.player_b_pid AND pd.exclude_d IS NOT TRUE)
-                        AS player_b_first_serves,
-                    COUNT(DISTINCT pd.point_key) FILTER (WHERE pd.serve_d = TRUE
-                                       AND pd.player_id = m.player_b_pid AND pd.exclude_d IS NOT TRUE)
-                        AS player_b_total_serves,
-
-                    -- Winners
-                    COUNT(*) FILTER (WHERE pd.shot_outcome_d = 'Winner'
-                                       AND pd.player_id = m.player_a_pid AND pd.exclude_d IS NOT TRUE)
-                        AS player_a_winners,
-                    COUNT(*) FILTER (WHERE pd.shot_outcome_d = 'Winner'
-                                       AND pd.player_id = m.player_b_pid AND pd.exclude_d IS NOT TRUE)
-                        AS player_b_winners
-
-                FROM silver.point_detail pd
-                JOIN mapped m ON m.task_id = pd.task_id
-                GROUP BY pd.task_id, m.player_a_pid, m.player_b_pid
-            )
-            SELECT
-                sc.task_id,
-                sc.match_date,
-                sc.location,
-                sc.player_a_name,
-                sc.player_b_name,
-                sc.sport_type,
-                sc.video_url,
-                sc.share_url,
-                sc.email,
-                sc.last_status,
-                sc.created_at,
-
-                COALESCE(s.total_points, 0)   AS total_points,
-                COALESCE(s.total_games, 0)    AS total_games,
-                COALESCE(s.total_sets, 0)     AS total_sets,
-                COALESCE(s.player_a_points_won, 0) AS player_a_points_won,
-                COALESCE(s.player_b_points_won, 0) AS player_b_points_won,
-                COALESCE(s.player_a_games_won, 0)  AS player_a_games_won,
-                COALESCE(s.player_b_games_won, 0)  AS player_b_games_won,
-                COALESCE(s.total_aces, 0)     AS total_aces,
-                COALESCE(s.total_double_faults, 0) AS total_double_faults,
-                ROUND(COALESCE(s.avg_rally_length, 0)::numeric, 1) AS avg_rally_length,
-                COALESCE(s.max_rally_length, 0) AS max_rally_length,
-                CASE WHEN s.player_a_total_serves > 0
-                     THEN ROUND(100.0 * s.player_a_first_serves / s.player_a_total_serves, 1)
-                     ELSE 0 END AS player_a_first_serve_pct,
-                CASE WHEN s.player_b_total_serves > 0
-                     THEN ROUND(100.0 * s.player_b_first_serves / s.player_b_total_serves, 1)
-                     ELSE 0 END AS player_b_first_serve_pct,
-                COALESCE(s.player_a_winners, 0) AS player_a_winners,
-                COALESCE(s.player_b_winners, 0) AS player_b_winners,
-
-                -- Score (from submission_context typed columns)
-                sc.player_a_set1_games, sc.player_b_set1_games,
-                sc.player_a_set2_games, sc.player_b_set2_games,
-                sc.player_a_set3_games, sc.player_b_set3_games
-
-            FROM bronze.submission_context sc
-            LEFT JOIN stats s ON s.task_id = sc.task_id::uuid
-            WHERE sc.email IS NOT NULL
-              -- legacy rows (pre-sport_type column) had NULL — treat as singles,
-              -- otherwise the historical match list silently drops them
-              AND (sc.sport_type IS NULL OR sc.sport_type = 'tennis_singles')
-              AND sc.deleted_at IS NULL;
+            CREATE INDEX IF NOT EXISTS ix_submission_context_client_list
+            ON bronze.submission_context
+               (email, (COALESCE(match_date, 'infinity'::date)), created_at, task_id)
+            INCLUDE (location, player_a_name, player_b_name, sport_type, last_status,
+                     player_a_set1_games, player_b_set1_games,
+                     player_a_set2_games, player_b_set2_games,
+                     player_a_set3_games, player_b_set3_games)
+            WHERE email IS NOT NULL AND deleted_at IS NULL
         """))
+        conn.execute(sql_text(
+            "CREATE INDEX IF NOT EXISTS ix_submission_context_created "
+            "ON bronze.submission_context (created_at DESC, task_id DESC)"
+        ))
+        conn.execute(sql_text(
+            "CREATE INDEX IF NOT EXISTS ix_submission_context_email "
+            "ON bronze.submission_context (email) INCLUDE (last_status, created_at)"
+        ))
+        # Per-task stats — the expensive silver aggregate. Evaluated on write
+        # into gold.client_match_stats (gold_materialize.refresh_task), not on
+        # every /api/client/matches load.
+        conn.execute(sql_text("DROP VIEW IF EXISTS gold.vw_client_match_stats_live CASCADE"))
+        conn.execute(sql_text(CLIENT_MATCH_STATS_LIVE_SQL))
+
+        from gold_materialize import ensure_mat_table, source_for
+        ensure_mat_table(conn, "gold.vw_client_match_stats_live", "gold.client_match_stats", "task_id")
+        stats_src = source_for("gold.vw_client_match_stats_live", "gold.client_match_stats", conn)
+
+        # Facade: submission_context stays live (status, share_url, names and
+        # soft-delete change often), the stats come from the table.
+        conn.execute(sql_text(client_match_summary_sql(stats_src)))
@@ -0,0 +1,270 @@
+# ddl_registry.py — Hash-fingerprinted boot DDL.
+#
+# Every gunicorn worker that imports upload_app used to run the whole schema
+# bootstrap: ml_analysis_init, billing_init, gold_init_presentation (DROP +
+# CREATE of every gold view), the legacy gold_init, tennis_coach, support_bot,
+# cockpit views, technique, bounce/identity schemas … — dozens of round trips
+# and AccessExclusiveLocks on every cold start and autoscale event, for DDL
+# that had not changed since the last deploy.
+#
+# Modules now REGISTER their DDL here and the app applies it once:
+#
+#   register_view(name, sql)        one view; fingerprint = SHA-256 of its SQL;
+#                                   applied as DROP VIEW IF EXISTS … CASCADE +
+#                                   the CREATE.
+#   register_init(name, fn, sources) an idempotent init function; fingerprint =
+#                                   SHA-256 of the source files of `sources`
+#                                   (default: fn's module), any `sql` text it
+#                                   depends on, plus the values of any `env`
+#                                   flags, so editing the DDL code or flipping
+#                                   a DDL feature flag re-runs it.
+#   apply_registered(engine)        ONE query compares every fingerprint with
+#                                   meta.ddl_applied (and checks each view still
+#                                   exists); only stale units are applied, under
+#                                   an advisory lock, in registration order.
+#
+# Unchanged deploy → one SELECT, zero DDL. Business rules:
+#   - A view drop CASCADEs to dependants (gold.vw_player → vw_point → match_*,
+#     vw_client_match_summary, coach views …). Once any view is re-applied,
+#     later views are re-checked for existence and every later init unit is
+#     re-run — registration order is dependency order, exactly like the old
+#     boot sequence.
+#   - Consecutive view units are applied in ONE transaction (gold_init's
+#     atomic-swap guarantee: readers never see a missing view; a failure rolls
+#     the batch back and leaves the previous views in place).
+#   - A failing unit is logged and NOT recorded, so the next boot retries it.
+#   - Force a full rebuild: POST /ops/ddl-rebuild, or DDL_FORCE_REBUILD=1.
+#   - DDL_REGISTRY=0 restores the legacy behaviour (apply every unit on every
+#     boot, meta.ddl_applied untouched).
+
+import hashlib
+import importlib
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence
+
+from sqlalchemy import text as sql_text
+
+log = logging.getLogger(__name__)
+
+DDL_REGISTRY = os.getenv("DDL_REGISTRY", "1").strip().lower() in ("1", "true", "yes")
+DDL_FORCE_REBUILD = os.getenv("DDL_FORCE_REBUILD", "0").strip().lower() in ("1", "true", "yes")
+
+_LOCK_KEY = "ddl_registry"
+
+
+@dataclass
+class _Unit:
+    name: str
+    kind: str                     # 'view' | 'init'
+    sha: str
+    sql: Optional[str] = None     # view units
+    fn: Optional[Callable[[], object]] = None  # init units
+
+
+_UNITS: Dict[str, _Unit] = {}
+
+
+def _sha(*parts: bytes) -> str:
+    h = hashlib.sha256()
+    for p in parts:
+        h.update(p)
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _source_bytes(module_name: str) -> bytes:
+    mod = importlib.import_module(module_name)
+    path = getattr(mod, "__file__", None)
+    if not path:
+        return module_name.encode()
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def register_view(name: str, sql: str) -> None:
+    """Register one view (schema-qualified name + its CREATE VIEW statement)."""
+    _UNITS[name] = _Unit(name=name, kind="view", sha=_sha(sql.strip().encode()), sql=sql)
+
+
+def register_init(name: str, fn: Callable[[], object],
+                  sources: Optional[Sequence[str]] = None,
+                  env: Sequence[str] = (),
+                  sql: Sequence[str] = ()) -> None:
+    """Register an idempotent init function, re-run when any of `sources`
+    (module names whose files hold its DDL) changes, when any `sql` statement
+    it builds on changes, or when the value of any `env` variable that
+    switches DDL on or off changes."""
+    mods = list(sources) if sources else [fn.__module__]
+    parts = [m.encode() + b":" + _source_bytes(m) for m in mods]
+    parts += [q.strip().encode() for q in sql]
+    parts += [f"${v}={os.getenv(v, '')}".encode() for v in env]
+    _UNITS[name] = _Unit(name=name, kind="init", sha=_sha(*parts), fn=fn)
+
+
+def registered() -> List[str]:
+    return list(_UNITS)
+
+
+# ---------------------------------------------------------------------------
+# State
+# ---------------------------------------------------------------------------
+
+def _ensure_meta(conn) -> None:
+    conn.execute(sql_text("CREATE SCHEMA IF NOT EXISTS meta"))
+    conn.execute(sql_text("""
+        CREATE TABLE IF NOT EXISTS meta.ddl_applied (
+            name         TEXT PRIMARY KEY,
+            kind         TEXT NOT NULL,
+            sha          TEXT NOT NULL,
+            duration_ms  INTEGER,
+            applied_at   TIMESTAMPTZ NOT NULL DEFAULT now()
+        )
+    """))
+
+
+def _stale_units(conn, units: List[_Unit]) -> List[_Unit]:
+    """One query: units whose fingerprint differs or whose view is missing."""
+    rows = conn.execute(sql_text("""
+        SELECT u.name,
+               a.sha,
+               CASE WHEN u.kind = 'view' THEN to_regclass(u.name) IS NOT NULL ELSE TRUE END AS present
+        FROM unnest(CAST(:names AS text[]), CAST(:kinds AS text[])) AS u(name, kind)
+        LEFT JOIN meta.ddl_applied a ON a.name = u.name
+    """), {"names": [u.name for u in units], "kinds": [u.kind for u in units]}).fetchall()
+    state = {r[0]: (r[1], bool(r[2])) for r in rows}
+    return [u for u in units if state.get(u.name, (None, False)) != (u.sha, True)]
+
+
+def _record(conn, unit: _Unit, seconds: float) -> None:
+    conn.execute(sql_text("""
+        INSERT INTO meta.ddl_applied (name, kind, sha, duration_ms, applied_at)
+        VALUES (:name, :kind, :sha, :ms, now())
+        ON CONFLICT (name) DO UPDATE SET
+            kind = EXCLUDED.kind, sha = EXCLUDED.sha,
+            duration_ms = EXCLUDED.duration_ms, applied_at = now()
+    """), {"name": unit.name, "kind": unit.kind, "sha": unit.sha, "ms": int(seconds * 1000)})
+
+
+# ---------------------------------------------------------------------------
+# Apply
+# ---------------------------------------------------------------------------
+
+def _apply_views(engine, batch: List[_Unit], stale: set, force: bool) -> tuple:
+    """Apply a run of consecutive view units in one transaction. A view is
+    (re)created when stale, forced, or missing after an earlier CASCADE."""
+    applied: List[tuple] = []
+    with engine.begin() as conn:
+        conn.execute(sql_text("CREATE SCHEMA IF NOT EXISTS gold"))
+        cascaded = False
+        for u in batch:
+            if not (force or u.name in stale):
+                if not cascaded:
+                    continue
+                present = conn.execute(sql_text("SELECT to_regclass(:n) IS NOT NULL"),
+                                       {"n": u.name}).scalar()
+                if present:
+                    continue
+            t0 = time.perf_counter()
+            conn.execute(sql_text(f"DROP VIEW IF EXISTS {u.name} CASCADE"))
+            conn.execute(sql_text(u.sql))
+            cascaded = True
+            applied.append((u, time.perf_counter() - t0))
+            log.info("[ddl_registry] recreated view %s", u.name)
+    return applied
+
+
+def _apply(engine, units: List[_Unit], stale: set, force: bool, record: bool) -> dict:
+    applied: List[str] = []
+    failed: List[tuple] = []
+    view_cascade = False
+    i = 0
+    while i < len(units):
+        u = units[i]
+        if u.kind == "view":
+            j = i
+            while j < len(units) and units[j].kind == "view":
+                j += 1
+            batch = units[i:j]
+            i = j
+            if not (force or view_cascade or any(b.name in stale for b in batch)):
+                continue
+            try:
+                done = _apply_views(engine, batch, stale, force or view_cascade)
+            except Exception as e:
+                log.exception("[ddl_registry] view batch %s..%s rolled back — previous views retained",
+                              batch[0].name, batch[-1].name)
+                failed.append((batch[0].name, str(e)))
+                continue
+            if done:
+                view_cascade = True
+            if record and done:
+                with engine.begin() as conn:
+                    for vu, sec in done:
+                        _record(conn, vu, sec)
+            applied.extend(vu.name for vu, _ in done)
+            continue
+
+        i += 1
+        if not (force or view_cascade or u.name in stale):
+            continue
+        t0 = time.perf_counter()
+        try:
+            u.fn()
+        except Exception as e:
+            log.exception("[ddl_registry] init %s failed — will retry next boot", u.name)
+            failed.append((u.name, str(e)))
+            continue
+        sec = time.perf_counter() - t0
+        if record:
+            with engine.begin() as conn:
+                _record(conn, u, sec)
+        applied.append(u.name)
+        log.info("[ddl_registry] applied %s (%.2fs)", u.name, sec)
+    return {"applied": applied, "failed": failed}
+
+
+def apply_registered(engine, force: bool = False) -> dict:
+    """Apply every stale registered unit. Safe to call on every boot."""
+    t0 = time.perf_counter()
+    units = list(_UNITS.values())
+    force = force or DDL_FORCE_REBUILD
+
+    if not DDL_REGISTRY:
+        result = _apply(engine, units, set(), force=True, record=False)
+        log.info("[ddl_registry] DDL_REGISTRY=0 — applied all %d units (%.2fs)",
+                 len(units), time.perf_counter() - t0)
+        return result
+
+    # Fast path: one query, no lock. meta.ddl_applied missing → first boot.
+    stale: Optional[List[_Unit]] = None
+    if not force:
+        try:
+            with engine.connect() as conn:
+                stale = _stale_units(conn, units)
+        except Exception:
+            stale = None
+        if stale is not None and not stale:
+            log.info("[ddl_registry] %d units up to date (%.3fs)",
+                     len(units), time.perf_counter() - t0)
+            return {"applied": [], "failed": []}
+
+    # Slow path: serialise across workers, re-read under the lock (another
+    # worker may have applied everything while we waited).
+    with engine.connect() as lock_conn:
+        lock_conn.execute(sql_text("SELECT pg_advisory_lock(hashtext(:k))"), {"k": _LOCK_KEY})
+        try:
+            with engine.begin() as conn:
+                _ensure_meta(conn)
+                stale = units if force else _stale_units(conn, units)
+            result = _apply(engine, units, {u.name for u in stale}, force=force, record=True)
+        finally:
+            lock_conn.execute(sql_text("SELECT pg_advisory_unlock(hashtext(:k))"), {"k": _LOCK_KEY})
+            lock_conn.commit()
+
+    log.info("[ddl_registry] applied %d/%d units, %d failed (force=%s, %.2fs)",
+             len(result["applied"]), len(units), len(result["failed"]), force,
+             time.perf_counter() - t0)
+    return result
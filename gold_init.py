@@ -10,6 +10,9 @@
 #   - Every view is created idempotently via DROP + CREATE on boot.
 #   - Every view carries both task_id (for joining) and session_id (for display).
 #   - Each view wraps a single try/except so one failure can't block the others.
+#   - match_kpi / player_match_kpis / player_performance are materialised per
+#     task: the SQL here defines the *_live views, gold_materialize.py owns the
+#     tables and the read facades under the original names.
 #
 # Consumers:
 #   - /api/client/match/* endpoints (thin passthrough, no aggregation in Python)
@@ -187,8 +190,10 @@ WHERE p.exclude_d IS NOT TRUE
 
 # gold.match_kpi — single row per match with every top-level KPI for both players.
 # Feeds: Summary tab (head-to-head card, score box, KPI strip).
+# Created as gold.match_kpi_live; dashboards read the per-task materialisation
+# through the gold.match_kpi facade (gold_materialize.py).
 MATCH_KPI_SQL = """
-CREATE VIEW gold.match_kpi AS
+CREATE VIEW gold.match_kpi_live AS
 WITH points_dedup AS (
     -- One row per unique point (last shot in the point)
     SELECT DISTINCT ON (task_id, game_number, point_number)
@@ -729,8 +734,9 @@ WHERE s.exclude_d IS NOT TRUE
 
 # gold.player_match_kpis — one row per (email, task_id) with all Player A KPIs.
 # Intermediate view — consumed by gold.player_performance for rolling averages.
+# Created as gold.player_match_kpis_live; materialised per task (gold_materialize.py).
 PLAYER_MATCH_KPIS_SQL = """
-CREATE VIEW gold.player_match_kpis AS
+CREATE VIEW gold.player_match_kpis_live AS
 WITH
 points_dedup AS (
     SELECT DISTINCT ON (pd.task_id, pd.game_number, pd.point_number)
@@ -864,8 +870,11 @@ LEFT JOIN game_agg ga ON ga.task_id = pl.task_id
 
 # gold.player_performance — one row per (email, kpi_name) with rolling avg, trend, status.
 # Feeds: Player Performance module scorecard.
+# Created as gold.player_performance_live over the materialised per-task rows,
+# by gold_materialize.init_gold_materialized() (NOT in _VIEWS — it depends on the
+# gold.player_match_kpis facade) and re-computed per (email, player) on refresh.
 PLAYER_PERFORMANCE_SQL = """
-CREATE VIEW gold.player_performance AS
+CREATE VIEW gold.player_performance_live AS
 WITH
 match_kpis AS (
     SELECT *,
@@ -1006,15 +1015,15 @@ _VIEWS = [
     ("gold.vw_player", VW_PLAYER_SQL),
     ("gold.vw_point", VW_POINT_SQL),
     # Presentation (per-match)
-    ("gold.match_kpi", MATCH_KPI_SQL),
+    ("gold.match_kpi_live", MATCH_KPI_SQL),
     ("gold.match_serve_breakdown", MATCH_SERVE_BREAKDOWN_SQL),
     ("gold.match_return_breakdown", MATCH_RETURN_BREAKDOWN_SQL),
     ("gold.match_rally_breakdown", MATCH_RALLY_BREAKDOWN_SQL),
     ("gold.match_rally_length", MATCH_RALLY_LENGTH_SQL),
     ("gold.match_shot_placement", MATCH_SHOT_PLACEMENT_SQL),
-    # Player performance (cross-match) — order matters: kpis before performance
-    ("gold.player_match_kpis", PLAYER_MATCH_KPIS_SQL),
-    ("gold.player_performance", PLAYER_PERFORMANCE_SQL),
+    # Player performance (cross-match). gold.player_performance_live is created by
+    # gold_materialize after the gold.player_match_kpis facade it reads.
+    ("gold.player_match_kpis_live", PLAYER_MATCH_KPIS_SQL),
     # Dual-submit (Phase 5c.2)
     ("gold.vw_dual_submit_pairs", VW_DUAL_SUBMIT_PAIRS_SQL),
 ]
@@ -1067,3 +1076,16 @@ def gold_init_presentation():
 
     log.info("[gold_init] presentation views: %d recreated atomically", len(created))
     return {"created": created, "failed": failed}
+
+
+def register_gold_views():
+    """Register every _VIEWS entry with ddl_registry (boot path).
+
+    apply_registered() then re-creates only views whose SQL changed (or that
+    went missing), still in _VIEWS order and in one transaction per run, with
+    the same DROP … CASCADE + CREATE as gold_init_presentation(). Call
+    gold_init_presentation() directly to force every view.
+    """
+    from ddl_registry import register_view
+    for name, sql in _VIEWS:
+        register_view(name, sql)
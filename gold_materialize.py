@@ -0,0 +1,392 @@
+# gold_materialize.py — Materialised gold match summaries, refreshed per task.
+#
+# gold.match_kpi, gold.player_match_kpis, gold.player_performance and
+# gold.vw_client_match_summary used to be plain views over silver.point_detail:
+# every dashboard hit, every /api/client/matches sidebar load and every LLM
+# coach fetch re-aggregated the whole point table. The SQL still lives in
+# gold_init.py / db_init.py, now as *_live views, and is evaluated on WRITE:
+#
+#   live view (gold_init / db_init)      table                       facade (read name)
+#   gold.match_kpi_live               →  gold.match_kpi_mat        → gold.match_kpi
+#   gold.player_match_kpis_live       →  gold.player_match_kpis_mat→ gold.player_match_kpis
+#   gold.player_performance_live      →  gold.player_performance_mat→ gold.player_performance
+#   gold.vw_client_match_stats_live   →  gold.client_match_stats   ← gold.vw_client_match_summary
+#
+# Facades keep the old names and columns, so client_api._gold_one,
+# /api/client/player-performance and tennis_coach.data_fetcher read unchanged.
+#
+# Refresh:
+#   refresh_task(task_id)  per-task rows re-computed from the live views for ONE
+#                          task (ingest_worker_app + T5 silver build, match edit,
+#                          reprocess, delete). Player rollups are then re-derived
+#                          from the per-task table for the (email, player) pairs
+#                          the task belonged to before and after — never a full
+#                          re-aggregation.
+#   rebuild_all()          set-based full rebuild that also points the facades
+#                          at the tables. Never on the boot path: when
+#                          init_gold_materialized() finds the tables stale it
+#                          starts it on a background thread. Also POST
+#                          /ops/gold-rebuild or `python gold_materialize.py --all`.
+#
+# Business rules:
+#   - Table columns are copied from the live view (CREATE TABLE … AS … WITH NO
+#     DATA). If a live view's columns change, its table is dropped, re-created
+#     and rebuilt — the facade can never drift from the SQL.
+#   - Refresh is DELETE + INSERT in one transaction: readers see the old rows
+#     until COMMIT, never a missing match.
+#   - ddl_registry re-runs init_gold_materialized() when this file, the live
+#     view SQL (live_view_sql) or GOLD_MATERIALIZED changes. gold.mat_state
+#     records the live SQL the tables were last fully built from; while it
+#     differs (or a table was just (re)created, or materialisation was off) the
+#     facades read the live views — slower, never stale — until the background
+#     rebuild fills the tables and switches the facades in the same COMMIT.
+#   - refresh_task() failures are logged and never fail the caller; the next
+#     refresh or rebuild repairs the rows.
+#   - GOLD_MATERIALIZED=0: facades read the live views directly (old behaviour),
+#     refresh_task() only bumps the task version and the tables are marked stale,
+#     so switching it back on rebuilds them before any facade reads them.
+#   - gold.task_version counts refreshes per task (plus a '*' row bumped by every
+#     full rebuild). Response caches key on it — client_api's bundled dashboard
+#     — so any process sees a rebuild without a cross-process invalidation.
+
+import argparse
+import hashlib
+import logging
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import text as sql_text
+
+from db_init import engine
+
+log = logging.getLogger(__name__)
+
+GOLD_MATERIALIZED = os.getenv("GOLD_MATERIALIZED", "1").strip().lower() in ("1", "true", "yes")
+
+# (live view, table, index columns) — per-task tables, refreshed by task_id.
+TASK_TABLES: List[Tuple[str, str, str]] = [
+    ("gold.match_kpi_live", "gold.match_kpi_mat", "task_id"),
+    ("gold.player_match_kpis_live", "gold.player_match_kpis_mat", "task_id"),
+    ("gold.vw_client_match_stats_live", "gold.client_match_stats", "task_id"),
+]
+
+# Player rollup: refreshed per (email, player_name) from gold.player_match_kpis.
+PLAYER_TABLE: Tuple[str, str, str] = (
+    "gold.player_performance_live", "gold.player_performance_mat", "email, player_name",
+)
+
+_PLAYER_ORDER = """
+    player_name,
+    CASE category WHEN 'Serve' THEN 1 WHEN 'Return' THEN 2 WHEN 'Rally' THEN 3 WHEN 'Games' THEN 4 WHEN 'Speed' THEN 5 END,
+    kpi_name
+"""
+
+
+_STATE_NAME = "gold_materialize"
+
+
+def live_view_sql() -> List[str]:
+    """SQL of every live view the tables are built from. Fingerprinted by
+    ddl_registry for init_gold_materialized and recorded by rebuild_all."""
+    from db_init import CLIENT_MATCH_STATS_LIVE_SQL
+    from gold_init import MATCH_KPI_SQL, PLAYER_MATCH_KPIS_SQL, PLAYER_PERFORMANCE_SQL
+    return [MATCH_KPI_SQL, PLAYER_MATCH_KPIS_SQL, PLAYER_PERFORMANCE_SQL,
+            CLIENT_MATCH_STATS_LIVE_SQL]
+
+
+def _live_sha() -> str:
+    h = hashlib.sha256()
+    for sql in live_view_sql():
+        h.update(sql.strip().encode())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _ensure_state(conn) -> None:
+    conn.execute(sql_text("""
+        CREATE TABLE IF NOT EXISTS gold.mat_state (
+            name        TEXT PRIMARY KEY,
+            live_sha    TEXT NOT NULL,
+            rebuilt_at  TIMESTAMPTZ NOT NULL DEFAULT now()
+        )
+    """))
+
+
+def mark_stale(conn) -> None:
+    """Forget the last full build: facades read the live views until the next
+    rebuild_all()."""
+    _ensure_state(conn)
+    conn.execute(sql_text("DELETE FROM gold.mat_state WHERE name = :n"), {"n": _STATE_NAME})
+
+
+def rebuild_pending(conn) -> bool:
+    """True unless the tables hold a full build of the current live SQL."""
+    _ensure_state(conn)
+    sha = conn.execute(sql_text("SELECT live_sha FROM gold.mat_state WHERE name = :n"),
+                       {"n": _STATE_NAME}).scalar()
+    return sha != _live_sha()
+
+
+def _exists(conn, rel: str) -> bool:
+    return bool(conn.execute(sql_text("SELECT to_regclass(:r) IS NOT NULL"), {"r": rel}).scalar())
+
+
+def _columns(conn, rel: str) -> List[Tuple[str, str]]:
+    rows = conn.execute(sql_text("""
+        SELECT a.attname, format_type(a.atttypid, a.atttypmod)
+        FROM pg_attribute a
+        WHERE a.attrelid = to_regclass(:r) AND a.attnum > 0 AND NOT a.attisdropped
+        ORDER BY a.attnum
+    """), {"r": rel}).fetchall()
+    return [(r[0], r[1]) for r in rows]
+
+
+def ensure_mat_table(conn, live: str, mat: str, index_cols: str) -> bool:
+    """Create `mat` with the live view's exact columns. Returns True when the
+    table was (re)created and needs a full rebuild."""
+    live_cols = _columns(conn, live)
+    mat_cols = _columns(conn, mat)
+    if mat_cols and mat_cols == live_cols:
+        return False
+    if mat_cols:
+        log.info("[gold_mat] %s columns changed — recreating", mat)
+        conn.execute(sql_text(f"DROP TABLE {mat} CASCADE"))
+    conn.execute(sql_text(f"CREATE TABLE {mat} AS SELECT * FROM {live} WITH NO DATA"))
+    ix = "ix_" + mat.split(".", 1)[1]
+    conn.execute(sql_text(f"CREATE INDEX IF NOT EXISTS {ix} ON {mat} ({index_cols})"))
+    mark_stale(conn)
+    return True
+
+
+def source_for(live: str, mat: str, conn=None) -> str:
+    """Relation a facade reads: the table, or the live view when disabled or
+    (given a connection to check) while the tables await a rebuild."""
+    if not GOLD_MATERIALIZED:
+        return live
+    if conn is not None and rebuild_pending(conn):
+        return live
+    return mat
+
+
+def _ensure_task_version(conn) -> None:
+    conn.execute(sql_text("""
+        CREATE TABLE IF NOT EXISTS gold.task_version (
+            task_id       TEXT PRIMARY KEY,
+            version       BIGINT NOT NULL DEFAULT 1,
+            refreshed_at  TIMESTAMPTZ NOT NULL DEFAULT now()
+        )
+    """))
+
+
+_BUMP_SQL = """
+    INSERT INTO gold.task_version (task_id, version, refreshed_at)
+    VALUES (:tid, 1, now())
+    ON CONFLICT (task_id) DO UPDATE SET
+        version = gold.task_version.version + 1, refreshed_at = now()
+"""
+
+
+def bump_task_version(task_id: str, conn=None) -> None:
+    """Mark a task's gold output as changed (silver rebuilt, edited, deleted…).
+    Inside a caller's transaction errors propagate; standalone it never raises."""
+    if conn is not None:
+        conn.execute(sql_text(_BUMP_SQL), {"tid": str(task_id)})
+        return
+    try:
+        with engine.begin() as c:
+            c.execute(sql_text(_BUMP_SQL), {"tid": str(task_id)})
+    except Exception as e:
+        log.warning("[gold_mat] version bump failed task_id=%s (%s)", task_id, e)
+
+
+def _facade(conn, name: str, body: str) -> None:
+    conn.execute(sql_text(f"DROP VIEW IF EXISTS {name} CASCADE"))
+    conn.execute(sql_text(f"CREATE VIEW {name} AS {body}"))
+
+
+def _point_facades(conn, materialized: bool) -> None:
+    """Re-point every facade at the tables or at the live views. CREATE OR
+    REPLACE — same columns either way, and dependants are kept."""
+    from db_init import client_match_summary_sql
+
+    def src(live, mat):
+        return mat if materialized else live
+
+    conn.execute(sql_text(
+        "CREATE OR REPLACE VIEW gold.match_kpi AS "
+        f"SELECT * FROM {src('gold.match_kpi_live', 'gold.match_kpi_mat')}"))
+    conn.execute(sql_text(
+        "CREATE OR REPLACE VIEW gold.player_match_kpis AS "
+        f"SELECT * FROM {src('gold.player_match_kpis_live', 'gold.player_match_kpis_mat')}"))
+    live, mat, _ = PLAYER_TABLE
+    conn.execute(sql_text(
+        "CREATE OR REPLACE VIEW gold.player_performance AS "
+        f"SELECT * FROM {src(live, mat)} ORDER BY {_PLAYER_ORDER}"))
+    conn.execute(sql_text(client_match_summary_sql(
+        src("gold.vw_client_match_stats_live", "gold.client_match_stats"))))
+
+
+# ---------------------------------------------------------------------------
+# Init (registered with ddl_registry after gold_init + db_init.gold_init)
+# ---------------------------------------------------------------------------
+
+def init_gold_materialized(background: bool = True) -> bool:
+    """Tables + facades + player_performance_live. No full rebuild here.
+
+    Runs (ddl_registry) when this file, the live view SQL or GOLD_MATERIALIZED
+    changes, or after any gold view was re-applied. When the tables are not a
+    full build of the current live SQL the facades are left on the live views
+    and rebuild_all() is started on a background thread (background=False
+    leaves that to the caller). Returns True when a rebuild is pending.
+    """
+    from gold_init import PLAYER_PERFORMANCE_SQL
+
+    with engine.begin() as conn:
+        _ensure_task_version(conn)
+        _ensure_state(conn)
+        if not GOLD_MATERIALIZED:
+            # refresh_task stops maintaining the tables from here on.
+            mark_stale(conn)
+        for live, mat, ix in TASK_TABLES[:2]:
+            ensure_mat_table(conn, live, mat, ix)
+        # Created over the live views; _point_facades below switches them to
+        # the tables once those are known to be complete.
+        _facade(conn, "gold.match_kpi", "SELECT * FROM gold.match_kpi_live")
+        _facade(conn, "gold.player_match_kpis", "SELECT * FROM gold.player_match_kpis_live")
+
+        # Player rollup over the per-task facade — recomputed per player on write.
+        conn.execute(sql_text("DROP VIEW IF EXISTS gold.player_performance_live CASCADE"))
+        conn.execute(sql_text(PLAYER_PERFORMANCE_SQL))
+        live, mat, ix = PLAYER_TABLE
+        ensure_mat_table(conn, live, mat, ix)
+        _facade(conn, "gold.player_performance",
+                f"SELECT * FROM {live} ORDER BY {_PLAYER_ORDER}")
+
+        pending = GOLD_MATERIALIZED and rebuild_pending(conn)
+        _point_facades(conn, materialized=GOLD_MATERIALIZED and not pending)
+
+    if pending:
+        log.info("[gold_mat] tables stale — facades on the live views until the rebuild commits")
+        if background:
+            threading.Thread(target=_rebuild_in_background, name="gold-mat-rebuild",
+                             daemon=True).start()
+    return pending
+
+
+def _rebuild_in_background() -> None:
+    try:
+        rebuild_all(if_pending=True)
+    except Exception:
+        log.exception("[gold_mat] background rebuild failed — facades stay on the live "
+                      "views; POST /ops/gold-rebuild to retry")
+
+
+def rebuild_all(if_pending: bool = False) -> Dict[str, int]:
+    """Full set-based rebuild of every table, then the facades are pointed at
+    them — one transaction, so readers move from the live views to complete
+    tables at COMMIT. Rebuilds are serialised; with if_pending a rebuild that
+    another one made unnecessary while it waited is skipped."""
+    counts: Dict[str, int] = {}
+    if not GOLD_MATERIALIZED:
+        return counts
+    sha = _live_sha()
+    with engine.begin() as conn:
+        conn.execute(sql_text("SELECT pg_advisory_xact_lock(hashtext(:k))"),
+                     {"k": "gold_mat:rebuild"})
+        if if_pending and not rebuild_pending(conn):
+            log.info("[gold_mat] full rebuild already done by another worker — skipped")
+            return counts
+        bump_task_version("*", conn)
+        complete = True
+        for live, mat, _ in TASK_TABLES + [PLAYER_TABLE]:
+            if not (_exists(conn, live) and _exists(conn, mat)):
+                log.warning("[gold_mat] %s or %s missing — skipped", live, mat)
+                complete = False
+                continue
+            conn.execute(sql_text(f"DELETE FROM {mat}"))
+            counts[mat] = conn.execute(sql_text(f"INSERT INTO {mat} SELECT * FROM {live}")).rowcount
+        if complete:
+            _point_facades(conn, materialized=True)
+            conn.execute(sql_text("""
+                INSERT INTO gold.mat_state (name, live_sha, rebuilt_at)
+                VALUES (:n, :sha, now())
+                ON CONFLICT (name) DO UPDATE SET live_sha = EXCLUDED.live_sha, rebuilt_at = now()
+            """), {"n": _STATE_NAME, "sha": sha})
+    log.info("[gold_mat] full rebuild: %s%s", counts,
+             "" if complete else " — incomplete, facades left on the live views")
+    return counts
+
+
+# ---------------------------------------------------------------------------
+# Per-task refresh
+# ---------------------------------------------------------------------------
+
+_PLAYERS_SQL = """
+    SELECT DISTINCT email, player_a_name
+    FROM gold.player_match_kpis_mat
+    WHERE task_id = CAST(:tid AS uuid) AND player_a_name IS NOT NULL
+"""
+
+
+def _refresh_player(conn, email: Optional[str], player: str) -> int:
+    live, mat, _ = PLAYER_TABLE
+    params = {"e": email, "p": player}
+    conn.execute(sql_text(
+        f"DELETE FROM {mat} WHERE email IS NOT DISTINCT FROM :e AND player_name = :p"), params)
+    return conn.execute(sql_text(
+        f"INSERT INTO {mat} SELECT * FROM {live} "
+        f"WHERE email IS NOT DISTINCT FROM :e AND player_name = :p"), params).rowcount
+
+
+def refresh_task(task_id: str) -> Dict:
+    """Re-materialise one task's gold rows and its players' rollups.
+
+    Never raises — a failure is logged and reported in the result.
+    """
+    if not task_id:
+        return {"ok": True, "skipped": True}
+    tid = str(task_id)
+    if not GOLD_MATERIALIZED:
+        bump_task_version(tid)
+        return {"ok": True, "skipped": True}
+    try:
+        with engine.begin() as conn:
+            conn.execute(sql_text("SELECT pg_advisory_xact_lock(hashtext(:k))"),
+                         {"k": f"gold_mat:{tid}"})
+            bump_task_version(tid, conn)
+            before = set(conn.execute(sql_text(_PLAYERS_SQL), {"tid": tid}).fetchall())
+            rows: Dict[str, int] = {}
+            for live, mat, _ in TASK_TABLES:
+                conn.execute(sql_text(f"DELETE FROM {mat} WHERE task_id = CAST(:tid AS uuid)"),
+                             {"tid": tid})
+                rows[mat] = conn.execute(sql_text(
+                    f"INSERT INTO {mat} SELECT * FROM {live} WHERE task_id = CAST(:tid AS uuid)"),
+                    {"tid": tid}).rowcount
+            after = set(conn.execute(sql_text(_PLAYERS_SQL), {"tid": tid}).fetchall())
+
+            # Sorted lock order: two tasks of the same player never deadlock.
+            players = sorted(before | after, key=lambda r: (r[0] or "", r[1]))
+            for email, player in players:
+                conn.execute(sql_text("SELECT pg_advisory_xact_lock(hashtext(:k))"),
+                             {"k": f"gold_mat_player:{email or ''}|{player}"})
+                rows[PLAYER_TABLE[1]] = rows.get(PLAYER_TABLE[1], 0) + _refresh_player(conn, email, player)
+        log.info("[gold_mat] refreshed task_id=%s rows=%s players=%d", tid, rows, len(players))
+        return {"ok": True, "rows": rows, "players": len(players)}
+    except Exception as e:
+        log.exception("[gold_mat] refresh failed task_id=%s", tid)
+        return {"ok": False, "error": str(e)}
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    ap = argparse.ArgumentParser(description="Refresh materialised gold match summaries")
+    g = ap.add_mutually_exclusive_group(required=True)
+    g.add_argument("--task-id", help="refresh one task")
+    g.add_argument("--all", action="store_true", help="ensure tables/facades and rebuild everything")
+    args = ap.parse_args()
+    if args.all:
+        init_gold_materialized(background=False)
+        print(rebuild_all())
+    else:
+        print(refresh_task(args.task_id))
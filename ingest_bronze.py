@@ -26,6 +26,9 @@
 #   - Idempotent DDL (CREATE TABLE / ADD COLUMN IF NOT EXISTS).
 #   - Transaction-scoped advisory locks on task_id prevent concurrent
 #     ingests for the same task (auto-release on commit/rollback).
+#   - Array tables are written with COPY FROM STDIN; the worker spools the
+#     result to disk and streams ball/player positions from it with ijson
+#     (see "streamed payloads + COPY" below).
 # ============================================================
 # Original header preserved below:
 # ingest_bronze.py — task_id-only bronze ingest (final, Nov 2025)
@@ -45,7 +48,7 @@
 #   - Transaction-scoped advisory locks (auto-release)
 #   - Defensive JSON parsing & shape guards
 
-import os, json, gzip, hashlib, io, re
+import os, json, gzip, hashlib, io, re, shutil, tempfile
 from datetime import datetime, timezone
 from typing import Any, Dict, Optional, List
 
@@ -117,7 +120,7 @@ def _encode_payload(payload: Dict[str, Any]) -> tuple[str, int, bytes]:
 
 def _as_list(v) -> List[Any]:
     if v is None: return []
-    return v if isinstance(v, list) else []
+    return v if isinstance(v, (list, StreamedArray)) else []
 
 def _as_dict(v) -> Dict[str, Any]:
     return v if isinstance(v, dict) else {}
@@ -144,7 +147,10 @@ def _sha256_payload(payload: Dict[str, Any]) -> str:
     return h.hexdigest()
 
 def _compute_session_uid(task_id: str, payload: Dict[str, Any]) -> str:
-    ph = _sha256_payload(payload)[:10]
+    # A StreamedPayload carries the sha of its file bytes (the dict form is not
+    # fully in memory to re-encode). Only affects NEW sessions: _ensure_session
+    # keeps an existing session_uid (COALESCE), so re-ingests stay stable.
+    ph = (getattr(payload, "sha256", None) or _sha256_payload(payload))[:10]
     return f"{task_id[:8]}-{ph}"
 
 def _as_float(x):
@@ -191,6 +197,191 @@ def _generated_cols(conn, table: str, cols: list[str]) -> set[str]:
         if r["column_name"] in target and (r.get("is_generated") or "").upper() == "ALWAYS"
     }
 
+# ---------------- streamed payloads + COPY ----------------
+# The worker used to json.load() the whole SportAI result (39 MB JSON -> ~180 MB
+# dict on a long match) and fan it out with executemany INSERTs — one
+# CAST(:j AS JSONB) bind per row over tens of thousands of ball/player positions.
+# Now, like ml_pipeline/bronze_ingest_t5.py:
+#   - spool_result() writes the HTTP body to a temp FILE (disk, not RAM);
+#   - read_payload_file() builds every top-level key EXCEPT the big arrays in
+#     _STREAMED_KEYS, which become StreamedArray handles re-read with ijson one
+#     item at a time when the insert iterates them;
+#   - the array tables are written with psycopg COPY FROM STDIN (_copy_rows),
+#     rows generated lazily, so peak memory no longer scales with match length.
+# Rollback: BRONZE_STREAM_INGEST=0 (callers json.load as before),
+# BRONZE_COPY_ENABLED=0 (batched executemany instead of COPY).
+BRONZE_STREAM_INGEST = (os.getenv("BRONZE_STREAM_INGEST", "1").strip() == "1")
+BRONZE_COPY_ENABLED = (os.getenv("BRONZE_COPY_ENABLED", "1").strip() == "1")
+_STREAMED_KEYS = ("ball_positions", "player_positions")
+_INSERT_BATCH = 5000
+_VALUE_EVENTS = ("start_map", "start_array", "string", "number", "boolean", "null")
+
+
+def _open_payload(path: str):
+    """Open a spooled result file, gzip or plain (sniffed — SportAI's
+    Content-Encoding header is not reliable enough to trust for this)."""
+    with open(path, "rb") as f:
+        magic = f.read(2)
+    return gzip.open(path, "rb") if magic == b"\x1f\x8b" else open(path, "rb")
+
+
+class _HashingReader:
+    """File wrapper that sha256s the (decompressed) bytes as ijson reads them."""
+    def __init__(self, f):
+        self._f = f
+        self.h = hashlib.sha256()
+
+    def read(self, n=-1):
+        b = self._f.read(n)
+        self.h.update(b)
+        return b
+
+
+class StreamedArray:
+    """A big top-level payload value left on disk by read_payload_file().
+
+    Iterating re-reads the file with ijson, one item at a time. len() matches the
+    in-memory value (items of a list, keys of a dict) so shape checks such as
+    ingest_quality's keep working. A dict value (player_positions:
+    {pid: [item, ...]}) iterates FLATTENED, each dict item tagged
+    "_player_id": str(pid) — the rows ingest_bronze_strict built from the dict.
+    """
+    streamed = True
+
+    def __init__(self, path: str, key: str, count: int, is_map: bool):
+        self.path, self.key, self.count, self.is_map = path, key, count, is_map
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        import ijson
+        with _open_payload(self.path) as f:
+            if not self.is_map:
+                yield from ijson.items(f, f"{self.key}.item", use_float=True)
+                return
+            from ijson.common import ObjectBuilder
+            head = self.key + "."
+            builder, depth, pid = None, 0, None
+            for prefix, event, value in ijson.parse(f, use_float=True):
+                if builder is None:
+                    if (event == "start_map" and prefix.startswith(head)
+                            and prefix.endswith(".item") and prefix.count(".") == 2):
+                        pid = prefix[len(head):-len(".item")]
+                        builder, depth = ObjectBuilder(), 0
+                    else:
+                        continue
+                builder.event(event, value)
+                if event in ("start_map", "start_array"):
+                    depth += 1
+                elif event in ("end_map", "end_array"):
+                    depth -= 1
+                    if depth == 0:
+                        yield {**builder.value, "_player_id": pid}
+                        builder = None
+
+
+class StreamedPayload(dict):
+    """Top-level payload dict from read_payload_file(); `sha256` is the digest of
+    the file's JSON bytes (used for the session uid)."""
+    sha256: Optional[str] = None
+
+
+def spool_result(resp) -> str:
+    """Write a streamed requests response body to a temp file; returns the path
+    (caller deletes). The body is copied as sent — gzip stays gzip."""
+    fd, path = tempfile.mkstemp(prefix="sportai_", suffix=".json")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            shutil.copyfileobj(resp.raw, f, 1 << 20)
+    except Exception:
+        os.unlink(path)
+        raise
+    return path
+
+
+def read_payload_file(path: str) -> StreamedPayload:
+    """Parse a spooled SportAI result. Every top-level key is built in memory
+    except the _STREAMED_KEYS arrays, which are counted and returned as
+    StreamedArray handles (the file must outlive the ingest that iterates them)."""
+    import ijson
+    from ijson.common import ObjectBuilder
+
+    out = StreamedPayload()
+    key, builder, depth, count, is_map = None, None, 0, 0, False
+    with _open_payload(path) as raw:
+        f = _HashingReader(raw)
+        events = ijson.parse(f, use_float=True)
+        first = next(events, None)
+        if first is None or first[1] != "start_map":
+            raise ValueError("SportAI result is not a JSON object")
+        for prefix, event, value in events:
+            if depth == 0:
+                if event == "map_key":
+                    key = value
+                elif event == "end_map":
+                    break
+                elif event in ("start_map", "start_array"):
+                    depth = 1
+                    if key in _STREAMED_KEYS:
+                        builder, count, is_map = None, 0, event == "start_map"
+                    else:
+                        builder = ObjectBuilder()
+                        builder.event(event, value)
+                else:
+                    out[key] = value
+                continue
+            if builder is not None:
+                builder.event(event, value)
+            elif depth == 1 and (event == "map_key" if is_map else event in _VALUE_EVENTS):
+                count += 1
+            if event in ("start_map", "start_array"):
+                depth += 1
+            elif event in ("end_map", "end_array"):
+                depth -= 1
+                if depth == 0:
+                    out[key] = (builder.value if builder is not None
+                                else StreamedArray(path, key, count, is_map))
+                    builder = None
+        while f.read(1 << 20):   # digest covers the whole file (trailing bytes)
+            pass
+    out.sha256 = f.h.hexdigest()
+    return out
+
+
+def _copy_rows(conn, table: str, cols: List[str], rows, jsonb: tuple = ()) -> int:
+    """Write dict rows (keyed by column name) into bronze.<table>(cols).
+
+    psycopg COPY FROM STDIN on the transaction's own connection, consuming `rows`
+    lazily (a generator over a StreamedArray never materialises). JSONB columns
+    take JSON text — COPY parses it server-side, no per-row CAST. Falls back to
+    batched executemany when BRONZE_COPY_ENABLED=0 or the driver has no COPY."""
+    col_sql = ", ".join(f'"{c}"' for c in cols)
+    n = 0
+    if BRONZE_COPY_ENABLED:
+        raw = conn.connection
+        dbapi = getattr(raw, "driver_connection", None) or raw
+        with dbapi.cursor() as cur:
+            if hasattr(cur, "copy"):
+                with cur.copy(f"COPY bronze.{table} ({col_sql}) FROM STDIN") as cp:
+                    for r in rows:
+                        cp.write_row([r[c] for c in cols])
+                        n += 1
+                return n
+    values = ", ".join(f"CAST(:{c} AS JSONB)" if c in jsonb else f":{c}" for c in cols)
+    stmt = sql_text(f"INSERT INTO bronze.{table} ({col_sql}) VALUES ({values})")
+    batch = []
+    for r in rows:
+        batch.append(r)
+        if len(batch) >= _INSERT_BATCH:
+            conn.execute(stmt, batch)
+            n += len(batch)
+            batch = []
+    if batch:
+        conn.execute(stmt, batch)
+        n += len(batch)
+    return n
+
 # ---------------- init / DDL (idempotent) ----------------
 def _run_bronze_init_conn(conn):
     conn.execute(sql_text("CREATE SCHEMA IF NOT EXISTS bronze;"))
@@ -516,116 +707,103 @@ def _insert_players(conn, task_id: str, players: list) -> int:
     """), rows)
     return len(rows)
 
+_PLAYER_SWING_COLS = [
+    "task_id", "data",
+    "start_ts", "start_frame", "end_ts", "end_frame",
+    "player_id", "valid", "serve", "swing_type", "volley", "is_in_rally",
+    "rally", "ball_hit",
+    "confidence_swing_type", "confidence", "confidence_volley",
+    "ball_hit_location", "ball_player_distance", "ball_speed",
+    "ball_impact_location", "ball_impact_type", "intercepting_player_id",
+    "ball_trajectory", "annotations",
+    "ball_hit_s", "ball_hit_frame", "ball_hit_location_x", "ball_hit_location_y",
+    "ball_impact_location_x", "ball_impact_location_y",
+    "rally_start_s", "rally_end_s",
+]
+_PLAYER_SWING_JSONB = ("data", "rally", "ball_hit", "ball_hit_location",
+                       "ball_impact_location", "ball_trajectory", "annotations")
+
 def _insert_player_swings(conn, task_id: str, swings: list) -> int:
     if not swings: return 0
-    rows = []
     drop = [
         "start","end","player_id","valid","serve","swing_type","volley","is_in_rally",
         "rally","ball_hit","confidence_swing_type","confidence","confidence_volley",
         "ball_hit_location","ball_player_distance","ball_speed","ball_impact_location",
         "ball_impact_type","intercepting_player_id","ball_trajectory","annotations",
     ]
-    for s in swings:
-        if not isinstance(s, dict):
-            continue
-        start = _as_dict(s.get("start"))
-        end   = _as_dict(s.get("end"))
-        ball_hit_obj = _as_dict(s.get("ball_hit"))
-        ball_hit_loc = s.get("ball_hit_location")
-        ball_impact_loc = s.get("ball_impact_location")
-        rally_raw = s.get("rally")
-        j_clean = _clean_data(s, drop)
-        rows.append({
-            "tid": task_id,
-            "j": json.dumps(j_clean) if j_clean is not None else None,
-            "start_ts": _as_float(start.get("timestamp")) if start else None,
-            "start_frame": _as_int(start.get("frame_nr")) if start else None,
-            "end_ts": _as_float(end.get("timestamp")) if end else None,
-            "end_frame": _as_int(end.get("frame_nr")) if end else None,
-            "player_id": _as_int(s.get("player_id")),
-            "valid": _as_bool(s.get("valid")),
-            "serve": _as_bool(s.get("serve")),
-            "swing_type": (s.get("swing_type") or None),
-            "volley": _as_bool(s.get("volley")),
-            "is_in_rally": _as_bool(s.get("is_in_rally")),
-            "rally": json.dumps(rally_raw) if rally_raw is not None else None,
-            "ball_hit": json.dumps(s.get("ball_hit")) if s.get("ball_hit") is not None else None,
-            "confidence_swing_type": _as_float(s.get("confidence_swing_type")),
-            "confidence": _as_float(s.get("confidence")),
-            "confidence_volley": _as_float(s.get("confidence_volley")),
-            "ball_hit_location": json.dumps(ball_hit_loc) if ball_hit_loc is not None else None,
-            "ball_player_distance": _as_float(s.get("ball_player_distance")),
-            "ball_speed": _as_float(s.get("ball_speed")),
-            "ball_impact_location": json.dumps(ball_impact_loc) if ball_impact_loc is not None else None,
-            "ball_impact_type": (s.get("ball_impact_type") or None),
-            "intercepting_player_id": _as_int(s.get("intercepting_player_id")),
-            "ball_trajectory": json.dumps(s.get("ball_trajectory")) if s.get("ball_trajectory") is not None else None,
-            "annotations": json.dumps(s.get("annotations")) if s.get("annotations") is not None else None,
-            # extracted scalars from ball_hit / ball_hit_location blobs
-            "ball_hit_s": _as_float(ball_hit_obj.get("timestamp")) if ball_hit_obj else None,
-            "ball_hit_frame": _as_int(ball_hit_obj.get("frame_nr")) if ball_hit_obj else None,
-            "ball_hit_location_x": _as_float(ball_hit_loc[0]) if isinstance(ball_hit_loc, list) and len(ball_hit_loc) > 0 else None,
-            "ball_hit_location_y": _as_float(ball_hit_loc[1]) if isinstance(ball_hit_loc, list) and len(ball_hit_loc) > 1 else None,
-            # extracted scalars from ball_impact_location blob
-            "ball_impact_location_x": _as_float(ball_impact_loc[0]) if isinstance(ball_impact_loc, list) and len(ball_impact_loc) > 0 else None,
-            "ball_impact_location_y": _as_float(ball_impact_loc[1]) if isinstance(ball_impact_loc, list) and len(ball_impact_loc) > 1 else None,
-            # extracted scalars from rally blob [start_s, end_s]
-            "rally_start_s": _as_float(rally_raw[0]) if isinstance(rally_raw, list) and len(rally_raw) > 0 else None,
-            "rally_end_s":   _as_float(rally_raw[1]) if isinstance(rally_raw, list) and len(rally_raw) > 1 else None,
-        })
-    if not rows: return 0
-    conn.execute(sql_text("""
-        INSERT INTO bronze.player_swing (
-            task_id, data,
-            start_ts, start_frame, end_ts, end_frame,
-            player_id, valid, serve, swing_type, volley, is_in_rally,
-            rally, ball_hit,
-            confidence_swing_type, confidence, confidence_volley,
-            ball_hit_location, ball_player_distance, ball_speed,
-            ball_impact_location, ball_impact_type, intercepting_player_id,
-            ball_trajectory, annotations,
-            ball_hit_s, ball_hit_frame, ball_hit_location_x, ball_hit_location_y,
-            ball_impact_location_x, ball_impact_location_y,
-            rally_start_s, rally_end_s
-        ) VALUES (
-            :tid, CAST(:j AS JSONB),
-            :start_ts, :start_frame, :end_ts, :end_frame,
-            :player_id, :valid, :serve, :swing_type, :volley, :is_in_rally,
-            CAST(:rally AS JSONB), CAST(:ball_hit AS JSONB),
-            :confidence_swing_type, :confidence, :confidence_volley,
-            CAST(:ball_hit_location AS JSONB), :ball_player_distance, :ball_speed,
-            CAST(:ball_impact_location AS JSONB), :ball_impact_type, :intercepting_player_id,
-            CAST(:ball_trajectory AS JSONB), CAST(:annotations AS JSONB),
-            :ball_hit_s, :ball_hit_frame, :ball_hit_location_x, :ball_hit_location_y,
-            :ball_impact_location_x, :ball_impact_location_y,
-            :rally_start_s, :rally_end_s
-        )
-    """), rows)
-    return len(rows)
+
+    def rows():
+        for s in swings:
+            if not isinstance(s, dict):
+                continue
+            start = _as_dict(s.get("start"))
+            end   = _as_dict(s.get("end"))
+            ball_hit_obj = _as_dict(s.get("ball_hit"))
+            ball_hit_loc = s.get("ball_hit_location")
+            ball_impact_loc = s.get("ball_impact_location")
+            rally_raw = s.get("rally")
+            j_clean = _clean_data(s, drop)
+            yield {
+                "task_id": task_id,
+                "data": json.dumps(j_clean) if j_clean is not None else None,
+                "start_ts": _as_float(start.get("timestamp")) if start else None,
+                "start_frame": _as_int(start.get("frame_nr")) if start else None,
+                "end_ts": _as_float(end.get("timestamp")) if end else None,
+                "end_frame": _as_int(end.get("frame_nr")) if end else None,
+                "player_id": _as_int(s.get("player_id")),
+                "valid": _as_bool(s.get("valid")),
+                "serve": _as_bool(s.get("serve")),
+                "swing_type": (s.get("swing_type") or None),
+                "volley": _as_bool(s.get("volley")),
+                "is_in_rally": _as_bool(s.get("is_in_rally")),
+                "rally": json.dumps(rally_raw) if rally_raw is not None else None,
+                "ball_hit": json.dumps(s.get("ball_hit")) if s.get("ball_hit") is not None else None,
+                "confidence_swing_type": _as_float(s.get("confidence_swing_type")),
+                "confidence": _as_float(s.get("confidence")),
+                "confidence_volley": _as_float(s.get("confidence_volley")),
+                "ball_hit_location": json.dumps(ball_hit_loc) if ball_hit_loc is not None else None,
+                "ball_player_distance": _as_float(s.get("ball_player_distance")),
+                "ball_speed": _as_float(s.get("ball_speed")),
+                "ball_impact_location": json.dumps(ball_impact_loc) if ball_impact_loc is not None else None,
+                "ball_impact_type": (s.get("ball_impact_type") or None),
+                "intercepting_player_id": _as_int(s.get("intercepting_player_id")),
+                "ball_trajectory": json.dumps(s.get("ball_trajectory")) if s.get("ball_trajectory") is not None else None,
+                "annotations": json.dumps(s.get("annotations")) if s.get("annotations") is not None else None,
+                # extracted scalars from ball_hit / ball_hit_location blobs
+                "ball_hit_s": _as_float(ball_hit_obj.get("timestamp")) if ball_hit_obj else None,
+                "ball_hit_frame": _as_int(ball_hit_obj.get("frame_nr")) if ball_hit_obj else None,
+                "ball_hit_location_x": _as_float(ball_hit_loc[0]) if isinstance(ball_hit_loc, list) and len(ball_hit_loc) > 0 else None,
+                "ball_hit_location_y": _as_float(ball_hit_loc[1]) if isinstance(ball_hit_loc, list) and len(ball_hit_loc) > 1 else None,
+                # extracted scalars from ball_impact_location blob
+                "ball_impact_location_x": _as_float(ball_impact_loc[0]) if isinstance(ball_impact_loc, list) and len(ball_impact_loc) > 0 else None,
+                "ball_impact_location_y": _as_float(ball_impact_loc[1]) if isinstance(ball_impact_loc, list) and len(ball_impact_loc) > 1 else None,
+                # extracted scalars from rally blob [start_s, end_s]
+                "rally_start_s": _as_float(rally_raw[0]) if isinstance(rally_raw, list) and len(rally_raw) > 0 else None,
+                "rally_end_s":   _as_float(rally_raw[1]) if isinstance(rally_raw, list) and len(rally_raw) > 1 else None,
+            }
+
+    return _copy_rows(conn, "player_swing", _PLAYER_SWING_COLS, rows(), jsonb=_PLAYER_SWING_JSONB)
 
 def _insert_ball_positions(conn, task_id: str, items: list) -> int:
     if not items:
         return 0
-    rows = []
     drop = ["X", "Y", "timestamp"]
-    for b in items:
-        if not isinstance(b, dict):
-            continue
-        j_clean = {k: v for k, v in b.items() if k not in drop} or None
-        rows.append({
-            "tid": task_id,
-            "j": json.dumps(j_clean) if j_clean is not None else None,
-            "x":  _as_float(b.get("X")),
-            "y":  _as_float(b.get("Y")),
-            "ts": _as_float(b.get("timestamp")),
-        })
-    if not rows:
-        return 0
-    conn.execute(sql_text("""
-        INSERT INTO bronze.ball_position (task_id, data, x, y, "timestamp")
-        VALUES (:tid, CAST(:j AS JSONB), :x, :y, :ts)
-    """), rows)
-    return len(rows)
+
+    def rows():
+        for b in items:
+            if not isinstance(b, dict):
+                continue
+            j_clean = {k: v for k, v in b.items() if k not in drop} or None
+            yield {
+                "task_id": task_id,
+                "data": json.dumps(j_clean) if j_clean is not None else None,
+                "x":  _as_float(b.get("X")),
+                "y":  _as_float(b.get("Y")),
+                "timestamp": _as_float(b.get("timestamp")),
+            }
+
+    return _copy_rows(conn, "ball_position", ["task_id", "data", "x", "y", "timestamp"],
+                      rows(), jsonb=("data",))
 
 def _insert_player_positions(conn, task_id: str, items: list) -> int:
     if not items:
@@ -633,80 +811,66 @@ def _insert_player_positions(conn, task_id: str, items: list) -> int:
     target_cols = ["x", "y", "court_x", "court_y", "timestamp"]
     gen = _generated_cols(conn, "player_position", target_cols)
 
-    rows = []
     if gen:
-        for it in items:
-            if not isinstance(it, dict): continue
-            pid = it.pop("_player_id", None)
-            rows.append({"tid": task_id, "j": json.dumps(it), "pid": pid})
-        if not rows: return 0
-        conn.execute(sql_text("""
-            INSERT INTO bronze.player_position (task_id, data, player_id)
-            VALUES (:tid, CAST(:j AS JSONB), :pid)
-        """), rows)
-        return len(rows)
+        def gen_rows():
+            for it in items:
+                if not isinstance(it, dict): continue
+                pid = it.pop("_player_id", None)
+                yield {"task_id": task_id, "data": json.dumps(it), "player_id": pid}
+        return _copy_rows(conn, "player_position", ["task_id", "data", "player_id"],
+                          gen_rows(), jsonb=("data",))
 
     drop = ["X", "Y", "court_X", "court_Y", "timestamp", "_player_id"]
-    for it in items:
-        if not isinstance(it, dict): continue
-        pid = it.get("_player_id")
-        j_clean = {k: v for k, v in it.items() if k not in drop} or None
-        rows.append({
-            "tid": task_id,
-            "j": json.dumps(j_clean) if j_clean is not None else None,
-            "pid": pid,
-            "x":  it.get("X"),
-            "y":  it.get("Y"),
-            "cx": it.get("court_X"),
-            "cy": it.get("court_Y"),
-            "ts": it.get("timestamp"),
-        })
-    if not rows:
-        return 0
-    conn.execute(sql_text("""
-        INSERT INTO bronze.player_position (task_id, data, player_id, x, y, court_x, court_y, timestamp)
-        VALUES (:tid, CAST(:j AS JSONB), :pid, :x, :y, :cx, :cy, :ts)
-    """), rows)
-    return len(rows)
+
+    def rows():
+        for it in items:
+            if not isinstance(it, dict): continue
+            j_clean = {k: v for k, v in it.items() if k not in drop} or None
+            yield {
+                "task_id": task_id,
+                "data": json.dumps(j_clean) if j_clean is not None else None,
+                "player_id": it.get("_player_id"),
+                "x":  it.get("X"),
+                "y":  it.get("Y"),
+                "court_x": it.get("court_X"),
+                "court_y": it.get("court_Y"),
+                "timestamp": it.get("timestamp"),
+            }
+
+    return _copy_rows(conn, "player_position",
+                      ["task_id", "data", "player_id", "x", "y", "court_x", "court_y", "timestamp"],
+                      rows(), jsonb=("data",))
 
 def _insert_ball_bounces(conn, task_id: str, items: list) -> int:
     if not items: return 0
     target_cols = ["type","frame_nr","player_id","timestamp","court_pos","image_pos"]
     gen = _generated_cols(conn, "ball_bounce", target_cols)
 
-    rows = []
     if gen:
+        return _copy_rows(conn, "ball_bounce", ["task_id", "data"],
+                          ({"task_id": task_id, "data": json.dumps(b)}
+                           for b in items if isinstance(b, dict)),
+                          jsonb=("data",))
+
+    def rows():
         for b in items:
             if not isinstance(b, dict): continue
-            rows.append({"tid": task_id, "j": json.dumps(b)})
-        if not rows: return 0
-        conn.execute(sql_text("""
-            INSERT INTO bronze.ball_bounce (task_id, data)
-            VALUES (:tid, CAST(:j AS JSONB))
-        """), rows)
-        return len(rows)
-
-    for b in items:
-        if not isinstance(b, dict): continue
-        j_clean = {k: v for k, v in b.items() if k not in target_cols} or None
-        rows.append({
-            "tid": task_id,
-            "j": json.dumps(j_clean) if j_clean is not None else None,
-            "type": b.get("type"),
-            "frame_nr": _as_int(b.get("frame_nr")),
-            "player_id": _as_int(b.get("player_id")),
-            "ts": _as_float(b.get("timestamp")),
-            "court_pos": json.dumps(b.get("court_pos")) if b.get("court_pos") is not None else None,
-            "image_pos": json.dumps(b.get("image_pos")) if b.get("image_pos") is not None else None,
-        })
-    if not rows: return 0
-    conn.execute(sql_text("""
-        INSERT INTO bronze.ball_bounce
-            (task_id, data, type, frame_nr, player_id, timestamp, court_pos, image_pos)
-        VALUES
-            (:tid, CAST(:j AS JSONB), :type, :frame_nr, :player_id, :ts, CAST(:court_pos AS JSONB), CAST(:image_pos AS JSONB))
-    """), rows)
-    return len(rows)
+            j_clean = {k: v for k, v in b.items() if k not in target_cols} or None
+            yield {
+                "task_id": task_id,
+                "data": json.dumps(j_clean) if j_clean is not None else None,
+                "type": b.get("type"),
+                "frame_nr": _as_int(b.get("frame_nr")),
+                "player_id": _as_int(b.get("player_id")),
+                "timestamp": _as_float(b.get("timestamp")),
+                "court_pos": json.dumps(b.get("court_pos")) if b.get("court_pos") is not None else None,
+                "image_pos": json.dumps(b.get("image_pos")) if b.get("image_pos") is not None else None,
+            }
+
+    return _copy_rows(conn, "ball_bounce",
+                      ["task_id", "data", "type", "frame_nr", "player_id", "timestamp",
+                       "court_pos", "image_pos"],
+                      rows(), jsonb=("data", "court_pos", "image_pos"))
 
 # Candidate-bounce recovery from debug_data.ball_bounces. SportAI's delivered
 # `ball_bounces` is a filtered subset; the debug set carries confidences and ~2x
@@ -1018,6 +1182,23 @@ def _post_ingest_transforms(conn, task_id: str):
     # We intentionally do not touch it here anymore.
 
 # --------------- core ingest ---------------
+def _flatten_player_positions(raw):
+    """player_positions as one item list: a list passes through, a
+    {pid: [item, ...]} map is flattened with each item tagged "_player_id"."""
+    if isinstance(raw, StreamedArray):
+        return raw  # flattened as it streams
+    if isinstance(raw, dict):
+        flat = []
+        for pid, v in raw.items():
+            if isinstance(v, list):
+                for item in v:
+                    if isinstance(item, dict):
+                        flat.append({**item, "_player_id": str(pid)})
+        return flat
+    if isinstance(raw, list):
+        return raw
+    return []
+
 def ingest_bronze_strict(
     conn,
     payload: Dict[str, Any],
@@ -1070,16 +1251,7 @@ def ingest_bronze_strict(
             for s in _as_list(stats.get(k)):
                 if isinstance(s, dict): swing_rows.append(s)
 
-    player_positions_raw = payload.get("player_positions")
-    player_positions_flat = []
-    if isinstance(player_positions_raw, dict):
-        for pid, v in player_positions_raw.items():
-            if isinstance(v, list):
-                for item in v:
-                    if isinstance(item, dict):
-                        player_positions_flat.append({**item, "_player_id": str(pid)})
-    elif isinstance(player_positions_raw, list):
-        player_positions_flat = player_positions_raw
+    player_positions_flat = _flatten_player_positions(payload.get("player_positions"))
 
     counts = {}
     counts["player"]             = _insert_players(conn, task_id, players)
@@ -1223,22 +1395,16 @@ def _insert_debug_data(conn, task_id: str, dbg) -> int:
         if isinstance(d.get("video_info"), dict):
             stub["video_info"] = d["video_info"]  # small + useful, keep it
         payload_json = json.dumps(stub)
-    conn.execute(sql_text("""
-        INSERT INTO bronze.debug_event (task_id, data)
-        VALUES (:tid, CAST(:j AS JSONB))
-    """), [{"tid": task_id, "j": payload_json}])
-    return 1
+    # COPY streams the blob as data instead of one giant bind parameter.
+    return _copy_rows(conn, "debug_event", ["task_id", "data"],
+                      [{"task_id": task_id, "data": payload_json}], jsonb=("data",))
 
 
 def _insert_json_array(conn, table: str, task_id: str, arr) -> int:
     if not arr: return 0
-    rows = [{"tid": task_id, "j": json.dumps(x)} for x in arr if isinstance(x, dict)]
-    if not rows: return 0
-    conn.execute(sql_text(f"""
-        INSERT INTO bronze.{table} (task_id, data)
-        VALUES (:tid, CAST(:j AS JSONB))
-    """), rows)
-    return len(rows)
+    return _copy_rows(conn, table, ["task_id", "data"],
+                      ({"task_id": task_id, "data": json.dumps(x)} for x in arr if isinstance(x, dict)),
+                      jsonb=("data",))
 
 # ------------------ routes ------------------
 @ingest_bronze.get("/bronze/init")
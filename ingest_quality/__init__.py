@@ -77,7 +77,10 @@ class Verdict:
 
 def _n(payload: dict, key: str) -> int:
     v = payload.get(key)
-    return len(v) if isinstance(v, (list, dict)) else 0
+    if isinstance(v, (list, dict)):
+        return len(v)
+    # ingest_bronze.StreamedArray: a big array left on disk, sized without loading it
+    return len(v) if getattr(v, "streamed", False) else 0
 
 
 def assess(payload: dict) -> Verdict:
@@ -0,0 +1,184 @@
+"""Streamed payload reader vs json.load. No DB, no network.
+
+    .venv/Scripts/python -m ingest_quality.tests.test_payload_stream
+
+The ingest worker spools the SportAI result to disk and parses it with
+ingest_bronze.read_payload_file(): ball_positions / player_positions stay on
+disk as StreamedArray handles and are re-read with ijson while the rows are
+COPYed. Each fixture is written gzip and plain, with player_positions as a list
+and as a {pid: [...]} map; the rows ingest_bronze_strict's row generators
+produce and ingest_quality's counts must match the json.load path exactly.
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import sys
+import tempfile
+
+# db_init builds its engine at import; nothing here ever connects.
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/unused")
+
+import ingest_bronze  # noqa: E402
+from ingest_bronze import StreamedArray, read_payload_file  # noqa: E402
+from ingest_quality import _n, assess  # noqa: E402
+
+
+def _ball(i):
+    b = {"X": 0.1 * i, "Y": 1.0 - 0.01 * i, "timestamp": i / 25}
+    if i % 3 == 0:
+        b["confidence"] = 0.5 + i / 1000     # leftover key -> data JSONB
+    if i % 7 == 0:
+        b["X"] = None
+    return b
+
+
+def _pos(i, pid=None):
+    p = {"X": 100 + i, "Y": 200.5 - i, "court_X": i * 0.25, "court_Y": -i * 0.5,
+         "timestamp": i / 25, "bbox": [i, i + 1, i + 20, i + 60]}
+    if pid is not None:
+        p["player_id"] = pid
+    return p
+
+
+def _payload(map_positions: bool, n_ball=400, n_pos=150):
+    if map_positions:
+        positions = {str(pid): [_pos(i) for i in range(n_pos)] for pid in (3, 11)}
+        positions["9"] = []                                    # empty player
+    else:
+        positions = [_pos(i, pid=i % 2) for i in range(n_pos)]
+    return {
+        "task_id": "0d1c2b3a-0000-4000-8000-000000000001",
+        "players": [{"player_id": i, "swings": [{"valid": i < 2, "ball_hit": {"timestamp": 1.5}}]}
+                    for i in range(3)],
+        "ball_positions": [_ball(i) for i in range(n_ball)] + ["not-a-dict", None],
+        "rallies": [[0.0, 4.5], [7.25, 12.0]],
+        "ball_bounces": [{"timestamp": 2.0, "court_pos": [1.0, 2.0], "type": "floor"}],
+        "player_positions": positions,
+        "meta": {"video_info": {"codec": "h264", "duration": 612.4}, "unicode": "Zoë — café"},
+        "confidences": {"final_confidences": {"final": 0.71}},
+        "highlights": None,
+    }
+
+
+def _spool(payload, compress: bool) -> str:
+    body = json.dumps(payload).encode("utf-8")
+    fd, path = tempfile.mkstemp(prefix="sportai_test_", suffix=".json")
+    with os.fdopen(fd, "wb") as f:
+        f.write(gzip.compress(body) if compress else body)
+    return path
+
+
+def _rows(items, generated=()):
+    """Rows the bronze insert helpers hand to _copy_rows, without a DB."""
+    captured = {}
+    orig_copy, orig_gen = ingest_bronze._copy_rows, ingest_bronze._generated_cols
+
+    def copy_rows(conn, table, cols, rows, jsonb=()):
+        captured[table] = (cols, list(rows))
+        return len(captured[table][1])
+
+    ingest_bronze._copy_rows = copy_rows
+    ingest_bronze._generated_cols = lambda conn, table, cols: set(generated)
+    try:
+        ingest_bronze._insert_ball_positions(None, "t", ingest_bronze._as_list(items["ball_positions"]))
+        ingest_bronze._insert_player_positions(
+            None, "t", ingest_bronze._flatten_player_positions(items["player_positions"]))
+    finally:
+        ingest_bronze._copy_rows, ingest_bronze._generated_cols = orig_copy, orig_gen
+    return captured
+
+
+def _check(map_positions: bool, compress: bool):
+    name = (f"{'gzip' if compress else 'plain'} / "
+            f"player_positions as {'map' if map_positions else 'list'}")
+    payload = _payload(map_positions)
+    path = _spool(payload, compress)
+    try:
+        with open(path, "rb") as f:
+            raw = f.read()
+        body = gzip.decompress(raw) if compress else raw
+        loaded = json.loads(body)
+        streamed = read_payload_file(path)
+
+        for key in ("ball_positions", "player_positions"):
+            assert isinstance(streamed[key], StreamedArray), f"{name}: {key} not streamed"
+            assert len(streamed[key]) == len(loaded[key]), \
+                f"{name}: len({key}) {len(streamed[key])} != {len(loaded[key])}"
+            assert _n(streamed, key) == _n(loaded, key), f"{name}: _n({key}) differs"
+        for key in loaded:
+            if key not in ("ball_positions", "player_positions"):
+                assert streamed[key] == loaded[key], f"{name}: {key} differs"
+        assert set(streamed) == set(loaded), f"{name}: keys {set(streamed) ^ set(loaded)}"
+        assert streamed.sha256 == hashlib.sha256(body).hexdigest(), f"{name}: sha256"
+
+        a, b = assess(streamed), assess(loaded)
+        assert (a.ok, a.warnings) == (b.ok, b.warnings), f"{name}: assess {a} != {b}"
+
+        # Iterating twice re-reads the file: the handle is not a one-shot generator.
+        assert list(streamed["ball_positions"]) == list(streamed["ball_positions"])
+
+        for generated in ((), ("x", "y")):
+            want = _rows(json.loads(body), generated)
+            got = _rows(streamed, generated)
+            for table in ("ball_position", "player_position"):
+                assert got[table][0] == want[table][0], f"{name}: {table} columns"
+                assert got[table][1] == want[table][1], \
+                    f"{name}: {table} rows differ (generated={generated})"
+        n_pos = len(want["player_position"][1])
+        print(f"  {name}: {len(want['ball_position'][1])} ball / {n_pos} player rows OK")
+    finally:
+        os.unlink(path)
+
+
+def test_payload_shapes():
+    for map_positions in (False, True):
+        for compress in (True, False):
+            _check(map_positions, compress)
+
+
+def test_map_player_ids():
+    path = _spool(_payload(True, n_ball=1, n_pos=2), compress=True)
+    try:
+        pp = read_payload_file(path)["player_positions"]
+        assert len(pp) == 3, "len() counts players (map keys), like the dict"
+        assert [it["_player_id"] for it in pp] == ["3", "3", "11", "11"], list(pp)
+    finally:
+        os.unlink(path)
+    print("  map items tagged with _player_id: OK")
+
+
+def test_not_an_object():
+    path = _spool([1, 2, 3], compress=False)
+    try:
+        read_payload_file(path)
+    except ValueError:
+        print("  top-level array rejected: OK")
+        return
+    finally:
+        os.unlink(path)
+    raise AssertionError("a top-level JSON array must be rejected")
+
+
+def main() -> int:
+    tests = [test_payload_shapes, test_map_player_ids, test_not_an_object]
+    print(f"Running {len(tests)} streamed payload tests:")
+    failures = 0
+    for t in tests:
+        try:
+            t()
+        except AssertionError as e:
+            print(f"  {t.__name__}: FAIL — {e}")
+            failures += 1
+    print()
+    if failures:
+        print(f"{failures} test(s) failed")
+        return 1
+    print("All tests passed.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
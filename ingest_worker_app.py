@@ -68,8 +68,12 @@ VIDEO_WORKER_OPS_KEY = (os.getenv("VIDEO_WORKER_OPS_KEY") or "").strip()
 # ============================================================
 
 from db_init import engine, log_task_event  # noqa: E402
-from ingest_bronze import ingest_bronze_strict, _run_bronze_init  # noqa: E402
+from ingest_bronze import (  # noqa: E402
+    ingest_bronze_strict, _run_bronze_init,
+    BRONZE_STREAM_INGEST, spool_result, read_payload_file,
+)
 from build_silver_v2 import build_silver_v2 as build_silver_point_detail  # noqa: E402
+from gold_materialize import refresh_task as refresh_gold_task  # noqa: E402
 from billing_import_from_bronze import sync_usage_for_task_id  # noqa: E402
 from ingest_quality import assess as assess_payload, should_reject  # noqa: E402
 
@@ -226,6 +230,14 @@ def _is_transient_db_error(exc: BaseException) -> bool:
     return any(m in msg for m in _TRANSIENT_DB_MARKERS)
 
 
+def _discard_result_file(path: Optional[str]) -> None:
+    if path:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
 def _do_ingest(task_id: str, result_url: str) -> bool:
     """
     Run the full ingest pipeline.
@@ -241,6 +253,7 @@ def _do_ingest(task_id: str, result_url: str) -> bool:
       7. Mark complete
     """
     sid = None
+    result_path = None
 
     try:
         app.logger.info("INGEST START task_id=%s result_url=%s", task_id, result_url)
@@ -275,7 +288,12 @@ def _do_ingest(task_id: str, result_url: str) -> bool:
             task_id, r.status_code, r.headers.get("Content-Length"), content_encoding,
         )
 
-        if "gzip" in content_encoding:
+        if BRONZE_STREAM_INGEST:
+            # Spool to disk; the big arrays stay there and stream into COPY
+            # (see ingest_bronze "streamed payloads + COPY").
+            result_path = spool_result(r)
+            payload = read_payload_file(result_path)
+        elif "gzip" in content_encoding:
             payload = json.load(gzip.GzipFile(fileobj=r.raw))
         else:
             payload = json.load(r.raw)
@@ -288,8 +306,11 @@ def _do_ingest(task_id: str, result_url: str) -> bool:
         # shout if SportAI added a top-level key we don't handle.
         # -------------------------
         try:
-            from raw_archive import archive_raw, detect_drift
-            archive_raw(task_id, payload)
+            from raw_archive import archive_raw, archive_raw_file, detect_drift
+            if result_path:
+                archive_raw_file(task_id, result_path)
+            else:
+                archive_raw(task_id, payload)
             detect_drift(task_id, payload)
         except Exception as _arch_e:
             app.logger.warning("RAW ARCHIVE/drift step failed task_id=%s: %s", task_id, _arch_e)
@@ -368,6 +389,8 @@ def _do_ingest(task_id: str, result_url: str) -> bool:
             del payload
         except Exception:
             pass
+        _discard_result_file(result_path)
+        result_path = None
 
         # -------------------------
         # STEP 3: SILVER BUILD
@@ -382,6 +405,15 @@ def _do_ingest(task_id: str, result_url: str) -> bool:
         app.logger.info("INGEST STEP task_id=%s step=silver_build_done", task_id)
         log_task_event(task_id, "silver", "ok")
 
+        # -------------------------
+        # STEP 3a: GOLD REFRESH — re-materialise this task's gold summaries
+        # (gold_materialize.py). Never raises; a failure is repaired by the
+        # next refresh / rebuild.
+        # -------------------------
+        gold = refresh_gold_task(task_id)
+        log_task_event(task_id, "gold", "ok" if gold.get("ok") else "skipped",
+                       detail=None if gold.get("ok") else gold.get("error"))
+
         # -------------------------
         # STEP 3b: ANALYTICS TABLES (best-effort, never fatal)
         # Fitness / movement-grid / match-quality from bronze data point_detail
@@ -504,6 +536,8 @@ def _do_ingest(task_id: str, result_url: str) -> bool:
             pass
 
         return False
+    finally:
+        _discard_result_file(result_path)
 
 
 # ============================================================
@@ -692,3 +726,12 @@ def ingest_status():
         "wix_notify_status": row.get("wix_notify_status"),
         "trim_status": row.get("trim_status"),
     })
+
+
+@app.get("/ops/db-pool-stats")
+def ops_db_pool_stats():
+    """Pool status + checkout telemetry for this worker's DB engine (db_engine.pool_stats)."""
+    if not _auth_ok(request):
+        return jsonify({"ok": False, "error": "unauthorized"}), 401
+    from db_engine import pool_stats
+    return jsonify({"ok": True, **pool_stats()})
@@ -1,15 +1,45 @@
 # marketing_crm/tracking/client.py — the track() implementation.
 #
-# Guarantees: never raises, never blocks the caller (daemon thread), no-op unless TRACKING_ENABLED=1.
+# Guarantees: never raises, never blocks the caller, no-op unless TRACKING_ENABLED=1.
 # Emits to core.usage_event (account/user resolved by email best-effort) + Amplitude (optional).
+#
+# Batched pipeline (TRACKING_BATCHED, default on). track() used to spawn a daemon thread per event,
+# each opening its own session, resolving account + user with two queries, inserting one row and
+# POSTing Amplitude synchronously — a busy dashboard (REPORT_VIEWED on every KPI load) meant
+# unbounded threads and connection churn. Now:
+#   - track() stamps occurred_at and put_nowait()s onto a bounded per-process queue
+#     (TRACKING_QUEUE_MAX). Full queue = backpressure by DROPPING the event (counted, logged at most
+#     once per TRACKING_DROP_LOG_S) — the request never waits on analytics.
+#   - ONE flusher thread per worker process (started lazily, re-created after fork) drains up to
+#     TRACKING_BATCH_SIZE events every TRACKING_FLUSH_INTERVAL_S and writes them as one multi-row
+#     INSERT into core.usage_event. email→(account_id, user_id) comes from a TTL cache
+#     (TRACKING_ID_CACHE_TTL_S) of fully linked emails; everything else is resolved for the whole
+#     batch in two queries, so an event right after signup links to the new account.
+#   - Amplitude gets one batched httpapi POST per flush; Klaviyo forwarding and the offline-
+#     conversion ledger run per event on the flusher, as before.
+#   - atexit drains the queue (bounded by TRACKING_SHUTDOWN_TIMEOUT_S).
+# TRACKING_BATCHED=0 restores a thread per event (each a batch of one). stats() exposes counters.
 
+import atexit
 import logging
 import os
+import queue
 import threading
+import time
+from datetime import datetime, timezone
 
 log = logging.getLogger("marketing_crm.tracking")
 
 _AMPLITUDE_URL = "https://api2.amplitude.com/2/httpapi"
+_AMPLITUDE_MAX_EVENTS = 1000   # httpapi accepts up to 2000 events / 1MB per request
+
+TRACKING_BATCHED = os.getenv("TRACKING_BATCHED", "1").strip().lower() in ("1", "true", "yes")
+TRACKING_QUEUE_MAX = int(os.getenv("TRACKING_QUEUE_MAX", "10000"))
+TRACKING_BATCH_SIZE = int(os.getenv("TRACKING_BATCH_SIZE", "200"))
+TRACKING_FLUSH_INTERVAL_S = float(os.getenv("TRACKING_FLUSH_INTERVAL_S", "1.0"))
+TRACKING_ID_CACHE_TTL_S = float(os.getenv("TRACKING_ID_CACHE_TTL_S", "300"))
+TRACKING_SHUTDOWN_TIMEOUT_S = float(os.getenv("TRACKING_SHUTDOWN_TIMEOUT_S", "5"))
+TRACKING_DROP_LOG_S = float(os.getenv("TRACKING_DROP_LOG_S", "60"))
 
 
 def _enabled():
@@ -25,85 +55,311 @@ def track(event_type, *, email=None, account_id=None, user_id=None, person_id=No
     if not _enabled():
         return
     try:
-        threading.Thread(
-            target=_emit,
-            args=(event_type, email, account_id, user_id, person_id, ref_type, ref_id,
-                  dict(properties or {})),
-            daemon=True,
-        ).start()
+        ev = {
+            "event_type": event_type, "email": email, "account_id": account_id,
+            "user_id": user_id, "person_id": person_id, "ref_type": ref_type,
+            "ref_id": ref_id, "properties": dict(properties or {}),
+            "occurred_at": datetime.now(timezone.utc),
+        }
+        if not TRACKING_BATCHED:
+            threading.Thread(target=_flush, args=([ev],), daemon=True).start()
+            return
+        _pipeline().put(ev)
     except Exception:
-        log.exception("track: failed to spawn emit thread for %s", event_type)
+        log.exception("track: failed to enqueue %s", event_type)
 
 
-def _emit(event_type, email, account_id, user_id, person_id, ref_type, ref_id, properties):
-    # 1) Durable: core.usage_event
+def flush(timeout=None):
+    """Drain everything queued so far (scripts, tests, shutdown). Returns True if drained."""
+    p = _PIPELINE
+    if p is None or p.pid != os.getpid():
+        return True
+    return p.drain(TRACKING_SHUTDOWN_TIMEOUT_S if timeout is None else timeout)
+
+
+def stats():
+    """Counters for this process: enqueued / written / dropped / failed / amplitude_failed / queued."""
+    p = _PIPELINE
+    if p is None or p.pid != os.getpid():
+        return dict(_ZERO_STATS, queued=0)
+    return p.stats()
+
+
+# ---------------------------------------------------------------------------
+# Queue + flusher
+# ---------------------------------------------------------------------------
+
+_ZERO_STATS = {"enqueued": 0, "written": 0, "dropped": 0, "failed": 0, "amplitude_failed": 0}
+_PIPELINE = None
+_PIPELINE_LOCK = threading.Lock()
+
+
+class _Pipeline:
+    def __init__(self):
+        self.pid = os.getpid()
+        self.q = queue.Queue(maxsize=TRACKING_QUEUE_MAX)
+        self.counts = dict(_ZERO_STATS)
+        self._lock = threading.Lock()
+        self._last_drop_log = 0.0
+        self._stop = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="tracking-flusher", daemon=True)
+        self.thread.start()
+
+    def put(self, ev):
+        try:
+            self.q.put_nowait(ev)
+        except queue.Full:
+            with self._lock:
+                self.counts["dropped"] += 1
+                dropped = self.counts["dropped"]
+                now = time.monotonic()
+                if now - self._last_drop_log < TRACKING_DROP_LOG_S:
+                    return
+                self._last_drop_log = now
+            log.warning("track: queue full (%d) — dropping events (%d dropped so far)",
+                        TRACKING_QUEUE_MAX, dropped)
+            return
+        with self._lock:
+            self.counts["enqueued"] += 1
+
+    def bump(self, key, n=1):
+        with self._lock:
+            self.counts[key] += n
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counts, queued=self.q.qsize())
+
+    def _take_batch(self):
+        try:
+            first = self.q.get(timeout=TRACKING_FLUSH_INTERVAL_S)
+        except queue.Empty:
+            return []
+        batch = [first]
+        while len(batch) < TRACKING_BATCH_SIZE:
+            try:
+                batch.append(self.q.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._take_batch()
+            if batch:
+                try:
+                    _flush(batch, self)
+                except Exception:
+                    log.exception("track: flush of %d events failed", len(batch))
+                finally:
+                    for _ in batch:
+                        self.q.task_done()
+            if self._stop.is_set() and self.q.empty():
+                return
+
+    def drain(self, timeout):
+        """Wait until every queued event has been flushed (not just dequeued)."""
+        deadline = time.monotonic() + max(0.0, timeout)
+        with self.q.all_tasks_done:
+            while self.q.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self.thread.is_alive():
+                    return False
+                self.q.all_tasks_done.wait(remaining)
+        return True
+
+    def shutdown(self):
+        self._stop.set()
+        self.thread.join(TRACKING_SHUTDOWN_TIMEOUT_S)
+        if not self.q.empty():
+            log.warning("track: shutdown with %d events still queued", self.q.qsize())
+
+
+def _pipeline():
+    global _PIPELINE
+    p = _PIPELINE
+    if p is not None and p.pid == os.getpid():
+        return p
+    with _PIPELINE_LOCK:
+        # Fresh queue + flusher in a forked worker: the parent's thread does not exist here.
+        if _PIPELINE is None or _PIPELINE.pid != os.getpid():
+            _PIPELINE = _Pipeline()
+        return _PIPELINE
+
+
+@atexit.register
+def _shutdown():
+    p = _PIPELINE
+    if p is not None and p.pid == os.getpid():
+        p.shutdown()
+
+
+# ---------------------------------------------------------------------------
+# Identity cache: email -> (account_id, user_id)
+# ---------------------------------------------------------------------------
+
+_ID_CACHE = {}   # norm email -> (expires_monotonic, account_id, user_id); flusher-thread only
+
+
+def _resolve_ids(session, emails):
+    """{norm email: (account_id, user_id)} for `emails`; misses resolved in two queries.
+    Only emails with both ids are cached: an unlinked email may sign up any moment, and
+    caching the miss would leave its next TTL worth of events without an account."""
+    from sqlalchemy import func, select
+    from core_db.db import norm_email
+    from core_db.models import Account, AppUser
+
+    now = time.monotonic()
+    out, missing = {}, set()
+    for e in emails:
+        ne = norm_email(e)
+        if not ne:
+            continue
+        hit = _ID_CACHE.get(ne)
+        if hit and hit[0] > now:
+            out[ne] = (hit[1], hit[2])
+        else:
+            missing.add(ne)
+    if missing:
+        accts = dict(session.execute(
+            select(func.lower(Account.email), Account.id)
+            .where(func.lower(Account.email).in_(missing), Account.deleted_at.is_(None))
+        ).all())
+        users = dict(session.execute(
+            select(func.lower(AppUser.email), AppUser.id)
+            .where(func.lower(AppUser.email).in_(missing), AppUser.deleted_at.is_(None))
+        ).all())
+        expires = now + TRACKING_ID_CACHE_TTL_S
+        for ne in missing:
+            ids = (accts.get(ne), users.get(ne))
+            if ids[0] is not None and ids[1] is not None:
+                _ID_CACHE[ne] = (expires, ids[0], ids[1])
+            out[ne] = ids
+        if len(_ID_CACHE) > 50_000:
+            for k in [k for k, v in _ID_CACHE.items() if v[0] <= now]:
+                _ID_CACHE.pop(k, None)
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Flush: one batch -> usage_event, Amplitude, Klaviyo, offline conversions
+# ---------------------------------------------------------------------------
+
+def _usage_row(ev):
+    meta = dict(ev["properties"])
+    # If we couldn't link to a core account yet (pre-backfill), keep the email so the
+    # event can be linked later. Otherwise don't duplicate PII into the metadata blob.
+    if ev["account_id"] is None and ev["email"]:
+        meta["email_unmatched"] = ev["email"]
+    return {
+        "event_type": ev["event_type"], "account_id": ev["account_id"], "user_id": ev["user_id"],
+        "person_id": ev["person_id"], "ref_type": ev["ref_type"],
+        "ref_id": (str(ev["ref_id"]) if ev["ref_id"] is not None else None),
+        "event_metadata": meta or None, "occurred_at": ev["occurred_at"],
+    }
+
+
+def _write_usage(batch, stats):
+    from sqlalchemy import insert
+    from core_db.db import norm_email, session_scope
+    from core_db.models import UsageEvent
+
+    with session_scope() as s:
+        ids = _resolve_ids(s, {ev["email"] for ev in batch if ev["email"]})
+        for ev in batch:
+            got = ids.get(norm_email(ev["email"])) if ev["email"] else None
+            if got:
+                if ev["account_id"] is None:
+                    ev["account_id"] = got[0]
+                if ev["user_id"] is None:
+                    ev["user_id"] = got[1]
+        rows = [_usage_row(ev) for ev in batch]
     try:
-        from core_db.db import session_scope
-        from core_db.repositories import accounts, matches
         with session_scope() as s:
-            if email:
-                if account_id is None:
-                    a = accounts.get_account_by_email(s, email)
-                    if a:
-                        account_id = a.id
-                if user_id is None:
-                    u = accounts.get_user_by_email(s, email)
-                    if u:
-                        user_id = u.id
-            meta = dict(properties)
-            # If we couldn't link to a core account yet (pre-backfill), keep the email so the
-            # event can be linked later. Otherwise don't duplicate PII into the metadata blob.
-            if account_id is None and email:
-                meta["email_unmatched"] = email
-            matches.record_usage(
-                s, event_type=event_type, account_id=account_id, user_id=user_id,
-                person_id=person_id, ref_type=ref_type, ref_id=ref_id, metadata=meta or None,
-            )
+            s.execute(insert(UsageEvent), rows)   # one multi-row INSERT (insertmanyvalues)
+        if stats:
+            stats.bump("written", len(rows))
+        return
+    except Exception:
+        if len(rows) == 1:
+            raise
+        log.exception("track: batch usage_event insert of %d failed — retrying row by row", len(rows))
+    # One bad row (e.g. a stale FK) must not lose the rest of the batch.
+    for row in rows:
+        try:
+            with session_scope() as s:
+                s.execute(insert(UsageEvent), [row])
+            if stats:
+                stats.bump("written")
+        except Exception:
+            log.exception("track: usage_event write failed for %s", row["event_type"])
+            if stats:
+                stats.bump("failed")
+
+
+def _flush(batch, stats=None):
+    # 1) Durable: core.usage_event
+    try:
+        _write_usage(batch, stats)
     except Exception:
-        log.exception("track: usage_event write failed for %s", event_type)
+        log.exception("track: usage_event write failed for %d events", len(batch))
+        if stats:
+            stats.bump("failed", len(batch))
 
-    # 2) Best-effort: Amplitude
+    # 2) Best-effort: Amplitude (one batched POST per flush)
     try:
-        _amplitude(event_type, email, account_id, properties)
+        _amplitude(batch)
     except Exception:
-        log.exception("track: amplitude emit failed for %s", event_type)
+        log.exception("track: amplitude emit failed for %d events", len(batch))
+        if stats:
+            stats.bump("amplitude_failed", len(batch))
 
     # 3) Best-effort: forward to Klaviyo so marketing flows can trigger (no-op unless CRM_SYNC_ENABLED)
     try:
         from marketing_crm.crm_sync import forward_event
-        forward_event(event_type, email, properties)
+        for ev in batch:
+            forward_event(ev["event_type"], ev["email"], ev["properties"])
     except Exception:
-        log.exception("track: crm forward failed for %s", event_type)
+        log.exception("track: crm forward failed")
 
-    # 4) Best-effort: ledger a Google Ads offline conversion if THIS money-event's buyer arrived via a
-    #    gclid'd ad click (closes the loop on the core.acquisition capture). Own session; a no-op for
-    #    non-conversion events and organic buyers. NEVER affects the caller. Shared, portable module —
-    #    identical to the CourtFlow wiring; only recorder.CONVERSION_MAP differs.
+    # 4) Best-effort: ledger a Google Ads offline conversion if a money-event's buyer arrived via a
+    #    gclid'd ad click (closes the loop on the core.acquisition capture). Own session; only opened
+    #    when the batch holds a mapped conversion event. NEVER affects the caller. Shared, portable
+    #    module — identical to the CourtFlow wiring; only recorder.CONVERSION_MAP differs.
     try:
-        from offline_conversions.recorder import record_from_emit
-        from core_db.db import session_scope
-        payload = dict(properties or {})
-        payload.setdefault("email", email)
-        payload.setdefault("user_id", user_id)
-        payload.setdefault("ref_id", ref_id)
-        with session_scope() as s3:
-            record_from_emit(s3, event_type, payload)
+        from offline_conversions.recorder import CONVERSION_MAP, record_from_emit
+        conversions = [ev for ev in batch if ev["event_type"] in CONVERSION_MAP]
+        if conversions:
+            from core_db.db import session_scope
+            for ev in conversions:
+                payload = dict(ev["properties"])
+                payload.setdefault("email", ev["email"])
+                payload.setdefault("user_id", ev["user_id"])
+                payload.setdefault("ref_id", ev["ref_id"])
+                try:
+                    with session_scope() as s3:
+                        record_from_emit(s3, ev["event_type"], payload)
+                except Exception:
+                    log.exception("track: offline-conversion ledger failed for %s (non-fatal)",
+                                  ev["event_type"])
     except Exception:
-        log.exception("track: offline-conversion ledger failed for %s (non-fatal)", event_type)
+        log.exception("track: offline-conversion ledger failed (non-fatal)")
 
 
-def _amplitude(event_type, email, account_id, properties):
+def _amplitude(batch):
     key = os.getenv("AMPLITUDE_API_KEY")
     if not key:
         return
     import requests
-    user_id = email or (f"account:{account_id}" if account_id else "anonymous")
-    payload = {
-        "api_key": key,
-        "events": [{
-            "user_id": user_id,
-            "event_type": event_type,
-            "event_properties": properties or {},
-        }],
-    }
-    requests.post(_AMPLITUDE_URL, json=payload, timeout=5)
+    events = []
+    for ev in batch:
+        email, account_id = ev["email"], ev["account_id"]
+        events.append({
+            "user_id": email or (f"account:{account_id}" if account_id else "anonymous"),
+            "event_type": ev["event_type"],
+            "event_properties": ev["properties"] or {},
+            "time": int(ev["occurred_at"].timestamp() * 1000),
+        })
+    for i in range(0, len(events), _AMPLITUDE_MAX_EVENTS):
+        requests.post(_AMPLITUDE_URL, json={"api_key": key, "events": events[i:i + _AMPLITUDE_MAX_EVENTS]},
+                      timeout=5)
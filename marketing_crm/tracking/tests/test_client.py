@@ -0,0 +1,233 @@
+"""Batched track() pipeline: identity cache, batch-insert fallback, queue-full drops.
+
+No DB needed — sessions are fakes. Run with:
+    python -m marketing_crm.tracking.tests.test_client
+"""
+from __future__ import annotations
+
+import contextlib
+import logging
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+import core_db.db
+from marketing_crm.tracking import client
+
+
+class _Session:
+    """Answers _resolve_ids' two SELECTs from dicts and records INSERTed rows."""
+
+    def __init__(self, accounts=None, users=None, inserted=None, bad=()):
+        self.accounts = accounts or {}
+        self.users = users or {}
+        self.inserted = inserted if inserted is not None else []
+        self.bad = set(bad)
+        self.selects = []
+
+    def execute(self, stmt, rows=None):
+        if rows is not None:                     # insert(UsageEvent), rows
+            if any(r["event_type"] in self.bad for r in rows):
+                raise RuntimeError("violates foreign key constraint")
+            self.inserted.extend(rows)
+            return None
+        table = stmt.get_final_froms()[0].name
+        emails = next(v for v in stmt.compile().params.values() if isinstance(v, (list, tuple, set)))
+        self.selects.append((table, sorted(emails)))
+        src = self.accounts if table == "account" else self.users
+        return _Result([(e, src[e]) for e in emails if e in src])
+
+
+class _Result:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+
+def _event(event_type="REPORT_VIEWED", email=None):
+    return {
+        "event_type": event_type, "email": email, "account_id": None, "user_id": None,
+        "person_id": None, "ref_type": None, "ref_id": None, "properties": {},
+        "occurred_at": datetime.now(timezone.utc),
+    }
+
+
+class _Stats:
+    def __init__(self):
+        self.counts = {"written": 0, "failed": 0}
+
+    def bump(self, key, n=1):
+        self.counts[key] += n
+
+
+def test_resolve_ids_caches_hits_only():
+    client._ID_CACHE.clear()
+    s = _Session(accounts={"both@x.com": 1, "acct@x.com": 2}, users={"both@x.com": 10})
+    got = client._resolve_ids(s, {"Both@X.com ", "acct@x.com", "nobody@x.com", ""})
+    assert got == {"both@x.com": (1, 10), "acct@x.com": (2, None), "nobody@x.com": (None, None)}, got
+    assert [t for t, _ in s.selects] == ["account", "app_user"], s.selects
+    assert set(client._ID_CACHE) == {"both@x.com"}, client._ID_CACHE
+
+    # The linked email is served from the cache; the others are queried again.
+    s.selects.clear()
+    got = client._resolve_ids(s, {"both@x.com", "nobody@x.com"})
+    assert got["both@x.com"] == (1, 10), got
+    assert s.selects == [("account", ["nobody@x.com"]), ("app_user", ["nobody@x.com"])], s.selects
+
+    # A miss that signs up is linked on the very next batch.
+    s.accounts["nobody@x.com"], s.users["nobody@x.com"] = 3, 30
+    got = client._resolve_ids(s, {"nobody@x.com"})
+    assert got == {"nobody@x.com": (3, 30)}, got
+    print("  _resolve_ids caches linked emails only: OK")
+
+
+def test_resolve_ids_ttl():
+    client._ID_CACHE.clear()
+    s = _Session(accounts={"a@x.com": 1}, users={"a@x.com": 10})
+    client._resolve_ids(s, {"a@x.com"})
+    client._ID_CACHE["a@x.com"] = (time.monotonic() - 1, 1, 10)   # expired
+    s.selects.clear()
+    s.accounts["a@x.com"] = 5
+    assert client._resolve_ids(s, {"a@x.com"}) == {"a@x.com": (5, 10)}
+    assert len(s.selects) == 2, s.selects
+    s.selects.clear()
+    assert client._resolve_ids(s, set()) == {} and not s.selects
+    print("  _resolve_ids re-queries expired entries: OK")
+
+
+@contextlib.contextmanager
+def _patched_sessions(**kw):
+    inserted, batches = [], []
+    orig = core_db.db.session_scope
+
+    @contextlib.contextmanager
+    def scope():
+        s = _Session(inserted=inserted, **kw)
+        batches.append(s)
+        yield s
+
+    core_db.db.session_scope = scope
+    try:
+        yield inserted, batches
+    finally:
+        core_db.db.session_scope = orig
+
+
+def test_write_usage_batch():
+    client._ID_CACHE.clear()
+    stats = _Stats()
+    with _patched_sessions(accounts={"a@x.com": 1}, users={"a@x.com": 10}) as (inserted, sessions):
+        client._write_usage([_event(email="A@x.com"), _event(), _event(email="new@x.com")], stats)
+    assert len(sessions) == 2, "one session to resolve ids, one multi-row INSERT"
+    assert [(r["account_id"], r["user_id"]) for r in inserted] == [(1, 10), (None, None), (None, None)]
+    assert inserted[2]["event_metadata"] == {"email_unmatched": "new@x.com"}, inserted[2]
+    assert inserted[0]["event_metadata"] is None, inserted[0]
+    assert stats.counts == {"written": 3, "failed": 0}, stats.counts
+    print("  _write_usage batch INSERT: OK")
+
+
+def test_write_usage_row_fallback():
+    client._ID_CACHE.clear()
+    stats = _Stats()
+    batch = [_event("A"), _event("BAD"), _event("C"), _event("BAD")]
+    logging.disable(logging.CRITICAL)
+    try:
+        with _patched_sessions(bad={"BAD"}) as (inserted, sessions):
+            client._write_usage(batch, stats)
+    finally:
+        logging.disable(logging.NOTSET)
+    assert [r["event_type"] for r in inserted] == ["A", "C"], inserted
+    # resolve + failed batch + one session per row
+    assert len(sessions) == 2 + len(batch), len(sessions)
+    assert stats.counts == {"written": 2, "failed": 2}, stats.counts
+
+    # A batch of one has nothing to fall back to: the error reaches _flush.
+    with _patched_sessions(bad={"BAD"}):
+        try:
+            client._write_usage([_event("BAD")], stats)
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError("single-row failure swallowed")
+    print("  _write_usage row-by-row fallback: OK")
+
+
+class _Capture(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def test_queue_full_drops():
+    started, release = threading.Event(), threading.Event()
+    flushed = []
+
+    def fake_flush(batch, stats=None):
+        started.set()
+        release.wait(5)
+        flushed.extend(ev["event_type"] for ev in batch)
+
+    saved = (client._flush, client.TRACKING_QUEUE_MAX, client.TRACKING_BATCH_SIZE,
+             client._PIPELINE, client.TRACKING_BATCHED)
+    cap = _Capture()
+    client.log.addHandler(cap)
+    try:
+        client._flush = fake_flush
+        client.TRACKING_QUEUE_MAX, client.TRACKING_BATCH_SIZE = 2, 1
+        client.TRACKING_BATCHED = True
+        client._PIPELINE = None
+        client.track("E0")
+        assert started.wait(5), "flusher never picked up the first event"
+        t0 = time.monotonic()
+        for i in range(1, 6):
+            client.track(f"E{i}")                 # E1, E2 fill the queue; E3..E5 dropped
+        assert time.monotonic() - t0 < 0.5, "track() blocked on a full queue"
+        st = client.stats()
+        assert (st["enqueued"], st["dropped"], st["queued"]) == (3, 3, 2), st
+        assert len([m for m in cap.messages if "queue full" in m]) == 1, cap.messages
+        release.set()
+        assert client.flush(5), "queue did not drain"
+        assert flushed == ["E0", "E1", "E2"], flushed
+    finally:
+        release.set()
+        client.log.removeHandler(cap)
+        p = client._PIPELINE
+        (client._flush, client.TRACKING_QUEUE_MAX, client.TRACKING_BATCH_SIZE,
+         client._PIPELINE, client.TRACKING_BATCHED) = saved
+        if p is not None and p is not saved[3]:
+            p.shutdown()
+    print("  full queue drops (and logs once) without blocking: OK")
+
+
+def main() -> int:
+    tests = [
+        test_resolve_ids_caches_hits_only,
+        test_resolve_ids_ttl,
+        test_write_usage_batch,
+        test_write_usage_row_fallback,
+        test_queue_full_drops,
+    ]
+    print(f"Running {len(tests)} tracking client tests:")
+    failures = 0
+    for t in tests:
+        try:
+            t()
+        except AssertionError as e:
+            print(f"  {t.__name__}: FAIL — {e}")
+            failures += 1
+    print()
+    if failures:
+        print(f"{failures} test(s) failed")
+        return 1
+    print("All tests passed.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -170,6 +170,9 @@ def _run_batch(job_id: str, s3_key: str, practice: bool = False):
     from ml_pipeline.db_schema import ml_analysis_init, _get_engine
     from ml_pipeline.db_writer import MLDBWriter
     from ml_pipeline.pipeline import TennisAnalysisPipeline
+    from ml_pipeline.telemetry_writer import TelemetryWriter
+    from ml_pipeline.court_calibration_cache import open_cache
+    from ml_pipeline.config import SWING_FLOW_FUSED
     from ml_pipeline.heatmaps import generate_all_heatmaps
     from ml_pipeline.bronze_export import export_bronze_to_s3
 
@@ -219,14 +222,20 @@ def _run_batch(job_id: str, s3_key: str, practice: bool = False):
             WHERE job_id = :job_id
         """), {"job_id": job_id, "batch_job_id": batch_job_id, "batch_job_arn": batch_job_arn})
 
-    # Progress callback writes to DB
+    # Progress callback -> coalescing telemetry writer: the latest stage/pct
+    # and stage timings go out in one transaction every TELEMETRY_FLUSH_SEC
+    # from a background thread; "complete" is written synchronously.
+    telemetry = TelemetryWriter(engine, job_id)
+
     def on_progress(stage: str, pct: int):
-        db.update_job_progress(job_id, stage, pct)
+        telemetry.progress(stage, pct)
 
     tmp_path = None
+    result = None
     try:
         # 1. Download from S3
         on_progress("downloading", 5)
+        t_phase = time.time()
         s3 = boto3.client("s3", region_name=s3_region)
         ext = os.path.splitext(s3_key)[1] or ".mp4"
         tmp_fd, tmp_path = tempfile.mkstemp(suffix=ext)
@@ -235,13 +244,21 @@ def _run_batch(job_id: str, s3_key: str, practice: bool = False):
         logger.info(f"Downloading s3://{s3_bucket}/{s3_key} → {tmp_path}")
         s3.download_file(s3_bucket, s3_key, tmp_path)
         logger.info(f"Download complete ({os.path.getsize(tmp_path)} bytes)")
+        telemetry.batch_stage("download", time.time() - t_phase)
 
         # 2. Run pipeline (with live debug frame S3 upload context)
-        pipeline = TennisAnalysisPipeline(progress_callback=on_progress, practice=practice)
+        t_phase = time.time()
+        pipeline = TennisAnalysisPipeline(
+            progress_callback=on_progress, practice=practice,
+            telemetry_callback=telemetry.timings,
+            calibration_cache=open_cache(engine, job_id),
+            defer_stroke_classification=SWING_FLOW_FUSED and not practice,
+        )
         # Enable LIVE debug frame upload — user can inspect frames mid-run
         # and cancel bad runs without waiting for full ML processing
         pipeline.player_tracker.set_debug_upload_context(s3, s3_bucket, job_id)
         result = pipeline.process(tmp_path)
+        telemetry.batch_stage("pipeline", time.time() - t_phase)
 
         # D1 (GPU memory audit) — phase boundary cleanup. The main loop's detection
         # data is already copied into `result` (player_detections / ball_detections),
@@ -276,6 +293,9 @@ def _run_batch(job_id: str, s3_key: str, practice: bool = False):
         # folded into the main loop (pose's rally gate + the bounce windows are
         # only known after _postprocess). Failure of either pass is non-fatal
         # and isolated — additive coverage must not block downstream.
+        # ROI_FRAME_SPILL=1 (C3) goes one further: the main loop spilled the
+        # ROI region of every frame, so the sweep replays that instead of
+        # decoding — one decode per job (see ml_pipeline/frame_spill.py).
         #
         # Pose: ViTPose-Base on YOLOv8m-det crops of the 30-50 px far player
         #   → ml_analysis.player_detections_roi (source='far_vitpose'),
@@ -304,12 +324,11 @@ def _run_batch(job_id: str, s3_key: str, practice: bool = False):
         # Shared by the bounce stage AND the serve-model stage below — built
         # outside the bounce try block so a bounce-stage failure can't
         # NameError the serve stage.
-        _balls = [
-            {"frame_idx": int(d.frame_idx), "x": d.x, "y": d.y,
-             "court_x": d.court_x, "court_y": d.court_y,
-             "is_bounce": d.is_bounce, "speed_kmh": d.speed_kmh}
-            for d in (result.ball_detections or [])
-        ] if not practice else []
+        # Rows come straight off the columnar result.ball_table (one column
+        # pass, no per-object attribute walk).
+        _balls = result.ball_table.to_dicts(
+            ("frame_idx", "x", "y", "court_x", "court_y", "is_bounce", "speed_kmh"),
+        ) if not practice else []
         if not practice:
             try:
                 import os as _os
@@ -323,10 +342,12 @@ def _run_batch(job_id: str, s3_key: str, practice: bool = False):
                 _bw = _os.path.join(_os.path.dirname(__file__), "models",
                                     "bounce_detector_v2_7match.pt")
                 _wrists: dict = {}
-                for _pd in (result.player_detections or []):
-                    if _pd.court_x is not None and _pd.court_y is not None:
-                        _wrists.setdefault(int(_pd.frame_idx), []).append(
-                            (float(_pd.court_x), float(_pd.court_y)))
+                _ptab = result.player_table
+                _pcx, _pcy = _ptab["court_x"], _ptab["court_y"]
+                _pok = (_pcx == _pcx) & (_pcy == _pcy)          # not NaN
+                for _fi, _x, _y in zip(_ptab["frame_idx"][_pok].tolist(),
+                                       _pcx[_pok].tolist(), _pcy[_pok].tolist()):
+                    _wrists.setdefault(_fi, []).append((_x, _y))
                 _last = max((b["frame_idx"] for b in _balls), default=0)
                 _rally = {fi: "in_rally" for fi in range(_last + 1)}
                 # Bounce CNN cutoff. Tuned 2026-06-14 via the offline corpus
@@ -364,21 +385,24 @@ def _run_batch(job_id: str, s3_key: str, practice: bool = False):
                                 for b in _balls
                                 if b.get("x") is not None and b.get("y") is not None}
                     _filled = 0
-                    for _e in _bev:
-                        if _e.court_x is not None and _e.court_y is not None:
-                            continue
-                        _xy = _ball_xy.get(int(_e.frame_idx))
-                        if not _xy:
-                            continue
+                    _todo = [(_e, _ball_xy[int(_e.frame_idx)]) for _e in _bev
+                             if (_e.court_x is None or _e.court_y is None)
+                             and _ball_xy.get(int(_e.frame_idx))]
+                    if _todo:
+                        # One vectorised projection for all NULL-coord events.
                         try:
-                            _coords = _court_det_b.to_court_coords(_xy[0], _xy[1])
+                            _mx, _my = _court_det_b.to_court_coords_batch(
+                                [_xy[0] for _, _xy in _todo],
+                                [_xy[1] for _, _xy in _todo],
+                            )
                         except Exception:
-                            _coords = None
-                        if _coords is not None:
-                            _e.court_x = float(_coords[0])
-                            _e.court_y = float(_coords[1])
-                            _e.player_side = _b_side(_e.court_y)
-                            _filled += 1
+                            _mx = _my = [float("nan")] * len(_todo)
+                        for (_e, _xy), _cx, _cy in zip(_todo, _mx, _my):
+                            if _cx == _cx and _cy == _cy:      # not NaN
+                                _e.court_x = float(_cx)
+                                _e.court_y = float(_cy)
+                                _e.player_side = _b_side(_e.court_y)
+                                _filled += 1
                     logger.info(
                         "Bounce CNN D2: projected court coords for %d "
                         "NULL-coord events (of %d total)", _filled, len(_bev))
@@ -403,6 +427,12 @@ def _run_batch(job_id: str, s3_key: str, practice: bool = False):
                 logger.warning(f"Bounce CNN stage failed (non-fatal): {e}")
 
         far_ball_export_rows: list = []
+        # Swing-type flow windows ride the ROI sweep's decode (SWING_FLOW_FUSED);
+        # finish_stroke_classification below falls back to the seek path when
+        # the sweep didn't feed them.
+        swing_proc = None
+        if not practice and SWING_FLOW_FUSED:
+            swing_proc = pipeline.make_swing_processor(result)
         if not practice:
             try:
                 # 81: must sit between the main pipeline's final stage
@@ -424,7 +454,7 @@ def _run_batch(job_id: str, s3_key: str, practice: bool = False):
                     engine=engine,
                     fps=float(FRAME_SAMPLE_FPS),
                     court_detector=court_det,
-                    bounces=getattr(result, "ball_detections", None),
+                    bounces=result.ball_table,
                     pose_sample_every=2,
                     bounce_window_s=2.5,
                     bounce_cluster_gap_s=0.5,
@@ -432,6 +462,8 @@ def _run_batch(job_id: str, s3_key: str, practice: bool = False):
                     bounce_anchor_bounce_only=True,
                     cnn_bounce_ts=_cnn_bounce_ts,
                     cnn_bounce_events=_cnn_bounce_events,
+                    spill=getattr(result, "frame_spill", None),
+                    swing=swing_proc,
                 )
                 logger.info(f"ROI unified: pose wrote {n_pose} rows, "
                             f"bounces wrote {n_bounces} rows, "
@@ -450,6 +482,19 @@ def _run_batch(job_id: str, s3_key: str, practice: bool = False):
             except Exception as e:
                 logger.warning(f"ROI extraction failed (non-fatal): {e}")
 
+        if not practice and SWING_FLOW_FUSED:
+            try:
+                pipeline.finish_stroke_classification(result, swing_proc)
+            except Exception as e:
+                logger.warning(f"Swing classification failed (non-fatal): {e}")
+
+        # C3: the ROI sweep was the spill's only reader — free the disk before
+        # bronze export + transcode need it.
+        _spill = getattr(result, "frame_spill", None)
+        if _spill is not None:
+            _spill.cleanup()
+            result.frame_spill = None
+
         # 2e. SERVE MODEL stage (match only) — score far-serve candidate
         # anchors with the trained MLP → ml_analysis.serve_candidates (the
         # MODEL-layer serve fact, same pattern as the bounce stage above).
@@ -470,20 +515,20 @@ def _run_batch(job_id: str, s3_key: str, practice: bool = False):
                         delete_candidates_for_task, persist_candidates,
                     )
                     from ml_pipeline.config import FRAME_SAMPLE_FPS as _SFPS
+                    from ml_pipeline.keypoint_codec import kp_sql
                     _smw = _os.path.join(_os.path.dirname(__file__), "models",
                                          "serve_model_v1.pt")
                     # ROI rows were just written by the sweep — read back in
                     # the exact shape dataset.load_task_arrays trained on.
                     with engine.connect() as _sc:
                         _roi_raw = _sc.execute(_sqltext(
-                            "SELECT frame_idx, keypoints, bbox_y1, bbox_y2 "
+                            f"SELECT frame_idx, {kp_sql()} AS keypoints, bbox_y1, bbox_y2 "
                             "FROM ml_analysis.player_detections_roi "
                             "WHERE job_id::text = :t ORDER BY frame_idx"
                         ), {"t": job_id}).fetchall()
-                    _far_f = [int(p.frame_idx) for p in (result.player_detections or [])
-                              if p.player_id == 1]
-                    _near_f = [int(p.frame_idx) for p in (result.player_detections or [])
-                               if p.player_id == 0]
+                    _ptab = result.player_table
+                    _far_f = _ptab["frame_idx"][_ptab["player_id"] == 1].tolist()
+                    _near_f = _ptab["frame_idx"][_ptab["player_id"] == 0].tolist()
                     _cands = detect_serve_candidates_offline(
                         task_id=job_id, fps=float(_SFPS),
                         ball_rows=_balls,
@@ -622,14 +667,22 @@ def _run_batch(job_id: str, s3_key: str, practice: bool = False):
             job_id, batch_job_id, batch_duration, estimated_cost,
             batch_job_arn=batch_job_arn,
         )
+        telemetry.batch_stage("total", batch_duration)
         on_progress("complete", 100)
         logger.info(f"Job {job_id} complete in {batch_duration:.0f}s (est. ${estimated_cost:.4f})")
 
     except Exception as e:
         logger.exception(f"Job {job_id} failed")
+        # Drain queued telemetry first so no 'processing' write lands after
+        # the failed status.
+        telemetry.close()
         db.mark_failed(job_id, str(e))
         sys.exit(1)
     finally:
+        telemetry.close()
+        _spill = getattr(result, "frame_spill", None)
+        if _spill is not None:
+            _spill.cleanup()
         if tmp_path and os.path.exists(tmp_path):
             os.unlink(tmp_path)
             logger.info(f"Cleaned up temp file: {tmp_path}")
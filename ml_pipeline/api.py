@@ -16,6 +16,8 @@ import boto3
 from flask import Blueprint, request, jsonify
 from sqlalchemy import text as sql_text
 
+from ml_pipeline.detection_partitions import DETECTION_TABLES, clear_job
+
 logger = logging.getLogger(__name__)
 
 ml_analysis_bp = Blueprint("ml_analysis", __name__)
@@ -194,13 +196,9 @@ def retry_job(job_id):
             WHERE job_id = :jid
         """), {"jid": job_id})
 
-        # Clear old detection data
-        conn.execute(sql_text(
-            "DELETE FROM ml_analysis.ball_detections WHERE job_id = :jid"
-        ), {"jid": job_id})
-        conn.execute(sql_text(
-            "DELETE FROM ml_analysis.player_detections WHERE job_id = :jid"
-        ), {"jid": job_id})
+        # Clear old detection data (TRUNCATE of the job's partitions when partitioned)
+        for table in DETECTION_TABLES:
+            clear_job(conn, table, job_id)
 
     # Submit new Batch job
     batch_job_queue = os.getenv("BATCH_JOB_QUEUE", "ten-fifty5-ml-queue")
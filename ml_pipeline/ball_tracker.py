@@ -28,7 +28,7 @@ import cv2
 import torch
 import torch.nn as nn
 from dataclasses import dataclass, field
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -48,6 +48,7 @@ from ml_pipeline.config import (
     TRACKNET_HOUGH_PARAM2,
     TRACKNET_HOUGH_MIN_RADIUS,
     TRACKNET_HOUGH_MAX_RADIUS,
+    TRACKNET_BATCH_POSTPROCESS,
     BALL_MAX_INTERPOLATION_GAP,
     BALL_MAX_DIST_BETWEEN_FRAMES,
     BALL_MAX_DIST_GAP,
@@ -59,6 +60,7 @@ from ml_pipeline.config import (
     COURT_WIDTH_DOUBLES_M,
     FRAME_SAMPLE_FPS,
 )
+from ml_pipeline.detection_table import DetectionTable
 # ── TrackNet V2 Architecture (from yastrebksv/TrackNet) ────────────────────
 
 class _ConvBlock(nn.Module):
@@ -138,6 +140,10 @@ class BallDetection:
 # ── BallTracker ─────────────────────────────────────────────────────────────
 
 class BallTracker:
+    # (width, height) detect_frame resizes every frame to — the decode
+    # prefetcher reads this to precompute the resize off the critical path.
+    INPUT_SIZE = (TRACKNET_INPUT_WIDTH, TRACKNET_INPUT_HEIGHT)
+
     def __init__(self, weights_path: str = None, device: str = None, model=None):
         """`model`: an already-loaded TrackNet model to reuse instead of
         loading weights from disk. Lets a caller that runs many short windows
@@ -169,7 +175,7 @@ class BallTracker:
         self._frame_buffer: list = []  # last N BGR frames (resized to model input dims)
         self._prev_gray: Optional[np.ndarray] = None  # for frame-delta ball fallback
 
-        self.detections: List[BallDetection] = []
+        self.detections = DetectionTable("ball")
         # Diagnostics — counters only, no behavior change. Used to diagnose
         # the 7% detection rate on T5 runs. Reported via log_diagnostics().
         self._diag = {
@@ -203,17 +209,30 @@ class BallTracker:
         )
         return model
 
-    def detect_frame(self, frame: np.ndarray, frame_idx: int) -> Optional[BallDetection]:
+    def detect_frame(self, frame: np.ndarray, frame_idx: int,
+                     resized: Optional[np.ndarray] = None,
+                     heatmap_xy: Optional[Tuple] = None) -> Optional[BallDetection]:
         """Feed one BGR frame. Returns a BallDetection once the sliding window is full.
 
         3-frame window → 9 channels → softmax argmax heatmap (TrackNet V2).
+
+        `resized`: the frame already resized to INPUT_SIZE (BGR) — the decode
+        prefetcher precomputes it off the critical path. Ignored unless it has
+        the model input shape; identical to the inline resize.
+
+        `heatmap_xy`: the (x, y) _postprocess_heatmaps already produced for
+        this frame's window (batched callers — roi_extractors/bounces.py).
+        Skips the forward + postprocess; the buffer, frame-delta fallback and
+        scaling run as usual.
         """
         h, w = frame.shape[:2]
         self.scale_x = w / TRACKNET_INPUT_WIDTH
         self.scale_y = h / TRACKNET_INPUT_HEIGHT
 
         # ── Resize + colour conversion ───────────────────────────────────────
-        resized = cv2.resize(frame, (TRACKNET_INPUT_WIDTH, TRACKNET_INPUT_HEIGHT))
+        if resized is None or resized.shape[:2] != (TRACKNET_INPUT_HEIGHT, TRACKNET_INPUT_WIDTH):
+            resized = cv2.resize(frame, (TRACKNET_INPUT_WIDTH, TRACKNET_INPUT_HEIGHT))
+        bgr_small = resized
         if TRACKNET_BGR2RGB:
             resized = cv2.cvtColor(resized, cv2.COLOR_BGR2RGB)
 
@@ -224,13 +243,13 @@ class BallTracker:
             return None
 
         # ── Build model input tensor ─────────────────────────────────────────
-        x, y = self._detect_frame_v2()
+        x, y = self._detect_frame_v2() if heatmap_xy is None else heatmap_xy
 
         if x is None:
             # Model produced no output — try frame-delta Hough fallback.
             # On 63.5% of V2 frames TrackNet produces nothing. Frame differencing
             # detects ANY moving circular object (the ball) regardless of size.
-            x, y = self._detect_ball_frame_delta(frame)
+            x, y = self._detect_ball_frame_delta(frame, resized=bgr_small)
             if x is not None:
                 self._diag["delta_fallback_hits"] = self._diag.get("delta_fallback_hits", 0) + 1
             else:
@@ -241,7 +260,7 @@ class BallTracker:
             x=x * self.scale_x,
             y=y * self.scale_y,
         )
-        self.detections.append(det)
+        self.detections.append_chunk(frame_idx=[det.frame_idx], x=[det.x], y=[det.y])
         return det
 
     def _detect_frame_v2(self):
@@ -256,9 +275,106 @@ class BallTracker:
 
         with torch.no_grad():
             output = self.model(tensor, testing=True)
+        if TRACKNET_BATCH_POSTPROCESS:
+            # Class indices are 0-255: narrow on-device so the host copy is
+            # 1 byte/pixel instead of int64.
+            heatmap = output.argmax(dim=1).to(torch.uint8).cpu().numpy()
+            return self._postprocess_heatmaps(heatmap)[0]
         heatmap = output.argmax(dim=1).squeeze().cpu().numpy()
         return self._postprocess_heatmap(heatmap)
 
+    def _postprocess_heatmaps(self, feature_maps: np.ndarray) -> List[Tuple]:
+        """Batched _postprocess_heatmap over a (B, H*W) or (B, H, W) stack of
+        argmax class maps. Returns B (x, y) pairs ((None, None) = no ball).
+
+        Same three tiers, same results and the same _diag counters as B
+        single-frame calls, but:
+          - max / histograms / threshold / mask counts are one NumPy pass;
+          - frames whose binary mask is empty skip cv2 entirely: Hough and CC
+            find nothing on an all-zero mask and tier 3 needs a pixel above
+            the threshold, so every tier would fall through to None;
+          - Hough + CC run on the mask's bounding box padded by more than the
+            Hough max radius, not the full map. The origin is even-aligned —
+            CC labels are assigned in 2x2 blocks, so an odd shift can reorder
+            equal-area components — and coordinates are shifted back exactly.
+        TRACKNET_BATCH_POSTPROCESS=0 runs the per-frame path instead.
+        """
+        if not TRACKNET_BATCH_POSTPROCESS:
+            return [self._postprocess_heatmap(fm) for fm in feature_maps]
+        H, W = TRACKNET_INPUT_HEIGHT, TRACKNET_INPUT_WIDTH
+        fms = np.asarray(feature_maps).reshape(-1, H, W)
+        n = len(fms)
+        d = self._diag
+        d["frames_inferred"] += n
+
+        raw_max = fms.reshape(n, -1).max(axis=1)
+        for b, c in enumerate(np.bincount(np.minimum(raw_max // 32, 7), minlength=8)):
+            d["fm_raw_max_hist"][b] += int(c)
+        # Class index in [0, 255] — see _postprocess_heatmap for why this is
+        # a plain cast and not *255.
+        fm = fms.astype(np.uint8, copy=False)
+        fm_max = raw_max.astype(np.uint8)
+        for b, c in enumerate(np.bincount(fm_max // 32, minlength=8)):
+            d["fm_max_hist"][b] += int(c)
+        d["heatmap_empty"] += int((fm_max < TRACKNET_HEATMAP_THRESHOLD).sum())
+
+        binary = fm > TRACKNET_HEATMAP_THRESHOLD          # cv2.THRESH_BINARY
+        nonzero = binary.reshape(n, -1).sum(axis=1)
+        d["mask_nonzero_sum"] += int(nonzero.sum())
+
+        pad = TRACKNET_HOUGH_MAX_RADIUS + 8
+        out: List[Tuple] = [(None, None)] * n
+        d["none_returned"] += int((nonzero == 0).sum())
+        for i in np.flatnonzero(nonzero):
+            rows = np.flatnonzero(binary[i].any(axis=1))
+            cols = np.flatnonzero(binary[i].any(axis=0))
+            y0 = max(0, int(rows[0]) - pad) & ~1
+            x0 = max(0, int(cols[0]) - pad) & ~1
+            y1 = min(H, int(rows[-1]) + 1 + pad)
+            x1 = min(W, int(cols[-1]) + 1 + pad)
+            crop = binary[i, y0:y1, x0:x1].astype(np.uint8) * 255
+
+            # Tier 1: Hough circles (strongest first)
+            circles = cv2.HoughCircles(
+                crop, cv2.HOUGH_GRADIENT,
+                dp=TRACKNET_HOUGH_DP,
+                minDist=TRACKNET_HOUGH_MIN_DIST,
+                param1=TRACKNET_HOUGH_PARAM1,
+                param2=TRACKNET_HOUGH_PARAM2,
+                minRadius=TRACKNET_HOUGH_MIN_RADIUS,
+                maxRadius=TRACKNET_HOUGH_MAX_RADIUS,
+            )
+            if circles is not None and len(circles) > 0 and len(circles[0]) > 0:
+                d["tier1_hough"] += 1
+                out[i] = (float(circles[0][0][0]) + x0, float(circles[0][0][1]) + y0)
+                continue
+
+            # Tier 2: largest connected component. The centroid is recomputed
+            # from full-map pixel sums so it is the same double cv2 returns.
+            try:
+                n_labels, labels, stats, _ = cv2.connectedComponentsWithStats(
+                    crop, connectivity=8,
+                )
+                if n_labels > 1:
+                    largest_idx = 1 + int(np.argmax(stats[1:, cv2.CC_STAT_AREA]))
+                    area = int(stats[largest_idx, cv2.CC_STAT_AREA])
+                    if 2 <= area <= 200:
+                        ys, xs = np.nonzero(labels == largest_idx)
+                        d["tier2_cc"] += 1
+                        out[i] = (float((int(xs.sum()) + x0 * area) / area),
+                                  float((int(ys.sum()) + y0 * area) / area))
+                        continue
+                    d["tier2_cc_rejected_size"] += 1
+            except Exception:
+                pass
+
+            # Tier 3: heatmap argmax — always fires here (mask non-empty means
+            # some pixel is above the threshold).
+            cy, cx = divmod(int(fm[i].argmax()), W)
+            d["tier3_argmax"] += 1
+            out[i] = (float(cx), float(cy))
+        return out
+
     def _postprocess_heatmap(self, feature_map: np.ndarray):
         """Convert heatmap to (x, y) via Hough circle detection.
 
@@ -388,7 +504,8 @@ class BallTracker:
             lo, hi = i * 32, (i + 1) * 32 - 1
             logger.info("  [%3d-%3d]: %6d (%5.1f%%)", lo, hi, c, pct(c))
 
-    def _detect_ball_frame_delta(self, frame: np.ndarray):
+    def _detect_ball_frame_delta(self, frame: np.ndarray,
+                                 resized: Optional[np.ndarray] = None):
         """Fallback ball detection via frame differencing + Hough circles.
 
         When TrackNet produces no output (63.5% of frames), this method
@@ -401,7 +518,8 @@ class BallTracker:
 
         Returns (x, y) in TrackNet input coordinates (640×360), or (None, None).
         """
-        resized = cv2.resize(frame, (TRACKNET_INPUT_WIDTH, TRACKNET_INPUT_HEIGHT))
+        if resized is None:
+            resized = cv2.resize(frame, (TRACKNET_INPUT_WIDTH, TRACKNET_INPUT_HEIGHT))
         gray = cv2.cvtColor(resized, cv2.COLOR_BGR2GRAY)
 
         if self._prev_gray is None:
@@ -436,66 +554,11 @@ class BallTracker:
 
     def interpolate_gaps(self):
         """Fill missing detections with linear interpolation for gaps <= BALL_MAX_INTERPOLATION_GAP."""
-        if len(self.detections) < 2:
-            return
-        # Build frame→detection map
-        by_frame = {d.frame_idx: d for d in self.detections}
-        frames = sorted(by_frame.keys())
-
-        interpolated = []
-        for i in range(len(frames) - 1):
-            f_start = frames[i]
-            f_end = frames[i + 1]
-            gap = f_end - f_start - 1
-            if 0 < gap <= BALL_MAX_INTERPOLATION_GAP:
-                d1 = by_frame[f_start]
-                d2 = by_frame[f_end]
-                dist = np.hypot(d2.x - d1.x, d2.y - d1.y)
-                if dist > BALL_MAX_DIST_GAP:
-                    continue
-                for g in range(1, gap + 1):
-                    t = g / (gap + 1)
-                    interpolated.append(BallDetection(
-                        frame_idx=f_start + g,
-                        x=d1.x + t * (d2.x - d1.x),
-                        y=d1.y + t * (d2.y - d1.y),
-                    ))
-
-        self.detections.extend(interpolated)
-        self.detections.sort(key=lambda d: d.frame_idx)
-        # Remove outlier jumps
-        self._filter_outliers()
+        self.detections = interpolate_ball_gaps(self.detections)
 
     def _filter_outliers(self):
-        """Remove pixel-jump outliers but re-anchor on a coherent post-gap cluster.
-
-        Greedy chain-rejection with a `pending` cluster: detections more than
-        BALL_MAX_DIST_BETWEEN_FRAMES from the current anchor are held aside.
-        If BALL_FILTER_REANCHOR_RUN of them in a row cohere with each other
-        (each within the same threshold of the previous pending entry), the
-        cluster is accepted and becomes the new anchor — a real new trajectory
-        after a gap, not a chain of noise. Pre-fix, a single bad early anchor
-        could freeze the filter and drop tens of thousands of valid downstream
-        detections (1d6feb3a: kept frames 2-3329 of 15,298).
-        """
-        if len(self.detections) < 2:
-            return
-        filtered = [self.detections[0]]
-        pending: list[BallDetection] = []
-        for d in self.detections[1:]:
-            anchor = filtered[-1]
-            if np.hypot(d.x - anchor.x, d.y - anchor.y) <= BALL_MAX_DIST_BETWEEN_FRAMES:
-                pending = []
-                filtered.append(d)
-                continue
-            if pending and np.hypot(d.x - pending[-1].x, d.y - pending[-1].y) <= BALL_MAX_DIST_BETWEEN_FRAMES:
-                pending.append(d)
-            else:
-                pending = [d]
-            if len(pending) >= BALL_FILTER_REANCHOR_RUN:
-                filtered.extend(pending)
-                pending = []
-        self.detections = filtered
+        """Remove pixel-jump outliers (see filter_ball_outliers)."""
+        self.detections = filter_ball_outliers(self.detections)
 
     def detect_bounces(self, court_detector=None):
         """Detect bounces via velocity reversal in y-coordinate. Optionally map to court coords.
@@ -505,94 +568,11 @@ class BallTracker:
           2. Minimum velocity magnitude on both sides (reject gentle rolls/noise)
           3. Minimum spacing from the previous bounce (reject double-counting)
         """
-        if len(self.detections) < BOUNCE_VELOCITY_WINDOW * 2:
-            return
-
-        # Compute rolling y-velocity
-        ys = np.array([d.y for d in self.detections])
-        vel = np.convolve(np.diff(ys), np.ones(BOUNCE_VELOCITY_WINDOW) / BOUNCE_VELOCITY_WINDOW, mode="valid")
-
-        # Minimum magnitude for a real bounce (px/frame). 2.0 = ignore slow
-        # rolls/noise. Lowered to 1.0 broke detection (more false positives
-        # disrupted velocity smoothing).
-        MIN_VEL_MAG = 2.0
-        # Minimum frame spacing between bounces — rejects double-counting on
-        # the same impact event.
-        MIN_BOUNCE_SPACING = 8
-
-        last_bounce_idx = -MIN_BOUNCE_SPACING  # allow first bounce
-        bounce_count = 0
-
-        for i in range(len(vel) - 1):
-            sign_flip = (vel[i] > 0 and vel[i + 1] < 0) or (vel[i] < 0 and vel[i + 1] > 0)
-            if not sign_flip:
-                continue
-            # Require minimum magnitude on both sides — rejects slow rolls
-            if abs(vel[i]) < MIN_VEL_MAG or abs(vel[i + 1]) < MIN_VEL_MAG:
-                continue
-
-            det_idx = i + BOUNCE_VELOCITY_WINDOW
-            if det_idx >= len(self.detections):
-                continue
-
-            # Minimum spacing — rejects double-counting on the same bounce
-            if det_idx - last_bounce_idx < MIN_BOUNCE_SPACING:
-                continue
-            last_bounce_idx = det_idx
-
-            self.detections[det_idx].is_bounce = True
-            bounce_count += 1
-
-            # In/out detection via court boundary (doubles court, matches homography)
-            if court_detector is not None:
-                coords = court_detector.to_court_coords(
-                    self.detections[det_idx].x, self.detections[det_idx].y
-                )
-                if coords is not None:
-                    cx, cy = coords
-                    self.detections[det_idx].court_x = cx
-                    self.detections[det_idx].court_y = cy
-                    self.detections[det_idx].is_in = (
-                        0 <= cx <= COURT_WIDTH_DOUBLES_M and
-                        0 <= cy <= COURT_LENGTH_M
-                    )
-        logger.info("detect_bounces: found %d bounces (after validation)", bounce_count)
+        detect_ball_bounces(self.detections, court_detector)
 
     def compute_speeds(self, court_detector=None, fps: float = None):
         """Compute ball speed in km/h using court-coordinate distances between frames."""
-        if court_detector is None or len(self.detections) < 2:
-            return
-        sample_fps = fps or FRAME_SAMPLE_FPS
-        none_count = 0
-        ok_count = 0
-        for i in range(1, len(self.detections)):
-            d_prev = self.detections[i - 1]
-            d_curr = self.detections[i]
-            c_prev = court_detector.to_court_coords(d_prev.x, d_prev.y)
-            c_curr = court_detector.to_court_coords(d_curr.x, d_curr.y)
-            if c_prev is None or c_curr is None:
-                none_count += 1
-                continue
-            ok_count += 1
-            dist_m = np.hypot(c_curr[0] - c_prev[0], c_curr[1] - c_prev[1])
-            dt_sec = (d_curr.frame_idx - d_prev.frame_idx) / sample_fps
-            if dt_sec > 0:
-                speed_ms = dist_m / dt_sec
-                speed_kmh = speed_ms * 3.6
-                # Clamp impossible speeds — TrackNet position glitches can
-                # produce 800+ km/h. Fastest recorded serve is ~263 km/h;
-                # 250 km/h is a generous ceiling for any ball movement.
-                if speed_kmh <= 250:
-                    d_curr.speed_kmh = speed_kmh
-                d_curr.court_x = c_curr[0]
-                d_curr.court_y = c_curr[1]
-        if none_count > 0:
-            logger.warning(
-                "compute_speeds: %d/%d pairs had None court coords (homography=%s)",
-                none_count, none_count + ok_count,
-                court_detector._last_detection.homography is not None
-                if court_detector._last_detection else "no_detection",
-            )
+        compute_ball_speeds(self.detections, court_detector, fps)
 
     def assign_peak_flight_speeds(self, window_frames: int = 15):
         """Overwrite each bounce's ``speed_kmh`` with a robust high-
@@ -617,33 +597,7 @@ class BallTracker:
         Call after ``compute_speeds`` has populated pairwise speeds on all
         detections. Non-bounce detections are left unchanged.
         """
-        n_updated = 0
-        for bi, det in enumerate(self.detections):
-            if not det.is_bounce:
-                continue
-            low_frame = det.frame_idx - window_frames
-            speeds = []
-            for j in range(bi - 1, -1, -1):
-                d = self.detections[j]
-                if d.frame_idx < low_frame:
-                    break
-                if d.speed_kmh is not None and d.speed_kmh > 0:
-                    speeds.append(d.speed_kmh)
-            if speeds:
-                speeds.sort()
-                # p75 = 75th percentile. For a 4-sample window this is the
-                # 3rd-highest; for a 3-sample window it's the 2nd-highest;
-                # for a single sample it falls back to that sample. Robust
-                # to one jitter outlier per window.
-                k = max(0, min(len(speeds) - 1, int(len(speeds) * 0.75)))
-                det.speed_kmh = speeds[k]
-                n_updated += 1
-        logger.info(
-            "assign_peak_flight_speeds: set peak-flight speed (p75) on %d/%d bounces (window=%d frames)",
-            n_updated,
-            sum(1 for d in self.detections if d.is_bounce),
-            window_frames,
-        )
+        assign_ball_peak_speeds(self.detections, window_frames)
 
     def flush(self) -> None:
         """No-op — TrackNet detects per-frame (no batched-inference backlog).
@@ -653,10 +607,214 @@ class BallTracker:
 
     def reset(self):
         self._frame_buffer.clear()
-        self.detections.clear()
+        # Fresh table, not an in-place clear: the previous run's
+        # AnalysisResult.ball_table is this same object.
+        self.detections = DetectionTable("ball")
         self._prev_gray = None
         for k in self._diag:
             if isinstance(self._diag[k], list):
                 self._diag[k] = [0] * len(self._diag[k])
             else:
                 self._diag[k] = 0
+
+
+# ── Column post-processing (shared with WASBBallTracker) ───────────────────
+# Tracker-agnostic: they operate on a ball DetectionTable and config constants,
+# so both trackers emit the same shape into ml_analysis.ball_detections.
+
+def interpolate_ball_gaps(table: DetectionTable) -> DetectionTable:
+    """Linearly interpolate gaps <= BALL_MAX_INTERPOLATION_GAP, sort by frame,
+    then drop outlier jumps. Returns the new table."""
+    if len(table) < 2:
+        return table
+    frames = table["frame_idx"]
+    # frame -> detection map (last detection wins on a duplicate frame)
+    order = np.argsort(frames, kind="stable")
+    sorted_frames = frames[order]
+    last = np.ones(len(order), dtype=bool)
+    last[:-1] = sorted_frames[1:] != sorted_frames[:-1]
+    rows = order[last]
+    uf, ux, uy = frames[rows], table["x"][rows], table["y"][rows]
+
+    gap = np.diff(uf) - 1
+    dist = np.hypot(ux[1:] - ux[:-1], uy[1:] - uy[:-1])
+    seg = np.flatnonzero((gap > 0) & (gap <= BALL_MAX_INTERPOLATION_GAP)
+                         & ~(dist > BALL_MAX_DIST_GAP))
+    if seg.size:
+        reps = gap[seg]
+        start = np.repeat(seg, reps)
+        g = np.arange(int(reps.sum())) - np.repeat(np.cumsum(reps) - reps, reps) + 1
+        t = g / (gap[start] + 1)
+        table.append_chunk(
+            frame_idx=uf[start] + g,
+            x=ux[start] + t * (ux[start + 1] - ux[start]),
+            y=uy[start] + t * (uy[start + 1] - uy[start]),
+        )
+
+    table = table.take(np.argsort(table["frame_idx"], kind="stable"))
+    # Remove outlier jumps
+    return filter_ball_outliers(table)
+
+
+def filter_ball_outliers(table: DetectionTable) -> DetectionTable:
+    """Remove pixel-jump outliers but re-anchor on a coherent post-gap cluster.
+
+    Greedy chain-rejection with a `pending` cluster: detections more than
+    BALL_MAX_DIST_BETWEEN_FRAMES from the current anchor are held aside.
+    If BALL_FILTER_REANCHOR_RUN of them in a row cohere with each other
+    (each within the same threshold of the previous pending entry), the
+    cluster is accepted and becomes the new anchor — a real new trajectory
+    after a gap, not a chain of noise. Pre-fix, a single bad early anchor
+    could freeze the filter and drop tens of thousands of valid downstream
+    detections (1d6feb3a: kept frames 2-3329 of 15,298).
+    """
+    n = len(table)
+    if n < 2:
+        return table
+    xs = table["x"].tolist()
+    ys = table["y"].tolist()
+    kept = [0]
+    pending: List[int] = []
+    for i in range(1, n):
+        a = kept[-1]
+        if np.hypot(xs[i] - xs[a], ys[i] - ys[a]) <= BALL_MAX_DIST_BETWEEN_FRAMES:
+            pending = []
+            kept.append(i)
+            continue
+        p = pending[-1] if pending else None
+        if p is not None and np.hypot(xs[i] - xs[p], ys[i] - ys[p]) <= BALL_MAX_DIST_BETWEEN_FRAMES:
+            pending.append(i)
+        else:
+            pending = [i]
+        if len(pending) >= BALL_FILTER_REANCHOR_RUN:
+            kept.extend(pending)
+            pending = []
+    if len(kept) == n:
+        return table
+    return table.take(np.asarray(kept, dtype=np.int64))
+
+
+def detect_ball_bounces(table: DetectionTable, court_detector=None, tag: str = "") -> None:
+    """Velocity-reversal bounce rule over the y column (see
+    BallTracker.detect_bounces). Sets is_bounce, and court_x/court_y/is_in
+    on each bounce when a court_detector is given."""
+    n = len(table)
+    if n < BOUNCE_VELOCITY_WINDOW * 2:
+        return
+
+    # Compute rolling y-velocity
+    vel = np.convolve(
+        np.diff(table["y"]), np.ones(BOUNCE_VELOCITY_WINDOW) / BOUNCE_VELOCITY_WINDOW,
+        mode="valid",
+    )
+
+    # Minimum magnitude for a real bounce (px/frame). 2.0 = ignore slow
+    # rolls/noise. Lowered to 1.0 broke detection (more false positives
+    # disrupted velocity smoothing).
+    MIN_VEL_MAG = 2.0
+    # Minimum frame spacing between bounces — rejects double-counting on
+    # the same impact event.
+    MIN_BOUNCE_SPACING = 8
+
+    v0, v1 = vel[:-1], vel[1:]
+    sign_flip = ((v0 > 0) & (v1 < 0)) | ((v0 < 0) & (v1 > 0))
+    # Require minimum magnitude on both sides — rejects slow rolls
+    strong = (np.abs(v0) >= MIN_VEL_MAG) & (np.abs(v1) >= MIN_VEL_MAG)
+    candidates = np.flatnonzero(sign_flip & strong) + BOUNCE_VELOCITY_WINDOW
+
+    bounce_rows = []
+    last_bounce_idx = -MIN_BOUNCE_SPACING  # allow first bounce
+    for det_idx in candidates[candidates < n].tolist():
+        # Minimum spacing — rejects double-counting on the same bounce
+        if det_idx - last_bounce_idx < MIN_BOUNCE_SPACING:
+            continue
+        last_bounce_idx = det_idx
+        bounce_rows.append(det_idx)
+
+    table["is_bounce"][bounce_rows] = True
+
+    # In/out detection via court boundary (doubles court, matches homography)
+    if court_detector is not None:
+        xs, ys = table["x"], table["y"]
+        court_x, court_y, is_in = table["court_x"], table["court_y"], table["is_in"]
+        for r in bounce_rows:
+            coords = court_detector.to_court_coords(float(xs[r]), float(ys[r]))
+            if coords is not None:
+                cx, cy = coords
+                court_x[r] = cx
+                court_y[r] = cy
+                is_in[r] = (0 <= cx <= COURT_WIDTH_DOUBLES_M and
+                            0 <= cy <= COURT_LENGTH_M)
+    logger.info("detect_bounces%s: found %d bounces (after validation)", tag, len(bounce_rows))
+
+
+def compute_ball_speeds(table: DetectionTable, court_detector=None, fps: float = None,
+                        tag: str = "") -> None:
+    """Pairwise ball speed in km/h from court-coordinate distances between
+    consecutive detections; also sets court_x/court_y on each pair's later row."""
+    n = len(table)
+    if court_detector is None or n < 2:
+        return
+    sample_fps = fps or FRAME_SAMPLE_FPS
+    # One vectorised projection for every detection (NaN = rejected).
+    mx, my = court_detector.to_court_coords_batch(table["x"], table["y"])
+    valid = np.isfinite(mx) & np.isfinite(my)
+    pair_ok = valid[:-1] & valid[1:]
+    ok_count = int(np.count_nonzero(pair_ok))
+    none_count = (n - 1) - ok_count
+
+    dist_m = np.hypot(mx[1:] - mx[:-1], my[1:] - my[:-1])
+    dt_sec = np.diff(table["frame_idx"]) / sample_fps
+    update = pair_ok & (dt_sec > 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        speed_kmh = dist_m / dt_sec * 3.6
+    rows = np.flatnonzero(update) + 1
+    speed_kmh = speed_kmh[update]
+    # Clamp impossible speeds — TrackNet position glitches can
+    # produce 800+ km/h. Fastest recorded serve is ~263 km/h;
+    # 250 km/h is a generous ceiling for any ball movement.
+    plausible = speed_kmh <= 250
+    table["speed_kmh"][rows[plausible]] = speed_kmh[plausible]
+    table["court_x"][rows] = mx[rows]
+    table["court_y"][rows] = my[rows]
+    if none_count > 0:
+        logger.warning(
+            "compute_speeds%s: %d/%d pairs had None court coords (homography=%s)",
+            tag, none_count, none_count + ok_count,
+            court_detector._last_detection.homography is not None
+            if court_detector._last_detection else "no_detection",
+        )
+
+
+def assign_ball_peak_speeds(table: DetectionTable, window_frames: int = 15,
+                              tag: str = "") -> None:
+    """p75 of the pairwise speeds in the window preceding each bounce (see
+    BallTracker.assign_peak_flight_speeds). Bounces are visited in order and
+    updated in place, so a later bounce's window sees earlier bounces' new
+    values — same as the per-object loop it replaces."""
+    frames = table["frame_idx"].tolist()
+    speed = table["speed_kmh"]
+    bounce_rows = np.flatnonzero(table["is_bounce"]).tolist()
+    n_updated = 0
+    for bi in bounce_rows:
+        low_frame = frames[bi] - window_frames
+        speeds = []
+        for j in range(bi - 1, -1, -1):
+            if frames[j] < low_frame:
+                break
+            s = float(speed[j])
+            if s > 0:                       # NaN (no speed) compares False
+                speeds.append(s)
+        if speeds:
+            speeds.sort()
+            # p75 = 75th percentile. For a 4-sample window this is the
+            # 3rd-highest; for a 3-sample window it's the 2nd-highest;
+            # for a single sample it falls back to that sample. Robust
+            # to one jitter outlier per window.
+            k = max(0, min(len(speeds) - 1, int(len(speeds) * 0.75)))
+            speed[bi] = speeds[k]
+            n_updated += 1
+    logger.info(
+        "assign_peak_flight_speeds%s: set peak-flight speed (p75) on %d/%d bounces (window=%d frames)",
+        tag, n_updated, len(bounce_rows), window_frames,
+    )
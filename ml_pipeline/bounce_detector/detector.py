@@ -48,6 +48,7 @@ from ml_pipeline.bounce_detector.models import (
 )
 from ml_pipeline.bounce_detector.pre_gates import apply_pre_gates
 from ml_pipeline.config import FRAME_SAMPLE_FPS
+from ml_pipeline.keypoint_codec import kp_present_sql
 
 logger = logging.getLogger(__name__)
 
@@ -66,7 +67,7 @@ KP_LEFT_WRIST = 9
 KP_RIGHT_WRIST = 10
 
 
-def _load_ball_rows(conn, task_id: str) -> list:
+def _load_ball_rows(conn, task_id: str, store=None) -> list:
     """All ball detections for a task, one row per frame_idx, ordered.
 
     Source-preference deduped (roi_far_ball > roi_prod > main > NULL) via
@@ -74,14 +75,18 @@ def _load_ball_rows(conn, task_id: str) -> list:
     (40%->80% offline, 2026-06-13), and without the dedup the overlapping
     roi_far_ball + main rows would put 2 rows on every far frame and corrupt
     the gravity-residual peak detector. No-op until roi_* rows exist.
+    A TaskFrameStore already holds this exact merged SELECT.
     """
+    if store is not None:
+        return store.dicts(store.balls, store.select(store.balls), (
+            "frame_idx", "x", "y", "court_x", "court_y", "is_bounce", "speed_kmh"))
     rows = conn.execute(sql_text(merged_ball_subquery(
         "frame_idx, x, y, court_x, court_y, is_bounce, speed_kmh"
     )), {"tid": task_id}).mappings().all()
     return [dict(r) for r in rows]
 
 
-def _load_wrist_positions(conn, task_id: str) -> dict[int, list]:
+def _load_wrist_positions(conn, task_id: str, store=None) -> dict[int, list]:
     """Map frame_idx -> [(wx, wy), ...] for both wrists of both players.
 
     Reads keypoints (court coords) from player_detections (and optionally
@@ -91,14 +96,18 @@ def _load_wrist_positions(conn, task_id: str) -> dict[int, list]:
     range, so missing wrists just mean "no rejection here".
     """
     out: dict[int, list] = {}
-    rows = conn.execute(sql_text("""
-        SELECT frame_idx, player_id, keypoints, court_x, court_y
-        FROM ml_analysis.player_detections
-        WHERE job_id = :tid AND keypoints IS NOT NULL
-        ORDER BY frame_idx
-    """), {"tid": task_id}).mappings().all()
+    if store is not None:
+        # Only the centre court coords are read below — skip the keypoints.
+        rows = store.dicts(store.players, store.select(store.players, kp_present=True),
+                           ("frame_idx", "player_id", "court_x", "court_y"))
+    else:
+        rows = conn.execute(sql_text(f"""
+            SELECT frame_idx, player_id, court_x, court_y
+            FROM ml_analysis.player_detections
+            WHERE job_id = :tid AND {kp_present_sql()}
+            ORDER BY frame_idx
+        """), {"tid": task_id}).mappings().all()
     for r in rows:
-        kp = r["keypoints"]
         # Keypoints come in as nested JSONB or flat list. We're only after
         # the COURT-coordinate wrist position, not pixel; player_detections
         # carries court_x/court_y for the player CENTRE (feet), so we
@@ -454,6 +463,7 @@ def detect_bounces(
     weights_path: Optional[str] = None,
     candidate_mode: Optional[str] = None,
     threshold_override: Optional[float] = None,
+    store=None,
 ) -> List[BounceEvent]:
     """Production entry point. Returns the list of detected bounces and
     persists them to ml_analysis.ball_bounces.
@@ -466,6 +476,8 @@ def detect_bounces(
     `weights_path`: path to the trained CNN weights file. When None or
     missing on disk, runs in STOPGAP mode (no rows written, threshold
     forced to 1.1). v0 always falls into this branch.
+
+    `store`: optional TaskFrameStore — ball + wrist rows read from it.
     """
     cnn = BounceCNNWrapper()
     cnn.load_weights(weights_path)
@@ -479,10 +491,12 @@ def detect_bounces(
             return _detect_with_conn(
                 conn=managed_conn, task_id=task_id, replace=replace,
                 cnn=cnn, threshold=threshold, candidate_mode=candidate_mode,
+                store=store,
             )
     return _detect_with_conn(
         conn=conn, task_id=task_id, replace=replace,
         cnn=cnn, threshold=threshold, candidate_mode=candidate_mode,
+        store=store,
     )
 
 
@@ -490,6 +504,7 @@ def _detect_with_conn(
     *, conn, task_id: str, replace: bool,
     cnn: BounceCNNWrapper, threshold: float,
     candidate_mode: Optional[str] = None,
+    store=None,
 ) -> List[BounceEvent]:
     init_bounce_schema(conn)
     if replace:
@@ -502,13 +517,13 @@ def _detect_with_conn(
         "WHERE job_id = :t OR task_id = :t LIMIT 1"
     ), {"t": task_id}).scalar() or 25.0
 
-    ball_rows = _load_ball_rows(conn, task_id)
+    ball_rows = _load_ball_rows(conn, task_id, store=store)
     if not ball_rows:
         logger.warning("bounce_detector: no ball_detections rows for task %s", task_id)
         return []
     last_frame_idx = max(int(r["frame_idx"]) for r in ball_rows)
 
-    wrists_by_frame = _load_wrist_positions(conn, task_id)
+    wrists_by_frame = _load_wrist_positions(conn, task_id, store=store)
     rally_by_frame = _load_rally_states_by_frame(
         conn, task_id, fps, last_frame_idx,
     )
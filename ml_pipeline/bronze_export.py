@@ -15,112 +15,93 @@ Usage (from ml_pipeline/__main__.py, Batch side):
     )
 
 The file lands at: s3://{bucket}/analysis/{job_id}/bronze.json.gz
+
+With BRONZE_EXPORT_FORMAT=npz it is instead a schema_version 2 columnar file,
+s3://{bucket}/analysis/{job_id}/bronze.v2.npz — the same rows as NumPy columns
+(np.savez_compressed, flat float32 keypoints) plus the header as a JSON blob,
+which bronze_ingest_t5 COPYs in binary without building a dict per row.
 """
 
 import gzip
+import io
 import json
 import logging
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ml_pipeline.config import BRONZE_EXPORT_FORMAT
+from ml_pipeline.detection_table import NUM_KEYPOINTS, nan_to_none
 
 logger = logging.getLogger(__name__)
 
 SCHEMA_VERSION = 1
 BRONZE_S3_KEY_TEMPLATE = "analysis/{job_id}/bronze.json.gz"
 
+# Columnar export (BRONZE_EXPORT_FORMAT=npz). Member names inside the .npz are
+# "<table>_<column>"; "meta_json" holds the UTF-8 header (schema_version,
+# job/task ids, pipeline_metadata, match_analytics) as a uint8 array.
+SCHEMA_VERSION_NPZ = 2
+BRONZE_NPZ_S3_KEY_TEMPLATE = "analysis/{job_id}/bronze.v2.npz"
+
 
-def _ball_detection_to_dict(d) -> Dict[str, Any]:
-    """Convert BallDetection dataclass → plain dict for JSON serialization.
+def _ball_rows(table) -> List[Dict[str, Any]]:
+    """Ball DetectionTable → plain dicts for JSON serialization.
 
     source='main' tags the global WASB ball. roi_far_ball rows are carried
     separately via build_bronze_payload(extra_ball_rows=...) so they survive
     the Render re-ingest's blanket DELETE+COPY (the export+reingest-carry rule).
     """
-    return {
-        "frame_idx": int(d.frame_idx),
-        "x": float(d.x) if d.x is not None else None,
-        "y": float(d.y) if d.y is not None else None,
-        "court_x": float(d.court_x) if d.court_x is not None else None,
-        "court_y": float(d.court_y) if d.court_y is not None else None,
-        "speed_kmh": float(d.speed_kmh) if d.speed_kmh is not None else None,
-        "is_bounce": bool(d.is_bounce),
-        "is_in": bool(d.is_in) if d.is_in is not None else None,
-        "source": getattr(d, "source", None) or "main",
-    }
+    rows = table.to_dicts(
+        ("frame_idx", "x", "y", "court_x", "court_y", "speed_kmh", "is_bounce",
+         "is_in", "source"),
+    )
+    for r in rows:
+        r["source"] = r["source"] or "main"
+    return rows
 
 
-def _player_detection_to_dict(d) -> Dict[str, Any]:
-    """Convert PlayerDetection dataclass → plain dict for JSON serialization.
+def _player_rows(table) -> List[Dict[str, Any]]:
+    """Player DetectionTable → plain dicts for JSON serialization.
 
     Keypoints stored as flat array [x1,y1,c1,x2,y2,c2,...] (17 keypoints × 3 = 51 floats).
     This is ~30% smaller than nested arrays in JSON.
     """
-    bbox = d.bbox if hasattr(d, "bbox") else (None, None, None, None)
-    center = d.center if hasattr(d, "center") else (None, None)
-
-    # Keypoints: numpy array (17, 3) → flat list of 51 floats
-    keypoints_flat = None
-    if getattr(d, "keypoints", None) is not None:
-        try:
-            kp = d.keypoints
-            if hasattr(kp, "flatten"):
-                keypoints_flat = [float(v) for v in kp.flatten()]
-            else:
-                # Already a list — flatten manually
-                keypoints_flat = [float(v) for row in kp for v in row]
-        except Exception:
-            keypoints_flat = None
-
-    return {
-        "frame_idx": int(d.frame_idx),
-        "player_id": int(d.player_id),
-        "bbox_x1": float(bbox[0]) if bbox[0] is not None else None,
-        "bbox_y1": float(bbox[1]) if bbox[1] is not None else None,
-        "bbox_x2": float(bbox[2]) if bbox[2] is not None else None,
-        "bbox_y2": float(bbox[3]) if bbox[3] is not None else None,
-        "center_x": float(center[0]) if center[0] is not None else None,
-        "center_y": float(center[1]) if center[1] is not None else None,
-        "court_x": float(d.court_x) if d.court_x is not None else None,
-        "court_y": float(d.court_y) if d.court_y is not None else None,
-        "keypoints": keypoints_flat,
-        # Swing-type classifier output (bronze fact). Without this, the Batch-side
-        # stroke_class is lost in the export→Render-reingest round-trip (the
-        # reingest DELETEs + re-COPYs from this JSON), so silver never sees the
-        # model and falls back to the pose heuristic. 2026-06-04.
-        "stroke_class": getattr(d, "stroke_class", None),
+    n = len(table)
+    if n == 0:
+        return []
+    bbox = table["bbox"]
+    center = table["center"]
+    cols = {
+        "frame_idx": table["frame_idx"].tolist(),
+        "player_id": table["player_id"].tolist(),
+        "bbox_x1": nan_to_none(bbox[:, 0]),
+        "bbox_y1": nan_to_none(bbox[:, 1]),
+        "bbox_x2": nan_to_none(bbox[:, 2]),
+        "bbox_y2": nan_to_none(bbox[:, 3]),
+        "center_x": nan_to_none(center[:, 0]),
+        "center_y": nan_to_none(center[:, 1]),
+        "court_x": nan_to_none(table["court_x"]),
+        "court_y": nan_to_none(table["court_y"]),
     }
-
-
-def build_bronze_payload(
-    job_id: str,
-    task_id: Optional[str],
-    result,
-    practice: bool = False,
-    player_window_frames: int = 5,
-    extra_ball_rows: Optional[List[Dict[str, Any]]] = None,
-) -> Dict[str, Any]:
-    """
-    Build the complete bronze JSON payload from ML pipeline result.
-
-    Optimization: SportAI sends ~5K rows total in 14MB. We're aggressively
-    filtered to match — most non-bounce frames are useless to the silver builder.
-    Strategy:
-      - ball_detections: keep ALL (small ~70 bytes/row, useful for trajectory)
-      - player_detections: keep only those within ±N frames of any bounce
-        (the silver builder only needs nearest-player to each bounce)
-
-    Args:
-        job_id: ML job identifier
-        task_id: Associated task_id (usually same as job_id for T5)
-        result: TennisAnalysisPipeline result object
-        practice: practice mode flag
-        player_window_frames: keep player detections within ±N frames of bounces (default 5)
-
-    Returns:
-        Dict ready for JSON serialization.
-    """
-    ball_dets = list(result.ball_detections or [])
-    player_dets_full = list(result.player_detections or [])
+    # Keypoints: one (N, 51) block → flat lists; rows without pose stay None.
+    flat = table["keypoints"].reshape(n, -1).tolist()
+    has_kp = table["has_keypoints"].tolist()
+    cols["keypoints"] = [f if h else None for f, h in zip(flat, has_kp)]
+    # Swing-type classifier output (bronze fact). Without this, the Batch-side
+    # stroke_class is lost in the export→Render-reingest round-trip (the
+    # reingest DELETEs + re-COPYs from this JSON), so silver never sees the
+    # model and falls back to the pose heuristic. 2026-06-04.
+    cols["stroke_class"] = list(table["stroke_class"])
+    names = list(cols)
+    return [dict(zip(names, row)) for row in zip(*cols.values())]
+
+
+def _select_export_tables(result, player_window_frames: int):
+    """Ball + player DetectionTables with the export row filters applied."""
+    balls = result.ball_table
+    players_full = result.player_table
 
     # D1 v3 spectator drop — SAME predicate as db_writer.save_player_
     # detections, applied here TOO because this payload is built from the
@@ -131,15 +112,16 @@ def build_bronze_payload(
     # whose STORED (strict-bounded, trustworthy) court_x sits clearly off
     # the playing surface are spectators; NULL-coord rows always pass
     # (the far player's unprojectable majority).
-    _n_pre_drop = len(player_dets_full)
-    player_dets_full = [
-        d for d in player_dets_full
-        if d.court_x is None or -2.0 <= d.court_x <= 12.97  # doubles W + 2m
-    ]
-    if len(player_dets_full) != _n_pre_drop:
+    _n_pre_drop = len(players_full)
+    court_x = players_full["court_x"]
+    with np.errstate(invalid="ignore"):
+        on_court = np.isnan(court_x) | ((court_x >= -2.0) & (court_x <= 12.97))  # doubles W + 2m
+    if not on_court.all():
+        players_full = players_full.take(on_court)
+    if len(players_full) != _n_pre_drop:
         logger.info(
             "bronze_export: dropped %d off-court-x player rows "
-            "(spectator band) of %d", _n_pre_drop - len(player_dets_full),
+            "(spectator band) of %d", _n_pre_drop - len(players_full),
             _n_pre_drop)
 
     # Filter NON-POSE player detections to a window around each bounce —
@@ -153,24 +135,27 @@ def build_bronze_payload(
     # Pose rows are ~500 bytes each; keeping them all adds ~2-3 MB to a
     # typical match's bronze JSON. Still well within SportAI-comparable
     # scale (~14 MB / 5K rows).
-    bounce_frames = sorted({d.frame_idx for d in ball_dets if d.is_bounce})
-    keep_frames = set()
-    for bf in bounce_frames:
-        for offset in range(-player_window_frames, player_window_frames + 1):
-            keep_frames.add(bf + offset)
-
-    player_dets = [
-        d for d in player_dets_full
-        if (d.frame_idx in keep_frames) or (d.keypoints is not None)
-    ]
-    n_pose = sum(1 for d in player_dets if d.keypoints is not None)
+    bounce_frames = np.unique(balls["frame_idx"][balls["is_bounce"]])
+    offsets = np.arange(-player_window_frames, player_window_frames + 1)
+    keep_frames = (bounce_frames[:, None] + offsets[None, :]).ravel()
+
+    has_kp = players_full["has_keypoints"]
+    keep = np.isin(players_full["frame_idx"], keep_frames) | has_kp
+    players = players_full if keep.all() else players_full.take(keep)
+    n_pose = int(np.count_nonzero(players["has_keypoints"]))
     logger.info(
         "bronze_export: player_detections %d -> %d kept (%d pose-carrying, "
         "remaining filtered to ±%d frames around %d bounces)",
-        len(player_dets_full), len(player_dets), n_pose,
+        len(players_full), len(players), n_pose,
         player_window_frames, len(bounce_frames),
     )
 
+    return balls, players
+
+
+def _payload_header(job_id: str, task_id: Optional[str], result, practice: bool,
+                    schema_version: int) -> Dict[str, Any]:
+    """Everything in the export except the two detection arrays."""
     # Pipeline video metadata (from VideoMetadata dataclass)
     vm = getattr(result, "video_metadata", None)
     video_fps = float(vm.fps) if vm and getattr(vm, "fps", None) is not None else None
@@ -178,8 +163,8 @@ def build_bronze_payload(
     video_width = int(vm.width) if vm and getattr(vm, "width", None) is not None else None
     video_height = int(vm.height) if vm and getattr(vm, "height", None) is not None else None
 
-    payload = {
-        "schema_version": SCHEMA_VERSION,
+    return {
+        "schema_version": schema_version,
         "job_id": str(job_id),
         "task_id": str(task_id) if task_id else None,
         "exported_at": datetime.now(timezone.utc).isoformat(),
@@ -210,10 +195,56 @@ def build_bronze_payload(
             "first_serve_pct": float(getattr(result, "first_serve_pct", 0.0) or 0.0),
             "player_count": int(getattr(result, "player_count", 0) or 0),
         },
-        "ball_detections": [_ball_detection_to_dict(d) for d in ball_dets],
-        "player_detections": [_player_detection_to_dict(d) for d in player_dets],
     }
 
+
+def _extra_ball_row(r: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "frame_idx": int(r["frame_idx"]),
+        "x": float(r["x"]) if r.get("x") is not None else None,
+        "y": float(r["y"]) if r.get("y") is not None else None,
+        "court_x": float(r["court_x"]) if r.get("court_x") is not None else None,
+        "court_y": float(r["court_y"]) if r.get("court_y") is not None else None,
+        "speed_kmh": float(r["speed_kmh"]) if r.get("speed_kmh") is not None else None,
+        "is_bounce": bool(r.get("is_bounce")),
+        "is_in": bool(r["is_in"]) if r.get("is_in") is not None else None,
+        "source": r.get("source") or "roi_far_ball",
+    }
+
+
+def build_bronze_payload(
+    job_id: str,
+    task_id: Optional[str],
+    result,
+    practice: bool = False,
+    player_window_frames: int = 5,
+    extra_ball_rows: Optional[List[Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """
+    Build the complete bronze JSON payload from ML pipeline result.
+
+    Optimization: SportAI sends ~5K rows total in 14MB. We're aggressively
+    filtered to match — most non-bounce frames are useless to the silver builder.
+    Strategy:
+      - ball_detections: keep ALL (small ~70 bytes/row, useful for trajectory)
+      - player_detections: keep only those within ±N frames of any bounce
+        (the silver builder only needs nearest-player to each bounce)
+
+    Args:
+        job_id: ML job identifier
+        task_id: Associated task_id (usually same as job_id for T5)
+        result: TennisAnalysisPipeline result object
+        practice: practice mode flag
+        player_window_frames: keep player detections within ±N frames of bounces (default 5)
+
+    Returns:
+        Dict ready for JSON serialization.
+    """
+    balls, players = _select_export_tables(result, player_window_frames)
+    payload = _payload_header(job_id, task_id, result, practice, SCHEMA_VERSION)
+    payload["ball_detections"] = _ball_rows(balls)
+    payload["player_detections"] = _player_rows(players)
+
     # Carry roi_far_ball rows (DB-direct writes from the far-ball ROI sweep)
     # into the export so they survive the Render re-ingest's blanket DELETE+COPY
     # (export+reingest-carry rule). Appended AFTER the bounce/keep computation so
@@ -222,17 +253,7 @@ def build_bronze_payload(
     # trajectory readers, never silver's bounce-driven row count.
     if extra_ball_rows:
         for r in extra_ball_rows:
-            payload["ball_detections"].append({
-                "frame_idx": int(r["frame_idx"]),
-                "x": float(r["x"]) if r.get("x") is not None else None,
-                "y": float(r["y"]) if r.get("y") is not None else None,
-                "court_x": float(r["court_x"]) if r.get("court_x") is not None else None,
-                "court_y": float(r["court_y"]) if r.get("court_y") is not None else None,
-                "speed_kmh": float(r["speed_kmh"]) if r.get("speed_kmh") is not None else None,
-                "is_bounce": bool(r.get("is_bounce")),
-                "is_in": bool(r["is_in"]) if r.get("is_in") is not None else None,
-                "source": r.get("source") or "roi_far_ball",
-            })
+            payload["ball_detections"].append(_extra_ball_row(r))
         logger.info("bronze_export: carried %d roi_far_ball rows into payload",
                     len(extra_ball_rows))
 
@@ -243,6 +264,106 @@ def build_bronze_payload(
     return payload
 
 
+def build_bronze_arrays(
+    job_id: str,
+    task_id: Optional[str],
+    result,
+    practice: bool = False,
+    player_window_frames: int = 5,
+    extra_ball_rows: Optional[List[Dict[str, Any]]] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Columnar (schema_version 2) counterpart of build_bronze_payload: the same
+    rows, filters and header, as NumPy arrays keyed "<table>_<column>".
+
+    NULL encoding: NaN for nullable floats, ball_is_in int8 -1, empty string
+    plus a has_* mask for text. player_keypoints is (N, 51) float32 — the flat
+    layout the ingest COPYs — with player_has_keypoints marking pose rows.
+    """
+    balls, players = _select_export_tables(result, player_window_frames)
+    header = _payload_header(job_id, task_id, result, practice, SCHEMA_VERSION_NPZ)
+
+    if extra_ball_rows:
+        # Same carry as the JSON path, appended after the keep-window.
+        rows = [_extra_ball_row(r) for r in extra_ball_rows]
+        balls = balls.take(slice(None))
+        balls.append_chunk(
+            frame_idx=[r["frame_idx"] for r in rows],
+            x=[np.nan if r["x"] is None else r["x"] for r in rows],
+            y=[np.nan if r["y"] is None else r["y"] for r in rows],
+            court_x=[np.nan if r["court_x"] is None else r["court_x"] for r in rows],
+            court_y=[np.nan if r["court_y"] is None else r["court_y"] for r in rows],
+            speed_kmh=[np.nan if r["speed_kmh"] is None else r["speed_kmh"] for r in rows],
+            is_bounce=[r["is_bounce"] for r in rows],
+            is_in=[-1 if r["is_in"] is None else int(r["is_in"]) for r in rows],
+            source=[r["source"] for r in rows],
+        )
+        logger.info("bronze_export: carried %d roi_far_ball rows into arrays",
+                    len(extra_ball_rows))
+
+    def _text(col: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        vals = ["" if v is None else str(v) for v in col]
+        return np.array(vals, dtype=str), np.array([v is not None for v in col], dtype=bool)
+
+    ball_source, ball_has_source = _text(balls["source"])
+    stroke, has_stroke = _text(players["stroke_class"])
+    n_p = len(players)
+    arrays = {
+        "meta_json": np.frombuffer(
+            json.dumps(header, separators=(",", ":"), default=str).encode("utf-8"),
+            dtype=np.uint8,
+        ),
+        "ball_frame_idx": balls["frame_idx"],
+        "ball_x": balls["x"],
+        "ball_y": balls["y"],
+        "ball_court_x": balls["court_x"],
+        "ball_court_y": balls["court_y"],
+        "ball_speed_kmh": balls["speed_kmh"],
+        "ball_is_bounce": balls["is_bounce"],
+        "ball_is_in": balls["is_in"],
+        "ball_source": ball_source,
+        "ball_has_source": ball_has_source,
+        "player_frame_idx": players["frame_idx"],
+        "player_player_id": players["player_id"],
+        "player_bbox": players["bbox"],
+        "player_center": players["center"],
+        "player_court_x": players["court_x"],
+        "player_court_y": players["court_y"],
+        "player_has_keypoints": players["has_keypoints"],
+        "player_keypoints": players["keypoints"].reshape(n_p, NUM_KEYPOINTS * 3),
+        "player_stroke_class": stroke,
+        "player_has_stroke_class": has_stroke,
+    }
+    logger.info(
+        "bronze_export: built arrays ball=%d player=%d", len(balls), n_p,
+    )
+    return arrays
+
+
+def _export_npz(job_id, task_id, result, s3_client, s3_bucket, practice,
+                extra_ball_rows) -> str:
+    arrays = build_bronze_arrays(
+        job_id=job_id, task_id=task_id, result=result, practice=practice,
+        extra_ball_rows=extra_ball_rows,
+    )
+    buf = io.BytesIO()
+    np.savez_compressed(buf, **arrays)
+    body = buf.getvalue()
+    logger.info(
+        "bronze_export: job_id=%s npz size=%.1fMB (%d columns)",
+        job_id, len(body) / 1024 / 1024, len(arrays),
+    )
+    s3_key = BRONZE_NPZ_S3_KEY_TEMPLATE.format(job_id=job_id)
+    s3_client.put_object(
+        Bucket=s3_bucket,
+        Key=s3_key,
+        Body=body,
+        ContentType="application/octet-stream",
+    )
+    logger.info("bronze_export: uploaded s3://%s/%s", s3_bucket, s3_key)
+    return s3_key
+
+
 def export_bronze_to_s3(
     job_id: str,
     task_id: Optional[str],
@@ -251,12 +372,24 @@ def export_bronze_to_s3(
     s3_bucket: str,
     practice: bool = False,
     extra_ball_rows: Optional[List[Dict[str, Any]]] = None,
+    fmt: Optional[str] = None,
 ) -> str:
     """
     Build the bronze payload, gzip it, and upload to S3.
 
+    fmt: "json" (schema_version 1, bronze.json.gz) or "npz" (schema_version 2,
+    bronze.v2.npz); defaults to BRONZE_EXPORT_FORMAT. The caller records the
+    returned key on the job row, which is how the ingest picks its reader.
+
     Returns the S3 key of the uploaded file.
     """
+    fmt = (fmt or BRONZE_EXPORT_FORMAT or "json").lower()
+    if fmt == "npz":
+        return _export_npz(job_id, task_id, result, s3_client, s3_bucket,
+                           practice, extra_ball_rows)
+    if fmt != "json":
+        logger.warning("bronze_export: unknown format %r, writing json", fmt)
+
     payload = build_bronze_payload(
         job_id=job_id, task_id=task_id, result=result, practice=practice,
         extra_ball_rows=extra_ball_rows,
@@ -15,6 +15,22 @@ stream each big array straight into psycopg COPY one row at a time — peak memo
 is bounded to ~a single row regardless of match length. Output is identical
 (ijson use_float=True matches json.loads' float parsing).
 
+Columnar exports (schema_version 2, analysis/{job_id}/bronze.v2.npz — written
+when the Batch side runs with BRONZE_EXPORT_FORMAT=npz) skip JSON entirely: the
+NumPy columns are sliced into fixed-size row batches and written with
+COPY ... FROM STDIN (FORMAT BINARY), so there is no per-row text parse on either
+side. The reader is chosen from the key's suffix; the key itself comes from
+video_analysis_jobs.bronze_s3_key when the caller does not pass one, so older
+v1 exports keep re-ingesting through the JSON path unchanged.
+
+Keypoints land in keypoints_f16 (17x3 float16, 102 bytes — see
+ml_pipeline/keypoint_codec.py) instead of re-nested JSONB text; the JSONB
+column is only written with KEYPOINTS_JSONB=1.
+
+replace=True clears the job's detections with detection_partitions.clear_job —
+a TRUNCATE of the job's own partition once the tables are partitioned
+(ML_DETECTION_PARTITIONS), the old DELETE otherwise.
+
 Usage:
     from ml_pipeline.bronze_ingest_t5 import ingest_bronze_t5
     result = ingest_bronze_t5(job_id='...', engine=engine, replace=True)
@@ -31,10 +47,17 @@ from typing import Any, Dict, Optional
 import boto3
 from sqlalchemy import text as sql_text
 
+from ml_pipeline.detection_partitions import DETECTION_TABLES, clear_job, ensure_job_partition
+from ml_pipeline.keypoint_codec import KEYPOINTS_JSONB, encode_f16, to_json as kp_to_json
+
 logger = logging.getLogger(__name__)
 
 BRONZE_S3_KEY_TEMPLATE = "analysis/{job_id}/bronze.json.gz"
 
+# Rows per slice when COPYing a v2 (.npz) export — bounds the Python objects
+# alive at once the way the ijson stream bounds v1 to a single row.
+_NPZ_COPY_BATCH = 5000
+
 
 def _get_s3_client():
     region = os.environ.get("AWS_REGION", "us-east-1")
@@ -42,17 +65,18 @@ def _get_s3_client():
 
 
 def _download_bronze_to_tempfile(bucket: str, key: str, s3_client=None) -> str:
-    """Stream the gzipped JSON from S3 to a temp file (NOT into memory).
+    """Stream the bronze export from S3 to a temp file (NOT into memory).
 
     Returns the local path; caller is responsible for deleting it."""
     if s3_client is None:
         s3_client = _get_s3_client()
-    fd, path = tempfile.mkstemp(suffix=".json.gz", prefix="t5bronze_")
+    suffix = ".npz" if key.endswith(".npz") else ".json.gz"
+    fd, path = tempfile.mkstemp(suffix=suffix, prefix="t5bronze_")
     os.close(fd)
     t0 = time.time()
     s3_client.download_file(bucket, key, path)
     logger.info(
-        "bronze_ingest_t5: downloaded s3://%s/%s in %.0fms (%.1fMB gzipped)",
+        "bronze_ingest_t5: downloaded s3://%s/%s in %.0fms (%.1fMB compressed)",
         bucket, key, (time.time() - t0) * 1000, os.path.getsize(path) / 1024 / 1024,
     )
     return path
@@ -105,26 +129,21 @@ def _copy_ball_detections_stream(conn_raw, job_id: str, gz_path: str) -> int:
 
 
 def _copy_player_detections_stream(conn_raw, job_id: str, gz_path: str) -> int:
-    """Stream player_detections into COPY one row at a time. Reconstructs nested
-    keypoints from flat [x,y,c,...] back to [[x,y,c],...] to match the JSONB
-    schema used by stroke inference (identical to the prior implementation)."""
+    """Stream player_detections into COPY one row at a time. Flat [x,y,c,...]
+    keypoints go straight into keypoints_f16 (keypoint_codec); the nested
+    JSONB column is only filled when KEYPOINTS_JSONB=1."""
     import ijson
     n = 0
     with conn_raw.cursor() as cur:
         with cur.copy(
             "COPY ml_analysis.player_detections "
             "(job_id, frame_idx, player_id, bbox_x1, bbox_y1, bbox_x2, bbox_y2, "
-            " center_x, center_y, court_x, court_y, keypoints, stroke_class) "
+            " center_x, center_y, court_x, court_y, keypoints, keypoints_f16, stroke_class) "
             "FROM STDIN"
         ) as copy:
             with gzip.open(gz_path, "rb") as f:
                 for r in ijson.items(f, "player_detections.item", use_float=True):
                     kp_flat = r.get("keypoints")
-                    kp_json = None
-                    if kp_flat is not None and len(kp_flat) >= 51:
-                        nested = [[kp_flat[i * 3], kp_flat[i * 3 + 1], kp_flat[i * 3 + 2]]
-                                  for i in range(17)]
-                        kp_json = json.dumps(nested)
                     copy.write_row([
                         job_id,
                         _as_int(r.get("frame_idx")),
@@ -137,13 +156,115 @@ def _copy_player_detections_stream(conn_raw, job_id: str, gz_path: str) -> int:
                         r.get("center_y"),
                         r.get("court_x"),
                         r.get("court_y"),
-                        kp_json,
+                        kp_to_json(kp_flat),
+                        encode_f16(kp_flat),
                         r.get("stroke_class"),  # swing-type fact from Batch (may be None)
                     ])
                     n += 1
     return n
 
 
+def _nullable(vals):
+    """float list (from ndarray.tolist()) with NaN -> None."""
+    return [None if v != v else v for v in vals]
+
+
+def _npz_text(z, name: str, lo: int, hi: int):
+    vals = z[name][lo:hi].tolist()
+    mask = z["%s_has_%s" % tuple(name.split("_", 1))][lo:hi].tolist()
+    return [v if m else None for v, m in zip(vals, mask)]
+
+
+def _copy_ball_detections_npz(conn_raw, job_id: str, z) -> int:
+    """Binary COPY of the ball_* columns of a v2 export, in row slices."""
+    n_total = len(z["ball_frame_idx"])
+    with conn_raw.cursor() as cur:
+        with cur.copy(
+            "COPY ml_analysis.ball_detections "
+            "(job_id, frame_idx, x, y, court_x, court_y, speed_kmh, is_bounce, is_in, source) "
+            "FROM STDIN (FORMAT BINARY)"
+        ) as copy:
+            copy.set_types(["text", "int4", "float8", "float8", "float8", "float8",
+                            "float8", "bool", "bool", "text"])
+            for lo in range(0, n_total, _NPZ_COPY_BATCH):
+                hi = min(lo + _NPZ_COPY_BATCH, n_total)
+                is_in = z["ball_is_in"][lo:hi].tolist()
+                source = _npz_text(z, "ball_source", lo, hi)
+                for row in zip(
+                    z["ball_frame_idx"][lo:hi].tolist(),
+                    _nullable(z["ball_x"][lo:hi].tolist()),
+                    _nullable(z["ball_y"][lo:hi].tolist()),
+                    _nullable(z["ball_court_x"][lo:hi].tolist()),
+                    _nullable(z["ball_court_y"][lo:hi].tolist()),
+                    _nullable(z["ball_speed_kmh"][lo:hi].tolist()),
+                    z["ball_is_bounce"][lo:hi].tolist(),
+                    [None if v < 0 else bool(v) for v in is_in],
+                    [v or "main" for v in source],
+                ):
+                    copy.write_row((job_id,) + row)
+    return n_total
+
+
+def _copy_player_detections_npz(conn_raw, job_id: str, z) -> int:
+    """Binary COPY of the player_* columns of a v2 export. Keypoints are cast
+    to float16 a slice at a time and each row's 102 bytes go into
+    keypoints_f16; the nested JSONB column (jsonb dumper serialises the list)
+    only when KEYPOINTS_JSONB=1."""
+    n_total = len(z["player_frame_idx"])
+    with conn_raw.cursor() as cur:
+        with cur.copy(
+            "COPY ml_analysis.player_detections "
+            "(job_id, frame_idx, player_id, bbox_x1, bbox_y1, bbox_x2, bbox_y2, "
+            " center_x, center_y, court_x, court_y, keypoints, keypoints_f16, stroke_class) "
+            "FROM STDIN (FORMAT BINARY)"
+        ) as copy:
+            copy.set_types(["text", "int4", "int4", "float8", "float8", "float8",
+                            "float8", "float8", "float8", "float8", "float8",
+                            "jsonb", "bytea", "text"])
+            for lo in range(0, n_total, _NPZ_COPY_BATCH):
+                hi = min(lo + _NPZ_COPY_BATCH, n_total)
+                kp_block = z["player_keypoints"][lo:hi].reshape(hi - lo, 17, 3)
+                kp_f16 = kp_block.astype("<f2")
+                kps = kp_block.tolist() if KEYPOINTS_JSONB else [None] * (hi - lo)
+                has_kp = z["player_has_keypoints"][lo:hi].tolist()
+                stroke = _npz_text(z, "player_stroke_class", lo, hi)
+                for i, (fi, pid, bbox, center, cx, cy, kp, hk, sc) in enumerate(zip(
+                    z["player_frame_idx"][lo:hi].tolist(),
+                    z["player_player_id"][lo:hi].tolist(),
+                    z["player_bbox"][lo:hi].tolist(),
+                    z["player_center"][lo:hi].tolist(),
+                    _nullable(z["player_court_x"][lo:hi].tolist()),
+                    _nullable(z["player_court_y"][lo:hi].tolist()),
+                    kps, has_kp, stroke,
+                )):
+                    copy.write_row([
+                        job_id, fi, pid,
+                        bbox[0], bbox[1], bbox[2], bbox[3],
+                        center[0], center[1], cx, cy,
+                        kp if hk else None,
+                        kp_f16[i].tobytes() if hk else None,
+                        sc,
+                    ])
+    return n_total
+
+
+def _load_npz_meta(z) -> Dict[str, Any]:
+    return json.loads(z["meta_json"].tobytes().decode("utf-8"))
+
+
+def _lookup_bronze_key(engine, job_id: str) -> Optional[str]:
+    """The key the Batch export recorded on the job row (None if unset)."""
+    try:
+        with engine.connect() as conn:
+            return conn.execute(sql_text(
+                "SELECT bronze_s3_key FROM ml_analysis.video_analysis_jobs "
+                "WHERE job_id = :jid"
+            ), {"jid": job_id}).scalar()
+    except Exception as e:
+        logger.warning("bronze_ingest_t5: bronze_s3_key lookup failed for %s: %s", job_id, e)
+        return None
+
+
 def _upsert_match_analytics(conn, job_id: str, task_id: Optional[str], analytics: Dict[str, Any]) -> int:
     """Upsert match analytics row."""
     if not analytics:
@@ -225,17 +346,19 @@ def ingest_bronze_t5(
     s3_key: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
-    Download T5 bronze JSON from S3 and bulk-insert into ml_analysis.* tables.
+    Download T5 bronze from S3 and bulk-insert into ml_analysis.* tables.
 
     Streams the (potentially large) export so peak memory stays bounded — see
-    the module docstring for the OOM history.
+    the module docstring for the OOM history. A .npz key (schema_version 2) is
+    ingested via binary COPY; anything else via the v1 JSON stream.
 
     Args:
         job_id: ML analysis job_id (also used as task_id for T5)
         engine: SQLAlchemy engine (auto-resolved if None)
         replace: if True, delete existing rows for this job_id before inserting
         s3_bucket: S3 bucket (defaults to env S3_BUCKET)
-        s3_key: explicit S3 key (defaults to analysis/{job_id}/bronze.json.gz)
+        s3_key: explicit S3 key (defaults to the job row's bronze_s3_key, then
+                analysis/{job_id}/bronze.json.gz)
 
     Returns:
         dict with counts: ball_rows, player_rows, analytics_row
@@ -250,21 +373,36 @@ def ingest_bronze_t5(
             raise RuntimeError("S3_BUCKET env var not set and no s3_bucket arg provided")
 
     if s3_key is None:
-        s3_key = BRONZE_S3_KEY_TEMPLATE.format(job_id=job_id)
+        s3_key = _lookup_bronze_key(engine, job_id) or BRONZE_S3_KEY_TEMPLATE.format(job_id=job_id)
+    columnar = s3_key.endswith(".npz")
 
     logger.info("bronze_ingest_t5: job_id=%s s3=%s/%s replace=%s",
                  job_id, s3_bucket, s3_key, replace)
 
     gz_path = _download_bronze_to_tempfile(s3_bucket, s3_key)
+    z: Optional[Dict[str, Any]] = None
     try:
         # Small top-level fields (tiny) — streamed so the big arrays aren't built.
         t0 = time.time()
-        schema_version = _stream_top_field(gz_path, "schema_version")
-        if schema_version != 1:
+        if columnar:
+            import numpy as np
+            # Materialise each member once — NpzFile[...] re-inflates on every
+            # access. The arrays are compact (~15 MB of keypoints on a 44-min
+            # match); only the per-slice row lists are Python objects.
+            with np.load(gz_path, allow_pickle=False) as npz:
+                z = {name: npz[name] for name in npz.files}
+            meta = _load_npz_meta(z)
+            schema_version = meta.get("schema_version")
+            task_id = meta.get("task_id") or job_id
+            pipeline_meta = meta.get("pipeline_metadata") or {}
+            analytics = meta.get("match_analytics") or {}
+        else:
+            schema_version = _stream_top_field(gz_path, "schema_version")
+            task_id = _stream_top_field(gz_path, "task_id") or job_id
+            pipeline_meta = _stream_top_field(gz_path, "pipeline_metadata", {}) or {}
+            analytics = _stream_top_field(gz_path, "match_analytics", {}) or {}
+        if schema_version != (2 if columnar else 1):
             logger.warning("bronze_ingest_t5: unexpected schema_version=%s", schema_version)
-        task_id = _stream_top_field(gz_path, "task_id") or job_id
-        pipeline_meta = _stream_top_field(gz_path, "pipeline_metadata", {}) or {}
-        analytics = _stream_top_field(gz_path, "match_analytics", {}) or {}
         logger.info("bronze_ingest_t5: read metadata fields in %.0fms", (time.time() - t0) * 1000)
 
         t0 = time.time()
@@ -282,15 +420,15 @@ def ingest_bronze_t5(
                 # once a bounce-DEDUP/merge step exists (merge roi_prod into the
                 # main bounce set instead of adding net-new shot events). Until
                 # then the blanket delete keeps silver clean. See next_session_pickup.
-                conn.execute(sql_text(
-                    "DELETE FROM ml_analysis.ball_detections WHERE job_id = :jid"
-                ), {"jid": job_id})
-                conn.execute(sql_text(
-                    "DELETE FROM ml_analysis.player_detections WHERE job_id = :jid"
-                ), {"jid": job_id})
+                # Partitioned tables: TRUNCATE of the job's partition, no dead rows.
+                for table in DETECTION_TABLES:
+                    clear_job(conn, table, job_id)
                 conn.execute(sql_text(
                     "DELETE FROM ml_analysis.match_analytics WHERE job_id = :jid"
                 ), {"jid": job_id})
+            else:
+                for table in DETECTION_TABLES:
+                    ensure_job_partition(conn, table, job_id)
 
             # Singletons (small)
             _update_job_metadata(conn, job_id, pipeline_meta)
@@ -299,8 +437,12 @@ def ingest_bronze_t5(
             # Bulk ball + player via streamed COPY — need the underlying psycopg conn
             raw = conn.connection  # DBAPI connection (psycopg)
             dbapi_conn = getattr(raw, "driver_connection", None) or raw
-            counts["ball_rows"] = _copy_ball_detections_stream(dbapi_conn, job_id, gz_path)
-            counts["player_rows"] = _copy_player_detections_stream(dbapi_conn, job_id, gz_path)
+            if columnar:
+                counts["ball_rows"] = _copy_ball_detections_npz(dbapi_conn, job_id, z)
+                counts["player_rows"] = _copy_player_detections_npz(dbapi_conn, job_id, z)
+            else:
+                counts["ball_rows"] = _copy_ball_detections_stream(dbapi_conn, job_id, gz_path)
+                counts["player_rows"] = _copy_player_detections_stream(dbapi_conn, job_id, gz_path)
 
         logger.info(
             "bronze_ingest_t5: inserted job_id=%s ball=%d player=%d in %.0fms",
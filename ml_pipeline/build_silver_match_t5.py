@@ -17,7 +17,6 @@ Usage:
     result = build_silver_match_t5(task_id="...", replace=True)
 """
 
-import json
 import logging
 import math
 import os
@@ -28,43 +27,20 @@ from sqlalchemy import text as sql_text
 from sqlalchemy.engine import Connection
 
 from ml_pipeline.ball_merge import MAIN_ONLY_WHERE
+from ml_pipeline.keypoint_codec import kp_present_sql, kp_sql, kps_to_array
 
 logger = logging.getLogger(__name__)
 
 
 def _kps_to_array(raw) -> Optional["np.ndarray"]:
-    """Compact JSON/list keypoints to numpy float32 (17, 3) or None.
+    """Compact f16-blob/JSON/list keypoints to numpy float32 (17, 3) or None.
 
     Same helper used by serve_detector / stroke_detector — collapses each
     keypoints row from ~2KB Python list to ~204 bytes numpy array. Applied at
     load time in _build_player_buckets, this drops silver-build peak heap on
     a ~44-min match from ~269MB to ~110MB (the dominant allocator was the
     72k-row player_dets list with nested-list keypoints)."""
-    if raw is None:
-        return None
-    if isinstance(raw, str):
-        try:
-            raw = json.loads(raw)
-        except (json.JSONDecodeError, TypeError):
-            return None
-    if not raw:
-        return None
-    if isinstance(raw[0], (int, float)):
-        if len(raw) < 51:
-            return None
-        return np.asarray(raw[:51], dtype=np.float32).reshape(17, 3)
-    try:
-        arr = np.asarray(raw, dtype=np.float32)
-    except (ValueError, TypeError):
-        return None
-    if arr.ndim != 2 or arr.shape[1] != 3 or arr.shape[0] < 11:
-        return None
-    if arr.shape[0] > 17:
-        return arr[:17]
-    if arr.shape[0] < 17:
-        pad = np.zeros((17 - arr.shape[0], 3), dtype=np.float32)
-        return np.vstack([arr, pad])
-    return arr
+    return kps_to_array(raw)
 
 # ---------------------------------------------------------------------------
 # Court geometry (ITF standard — same constants as build_silver_v2.SPORT_CONFIG)
@@ -169,7 +145,7 @@ TABLE = "point_detail"
 # T5 PASS 1: shared player-detection index
 # ============================================================
 
-def _build_player_buckets(conn: Connection, job_id: str) -> dict:
+def _build_player_buckets(conn: Connection, job_id: str, store=None) -> dict:
     """Fetch player detections and build the side/keypoint indices used by
     both Pass-1 row-generation strategies (bounce-driven and stroke-driven).
 
@@ -180,6 +156,9 @@ def _build_player_buckets(conn: Connection, job_id: str) -> dict:
       near_kp_frames/..._dets — near players that also carry pose keypoints
       far_kp_frames/..._dets  — far players that also carry pose keypoints
       pid_map, top_pids       — ghost-id → top-2 mapping (guarantees 2 players)
+
+    `store` (TaskFrameStore for this job) supplies the main + ROI rows when the
+    post-ingest run already loaded them; the merge and bucketing are unchanged.
     """
     # Stream with a server-side cursor on a SEPARATE connection + compact
     # keypoints to numpy float32 (17,3) at load time. Without this, a 44-min
@@ -190,17 +169,24 @@ def _build_player_buckets(conn: Connection, job_id: str) -> dict:
     # DBAPI to a named cursor, which can't host the downstream INSERT
     # executemany on the same conn. Bronze isn't mutating during silver
     # build, so a fresh-snapshot read is safe.
-    with conn.engine.connect() as _sc:
-        _sc = _sc.execution_options(stream_results=True, yield_per=5000)
-        player_dets = [
-            (r[0], r[1], r[2], r[3], r[4], r[5], _kps_to_array(r[6]), r[7])
-            for r in _sc.execute(sql_text("""
-                SELECT frame_idx, player_id, court_x, court_y, center_x, center_y, keypoints, stroke_class
-                FROM ml_analysis.player_detections
-                WHERE job_id = :jid
-                ORDER BY frame_idx
-            """), {"jid": job_id})
-        ]
+    _cols = ("frame_idx", "player_id", "court_x", "court_y", "center_x", "center_y", "keypoints")
+    if store is not None:
+        # Already loaded (and keypoints parsed) once for the whole post-ingest run.
+        player_dets = store.rows(store.players, store.select(store.players),
+                                 _cols + ("stroke_class",))
+    else:
+        with conn.engine.connect() as _sc:
+            _sc = _sc.execution_options(stream_results=True, yield_per=5000)
+            player_dets = [
+                (r[0], r[1], r[2], r[3], r[4], r[5], _kps_to_array(r[6]), r[7])
+                for r in _sc.execute(sql_text(f"""
+                    SELECT frame_idx, player_id, court_x, court_y, center_x, center_y,
+                           {kp_sql()} AS keypoints, stroke_class
+                    FROM ml_analysis.player_detections
+                    WHERE job_id = :jid
+                    ORDER BY frame_idx
+                """), {"jid": job_id})
+            ]
 
     # ---- Merge far ViTPose pose from ml_analysis.player_detections_roi ----
     # extract_far_pose writes high-quality far-player keypoints (source=
@@ -215,24 +201,33 @@ def _build_player_buckets(conn: Connection, job_id: str) -> dict:
     # missing table can't poison the txn (memory feedback_postgres_missing_table).
     # No-op on SportAI tasks (they have no ROI rows) and on tasks predating the
     # ROI extractor.
-    roi_present = conn.execute(sql_text("""
-        SELECT 1 FROM information_schema.tables
-        WHERE table_schema = 'ml_analysis' AND table_name = 'player_detections_roi'
-        LIMIT 1
-    """)).scalar()
+    if store is not None:
+        roi_present = store.players_roi is not None
+    else:
+        roi_present = conn.execute(sql_text("""
+            SELECT 1 FROM information_schema.tables
+            WHERE table_schema = 'ml_analysis' AND table_name = 'player_detections_roi'
+            LIMIT 1
+        """)).scalar()
     if roi_present:
-        # Same streaming + numpy-compaction pattern (separate conn — see above).
-        with conn.engine.connect() as _sc:
-            _sc = _sc.execution_options(stream_results=True, yield_per=5000)
-            roi_rows = [
-                (r[0], r[1], r[2], r[3], r[4], r[5], _kps_to_array(r[6]), None)
-                for r in _sc.execute(sql_text("""
-                    SELECT frame_idx, player_id, court_x, court_y, center_x, center_y, keypoints
-                    FROM ml_analysis.player_detections_roi
-                    WHERE job_id = :jid AND keypoints IS NOT NULL
-                    ORDER BY frame_idx
-                """), {"jid": job_id})
-            ]
+        if store is not None:
+            _rt = store.players_roi
+            roi_rows = [r + (None,) for r in
+                        store.rows(_rt, store.select(_rt, kp_present=True), _cols)]
+        else:
+            # Same streaming + numpy-compaction pattern (separate conn — see above).
+            with conn.engine.connect() as _sc:
+                _sc = _sc.execution_options(stream_results=True, yield_per=5000)
+                roi_rows = [
+                    (r[0], r[1], r[2], r[3], r[4], r[5], _kps_to_array(r[6]), None)
+                    for r in _sc.execute(sql_text(f"""
+                        SELECT frame_idx, player_id, court_x, court_y, center_x, center_y,
+                               {kp_sql()} AS keypoints
+                        FROM ml_analysis.player_detections_roi
+                        WHERE job_id = :jid AND {kp_present_sql()}
+                        ORDER BY frame_idx
+                    """), {"jid": job_id})
+                ]
         if roi_rows:
             merged = {(r[1], r[0]): r for r in player_dets}  # (player_id, frame_idx) -> row
             roi_won = roi_added = 0
@@ -387,7 +382,8 @@ def _load_bounce_index(conn: Connection, job_id: str):
 # T5 PASS 1 (bounce-driven): one bounce → one silver row
 # ============================================================
 
-def _t5_pass1_load_bounce_driven(conn: Connection, task_id: str, job_id: str, fps: float) -> int:
+def _t5_pass1_load_bounce_driven(conn: Connection, task_id: str, job_id: str, fps: float,
+                                 store=None) -> int:
     """
     Transform T5 ml_analysis.* bounce data into silver.point_detail base fields.
 
@@ -432,7 +428,7 @@ def _t5_pass1_load_bounce_driven(conn: Connection, task_id: str, job_id: str, fp
     logger.info("T5 Pass 1: %d bounces for job_id=%s at %.1f fps", len(bounces), job_id, fps)
 
     # ---- Step 2-3: Shared player-detection buckets + two-player mapping ----
-    buckets = _build_player_buckets(conn, job_id)
+    buckets = _build_player_buckets(conn, job_id, store=store)
     near_frames, near_dets = buckets["near_frames"], buckets["near_dets"]
     far_frames, far_dets = buckets["far_frames"], buckets["far_dets"]
     any_frames, any_dets = buckets["any_frames"], buckets["any_dets"]
@@ -931,7 +927,8 @@ def _apply_serve_events_overlay(
 # T5 PASS 1 (stroke-driven): one stroke contact → one silver row
 # ============================================================
 
-def _t5_pass1_load_stroke_driven(conn: Connection, task_id: str, job_id: str, fps: float) -> int:
+def _t5_pass1_load_stroke_driven(conn: Connection, task_id: str, job_id: str, fps: float,
+                                 store=None) -> int:
     """Phase 6: generate one silver row per detected stroke contact.
 
     Iterates ml_analysis.stroke_events (pose wrist-velocity peaks) instead of
@@ -969,7 +966,7 @@ def _t5_pass1_load_stroke_driven(conn: Connection, task_id: str, job_id: str, fp
     # stroke_events (the model owns the hit fact, 867119f), so the hit-
     # reconstruction buckets (near/far/any/kp/pid_map) are no longer
     # read here — that assembly moved to stroke_detector.hit_location.
-    buckets = _build_player_buckets(conn, job_id)
+    buckets = _build_player_buckets(conn, job_id, store=store)
     near_sc_frames, near_sc_dets = buckets["near_sc_frames"], buckets["near_sc_dets"]
     far_sc_frames, far_sc_dets = buckets["far_sc_frames"], buckets["far_sc_dets"]
     top_pids = buckets["top_pids"]
@@ -1200,7 +1197,8 @@ def _stroke_driven_enabled() -> bool:
     return os.getenv("T5_STROKE_DRIVEN_SILVER", "1").strip().lower() in ("1", "true", "yes", "on")
 
 
-def _t5_pass1_load(conn: Connection, task_id: str, job_id: str, fps: float) -> int:
+def _t5_pass1_load(conn: Connection, task_id: str, job_id: str, fps: float,
+                   store=None) -> int:
     """Pick the Pass-1 row-generation strategy.
 
     STROKE-DRIVEN IS THE LIVE PROD PATH (T5_STROKE_DRIVEN_SILVER defaults ON,
@@ -1231,11 +1229,11 @@ def _t5_pass1_load(conn: Connection, task_id: str, job_id: str, fps: float) -> i
                     "T5 Pass 1: stroke-driven row generation ENABLED via "
                     "T5_STROKE_DRIVEN_SILVER (task=%s, %d stroke events)", task_id, n,
                 )
-                return _t5_pass1_load_stroke_driven(conn, task_id, job_id, fps)
+                return _t5_pass1_load_stroke_driven(conn, task_id, job_id, fps, store=store)
         logger.info("T5 Pass 1: stroke-driven enabled but no stroke events — bounce-driven (task=%s)", task_id)
     else:
         logger.info("T5 Pass 1: bounce-driven (live default; stroke-driven gated off) task=%s", task_id)
-    return _t5_pass1_load_bounce_driven(conn, task_id, job_id, fps)
+    return _t5_pass1_load_bounce_driven(conn, task_id, job_id, fps, store=store)
 
 
 def _build_detection_index(dets: List[dict]) -> Tuple[List[int], List[dict]]:
@@ -1307,7 +1305,8 @@ def _find_nearest_detection(frames: List[int], dets: List[dict],
 # ============================================================
 
 def build_silver_match_t5(task_id: str, replace: bool = True,
-                          engine=None) -> Dict:
+                          engine=None, store=None,
+                          silver_engine: Optional[str] = None) -> Dict:
     """
     Build silver.point_detail from T5 ML pipeline bronze data for a singles match.
 
@@ -1321,6 +1320,10 @@ def build_silver_match_t5(task_id: str, replace: bool = True,
         task_id: task_id/job_id from ml_analysis.video_analysis_jobs
         replace: if True, delete existing T5 rows before rebuilding
         engine: SQLAlchemy engine (auto-resolved if None)
+        store: optional TaskFrameStore already loaded by the post-ingest run
+            (used only when it was opened for this job_id)
+        silver_engine: 'legacy' | 'staged' for the shared passes (default
+            build_silver_v2.SILVER_ENGINE — see there)
 
     Returns:
         dict with pass row counts and metadata
@@ -1331,13 +1334,19 @@ def build_silver_match_t5(task_id: str, replace: bool = True,
 
     # Import shared passes from build_silver_v2
     from build_silver_v2 import (
+        BuildProfile,
         ensure_schema,
         pass3_point_context,
         pass4_zones_and_normalize,
         pass5_analytics,
+        resolve_engine,
+        stage_flush,
+        stage_open,
     )
 
-    out: Dict = {"task_id": task_id, "model": "t5"}
+    engine_name = resolve_engine(silver_engine)
+    out: Dict = {"task_id": task_id, "model": "t5", "silver_engine": engine_name}
+    profile = BuildProfile(task_id, engine_name, "t5")
 
     with engine.begin() as conn:
         # Ensure schema + columns exist (including model column)
@@ -1380,7 +1389,10 @@ def build_silver_match_t5(task_id: str, replace: bool = True,
             ), {"tid": task_id})
 
         # T5 Pass 1: Extract bounces → 18 base fields
-        out["pass1_rows"] = _t5_pass1_load(conn, task_id, job_id, fps)
+        if store is not None and store.task_id != str(job_id):
+            store = None
+        out["pass1_rows"] = profile.run("pass1", _t5_pass1_load, conn, task_id, job_id, fps,
+                                        store=store, explain=False)
 
         if out["pass1_rows"] == 0:
             logger.warning("T5 match builder: pass 1 produced 0 rows — skipping passes 3-5")
@@ -1391,26 +1403,38 @@ def build_silver_match_t5(task_id: str, replace: bool = True,
         # They work on ALL rows for this task_id (both models if present)
         cfg = SPORT_CONFIG_SINGLES
 
+        # Staged engine: passes 3-5 run on a TEMP copy of the task's rows and
+        # the result replaces them in one write (build_silver_v2.stage_open).
+        tgt = profile.run("stage_open", stage_open, conn, task_id) if engine_name == "staged" else None
+
         try:
-            out["pass3_rows"] = pass3_point_context(conn, task_id, cfg)
+            out["pass3_rows"] = profile.run("pass3", pass3_point_context, conn, task_id, cfg,
+                                            target=tgt)
         except Exception as e:
             logger.warning("T5 match builder: pass 3 failed (non-fatal): %s", e)
             out["pass3_error"] = str(e)
             out["pass3_rows"] = 0
 
         try:
-            out["pass4_rows"] = pass4_zones_and_normalize(conn, task_id, cfg)
+            out["pass4_rows"] = profile.run("pass4", pass4_zones_and_normalize, conn, task_id, cfg,
+                                            target=tgt)
         except Exception as e:
             logger.warning("T5 match builder: pass 4 failed (non-fatal): %s", e)
             out["pass4_error"] = str(e)
             out["pass4_rows"] = 0
 
         try:
-            out["pass5_rows"] = pass5_analytics(conn, task_id, cfg)
+            out["pass5_rows"] = profile.run("pass5", pass5_analytics, conn, task_id, cfg,
+                                            target=tgt)
         except Exception as e:
             logger.warning("T5 match builder: pass 5 failed (non-fatal): %s", e)
             out["pass5_error"] = str(e)
             out["pass5_rows"] = 0
 
+        if tgt is not None:
+            out["staged_rows_written"] = profile.run("stage_flush", stage_flush, conn, task_id)
+        out["pass_seconds"] = profile.seconds()
+        profile.write(conn)
+
     logger.info("T5 match builder COMPLETE: %s", out)
     return out
@@ -19,6 +19,8 @@ from typing import Dict
 
 from sqlalchemy import text as sql_text
 
+from ml_pipeline.keypoint_codec import kp_present_sql, kp_sql, kps_to_array
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
@@ -473,9 +475,9 @@ def _pass3_stroke_inference(conn, task_id):
         fh, bh = bh, fh
 
     # Try pose-based inference first: check if any player detections have keypoints
-    has_kps = conn.execute(sql_text("""
+    has_kps = conn.execute(sql_text(f"""
         SELECT count(*) FROM ml_analysis.player_detections
-        WHERE job_id = :tid AND keypoints IS NOT NULL
+        WHERE job_id = :tid AND {kp_present_sql()}
         LIMIT 1
     """), {"tid": task_id}).scalar()
 
@@ -488,14 +490,14 @@ def _pass3_stroke_inference(conn, task_id):
         logger.info("Stroke inference: using pose keypoints (wrist_idx=%d, hand=%s)", wrist_idx, dominant)
 
         # Get practice detail rows with matching player keypoints
-        rows = conn.execute(sql_text("""
+        rows = conn.execute(sql_text(f"""
             SELECT pd.id, pd.frame_idx, pd.player_court_x,
                    p.keypoints, p.center_x
             FROM silver.practice_detail pd
             LEFT JOIN LATERAL (
-                SELECT pk.keypoints, pk.center_x
+                SELECT {kp_sql("pk")} AS keypoints, pk.center_x
                 FROM ml_analysis.player_detections pk
-                WHERE pk.job_id = :tid AND pk.keypoints IS NOT NULL
+                WHERE pk.job_id = :tid AND {kp_present_sql("pk")}
                 ORDER BY ABS(pk.frame_idx - pd.frame_idx)
                 LIMIT 1
             ) p ON TRUE
@@ -506,9 +508,8 @@ def _pass3_stroke_inference(conn, task_id):
         for row_id, frame_idx, pcx, kps_json, center_x in rows:
             if kps_json is None or center_x is None:
                 continue
-            import json
-            kps = json.loads(kps_json) if isinstance(kps_json, str) else kps_json
-            if len(kps) <= wrist_idx:
+            kps = kps_to_array(kps_json)
+            if kps is None:
                 continue
             wrist_x, wrist_y, wrist_conf = kps[wrist_idx]
             if wrist_conf < 0.3:
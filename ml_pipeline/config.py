@@ -51,6 +51,18 @@ TRACKNET_HOUGH_PARAM1 = 50
 TRACKNET_HOUGH_PARAM2 = 2
 TRACKNET_HOUGH_MIN_RADIUS = 1   # Allow smaller ball circles (serves/fast balls)
 TRACKNET_HOUGH_MAX_RADIUS = 10  # Allow larger ball circles (slow/zoomed)
+
+# TrackNet heatmap postprocess (BallTracker._postprocess_heatmaps). Default on:
+# the per-frame Hough -> CC -> argmax tiers run over a whole stack of argmax
+# maps — max / histogram / threshold / mask counts in one vectorised pass,
+# frames with an empty mask (most of them) skip cv2 entirely, and Hough + CC
+# run on the mask's bounding box (even-aligned, padded past the Hough radius)
+# instead of the full 640x360 map. Same (x, y) and the same _diag tier
+# counters as the per-frame path (ml_pipeline/tests/test_tracknet_postprocess.py
+# holds both paths to that); the ROI bounce pass was CPU-bound on exactly
+# this (~0.13 s/frame, C1 in t5_runtime_backlog.md). 0 = legacy per-frame
+# full-map postprocess.
+TRACKNET_BATCH_POSTPROCESS = os.getenv("TRACKNET_BATCH_POSTPROCESS", "1") != "0"
 BALL_MAX_INTERPOLATION_GAP = 5   # Standard 5 frames
 BALL_MAX_DIST_BETWEEN_FRAMES = 150
 BALL_MAX_DIST_GAP = 150
@@ -212,6 +224,64 @@ YOLO_FP16 = os.getenv("YOLO_FP16", "0").strip().lower() in ("1", "true", "yes")
 # (zero-risk rollback).
 PIPELINE_STAGE_OVERLAP = os.getenv("PIPELINE_STAGE_OVERLAP", "0").strip().lower() in ("1", "true", "yes")
 
+# ---------------------------------------------------------------------------
+# Decode prefetch (producer/consumer main loop). The per-frame loop pulls
+# frames from VideoPreprocessor.frames() synchronously, so the H.264 decode +
+# the ball-model / MOG2 resizes sit on the critical path between GPU calls
+# (the "decode_wait" stage in the stage-timing log measures it). With
+# DECODE_PREFETCH=N a single producer thread (ml_pipeline/frame_prefetch.py)
+# decodes up to N frames ahead into a bounded queue and precomputes those
+# resizes; _process_frame consumes the ready buffers. Frames are consumed in
+# strict order and the prepared buffers are the same cv2.resize calls the
+# stages make inline, so outputs are identical. Memory: N full frames in
+# flight (~6 MB each at 1080p). 8 is a good starting point.
+# Default 0 = today's synchronous decode (zero-risk rollback).
+DECODE_PREFETCH = max(0, int(os.getenv("DECODE_PREFETCH", "0")))
+
+# ---------------------------------------------------------------------------
+# Single-decode ROI sweep (C3 in docs/_investigation/t5_runtime_backlog.md).
+# The post-pipeline ROI sweep (roi_extractors/unified.py) re-decodes the whole
+# source video — the ~51-min second rock. With ROI_FRAME_SPILL=1 the main loop
+# spills the ROI region (union of far-pose / service-box / far-court rects,
+# known once the court locks) of every sampled frame to a chunked local store
+# (ml_pipeline/frame_spill.py) and the sweep replays it instead of opening
+# cv2.VideoCapture. Same frames, same 25fps index space; only the decode is
+# removed.
+#
+# Raw, a 1080p/47-min match with the ROI union at ~50% of the frame is
+# ~220 GB — more than the g4dn.xlarge instance store holds. So the crops are
+# spilled as JPEG at ROI_FRAME_SPILL_JPEG_QUALITY (default 95, well under the
+# H.264 source's own quantisation noise; ROI rows can differ from the decode
+# path at that noise level), which puts a full match inside the default
+# budget. ROI_FRAME_SPILL_JPEG_QUALITY=0 spills raw pixels (identical rows,
+# full size — short matches / tight cameras only).
+#
+# ROI_FRAME_SPILL_MAX_GB caps the disk the store may use; a projected overrun
+# (raw: when the rect locks; JPEG: after the first full chunk of ROI crops)
+# or any write error disables the store and the sweep falls back to its own
+# decode. ROI_FRAME_SPILL_DIR picks the volume (default: the system temp dir).
+# Default 0 = today's two-decode behaviour (zero-risk rollback).
+ROI_FRAME_SPILL = os.getenv("ROI_FRAME_SPILL", "0").strip().lower() in ("1", "true", "yes")
+ROI_FRAME_SPILL_MAX_GB = float(os.getenv("ROI_FRAME_SPILL_MAX_GB", "60"))
+ROI_FRAME_SPILL_DIR = os.getenv("ROI_FRAME_SPILL_DIR", "").strip() or None
+ROI_FRAME_SPILL_CHUNK = max(1, int(os.getenv("ROI_FRAME_SPILL_CHUNK", "250")))
+ROI_FRAME_SPILL_JPEG_QUALITY = min(100, max(0, int(os.getenv("ROI_FRAME_SPILL_JPEG_QUALITY", "95"))))
+
+# Swing-type optical flow (stroke_classifier/inference_v2.py). The v2
+# classifier used to re-open the source video after the main loop, seek once
+# per hitter-candidate for its 16-frame window and run Farneback serially on
+# one core. With SWING_FLOW_FUSED=1 the windows are gathered by the unified
+# ROI sweep's decode (it already walks the source video; it now also retrieves
+# the source frames inside swing windows) and classification happens after the
+# sweep, before results are saved. The standalone seek path stays the fallback
+# (spill replay, practice mode, any sweep failure). Either way Farneback runs
+# on a process pool of SWING_FLOW_WORKERS (0 = every vCPU the job is pinned
+# to); at most SWING_FLOW_INFLIGHT windows are queued ahead of predict_batch.
+# 0 = legacy in-_postprocess classification (pool still used).
+SWING_FLOW_FUSED = os.getenv("SWING_FLOW_FUSED", "1").strip().lower() in ("1", "true", "yes")
+SWING_FLOW_WORKERS = max(0, int(os.getenv("SWING_FLOW_WORKERS", "0")))
+SWING_FLOW_INFLIGHT = max(1, int(os.getenv("SWING_FLOW_INFLIGHT", "64")))
+
 # ---------------------------------------------------------------------------
 # Court detector (ResNet50 keypoints)
 # ---------------------------------------------------------------------------
@@ -226,6 +296,22 @@ COURT_CONFIDENCE_THRESHOLD = 0.5   # Below this → fall back to Hough lines
 COURT_IMAGENET_MEAN = [0.485, 0.456, 0.406]
 COURT_IMAGENET_STD = [0.229, 0.224, 0.225]
 
+# Per-camera calibration cache (court_calibration_cache.py). Most customers
+# film repeatedly from the same fixed club camera, yet every job re-ran the
+# CNN + Hough search and the lens fit before locking. A locked calibration is
+# stored in ml_analysis.court_calibration_cache keyed by (resolution, edge-map
+# fingerprint of the first frame); a new job whose fingerprint is within
+# COURT_CALIB_CACHE_MAX_HAMMING bits re-detects the keypoints on its first
+# COURT_CALIB_CACHE_VALIDATE_FRAMES CNN runs, and locks the cached
+# calibration only if every run agrees within COURT_CALIB_CACHE_MAX_KP_PX
+# (median, source pixels) and _projection_quality clears the lock floors.
+# Any miss falls back to the full calibration search. 0 = no lookup/store.
+# Gates covered by ml_pipeline/tests/test_court_calibration_cache.py.
+COURT_CALIB_CACHE = os.getenv("COURT_CALIB_CACHE", "1").strip().lower() in ("1", "true", "yes")
+COURT_CALIB_CACHE_MAX_HAMMING = int(os.getenv("COURT_CALIB_CACHE_MAX_HAMMING", "80"))  # of 512 bits
+COURT_CALIB_CACHE_VALIDATE_FRAMES = max(1, int(os.getenv("COURT_CALIB_CACHE_VALIDATE_FRAMES", "3")))
+COURT_CALIB_CACHE_MAX_KP_PX = float(os.getenv("COURT_CALIB_CACHE_MAX_KP_PX", "6.0"))
+
 # Hough line fallback parameters
 HOUGH_RHO = 1
 HOUGH_THETA_DIVISOR = 180          # np.pi / HOUGH_THETA_DIVISOR
@@ -405,9 +491,31 @@ MOG2_DOWNSCALE = max(1, int(os.getenv("MOG2_DOWNSCALE", "1")))
 # ---------------------------------------------------------------------------
 PROGRESS_LOG_INTERVAL = 100        # Log progress every N frames
 
+# Batch telemetry (ml_pipeline/telemetry_writer.py). Progress updates, the
+# per-stage timing snapshot and loop diagnostics are coalesced by a background
+# thread into ONE transaction every TELEMETRY_FLUSH_SEC seconds instead of a
+# synchronous UPDATE on the pipeline thread per _report_progress call (a slow
+# or reconnecting Postgres used to stall the frame loop). Latest value wins
+# between flushes; terminal states (complete / failed) always flush through
+# synchronously. 0 = legacy synchronous writes, progress only (no
+# ml_analysis.job_stage_timings rows).
+TELEMETRY_FLUSH_SEC = max(0.0, float(os.getenv("TELEMETRY_FLUSH_SEC", "10")))
+
 # ---------------------------------------------------------------------------
 # Bounce / speed detection
 # ---------------------------------------------------------------------------
 BOUNCE_VELOCITY_WINDOW = 5         # Standard 5 frames (shorter broke bounce detection)
 BOUNCE_MIN_DIRECTION_CHANGE = 25   # Minimum frames of sustained direction change (rally split)
 SPEED_SMOOTHING_WINDOW = 3         # Frames to average for speed calc
+
+# ---------------------------------------------------------------------------
+# Bronze export format
+# ---------------------------------------------------------------------------
+# "json" (default): analysis/{job_id}/bronze.json.gz, schema_version 1 — one
+# JSON dict per detection, re-parsed row by row with ijson on the Render
+# ingest. "npz": analysis/{job_id}/bronze.v2.npz, schema_version 2 — one
+# compressed NumPy column per field (flat float32 keypoints), ingested by
+# COPY ... (FORMAT BINARY) straight from the columns. The ingest picks the
+# reader off the job row's bronze_s3_key, so v1 exports keep re-ingesting.
+# Flip to npz only after the Render service carrying the v2 reader is live.
+BRONZE_EXPORT_FORMAT = os.getenv("BRONZE_EXPORT_FORMAT", "json").strip().lower()
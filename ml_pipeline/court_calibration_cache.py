@@ -0,0 +1,209 @@
+"""Persistent per-camera court calibration cache.
+
+CourtDetector.detect re-runs the keypoint CNN + _detect_hough for at least
+COURT_CALIBRATION_FRAMES (usually far longer — COURT_MIN_CALIB_OBS validated
+observations and the COURT_GREAT_COVERAGE search) and then re-fits the lens
+model, on every job. Most customers film again and again from the same fixed
+club camera, so the answer is almost always one we already computed.
+
+A locked calibration (lens CalibrationResult, locked homography + keypoints)
+is stored in ml_analysis.court_calibration_cache, keyed by:
+
+    frame_width, frame_height   exact match
+    fingerprint                 512-bit edge-map hash of the first frame;
+                                nearest row within COURT_CALIB_CACHE_MAX_HAMMING
+
+The fingerprint is only a candidate selector — court lines dominate a fixed
+camera's edge map, players and lighting move a few bits. Acceptance is decided
+by CourtDetector on the new video itself: its first
+COURT_CALIB_CACHE_VALIDATE_FRAMES CNN runs must put the keypoints where the
+cached ones are, and _projection_quality must clear the usual lock floors. A
+miss anywhere drops the candidate and the full calibration search runs as
+before; a full search that locks stores its result for the next job.
+
+Lookup/store failures are logged and never fail the job. COURT_CALIB_CACHE=0
+disables both.
+"""
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import dataclass
+from typing import Optional
+
+import cv2
+import numpy as np
+from sqlalchemy import text as sql_text
+
+from ml_pipeline.camera_calibration import (
+    CalibrationResult,
+    calibration_from_dict,
+    calibration_to_dict,
+)
+from ml_pipeline.config import COURT_CALIB_CACHE, COURT_CALIB_CACHE_MAX_HAMMING
+
+logger = logging.getLogger(__name__)
+
+# Fingerprint grid: 32x16 cells → 512 bits. Each bit is "this cell has more
+# edge pixels than the median cell", which keeps ~half the bits set whatever
+# the exposure and makes Hamming distance meaningful across lighting changes.
+_FP_GRID_W = 32
+_FP_GRID_H = 16
+_FP_WORK_W = 320
+_FP_WORK_H = 180
+
+_LOOKUP_SQL = """
+    SELECT id, fingerprint, calibration, keypoints, homography, confidence
+    FROM ml_analysis.court_calibration_cache
+    WHERE frame_width = :w AND frame_height = :h
+    ORDER BY last_used_at DESC
+    LIMIT 500
+"""
+
+_STORE_SQL = """
+    INSERT INTO ml_analysis.court_calibration_cache
+        (fingerprint, frame_width, frame_height, calibration, keypoints,
+         homography, confidence, source_job_id)
+    VALUES
+        (:fp, :w, :h, CAST(:calibration AS JSONB), CAST(:keypoints AS JSONB),
+         CAST(:homography AS JSONB), :confidence, :job_id)
+    ON CONFLICT (frame_width, frame_height, fingerprint) DO UPDATE SET
+        calibration = EXCLUDED.calibration,
+        keypoints = EXCLUDED.keypoints,
+        homography = EXCLUDED.homography,
+        confidence = EXCLUDED.confidence,
+        source_job_id = EXCLUDED.source_job_id,
+        last_used_at = now()
+"""
+
+_HIT_SQL = """
+    UPDATE ml_analysis.court_calibration_cache
+    SET hits = hits + 1, last_used_at = now()
+    WHERE id = :id
+"""
+
+
+def frame_fingerprint(frame: np.ndarray) -> str:
+    """512-bit perceptual hash of a frame's edge map, as 128 hex chars."""
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+    small = cv2.resize(gray, (_FP_WORK_W, _FP_WORK_H), interpolation=cv2.INTER_AREA)
+    edges = cv2.Canny(cv2.GaussianBlur(small, (3, 3), 0), 50, 150)
+    cells = cv2.resize(
+        edges.astype(np.float32), (_FP_GRID_W, _FP_GRID_H),
+        interpolation=cv2.INTER_AREA,
+    ).reshape(-1)
+    bits = cells > np.median(cells)
+    return np.packbits(bits).tobytes().hex()
+
+
+def hamming(fp_a: str, fp_b: str) -> int:
+    """Bit distance between two frame_fingerprint values (512 if sizes differ)."""
+    a = np.frombuffer(bytes.fromhex(fp_a), dtype=np.uint8)
+    b = np.frombuffer(bytes.fromhex(fp_b), dtype=np.uint8)
+    if a.shape != b.shape:
+        return _FP_GRID_W * _FP_GRID_H
+    return int(np.unpackbits(a ^ b).sum())
+
+
+@dataclass
+class CachedCalibration:
+    """One cache row, ready for CourtDetector.use_cached_calibration."""
+    id: int
+    fingerprint: str
+    distance: int
+    calibration: Optional[CalibrationResult]
+    keypoints: np.ndarray              # (14, 2), -1 = missing
+    homography: Optional[np.ndarray]   # (3, 3)
+    confidence: float
+
+
+class CourtCalibrationCache:
+    """Lookup/store for ml_analysis.court_calibration_cache on one engine."""
+
+    def __init__(self, engine, job_id: Optional[str] = None):
+        self.engine = engine
+        self.job_id = job_id
+
+    def lookup(self, fingerprint: str, frame_shape) -> Optional[CachedCalibration]:
+        """Nearest cached calibration for this resolution, or None."""
+        h, w = int(frame_shape[0]), int(frame_shape[1])
+        try:
+            with self.engine.connect() as conn:
+                rows = conn.execute(sql_text(_LOOKUP_SQL), {"w": w, "h": h}).mappings().all()
+        except Exception as e:
+            logger.warning("court_calib_cache: lookup failed (%s) — full calibration", e)
+            return None
+
+        best, best_d = None, COURT_CALIB_CACHE_MAX_HAMMING + 1
+        for r in rows:
+            d = hamming(fingerprint, r["fingerprint"])
+            if d < best_d:
+                best, best_d = r, d
+        if best is None:
+            logger.info(
+                "court_calib_cache: miss (%dx%d, %d candidates, max_hamming=%d)",
+                w, h, len(rows), COURT_CALIB_CACHE_MAX_HAMMING,
+            )
+            return None
+
+        cal = best["calibration"]
+        kps = best["keypoints"]
+        H = best["homography"]
+        # psycopg hands JSONB back decoded; tolerate text for other drivers.
+        if isinstance(cal, str):
+            cal = json.loads(cal)
+        if isinstance(kps, str):
+            kps = json.loads(kps)
+        if isinstance(H, str):
+            H = json.loads(H)
+        logger.info(
+            "court_calib_cache: candidate id=%d hamming=%d (%dx%d)",
+            best["id"], best_d, w, h,
+        )
+        return CachedCalibration(
+            id=int(best["id"]),
+            fingerprint=best["fingerprint"],
+            distance=best_d,
+            calibration=None if cal is None else calibration_from_dict(cal, (h, w)),
+            keypoints=np.asarray(kps, dtype=np.float32).reshape(-1, 2),
+            homography=None if H is None else np.asarray(H, dtype=np.float64),
+            confidence=float(best["confidence"] or 0.0),
+        )
+
+    def record_hit(self, entry: CachedCalibration) -> None:
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(sql_text(_HIT_SQL), {"id": entry.id})
+        except Exception as e:
+            logger.warning("court_calib_cache: hit update failed (%s)", e)
+
+    def store(self, fingerprint: str, frame_shape, calibration: Optional[CalibrationResult],
+              keypoints: np.ndarray, homography: Optional[np.ndarray],
+              confidence: float) -> None:
+        h, w = int(frame_shape[0]), int(frame_shape[1])
+        params = {
+            "fp": fingerprint,
+            "w": w,
+            "h": h,
+            "calibration": json.dumps(
+                None if calibration is None else calibration_to_dict(calibration)),
+            "keypoints": json.dumps(np.asarray(keypoints, dtype=np.float64).tolist()),
+            "homography": json.dumps(
+                None if homography is None
+                else np.asarray(homography, dtype=np.float64).tolist()),
+            "confidence": float(confidence),
+            "job_id": self.job_id,
+        }
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(sql_text(_STORE_SQL), params)
+            logger.info("court_calib_cache: stored calibration (%dx%d)", w, h)
+        except Exception as e:
+            logger.warning("court_calib_cache: store failed (%s)", e)
+
+
+def open_cache(engine, job_id: Optional[str] = None) -> Optional[CourtCalibrationCache]:
+    """CourtCalibrationCache for engine, or None when COURT_CALIB_CACHE=0."""
+    if not COURT_CALIB_CACHE or engine is None:
+        return None
+    return CourtCalibrationCache(engine, job_id=job_id)
@@ -18,7 +18,9 @@ from ml_pipeline.camera_calibration import (
     evaluate_calibration,
     fit_calibration,
     project_metres_to_pixel,
+    project_metres_to_pixel_batch,
     project_pixel_to_metres,
+    project_pixel_to_metres_batch,
 )
 
 logger = logging.getLogger(__name__)
@@ -29,6 +31,8 @@ from ml_pipeline.config import (
     COURT_DETECTION_INTERVAL,
     COURT_CALIBRATION_FRAMES,
     COURT_CONFIDENCE_THRESHOLD,
+    COURT_CALIB_CACHE_VALIDATE_FRAMES,
+    COURT_CALIB_CACHE_MAX_KP_PX,
     COURT_REFERENCE_KEYPOINTS,
     COURT_LENGTH_M,
     COURT_WIDTH_DOUBLES_M,
@@ -155,7 +159,8 @@ class CourtDetection:
 # ── CourtDetector ───────────────────────────────────────────────────────────
 
 class CourtDetector:
-    def __init__(self, weights_path: str = COURT_DETECTOR_WEIGHTS, device: str = None):
+    def __init__(self, weights_path: str = COURT_DETECTOR_WEIGHTS, device: str = None,
+                 calibration_cache=None):
         self.device = device or ("cuda" if torch.cuda.is_available() else "cpu")
         self.model = self._load_model(weights_path)
         self.ref_keypoints = np.array(COURT_REFERENCE_KEYPOINTS, dtype=np.float32)
@@ -184,6 +189,16 @@ class CourtDetector:
         # lock-first): (calibration, detection, coverage, y_span, x_span).
         self._best_lock: Optional[tuple] = None
         self._best_lock_cov: float = -1.0
+        # Per-camera calibration cache (court_calibration_cache.py). The first
+        # detect() fingerprints the frame and looks up a candidate; the next
+        # COURT_CALIB_CACHE_VALIDATE_FRAMES CNN runs must agree with its
+        # keypoints before it is locked. A full-search lock is stored back.
+        self._calibration_cache = calibration_cache
+        self._cache_fingerprint: Optional[str] = None
+        self._cache_frame_shape: Optional[tuple] = None
+        self._cache_candidate = None
+        self._cache_matches: int = 0
+        self.locked_from_cache: bool = False
 
     def _load_model(self, weights_path: str) -> CourtKeypointNet:
         model = CourtKeypointNet(in_channels=3, out_channels=15)
@@ -201,6 +216,9 @@ class CourtDetector:
         1. First COURT_CALIBRATION_FRAMES: run CNN, track best detection
         2. After calibration: LOCK the best detection, stop running CNN
         3. All subsequent frames reuse the locked homography (zero cost)
+
+        With a calibration cache, a fingerprint-matched cached calibration
+        that the first CNN runs confirm is locked instead, skipping 1-2.
         """
         # If locked, always return locked detection (post-calibration)
         if self._locked_detection is not None:
@@ -210,7 +228,18 @@ class CourtDetector:
         if (frame_idx - self._last_frame_idx) < self._detect_interval and self._last_detection is not None:
             return self._last_detection
 
+        if self._calibration_cache is not None and self._cache_fingerprint is None:
+            from ml_pipeline.court_calibration_cache import frame_fingerprint
+            self._cache_fingerprint = frame_fingerprint(frame)
+            self._cache_frame_shape = frame.shape[:2]
+            self._cache_candidate = self._calibration_cache.lookup(
+                self._cache_fingerprint, self._cache_frame_shape)
+
         detection = self._detect_cnn(frame)
+        if self._cache_candidate is not None:
+            locked = self._validate_cached_calibration(detection, frame, frame_idx)
+            if locked is not None:
+                return locked
         # During calibration, always TRY Hough as well — the CNN often fails
         # on far-baseline keypoints while Hough can find all 4 baselines.
         # Prefer CNN in almost all cases — Hough is only a fallback for when
@@ -378,6 +407,11 @@ class CourtDetector:
                 frame_idx, lock_cal.mode, lock_cal.rms_px, n_obs, 100.0 * cov, y_span, x_span,
                 locked_inliers, lock_det.confidence,
             )
+            if self._calibration_cache is not None and self._cache_fingerprint is not None:
+                self._calibration_cache.store(
+                    self._cache_fingerprint, self._cache_frame_shape, lock_cal,
+                    lock_det.keypoints, lock_det.homography, lock_det.confidence,
+                )
             if self._calibration is not None:
                 logger.info(
                     "court_calibration: lens calibration locked — mode=%s rms=%.4f px "
@@ -442,6 +476,71 @@ class CourtDetector:
 
         return detection
 
+    def _validate_cached_calibration(self, detection: CourtDetection,
+                                     frame: np.ndarray,
+                                     frame_idx: int) -> Optional[CourtDetection]:
+        """Check this CNN run against the cached calibration candidate.
+
+        The candidate survives only while every run puts the shared keypoints
+        (≥ 8 detected in both) within COURT_CALIB_CACHE_MAX_KP_PX median of
+        the cached ones. After COURT_CALIB_CACHE_VALIDATE_FRAMES agreeing runs
+        it must also clear the same _projection_quality floors as a fresh lock;
+        then it is locked and returned. Any miss drops the candidate and the
+        normal calibration search carries on from this frame. Returns None
+        unless the cached calibration was locked on this call.
+        """
+        entry = self._cache_candidate
+        det_kps = detection.keypoints
+        both = (det_kps[:, 0] >= 0) & (entry.keypoints[:, 0] >= 0)
+        if int(both.sum()) >= 8:
+            err = float(np.median(np.hypot(
+                det_kps[both, 0] - entry.keypoints[both, 0],
+                det_kps[both, 1] - entry.keypoints[both, 1],
+            )))
+        else:
+            err = float("inf")
+        if err > COURT_CALIB_CACHE_MAX_KP_PX:
+            logger.info(
+                "court_calib_cache: candidate id=%d rejected at frame=%d "
+                "(shared_kps=%d median_err=%.1fpx > %.1fpx) — full calibration",
+                entry.id, frame_idx, int(both.sum()), err, COURT_CALIB_CACHE_MAX_KP_PX,
+            )
+            self._cache_candidate = None
+            return None
+        self._cache_matches += 1
+        if self._cache_matches < COURT_CALIB_CACHE_VALIDATE_FRAMES:
+            return None
+
+        cov, y_span, x_span = self._projection_quality(entry.calibration, frame.shape[:2])
+        self._cache_candidate = None
+        if not (cov >= COURT_MIN_PROJECTION_COVERAGE
+                and y_span >= COURT_MIN_PROJECTION_Y_SPAN
+                and x_span >= COURT_MIN_PROJECTION_X_SPAN):
+            logger.info(
+                "court_calib_cache: candidate id=%d failed projection check "
+                "(cov=%.0f%% y_span=%.1fm x_span=%.1fm) — full calibration",
+                entry.id, 100.0 * cov, y_span, x_span,
+            )
+            return None
+
+        self._calibration = entry.calibration
+        self._locked_detection = CourtDetection(
+            keypoints=entry.keypoints.copy(),
+            homography=entry.homography,
+            confidence=entry.confidence,
+            used_fallback=False,
+        )
+        self.locked_from_cache = True
+        self._calibration_cache.record_hit(entry)
+        logger.info(
+            "court_calibration: LOCKED from cache at frame=%d — id=%d hamming=%d "
+            "mode=%s median_err=%.1fpx cov=%.0f%% y_span=%.1fm x_span=%.1fm. "
+            "No more CNN runs.",
+            frame_idx, entry.id, entry.distance, entry.calibration.mode, err,
+            100.0 * cov, y_span, x_span,
+        )
+        return self._locked_detection
+
     def _detect_cnn(self, frame: np.ndarray) -> CourtDetection:
         """Detect court keypoints from CNN heatmaps.
 
@@ -1147,6 +1246,52 @@ class CourtDetector:
 
         return (float(mx), float(my))
 
+    def to_court_coords_batch(self, xs, ys, strict: bool = True) -> tuple:
+        """Vectorised to_court_coords over (N,) pixel arrays.
+
+        Returns (mx, my) float64 arrays; NaN wherever the scalar version
+        would return None (no homography, degenerate projection, strict
+        bounds, non-finite input). Same calibration → locked → last →
+        last-good priority, so callers can swap N scalar calls for one.
+        """
+        xs = np.asarray(xs, dtype=np.float64).reshape(-1)
+        ys = np.asarray(ys, dtype=np.float64).reshape(-1)
+        n = xs.shape[0]
+        nan = np.full(n, np.nan)
+        if self._calibration is not None:
+            mx, my = project_pixel_to_metres_batch(xs, ys, self._calibration)
+        else:
+            det = self._locked_detection
+            if det is None or det.homography is None:
+                det = self._last_detection
+            if det is None or det.homography is None:
+                det = self._last_good_detection
+            if det is None or det.homography is None:
+                if self._coord_log_count < 3:
+                    logger.warning(
+                        "to_court_coords_batch: returning NaN — no valid homography available",
+                    )
+                    self._coord_log_count += 1
+                return nan, nan.copy()
+            ref = self.ref_keypoints
+            ref_w = ref[1][0] - ref[0][0]
+            ref_h = ref[2][1] - ref[0][1]
+            if ref_w == 0 or ref_h == 0:
+                return nan, nan.copy()
+            v = det.homography @ np.vstack([xs, ys, np.ones(n)])
+            bad = np.abs(v[2]) < 1e-10
+            w = np.where(bad, 1.0, v[2])
+            mx = np.where(bad, np.nan, (v[0] / w - ref[0][0]) / ref_w * COURT_WIDTH_DOUBLES_M)
+            my = np.where(bad, np.nan, (v[1] / w - ref[0][1]) / ref_h * COURT_LENGTH_M)
+
+        if strict:
+            with np.errstate(invalid="ignore"):
+                out = ~((mx >= -5.0) & (mx <= COURT_WIDTH_DOUBLES_M + 5.0)
+                        & (my >= -5.0) & (my <= COURT_LENGTH_M + 5.0))
+            mx = np.where(out, np.nan, mx)
+            my = np.where(out, np.nan, my)
+        return mx, my
+
     def to_pixel_coords(self, metric_x: float, metric_y: float) -> Optional[tuple]:
         """Inverse of to_court_coords — metric → raw pixel. Used for
         drawing projected court lines on debug frames. Returns None if
@@ -1156,6 +1301,14 @@ class CourtDetector:
             return None
         return project_metres_to_pixel(metric_x, metric_y, self._calibration)
 
+    def to_pixel_coords_batch(self, metric_xs, metric_ys) -> tuple:
+        """Vectorised to_pixel_coords: (N,) metres → (px, py) arrays, NaN
+        where a point can't project or calibration isn't available."""
+        if self._calibration is None:
+            n = np.asarray(metric_xs).reshape(-1).shape[0]
+            return np.full(n, np.nan), np.full(n, np.nan)
+        return project_metres_to_pixel_batch(metric_xs, metric_ys, self._calibration)
+
     def get_court_corners_pixels(self) -> Optional[list]:
         """Return the 4 baseline corner keypoints as pixel coordinates.
 
@@ -4,17 +4,33 @@ ml_pipeline/db_schema.py — Idempotent DDL for ML analysis tables.
 Creates tables in the `ml_analysis` schema:
   - video_analysis_jobs  (one row per pipeline invocation)
   - ball_detections      (per-frame ball positions)
-  - player_detections    (per-frame player bounding boxes)
+  - player_detections    (per-frame player bounding boxes + keypoints_f16;
+                          player_detections_kp view = JSONB keypoints)
   - match_analytics      (aggregated stats per job)
   - training_corpus      (Phase 5c.2 — index of dual-submit-derived label sets)
+  - job_stage_timings    (per-stage wall-clock breakdown of each Batch job)
+  - court_calibration_cache (locked court calibrations keyed by camera fingerprint)
 
 Safe to call on every boot (CREATE TABLE IF NOT EXISTS / CREATE INDEX IF NOT EXISTS).
+
+ML_DETECTION_PARTITIONS=1 additionally converts ball_detections /
+player_detections to per-job LIST partitions, once, in place
+(ml_pipeline/detection_partitions.py). The copy runs under an exclusive lock
+inside the boot DDL — enable it in a quiet window. The web app's DDL registry
+fingerprints the flag, so flipping it re-runs this unit on the next boot; it
+calls ml_analysis_init(strict_partitions=True), so a failed migration fails the
+unit (the rest of the schema still commits) and the next boot retries it.
+Batch callers keep the default: the failure is logged and the job carries on
+against the unpartitioned table.
 """
 
 import os
 import logging
 from sqlalchemy import create_engine, text as sql_text
 
+from ml_pipeline.detection_partitions import ML_DETECTION_PARTITIONS, migrate_to_partitions
+from ml_pipeline.keypoint_codec import KP_F16_TO_JSONB_SQL, compat_view_sql
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
@@ -34,22 +50,32 @@ def _get_engine():
     return create_engine(url, pool_pre_ping=True, pool_recycle=1800, future=True)
 
 
-def ml_analysis_init(engine=None):
+def ml_analysis_init(engine=None, strict_partitions=False):
     """
     Public entrypoint: create ml_analysis schema + all tables + indexes.
     Safe to call on every boot (idempotent).
+
+    strict_partitions=True raises RuntimeError (after the rest of the schema
+    has committed) when an ML_DETECTION_PARTITIONS migration failed, so the
+    DDL registry does not record the unit as applied.
     """
     if engine is None:
         engine = _get_engine()
+    partition_failures = []
     with engine.begin() as conn:
         _create_schema(conn)
         _create_jobs_table(conn)
-        _create_ball_detections_table(conn)
-        _create_player_detections_table(conn)
+        _create_ball_detections_table(conn, partition_failures)
+        _create_player_detections_table(conn, partition_failures)
         _create_match_analytics_table(conn)
         _create_practice_detail_table(conn)
         _create_training_corpus_table(conn)
+        _create_job_stage_timings_table(conn)
+        _create_court_calibration_cache_table(conn)
         _create_indexes(conn)
+    if partition_failures and strict_partitions:
+        raise RuntimeError("ml_analysis_init: partitioning failed for "
+                           + ", ".join(partition_failures))
     logger.info("ml_analysis schema init complete")
 
 
@@ -118,7 +144,7 @@ def _create_jobs_table(conn):
     ))
 
 
-def _create_ball_detections_table(conn):
+def _create_ball_detections_table(conn, partition_failures):
     conn.execute(sql_text("""
         CREATE TABLE IF NOT EXISTS ml_analysis.ball_detections (
             id          BIGSERIAL PRIMARY KEY,
@@ -142,9 +168,10 @@ def _create_ball_detections_table(conn):
         "ALTER TABLE ml_analysis.ball_detections "
         "ADD COLUMN IF NOT EXISTS source TEXT"
     ))
+    _partition_detection_table(conn, "ball_detections", partition_failures)
 
 
-def _create_player_detections_table(conn):
+def _create_player_detections_table(conn, partition_failures):
     conn.execute(sql_text("""
         CREATE TABLE IF NOT EXISTS ml_analysis.player_detections (
             id          BIGSERIAL PRIMARY KEY,
@@ -170,6 +197,36 @@ def _create_player_detections_table(conn):
     conn.execute(sql_text(
         "ALTER TABLE ml_analysis.player_detections ADD COLUMN IF NOT EXISTS stroke_class TEXT"
     ))
+    # 17x3 float16 keypoints (ml_pipeline/keypoint_codec.py) — what ingest writes
+    # and every loader reads; the JSONB column above is legacy / KEYPOINTS_JSONB=1.
+    conn.execute(sql_text(
+        "ALTER TABLE ml_analysis.player_detections ADD COLUMN IF NOT EXISTS keypoints_f16 BYTEA"
+    ))
+    _partition_detection_table(conn, "player_detections", partition_failures)
+    conn.execute(sql_text(KP_F16_TO_JSONB_SQL))
+    conn.execute(sql_text(compat_view_sql(
+        "player_detections",
+        "id, job_id, frame_idx, player_id, bbox_x1, bbox_y1, bbox_x2, bbox_y2, "
+        "center_x, center_y, court_x, court_y, stroke_class, created_at",
+    )))
+    # player_detections_roi is created by roi_extractors/pose.py on its first
+    # run; an existing one needs the column before any loader selects it.
+    conn.execute(sql_text(
+        "ALTER TABLE IF EXISTS ml_analysis.player_detections_roi "
+        "ADD COLUMN IF NOT EXISTS keypoints_f16 BYTEA"
+    ))
+
+
+def _partition_detection_table(conn, table: str, failures: list):
+    if not ML_DETECTION_PARTITIONS:
+        return
+    try:
+        with conn.begin_nested():
+            migrate_to_partitions(conn, table)
+    except Exception:
+        logger.exception("ml_analysis_init: partitioning ml_analysis.%s failed — "
+                         "left unpartitioned", table)
+        failures.append(table)
 
 
 def _create_match_analytics_table(conn):
@@ -284,6 +341,61 @@ def _create_training_corpus_table(conn):
     """))
 
 
+def _create_job_stage_timings_table(conn):
+    # Per-stage timing breakdown written by ml_pipeline/telemetry_writer.py —
+    # the same numbers the stage_timings / player_sub log lines print, kept
+    # queryable across runs. One row per (job_id, stage), upserted with the
+    # cumulative value on every telemetry flush; is_final marks the snapshot
+    # taken after postprocess. kind: 'wall' (sequential frame-loop stages),
+    # 'overlap' (work hidden behind other stages, e.g. decode_compute),
+    # 'player_sub' (player stage split), 'batch' (_run_batch phases),
+    # 'loop' (frame-loop diagnostics in detail).
+    conn.execute(sql_text("""
+        CREATE TABLE IF NOT EXISTS ml_analysis.job_stage_timings (
+            job_id          TEXT NOT NULL,
+            stage           TEXT NOT NULL,
+            kind            TEXT NOT NULL,
+            seconds         DOUBLE PRECISION NOT NULL,
+            frames          INTEGER,
+            ms_per_frame    DOUBLE PRECISION,
+            is_final        BOOLEAN NOT NULL DEFAULT FALSE,
+            detail          JSONB,
+            updated_at      TIMESTAMPTZ NOT NULL DEFAULT now(),
+            PRIMARY KEY (job_id, stage)
+        );
+    """))
+
+
+def _create_court_calibration_cache_table(conn):
+    # Locked court calibrations reused across jobs from the same fixed camera
+    # (ml_pipeline/court_calibration_cache.py). fingerprint is the 512-bit
+    # edge-map hash of the job's first frame (hex); lookups scan one
+    # resolution and pick the nearest by Hamming distance. calibration is
+    # camera_calibration.calibration_to_dict (undistort maps rebuilt on load),
+    # keypoints the locked (14, 2) pixel positions, homography the locked 3x3.
+    conn.execute(sql_text("""
+        CREATE TABLE IF NOT EXISTS ml_analysis.court_calibration_cache (
+            id              BIGSERIAL PRIMARY KEY,
+            fingerprint     TEXT NOT NULL,
+            frame_width     INTEGER NOT NULL,
+            frame_height    INTEGER NOT NULL,
+            calibration     JSONB,
+            keypoints       JSONB NOT NULL,
+            homography      JSONB,
+            confidence      DOUBLE PRECISION,
+            source_job_id   TEXT,
+            hits            INTEGER NOT NULL DEFAULT 0,
+            created_at      TIMESTAMPTZ NOT NULL DEFAULT now(),
+            last_used_at    TIMESTAMPTZ NOT NULL DEFAULT now(),
+            UNIQUE (frame_width, frame_height, fingerprint)
+        );
+    """))
+    conn.execute(sql_text("""
+        CREATE INDEX IF NOT EXISTS ix_ml_court_calib_cache_res
+            ON ml_analysis.court_calibration_cache (frame_width, frame_height, last_used_at DESC);
+    """))
+
+
 def _create_indexes(conn):
     # video_analysis_jobs
     conn.execute(sql_text("""
@@ -0,0 +1,235 @@
+"""Per-job LIST partitions for ml_analysis.ball_detections / player_detections.
+
+Both tables grow by ~100k rows per match in one heap. A replace-ingest
+(bronze_ingest_t5 replace=True, the reprocess endpoint) DELETEd every row of the
+job before re-COPYing it, leaving a match-sized run of dead tuples each time —
+the bloat /ops/compact-storage exists to VACUUM FULL away.
+
+With ML_DETECTION_PARTITIONS=1, ml_analysis_init converts each table (once, in
+place) to
+
+    ml_analysis.<table>                  PARTITION BY LIST (job_id)
+    ml_analysis.<table>_j<md5(job)[:16]> FOR VALUES IN ('<job_id>')
+
+so a job's rows are one small heap of their own:
+
+    clear_job()   replace-ingest: TRUNCATE the job's partition — no dead tuples.
+    drop_jobs()   delete / orphan sweep: DROP the job's partition — the space
+                  goes straight back to the OS.
+
+Every reader filters job_id = :tid, which the planner prunes to the one
+partition. There is deliberately NO default partition: attaching a partition
+would have to scan it (under an exclusive lock) every time. Every writer
+therefore calls ensure_job_partition() before inserting (bronze_ingest_t5,
+roi_extractors bounces / far_ball). New partitions are created standalone and
+ATTACHed, which only takes SHARE UPDATE EXCLUSIVE on the parent — running
+readers of other jobs are not blocked. DROP needs ACCESS EXCLUSIVE on the
+parent, so it runs under a short lock_timeout in a savepoint and falls back to
+TRUNCATE of the partition when it cannot get the lock.
+
+Every helper checks pg_class.relkind, not the env flag: an unmigrated table
+keeps the old DELETE behaviour, so the Batch side and the web app can roll out
+in either order. bloat_report() feeds `harness validate-bronze`.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import text as sql_text
+
+logger = logging.getLogger(__name__)
+
+DETECTION_TABLES = ("ball_detections", "player_detections")
+
+# Convert the detection tables to per-job partitions in ml_analysis_init.
+ML_DETECTION_PARTITIONS = (os.getenv("ML_DETECTION_PARTITIONS", "0").strip() == "1")
+# How long drop_jobs() may wait for the parent's ACCESS EXCLUSIVE lock.
+_DROP_LOCK_TIMEOUT_MS = int(os.getenv("ML_DETECTION_DROP_LOCK_TIMEOUT_MS", "3000"))
+
+
+def partition_name(table: str, job_id: str) -> str:
+    return f"{table}_j{hashlib.md5(job_id.encode('utf-8')).hexdigest()[:16]}"
+
+
+def _literal(value: str) -> str:
+    # Partition bounds are DDL and cannot take bind parameters.
+    return "'" + value.replace("'", "''") + "'"
+
+
+def is_partitioned(conn, table: str) -> bool:
+    return bool(conn.execute(sql_text("""
+        SELECT c.relkind = 'p'
+        FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = 'ml_analysis' AND c.relname = :t
+    """), {"t": table}).scalar())
+
+
+def _exists(conn, name: str) -> bool:
+    return conn.execute(sql_text("SELECT to_regclass(:n) IS NOT NULL"),
+                        {"n": f"ml_analysis.{name}"}).scalar()
+
+
+def ensure_job_partition(conn, table: str, job_id: str) -> Optional[str]:
+    """Create the job's partition if the table is partitioned and it is
+    missing. Returns the partition name (None for an unpartitioned table)."""
+    if not is_partitioned(conn, table):
+        return None
+    part = partition_name(table, job_id)
+    if _exists(conn, part):
+        return part
+    # Two writers for the same job (ingest + a ROI pass) must not both create.
+    conn.execute(sql_text("SELECT pg_advisory_xact_lock(hashtextextended(:k, 0))"),
+                 {"k": f"ml_analysis.{part}"})
+    if _exists(conn, part):
+        return part
+    conn.execute(sql_text(
+        f"CREATE TABLE ml_analysis.{part} "
+        f"(LIKE ml_analysis.{table} INCLUDING DEFAULTS)"
+    ))
+    conn.execute(sql_text(
+        f"ALTER TABLE ml_analysis.{table} ATTACH PARTITION ml_analysis.{part} "
+        f"FOR VALUES IN ({_literal(job_id)})"
+    ))
+    logger.info("detection_partitions: created %s for job %s", part, job_id)
+    return part
+
+
+def clear_job(conn, table: str, job_id: str) -> str:
+    """Remove all of a job's rows ahead of a re-ingest. Returns 'truncate'
+    (partitioned) or 'delete'."""
+    part = ensure_job_partition(conn, table, job_id)
+    if part is not None:
+        conn.execute(sql_text(f"TRUNCATE ml_analysis.{part}"))
+        return "truncate"
+    conn.execute(sql_text(f"DELETE FROM ml_analysis.{table} WHERE job_id = :jid"),
+                 {"jid": job_id})
+    return "delete"
+
+
+def drop_jobs(conn, table: str, job_ids: Sequence[str]) -> int:
+    """Delete every row of the given jobs; returns the row count removed.
+    Partitioned: DROP each job's partition (TRUNCATE it if the parent lock is
+    contended — the empty partition is dropped on a later call)."""
+    job_ids = [str(j) for j in job_ids if j]
+    if not job_ids:
+        return 0
+    if not is_partitioned(conn, table):
+        return conn.execute(sql_text(
+            f"DELETE FROM ml_analysis.{table} WHERE job_id = ANY(:ids)"
+        ), {"ids": job_ids}).rowcount or 0
+    n = 0
+    for jid in job_ids:
+        part = partition_name(table, jid)
+        if not _exists(conn, part):
+            continue
+        rows = conn.execute(sql_text(f"SELECT count(*) FROM ml_analysis.{part}")).scalar() or 0
+        try:
+            with conn.begin_nested():
+                conn.execute(sql_text(f"SET LOCAL lock_timeout = {int(_DROP_LOCK_TIMEOUT_MS)}"))
+                conn.execute(sql_text(f"DROP TABLE ml_analysis.{part}"))
+        except Exception as e:
+            logger.warning("detection_partitions: DROP %s failed (%s) — truncating instead",
+                           part, e.__class__.__name__)
+            conn.execute(sql_text(f"TRUNCATE ml_analysis.{part}"))
+        n += rows
+    conn.execute(sql_text("SET LOCAL lock_timeout = DEFAULT"))
+    return n
+
+
+def migrate_to_partitions(conn, table: str) -> bool:
+    """Convert a plain detection table to per-job LIST partitions in place.
+    Idempotent (no-op once partitioned). One partition per existing job, one
+    INSERT ... SELECT routes the rows, the old heap is dropped. Returns True if
+    a migration ran."""
+    if is_partitioned(conn, table):
+        return False
+    new = f"{table}_partitioned"
+    t0 = conn.execute(sql_text("SELECT clock_timestamp()")).scalar()
+    conn.execute(sql_text(f"LOCK TABLE ml_analysis.{table} IN ACCESS EXCLUSIVE MODE"))
+    # ml_analysis_init runs on every job; a concurrent caller may have
+    # migrated the table while we waited for the lock.
+    if is_partitioned(conn, table):
+        logger.info("detection_partitions: ml_analysis.%s already partitioned by a "
+                    "concurrent caller", table)
+        return False
+    seq = conn.execute(sql_text("SELECT pg_get_serial_sequence(:t, 'id')"),
+                       {"t": f"ml_analysis.{table}"}).scalar()
+    conn.execute(sql_text(f"DROP TABLE IF EXISTS ml_analysis.{new}"))
+    # LIKE keeps column order, NOT NULLs and the id default (the existing
+    # sequence), so INSERT ... SELECT * lines up.
+    conn.execute(sql_text(
+        f"CREATE TABLE ml_analysis.{new} (LIKE ml_analysis.{table} INCLUDING DEFAULTS, "
+        f"PRIMARY KEY (job_id, id)) PARTITION BY LIST (job_id)"
+    ))
+    job_ids = [r[0] for r in conn.execute(sql_text(
+        f"SELECT DISTINCT job_id FROM ml_analysis.{table}"
+    ))]
+    for jid in job_ids:
+        part = partition_name(table, jid)
+        conn.execute(sql_text(
+            f"CREATE TABLE ml_analysis.{part} PARTITION OF ml_analysis.{new} "
+            f"FOR VALUES IN ({_literal(jid)})"
+        ))
+    n = conn.execute(sql_text(
+        f"INSERT INTO ml_analysis.{new} SELECT * FROM ml_analysis.{table}"
+    )).rowcount
+    if seq:
+        conn.execute(sql_text(f"ALTER SEQUENCE {seq} OWNED BY ml_analysis.{new}.id"))
+    # keypoint_codec's compat view reads the old heap; db_schema recreates it.
+    conn.execute(sql_text(f"DROP VIEW IF EXISTS ml_analysis.{table}_kp"))
+    conn.execute(sql_text(f"DROP TABLE ml_analysis.{table}"))
+    conn.execute(sql_text(f"ALTER TABLE ml_analysis.{new} RENAME TO {table}"))
+    conn.execute(sql_text(
+        f"ALTER TABLE ml_analysis.{table} RENAME CONSTRAINT {new}_pkey TO {table}_pkey"
+    ))
+    dt = conn.execute(sql_text("SELECT extract(epoch FROM clock_timestamp() - :t0)"),
+                      {"t0": t0}).scalar()
+    logger.info("detection_partitions: migrated ml_analysis.%s — %d rows into %d job "
+                "partitions in %.1fs", table, n, len(job_ids), float(dt or 0))
+    return True
+
+
+def bloat_report(conn, job_id: Optional[str] = None) -> List[Dict]:
+    """Live/dead tuples and on-disk size per detection table (summed over its
+    partitions), plus the job's own partition when job_id is given."""
+    out: List[Dict] = []
+    for table in DETECTION_TABLES:
+        if not _exists(conn, table):
+            continue
+        partitioned = is_partitioned(conn, table)
+        r = conn.execute(sql_text("""
+            WITH rels AS (
+                SELECT c.oid, c.relname
+                FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+                WHERE n.nspname = 'ml_analysis' AND c.relname = :t AND c.relkind = 'r'
+                UNION ALL
+                SELECT i.inhrelid, c.relname
+                FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+                WHERE i.inhparent = to_regclass(:q)
+            )
+            SELECT count(*)                                   AS relations,
+                   coalesce(sum(s.n_live_tup), 0)             AS live,
+                   coalesce(sum(s.n_dead_tup), 0)             AS dead,
+                   coalesce(sum(pg_total_relation_size(r.oid)), 0) AS bytes,
+                   max(greatest(s.last_vacuum, s.last_autovacuum)) AS last_vacuum
+            FROM rels r LEFT JOIN pg_stat_user_tables s ON s.relid = r.oid
+        """), {"t": table, "q": f"ml_analysis.{table}"}).mappings().first()
+        live, dead = int(r["live"]), int(r["dead"])
+        entry = {
+            "table": f"ml_analysis.{table}",
+            "partitioned": partitioned,
+            "relations": int(r["relations"]),
+            "live_tuples": live,
+            "dead_tuples": dead,
+            "dead_pct": round(100.0 * dead / (live + dead), 1) if live + dead else 0.0,
+            "total_bytes": int(r["bytes"]),
+            "last_vacuum": r["last_vacuum"],
+        }
+        if job_id and partitioned:
+            part = partition_name(table, job_id)
+            entry["job_partition"] = part if _exists(conn, part) else None
+        out.append(entry)
+    return out
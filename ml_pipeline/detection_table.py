@@ -0,0 +1,269 @@
+"""Columnar (structure-of-arrays) detection store.
+
+The trackers used to accumulate BallDetection / PlayerDetection dataclass
+objects — ~35k ball and ~72k player objects on a 44-min match, each player
+carrying its own keypoint array — and every post-process step that only needs
+a few fields (stationary-player filter, the bounce CNN's ball_rows / wrists,
+the bronze export) walked those lists and rebuilt a fresh list of dicts or
+tuples each time. BallTracker / WASBBallTracker / PlayerTracker.detections
+are now DetectionTables: each frame's detections are appended as a chunk, the
+post-process steps are array ops over the columns, and AnalysisResult holds
+the same tables (no second copy):
+
+    frame_idx (int64), x / y, court_x / court_y, speed_kmh (float64, NaN=None),
+    is_bounce (bool), is_in (int8, -1=None)                       — ball
+    frame_idx, player_id (int64), bbox (N,4), center (N,2), court_x / court_y
+    (float64, NaN=None), has_keypoints (bool), keypoints (N,17,3) float32,
+    stroke_class / detection_source (object)                        — player
+
+Floats stay float64 so every exported value is bit-identical to the
+dataclass path; only the keypoint block is float32 (what YOLO emits).
+
+Columns are read as zero-copy views (`table["x"]`); appends go through
+append_chunk() / append_detections() with amortised growth. Iterating a table
+(iter_detections()) yields dataclass objects rebuilt from the columns for
+callers that still want them — a read-only view: keypoints are views into the
+block, and writing an attribute does not reach the table (write the column).
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+NUM_KEYPOINTS = 17
+
+# column -> (dtype, trailing shape, fill value for unset rows)
+BALL_SCHEMA: Dict[str, Tuple[Any, Tuple[int, ...], Any]] = {
+    "frame_idx": (np.int64, (), 0),
+    "x": (np.float64, (), np.nan),
+    "y": (np.float64, (), np.nan),
+    "court_x": (np.float64, (), np.nan),
+    "court_y": (np.float64, (), np.nan),
+    "speed_kmh": (np.float64, (), np.nan),
+    "is_bounce": (np.bool_, (), False),
+    "is_in": (np.int8, (), -1),
+    "source": (object, (), None),
+}
+
+PLAYER_SCHEMA: Dict[str, Tuple[Any, Tuple[int, ...], Any]] = {
+    "frame_idx": (np.int64, (), 0),
+    "player_id": (np.int64, (), 0),
+    "bbox": (np.float64, (4,), np.nan),
+    "center": (np.float64, (2,), np.nan),
+    "court_x": (np.float64, (), np.nan),
+    "court_y": (np.float64, (), np.nan),
+    "has_keypoints": (np.bool_, (), False),
+    "keypoints": (np.float32, (NUM_KEYPOINTS, 3), 0.0),
+    "stroke_class": (object, (), None),
+    "detection_source": (object, (), None),
+}
+
+
+def _opt_float(v) -> float:
+    return np.nan if v is None else float(v)
+
+
+def nan_to_none(arr: np.ndarray) -> List[Optional[float]]:
+    """float column -> list of Python floats with NaN mapped back to None."""
+    vals = arr.tolist()
+    return [None if v != v else v for v in vals]
+
+
+class DetectionTable:
+    """Growable column store. `kind` is 'ball' or 'player'."""
+
+    def __init__(self, kind: str, capacity: int = 1024):
+        if kind == "ball":
+            schema = BALL_SCHEMA
+        elif kind == "player":
+            schema = PLAYER_SCHEMA
+        else:
+            raise ValueError(f"unknown DetectionTable kind {kind!r}")
+        self.kind = kind
+        self._schema = schema
+        self._n = 0
+        self._cols: Dict[str, np.ndarray] = {
+            name: self._alloc(name, max(1, int(capacity))) for name in schema
+        }
+
+    def _alloc(self, name: str, n: int) -> np.ndarray:
+        dtype, tail, fill = self._schema[name]
+        return np.full((n,) + tail, fill, dtype=dtype)
+
+    # -- size / access -------------------------------------------------------
+
+    def __len__(self) -> int:
+        return self._n
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        return tuple(self._schema)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        """Zero-copy view of the filled part of a column."""
+        return self._cols[name][:self._n]
+
+    def __iter__(self) -> Iterator:
+        return self.iter_detections()
+
+    # -- append --------------------------------------------------------------
+
+    def _reserve(self, extra: int) -> None:
+        cap = len(self._cols["frame_idx"])
+        need = self._n + extra
+        if need <= cap:
+            return
+        new_cap = max(need, cap * 2)
+        for name, col in self._cols.items():
+            grown = self._alloc(name, new_cap)
+            grown[:self._n] = col[:self._n]
+            self._cols[name] = grown
+
+    def append_chunk(self, **cols) -> None:
+        """Append len(frame_idx) rows. Omitted columns keep their fill value
+        (NaN / False / -1 / None)."""
+        unknown = set(cols) - set(self._schema)
+        if unknown:
+            raise KeyError(f"unknown {self.kind} columns: {sorted(unknown)}")
+        n = len(cols["frame_idx"])
+        if n == 0:
+            return
+        self._reserve(n)
+        s, e = self._n, self._n + n
+        for name, values in cols.items():
+            dtype = self._schema[name][0]
+            if dtype is object:
+                col = self._cols[name]
+                for i, v in enumerate(values):
+                    col[s + i] = v
+            else:
+                self._cols[name][s:e] = np.asarray(values, dtype=dtype)
+        self._n = e
+
+    def append_detections(self, dets: Sequence) -> None:
+        """Append BallDetection / PlayerDetection objects as one chunk."""
+        if not dets:
+            return
+        if self.kind == "ball":
+            self.append_chunk(
+                frame_idx=[int(d.frame_idx) for d in dets],
+                x=[_opt_float(d.x) for d in dets],
+                y=[_opt_float(d.y) for d in dets],
+                court_x=[_opt_float(d.court_x) for d in dets],
+                court_y=[_opt_float(d.court_y) for d in dets],
+                speed_kmh=[_opt_float(d.speed_kmh) for d in dets],
+                is_bounce=[bool(d.is_bounce) for d in dets],
+                is_in=[-1 if d.is_in is None else int(bool(d.is_in)) for d in dets],
+                source=[getattr(d, "source", None) for d in dets],
+            )
+            return
+        n = len(dets)
+        kps = np.zeros((n, NUM_KEYPOINTS, 3), dtype=np.float32)
+        has_kp = np.zeros(n, dtype=bool)
+        for i, d in enumerate(dets):
+            kp = getattr(d, "keypoints", None)
+            if kp is not None:
+                kps[i] = np.asarray(kp, dtype=np.float32).reshape(NUM_KEYPOINTS, 3)
+                has_kp[i] = True
+        self.append_chunk(
+            frame_idx=[int(d.frame_idx) for d in dets],
+            player_id=[int(d.player_id) for d in dets],
+            bbox=[[_opt_float(v) for v in d.bbox[:4]] for d in dets],
+            center=[[_opt_float(v) for v in d.center[:2]] for d in dets],
+            court_x=[_opt_float(d.court_x) for d in dets],
+            court_y=[_opt_float(d.court_y) for d in dets],
+            has_keypoints=has_kp,
+            keypoints=kps,
+            stroke_class=[getattr(d, "stroke_class", None) for d in dets],
+            detection_source=[getattr(d, "detection_source", None) for d in dets],
+        )
+
+    def compact(self, mask) -> None:
+        """Keep only the rows where `mask` is True, in place (no second table;
+        one column's kept rows are copied at a time)."""
+        mask = np.asarray(mask, dtype=bool)
+        k = int(np.count_nonzero(mask))
+        if k == self._n:
+            return
+        for name, col in self._cols.items():
+            col[:k] = col[:self._n][mask]
+            col[k:self._n] = self._schema[name][2]
+        self._n = k
+
+    def take(self, index) -> "DetectionTable":
+        """New table holding the rows selected by a bool mask or index array."""
+        out = DetectionTable(self.kind, capacity=1)
+        picked = {name: self[name][index] for name in self._schema}
+        n = len(picked["frame_idx"])
+        out._cols = {name: arr.copy() if n else out._alloc(name, 1)
+                     for name, arr in picked.items()}
+        out._n = n
+        return out
+
+    # -- construction from / back to dataclass lists -------------------------
+
+    @classmethod
+    def from_ball_detections(cls, dets: Sequence) -> "DetectionTable":
+        t = cls("ball", capacity=len(dets) or 1)
+        t.append_detections(dets)
+        return t
+
+    @classmethod
+    def from_player_detections(cls, dets: Sequence) -> "DetectionTable":
+        t = cls("player", capacity=len(dets) or 1)
+        t.append_detections(dets)
+        return t
+
+    def iter_detections(self) -> Iterator:
+        """Compatibility iterator — yields BallDetection / PlayerDetection
+        objects rebuilt from the columns (keypoints are views, not copies)."""
+        if self.kind == "ball":
+            from ml_pipeline.ball_tracker import BallDetection
+            is_in = self["is_in"].tolist()
+            for fi, x, y, cx, cy, sp, ib, ii in zip(
+                self["frame_idx"].tolist(), self["x"].tolist(), self["y"].tolist(),
+                nan_to_none(self["court_x"]), nan_to_none(self["court_y"]),
+                nan_to_none(self["speed_kmh"]), self["is_bounce"].tolist(), is_in,
+            ):
+                yield BallDetection(
+                    frame_idx=fi, x=x, y=y, court_x=cx, court_y=cy,
+                    speed_kmh=sp, is_bounce=ib,
+                    is_in=None if ii < 0 else bool(ii),
+                )
+        else:
+            from ml_pipeline.player_tracker import PlayerDetection
+            kps = self["keypoints"]
+            has_kp = self["has_keypoints"]
+            for i, (fi, pid, bbox, center, cx, cy, sc, src) in enumerate(zip(
+                self["frame_idx"].tolist(), self["player_id"].tolist(),
+                self["bbox"].tolist(), self["center"].tolist(),
+                nan_to_none(self["court_x"]), nan_to_none(self["court_y"]),
+                self["stroke_class"], self["detection_source"],
+            )):
+                yield PlayerDetection(
+                    frame_idx=fi, player_id=pid, bbox=tuple(bbox),
+                    center=tuple(center), court_x=cx, court_y=cy,
+                    keypoints=kps[i] if has_kp[i] else None, stroke_class=sc,
+                    detection_source=src,
+                )
+
+    # -- row export ----------------------------------------------------------
+
+    def to_dicts(self, columns: Iterable[str]) -> List[Dict[str, Any]]:
+        """Rows as plain dicts over scalar columns (NaN / -1 -> None; is_in
+        back to bool). Used for the ball_rows the bounce CNN consumes."""
+        columns = list(columns)
+        lists = []
+        for name in columns:
+            col = self[name]
+            if name == "is_in":
+                lists.append([None if v < 0 else bool(v) for v in col.tolist()])
+            elif col.dtype == np.float64:
+                lists.append(nan_to_none(col))
+            elif col.dtype == object:
+                lists.append(list(col))
+            else:
+                lists.append(col.tolist())
+        return [dict(zip(columns, row)) for row in zip(*lists)]
+
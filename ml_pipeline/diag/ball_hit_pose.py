@@ -100,7 +100,7 @@ def fetch_t5_player_poses(engine, t5_task_id: str) -> List[Tuple[int, int, list]
     with engine.connect() as conn:
         rows = conn.execute(sql_text("""
             SELECT frame_idx, player_id, keypoints
-            FROM ml_analysis.player_detections
+            FROM ml_analysis.player_detections_kp
             WHERE job_id::text = :tid AND keypoints IS NOT NULL
             ORDER BY player_id, frame_idx
         """), {"tid": t5_task_id}).fetchall()
@@ -108,7 +108,7 @@ def fetch_t5_player_poses(engine, t5_task_id: str) -> List[Tuple[int, int, list]
         with engine.connect() as conn:
             rows = conn.execute(sql_text("""
                 SELECT pd.frame_idx, pd.player_id, pd.keypoints
-                FROM ml_analysis.player_detections pd
+                FROM ml_analysis.player_detections_kp pd
                 JOIN ml_analysis.video_analysis_jobs vaj ON pd.job_id = vaj.id::text
                 WHERE vaj.task_id::text = :tid AND pd.keypoints IS NOT NULL
                 ORDER BY pd.player_id, pd.frame_idx
@@ -25,6 +25,8 @@ Usage:
     python -m ml_pipeline.diag.bench_silver --update-baseline  # lock current
     python -m ml_pipeline.diag.bench_silver --teardown    # stop + remove
     python -m ml_pipeline.diag.bench_silver --status      # container status
+    python -m ml_pipeline.diag.bench_silver --engine staged   # staged silver engine
+    python -m ml_pipeline.diag.bench_silver --compare-engines # legacy vs staged, row-for-row
 
 The bench is empty until a fixture lands in `ml_pipeline/fixtures_silver/`
 (via `python -m ml_pipeline.diag.bench_silver.snapshot --task <TID>` on
@@ -250,10 +252,50 @@ def _restore_fixture(sql_gz_path: Path) -> None:
         )
 
 
-def _run_silver_builder(engine, task_id: str) -> dict:
+def _run_silver_builder(engine, task_id: str, silver_engine: str | None = None) -> dict:
     """Run build_silver_match_t5 against the bench engine for one task."""
     from ml_pipeline.build_silver_match_t5 import build_silver_match_t5
-    return build_silver_match_t5(task_id=task_id, replace=True, engine=engine)
+    return build_silver_match_t5(task_id=task_id, replace=True, engine=engine,
+                                 silver_engine=silver_engine)
+
+
+def _dump_rows(engine, task_id: str) -> list[dict]:
+    """Every silver.point_detail row for the task, in a stable order."""
+    from sqlalchemy import text as sql_text
+    with engine.connect() as conn:
+        rows = conn.execute(sql_text("""
+            SELECT * FROM silver.point_detail
+             WHERE task_id::text = :t
+             ORDER BY model, id
+        """), {"t": task_id}).mappings().all()
+    return [dict(r) for r in rows]
+
+
+def _diff_rows(a: list[dict], b: list[dict], limit: int = 20) -> list[str]:
+    """Row-for-row differences between two _dump_rows results."""
+    if len(a) != len(b):
+        return [f"row count: legacy={len(a)} staged={len(b)}"]
+    diffs = []
+    for ra, rb in zip(a, b):
+        for col in ra:
+            if ra[col] != rb.get(col):
+                diffs.append(f"id={ra.get('id')} model={ra.get('model')} {col}: "
+                             f"legacy={ra[col]!r} staged={rb.get(col)!r}")
+                if len(diffs) >= limit:
+                    return diffs
+    return diffs
+
+
+def _compare_engines(engine, bronze_path: Path, task_id: str) -> list[str]:
+    """Build the fixture with both silver engines and diff every column."""
+    dumps = {}
+    for name in ("legacy", "staged"):
+        _truncate_task_tables(engine)
+        _restore_fixture(bronze_path)
+        result = _run_silver_builder(engine, task_id, silver_engine=name)
+        print(f"  {name}: pass_seconds={result.get('pass_seconds')}")
+        dumps[name] = _dump_rows(engine, task_id)
+    return _diff_rows(dumps["legacy"], dumps["staged"])
 
 
 def _measure_current(engine, task_id: str, model: str) -> dict:
@@ -308,8 +350,13 @@ def _compare(current: dict, baseline: dict, tolerance: dict) -> list[str]:
     return regressions
 
 
-def run_bench(task_filter: str | None = None, update_baseline: bool = False) -> int:
-    """Top-level bench loop. Returns process exit code (0 green, 1 regression)."""
+def run_bench(task_filter: str | None = None, update_baseline: bool = False,
+              silver_engine: str | None = None, compare_engines: bool = False) -> int:
+    """Top-level bench loop. Returns process exit code (0 green, 1 regression).
+
+    compare_engines: instead of checking the baseline, build every fixture with
+    the legacy AND staged silver engines and require identical rows.
+    """
     fixtures = _discover_fixtures(task_filter)
     if not fixtures:
         if task_filter:
@@ -333,11 +380,27 @@ def run_bench(task_filter: str | None = None, update_baseline: bool = False) ->
         task_id = baseline_doc["task_id"]
         model = baseline_doc.get("model", "t5")
 
+        if compare_engines:
+            try:
+                diffs = _compare_engines(engine, bronze_path, task_id)
+            except Exception as e:
+                print(f"  [!] silver builder raised: {e}")
+                overall_regressions += 1
+                summary.append((short, -1))
+                continue
+            for d in diffs:
+                print(f"  [!] {d}")
+            if not diffs:
+                print("  [OK] legacy and staged engines produced identical rows")
+            overall_regressions += len(diffs)
+            summary.append((short, len(diffs)))
+            continue
+
         _truncate_task_tables(engine)
         _restore_fixture(bronze_path)
 
         try:
-            result = _run_silver_builder(engine, task_id)
+            result = _run_silver_builder(engine, task_id, silver_engine=silver_engine)
         except Exception as e:
             print(f"  [!] silver builder raised: {e}")
             overall_regressions += 1
@@ -392,6 +455,10 @@ def main(argv=None) -> int:
                     help="Lock current bench results as the new baseline")
     ap.add_argument("--task", default=None,
                     help="Run only this fixture stem (default: all fixtures)")
+    ap.add_argument("--engine", choices=("legacy", "staged"), default=None,
+                    help="Silver pass engine (default: SILVER_ENGINE env, else legacy)")
+    ap.add_argument("--compare-engines", action="store_true",
+                    help="Build each fixture with both engines and diff every row")
     args = ap.parse_args(argv)
 
     logging.basicConfig(level=logging.INFO,
@@ -416,6 +483,8 @@ def main(argv=None) -> int:
     return run_bench(
         task_filter=args.task,
         update_baseline=args.update_baseline,
+        silver_engine=args.engine,
+        compare_engines=args.compare_engines,
     )
 
 
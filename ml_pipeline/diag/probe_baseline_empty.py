@@ -75,7 +75,7 @@ def _probe(conn, task: str, ts: float, fps: float, win: float, pid: int) -> dict
                 MIN(court_y) FILTER (WHERE keypoints IS NOT NULL) AS cy_min_kpts,
                 MAX(court_y) FILTER (WHERE keypoints IS NOT NULL) AS cy_max_kpts,
                 AVG(court_y) FILTER (WHERE keypoints IS NOT NULL) AS cy_avg_kpts
-            FROM ml_analysis.{table}
+            FROM ml_analysis.{table}_kp
             WHERE job_id = :t
               AND player_id = :pid
               AND frame_idx BETWEEN :lo AND :hi
@@ -70,7 +70,7 @@ def _task_wide_roi_stats(conn, task: str, pid: int) -> dict:
             MIN(court_y)                                       AS cy_min,
             MAX(court_y)                                       AS cy_max,
             AVG(court_y)                                       AS cy_avg
-        FROM ml_analysis.player_detections_roi
+        FROM ml_analysis.player_detections_roi_kp
         WHERE job_id = :t AND player_id = :pid
         GROUP BY source
         ORDER BY source
@@ -110,7 +110,7 @@ def _window_detail(conn, task: str, ts: float, fps: float, win: float,
                                      AND court_y BETWEEN -3.5 AND 4.5) AS rows_kpts_in_far_bz,
                     MIN(court_y) AS cy_min,
                     MAX(court_y) AS cy_max
-                FROM ml_analysis.{table}
+                FROM ml_analysis.{table}_kp
                 WHERE job_id = :t AND player_id = :pid
                   AND frame_idx BETWEEN :lo AND :hi
             """), {"t": task, "pid": pid, "lo": lo, "hi": hi}).mappings().one()
@@ -127,7 +127,7 @@ def _window_detail(conn, task: str, ts: float, fps: float, win: float,
                                      AND court_y BETWEEN -3.5 AND 4.5) AS rows_kpts_in_far_bz,
                     MIN(court_y) AS cy_min,
                     MAX(court_y) AS cy_max
-                FROM ml_analysis.{table}
+                FROM ml_analysis.{table}_kp
                 WHERE job_id = :t AND player_id = :pid
                   AND frame_idx BETWEEN :lo AND :hi
             """), {"t": task, "pid": pid, "lo": lo, "hi": hi}).mappings().one()
@@ -150,7 +150,7 @@ def _row_dump(conn, task: str, ts: float, fps: float, win: float,
                    (bbox_y1 + bbox_y2)/2 AS bcy,
                    (bbox_x2 - bbox_x1) * (bbox_y2 - bbox_y1) AS area,
                    court_x, court_y
-            FROM ml_analysis.player_detections
+            FROM ml_analysis.player_detections_kp
             WHERE job_id = :t AND player_id = :pid
               AND frame_idx BETWEEN :lo AND :hi
               AND keypoints IS NOT NULL
@@ -166,7 +166,7 @@ def _row_dump(conn, task: str, ts: float, fps: float, win: float,
                    (bbox_y1 + bbox_y2)/2 AS bcy,
                    (bbox_x2 - bbox_x1) * (bbox_y2 - bbox_y1) AS area,
                    court_x, court_y
-            FROM ml_analysis.player_detections_roi
+            FROM ml_analysis.player_detections_roi_kp
             WHERE job_id = :t AND player_id = :pid
               AND frame_idx BETWEEN :lo AND :hi
               AND keypoints IS NOT NULL
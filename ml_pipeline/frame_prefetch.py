@@ -0,0 +1,135 @@
+"""Threaded decode prefetch for the main frame loop.
+
+TennisAnalysisPipeline.process used to pull frames from
+VideoPreprocessor.frames() synchronously, so H.264 decode, BGR conversion and
+the per-stage resizes sat on the critical path between GPU calls. With
+DECODE_PREFETCH=N the decode runs on ONE producer thread that fills a bounded
+queue of N ready frames; alongside each frame it precomputes the downscaled
+copies the stages would otherwise build inline (the ball-model input and the
+MOG2 downscale), so _process_frame only consumes ready buffers.
+
+Output-identical: the producer walks the same VideoPreprocessor generator (same
+grab/retrieve sampling), frames arrive strictly in order, and every prepared
+buffer is the exact cv2.resize call the consuming stage would make itself — the
+stages fall back to resizing inline if a buffer is missing. cv2 decode and
+resize release the GIL, so the producer genuinely overlaps the GPU stages.
+
+Producer exceptions are re-raised in the consumer at the point the failing
+frame would have been read, matching the synchronous generator.
+"""
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# A resize the producer precomputes per frame:
+#   (key, (width, height) or integer downscale divisor, cv2 interpolation)
+ResizeSpec = Tuple[str, object, int]
+
+_END = object()
+
+
+class FramePrefetcher:
+    """Iterate (frame, prepared) pairs decoded ahead on a worker thread.
+
+    `prepared` maps each ResizeSpec key to its resized array. An integer size
+    is a divisor of the frame's own dims (w // n, h // n) — MOG2_DOWNSCALE's
+    convention.
+
+    The producer's own decode + resize time accumulates in `produce_seconds`;
+    the caller times its next() calls for the residual wait, so the gap
+    between the two is what the overlap hid.
+    """
+
+    def __init__(self, frames: Iterator[np.ndarray], *, depth: int,
+                 resizes: Optional[List[ResizeSpec]] = None):
+        self._frames = frames
+        self._resizes = list(resizes or [])
+        self._q: "queue.Queue" = queue.Queue(maxsize=max(1, int(depth)))
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.produce_seconds = 0.0
+
+    def _prepare(self, frame: np.ndarray) -> Dict[str, np.ndarray]:
+        h, w = frame.shape[:2]
+        out = {}
+        for key, size, interp in self._resizes:
+            if isinstance(size, int):
+                size = (w // size, h // size)
+            out[key] = cv2.resize(frame, size, interpolation=interp)
+        return out
+
+    def _put(self, item) -> bool:
+        # Bounded put that still notices a consumer that stopped early.
+        while not self._stop.is_set():
+            try:
+                self._q.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self) -> None:
+        pc = time.perf_counter
+        it = iter(self._frames)
+        try:
+            while not self._stop.is_set():
+                t = pc()
+                try:
+                    frame = next(it)
+                except StopIteration:
+                    break
+                item = (frame, self._prepare(frame))
+                self.produce_seconds += pc() - t
+                if not self._put(item):
+                    return
+        except BaseException as e:  # surfaced to the consumer, not swallowed
+            self._put(e)
+            return
+        finally:
+            close = getattr(it, "close", None)
+            if close is not None and self._stop.is_set():
+                try:
+                    close()     # release the VideoCapture held by the generator
+                except Exception:
+                    pass
+        self._put(_END)
+
+    def __iter__(self):
+        self._thread = threading.Thread(
+            target=self._run, name="decode-prefetch", daemon=True,
+        )
+        self._thread.start()
+        try:
+            while True:
+                item = self._q.get()
+                if item is _END:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Stop the producer (idempotent). Drains the queue so a producer
+        blocked on put() sees the stop flag."""
+        self._stop.set()
+        while True:
+            try:
+                self._q.get_nowait()
+            except queue.Empty:
+                break
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            if self._thread.is_alive():
+                logger.warning("decode-prefetch: producer did not stop within 10s")
+            self._thread = None
@@ -0,0 +1,331 @@
+"""Frame spill store — lets the ROI sweep replay the main loop's decode instead
+of decoding the source video a second time.
+
+Why this exists
+---------------
+Every match decodes the video twice: once in TennisAnalysisPipeline.process
+(VideoPreprocessor.frames) and once more in roi_extractors.unified.run_unified_roi.
+The ROI consumers can't run inside the main loop — they need the FINAL bounce
+list (pose rally gate, bounce / far-ball windows), which only exists after
+_postprocess — but they only ever READ pixels inside their projected ROIs, and
+those ROIs are fixed once the court calibration locks. So the main loop can
+spill just that region of every sampled frame to local disk, and the ROI sweep
+replays it in the same 25fps index space without re-opening cv2.VideoCapture
+(the ~51-min "rock" in docs/_investigation/t5_runtime_backlog.md, C3).
+
+Layout: one file per CHUNK of frames plus the pixel rect each chunk covers.
+With jpeg_quality > 0 (ROI_FRAME_SPILL_JPEG_QUALITY, default 95) a chunk is
+the frames' crops JPEG-encoded back to back with their byte offsets kept in
+memory; a raw 1080p ROI union is ~3 MB/frame (~220 GB for a 47-min match),
+JPEG brings a full match inside the default budget. jpeg_quality=0 keeps the
+raw uint8 .npy memmap, shape (n, h, w, 3) — bit-exact pixels, full size. Frames seen before the court locks (the first
+~COURT_CALIBRATION_FRAMES) spill full-frame because the ROI rect isn't known
+yet; after the lock every frame spills only the union of the three ROI rects
+(far-pose, service-box, far-court) plus a margin. Replay pastes each chunk's
+crop into a full-size canvas so the processors index it exactly as they index
+a decoded frame.
+
+Fail-open: any write error, a non-contiguous frame index or the disk budget
+(ROI_FRAME_SPILL_MAX_GB — projected from the bytes actually written once the
+rect has locked and a chunk is full) marks the store unusable and deletes its files — the
+ROI sweep then falls back to its own decode, i.e. today's behaviour. The store
+never raises into the frame loop.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import tempfile
+from typing import Callable, Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+Rect = Tuple[int, int, int, int]   # (x0, y0, x1, y1), half-open, full-frame pixels
+
+# Pixels of slack around the ROI union. The far-pose pass reads an EXPANDED
+# person bbox (pose.BBOX_EXPAND_*) that can poke just past its own ROI; the
+# service-box ROI below it usually covers that, the margin covers the sides.
+SPILL_MARGIN_PX = 96
+
+# Free-disk headroom kept back for the transcode + bronze export that run
+# after the sweep.
+_DISK_RESERVE_BYTES = 4 * 1024 ** 3
+
+
+def roi_spill_rect(court_detector, frame_shape, margin_px: int = SPILL_MARGIN_PX) -> Optional[Rect]:
+    """Union of every ROI consumer's pixel rect, padded and clamped to the frame.
+
+    Uses the processors' own projection helpers so the spill rect can't drift
+    from what prepare() later computes. Returns None when no ROI projects
+    (uncalibrated court) — nothing downstream could use the frames then."""
+    from ml_pipeline.roi_extractors.pose import _compute_far_roi_pixel
+    from ml_pipeline.roi_extractors.bounces import _service_box_pixel_roi
+    from ml_pipeline.roi_extractors.far_ball import far_court_pixel_roi
+
+    rects = []
+    for fn in (_compute_far_roi_pixel, _service_box_pixel_roi, far_court_pixel_roi):
+        try:
+            r = fn(court_detector, frame_shape)
+        except Exception as e:
+            logger.warning("frame_spill: %s raised (%s) — ignoring", fn.__name__, e)
+            r = None
+        if r is not None:
+            rects.append(r)
+    if not rects:
+        return None
+    h, w = frame_shape[:2]
+    x0 = max(0, min(r[0] for r in rects) - margin_px)
+    y0 = max(0, min(r[1] for r in rects) - margin_px)
+    x1 = min(w, max(r[2] for r in rects) + margin_px)
+    y1 = min(h, max(r[3] for r in rects) + margin_px)
+    if x1 <= x0 or y1 <= y0:
+        return None
+    return (int(x0), int(y0), int(x1), int(y1))
+
+
+def _contains(outer: Rect, inner: Rect) -> bool:
+    return (outer[0] <= inner[0] and outer[1] <= inner[1]
+            and outer[2] >= inner[2] and outer[3] >= inner[3])
+
+
+class FrameSpillStore:
+    """Append-only chunked store of sampled frames — JPEG crops, or raw
+    memmaps when jpeg_quality=0 (write side: main loop, read side: ROI sweep).
+
+    Lifecycle:
+        store = FrameSpillStore(rect_fn=..., expected_frames=N)
+        for idx, frame in enumerate(decoded):
+            store.write(frame, idx)        # never raises
+        store.finish()
+        if store.usable: run_unified_roi(..., spill=store)
+        store.cleanup()
+
+    rect_fn() is polled until it returns a rect (the court has locked); from
+    then on only that rect is spilled.
+    """
+
+    def __init__(
+        self,
+        *,
+        rect_fn: Optional[Callable[[Tuple[int, ...]], Optional[Rect]]] = None,
+        root_dir: Optional[str] = None,
+        chunk_frames: int = 250,
+        max_bytes: Optional[int] = None,
+        expected_frames: int = 0,
+        jpeg_quality: int = 0,
+    ):
+        self.root = tempfile.mkdtemp(prefix="roi_spill_", dir=root_dir or None)
+        self.frame_shape: Optional[Tuple[int, ...]] = None
+        self.rect: Optional[Rect] = None
+        self.n_frames = 0
+        self.bytes_written = 0
+        self.failed: Optional[str] = None
+        self._rect_fn = rect_fn
+        self._chunk_frames = max(1, int(chunk_frames))
+        self._max_bytes = max_bytes
+        self._expected_frames = max(0, int(expected_frames))
+        self._jpeg_quality = min(100, max(0, int(jpeg_quality)))
+        # [{"path", "rect", "start", "count"[, "offsets"]}] in frame order
+        self._chunks: List[dict] = []
+        self._mm = None      # raw mode: open memmap of the tail chunk
+        self._fh = None      # JPEG mode: open file of the tail chunk
+        self._projected = False
+        self._finished = False
+
+    # -- write side ----------------------------------------------------------
+
+    @property
+    def usable(self) -> bool:
+        return self._finished and self.failed is None and self.n_frames > 0
+
+    def write(self, frame: np.ndarray, idx: int) -> None:
+        """Spill one sampled frame. idx must be the next contiguous index."""
+        if self.failed is not None or self._finished:
+            return
+        try:
+            if idx != self.n_frames:
+                self._fail(f"non-contiguous frame idx {idx} (expected {self.n_frames})")
+                return
+            if self.frame_shape is None:
+                self.frame_shape = tuple(frame.shape)
+            elif tuple(frame.shape) != self.frame_shape:
+                self._fail(f"frame shape changed {self.frame_shape} -> {frame.shape}")
+                return
+            if self.rect is None and self._rect_fn is not None:
+                rect = self._rect_fn(self.frame_shape)
+                if rect is not None:
+                    self._lock_rect(rect)
+                    if self.failed is not None:
+                        return
+            rect = self.rect or (0, 0, self.frame_shape[1], self.frame_shape[0])
+            chunk = self._chunks[-1] if self._chunks else None
+            if (chunk is None or (self._mm is None and self._fh is None)
+                    or chunk["rect"] != rect or chunk["count"] >= self._chunk_frames):
+                self._open_chunk(rect)
+                if self.failed is not None:
+                    return
+                chunk = self._chunks[-1]
+            x0, y0, x1, y1 = rect
+            if self._fh is not None:
+                ok, buf = cv2.imencode(".jpg", frame[y0:y1, x0:x1],
+                                       [cv2.IMWRITE_JPEG_QUALITY, self._jpeg_quality])
+                if not ok:
+                    self._fail(f"JPEG encode failed at frame {idx}")
+                    return
+                self._fh.write(buf.tobytes())
+                chunk["offsets"].append(chunk["offsets"][-1] + buf.size)
+                self.bytes_written += int(buf.size)
+                if self._max_bytes is not None and self.bytes_written > self._max_bytes:
+                    self._fail(f"disk budget {self._max_bytes / 1024 ** 3:.1f} GB exhausted")
+                    return
+            else:
+                self._mm[chunk["count"]] = frame[y0:y1, x0:x1]
+            chunk["count"] += 1
+            self.n_frames += 1
+        except Exception as e:
+            self._fail(f"write raised at frame {idx}: {e}")
+
+    def _lock_rect(self, rect: Rect) -> None:
+        self.rect = rect
+        x0, y0, x1, y1 = rect
+        h, w = self.frame_shape[:2]
+        logger.info(
+            "frame_spill: ROI rect locked at frame %d — (%d,%d)-(%d,%d) = %.0f%% of "
+            "frame (%s)",
+            self.n_frames, x0, y0, x1, y1, 100.0 * (x1 - x0) * (y1 - y0) / max(1, w * h),
+            f"JPEG q{self._jpeg_quality}" if self._jpeg_quality else "raw",
+        )
+        if not self._jpeg_quality:
+            # Raw frames have a fixed size: project the whole run right away.
+            self._check_projection((x1 - x0) * (y1 - y0) * 3)
+
+    def _check_projection(self, per_frame: float) -> None:
+        """Fail early when `per_frame` bytes for every remaining expected
+        frame would overrun the budget."""
+        self._projected = True
+        projected = self.bytes_written + per_frame * max(0, self._expected_frames - self.n_frames)
+        logger.info("frame_spill: projected %.1f GB for %d frames",
+                    projected / 1024 ** 3, self._expected_frames)
+        if self._max_bytes is not None and projected > self._max_bytes:
+            self._fail(
+                f"projected {projected / 1024 ** 3:.1f} GB exceeds budget "
+                f"{self._max_bytes / 1024 ** 3:.1f} GB"
+            )
+
+    def _open_chunk(self, rect: Rect) -> None:
+        prev = self._chunks[-1] if self._chunks else None
+        self._close_chunk()
+        if (self._jpeg_quality and not self._projected and self.rect is not None
+                and prev is not None and prev["rect"] == self.rect and prev["count"]):
+            # JPEG size depends on content: project from the first full chunk
+            # of locked-rect frames.
+            self._check_projection(prev["offsets"][-1] / prev["count"])
+            if self.failed is not None:
+                return
+        x0, y0, x1, y1 = rect
+        raw_bytes = self._chunk_frames * (y1 - y0) * (x1 - x0) * 3
+        if not self._jpeg_quality and self._max_bytes is not None \
+                and self.bytes_written + raw_bytes > self._max_bytes:
+            self._fail(f"disk budget {self._max_bytes / 1024 ** 3:.1f} GB exhausted")
+            return
+        # The raw size is also the worst case for a JPEG chunk.
+        if shutil.disk_usage(self.root).free < raw_bytes + _DISK_RESERVE_BYTES:
+            self._fail("not enough free disk for the next chunk")
+            return
+        entry = {"rect": rect, "start": self.n_frames, "count": 0}
+        if self._jpeg_quality:
+            entry["path"] = os.path.join(self.root, f"chunk_{len(self._chunks):05d}.jpgs")
+            entry["offsets"] = [0]
+            self._fh = open(entry["path"], "wb")
+        else:
+            entry["path"] = os.path.join(self.root, f"chunk_{len(self._chunks):05d}.npy")
+            self._mm = np.lib.format.open_memmap(
+                entry["path"], mode="w+", dtype=np.uint8,
+                shape=(self._chunk_frames, y1 - y0, x1 - x0, 3),
+            )
+            self.bytes_written += raw_bytes
+        self._chunks.append(entry)
+
+    def _close_chunk(self) -> None:
+        if self._mm is not None:
+            self._mm.flush()
+            self._mm = None
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    def finish(self) -> None:
+        """Flush the tail chunk; the store becomes readable."""
+        if self._finished:
+            return
+        self._close_chunk()
+        self._finished = True
+        if self.failed is None:
+            logger.info(
+                "frame_spill: %d frames in %d chunks (%.1f GB) at %s",
+                self.n_frames, len(self._chunks), self.bytes_written / 1024 ** 3, self.root,
+            )
+
+    def _fail(self, reason: str) -> None:
+        self.failed = reason
+        logger.warning("frame_spill: disabled (%s) — ROI sweep will re-decode", reason)
+        self._mm = None
+        if self._fh is not None:
+            try:
+                self._fh.close()
+            except OSError:
+                pass
+            self._fh = None
+        self._chunks = []
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    # -- read side -----------------------------------------------------------
+
+    def covers(self, rect: Rect) -> bool:
+        """True if every spilled frame holds the pixels of `rect`."""
+        return bool(self._chunks) and all(_contains(c["rect"], rect) for c in self._chunks)
+
+    def frames(self, stop: Optional[int] = None) -> Iterator[Tuple[int, np.ndarray]]:
+        """Yield (frame_idx, frame) in order, up to exclusive `stop`.
+
+        The yielded array is a reused full-size canvas — pixels outside the
+        spilled rect are undefined, and it is overwritten on the next
+        iteration, so consumers must copy anything they keep (the ROI
+        processors already do: they hold crops / resized tensors, never the
+        decoded frame itself)."""
+        if not self.usable:
+            return
+        canvas = np.zeros(self.frame_shape, dtype=np.uint8)
+        prev_rect = None
+        for c in self._chunks:
+            if stop is not None and c["start"] >= stop:
+                return
+            if c["rect"] != prev_rect:
+                canvas[:] = 0
+                prev_rect = c["rect"]
+            x0, y0, x1, y1 = c["rect"]
+            offsets = c.get("offsets")
+            if offsets is not None:
+                with open(c["path"], "rb") as f:
+                    data = np.frombuffer(f.read(), dtype=np.uint8)
+            else:
+                mm = np.load(c["path"], mmap_mode="r")
+            for i in range(c["count"]):
+                idx = c["start"] + i
+                if stop is not None and idx >= stop:
+                    return
+                if offsets is not None:
+                    canvas[y0:y1, x0:x1] = cv2.imdecode(
+                        data[offsets[i]:offsets[i + 1]], cv2.IMREAD_COLOR)
+                else:
+                    canvas[y0:y1, x0:x1] = mm[i]
+                yield idx, canvas
+            data = mm = None
+
+    def cleanup(self) -> None:
+        self._close_chunk()
+        shutil.rmtree(self.root, ignore_errors=True)
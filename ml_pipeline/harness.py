@@ -9,7 +9,7 @@ Usage:
     python -m ml_pipeline.harness <command> [args]
 
 Quality checks:
-    validate-bronze <job_id>             — sanity-check ml_analysis.* data
+    validate-bronze <job_id>             — sanity-check ml_analysis.* data (+ table bloat)
     validate-silver <task_id>            — sanity-check silver.point_detail data
     validate <task_id>                   — both bronze + silver checks
 
@@ -33,6 +33,12 @@ Operational:
     list-matches [--limit 20] [--source sportai|t5]  — recent silver matches
     rerun-silver <task_id>               — rebuild silver from existing bronze
     rerun-ingest <task_id>               — re-download bronze from S3 + rebuild silver
+    rebuild --tasks t1,t2 [--tasks-file F] [--jobs N] [--steps serve,identity,stroke,silver]
+            [--state-file F] [--fresh] [--force] [--csv PATH]
+                                         — re-run detectors + silver for many tasks on a
+                                           process pool; resumable, per-task advisory lock,
+                                           summary of durations + row deltas
+                                           (see ml_pipeline/rebuild.py)
     dual-submit <sportai_task_id>        — submit existing SportAI video to T5 pipeline
 
 Regression / golden datasets:
@@ -102,6 +108,9 @@ FAIL = "[FAIL]"
 WARN = "[WARN]"
 INFO = "[INFO]"
 
+# validate-bronze flags a detection table whose dead tuples reach this share.
+BLOAT_WARN_DEAD_PCT = 20.0
+
 
 def hr(title: str, char: str = "=", width: int = 78) -> None:
     print()
@@ -211,7 +220,8 @@ def validate_bronze(job_id: str) -> bool:
             SELECT count(*) AS total,
                    count(DISTINCT player_id) AS players,
                    count(court_x) AS court_x_pop,
-                   count(keypoints) AS kp_pop
+                   count(*) FILTER (WHERE keypoints_f16 IS NOT NULL
+                                      OR keypoints IS NOT NULL) AS kp_pop
             FROM ml_analysis.player_detections
             WHERE job_id = :j
         """), {"j": job_id}).mappings().first()
@@ -234,6 +244,20 @@ def validate_bronze(job_id: str) -> bool:
         else:
             all_ok &= check("ma_row_exists", False)
 
+        # Storage / bloat — informational, never fails the validation
+        sub("storage / bloat")
+        from ml_pipeline.detection_partitions import bloat_report
+        for r in bloat_report(conn, job_id):
+            tag = WARN if r["dead_pct"] >= BLOAT_WARN_DEAD_PCT else INFO
+            layout = f"partitioned ({r['relations']} rel)" if r["partitioned"] else "heap"
+            print(f"  {tag} {r['table']:40s} {layout}  "
+                  f"{r['total_bytes'] / 1e6:.1f} MB  live={r['live_tuples']} "
+                  f"dead={r['dead_tuples']} ({r['dead_pct']}%)  "
+                  f"last_vacuum={r['last_vacuum']}")
+            if "job_partition" in r:
+                print(f"  {INFO}   job partition                          "
+                      f"{r['job_partition'] or 'MISSING'}")
+
     return all_ok
 
 
@@ -454,6 +478,24 @@ def cmd_rerun_silver(args: argparse.Namespace) -> int:
     return 0
 
 
+def cmd_rebuild(args: argparse.Namespace) -> int:
+    from ml_pipeline import rebuild
+
+    task_ids = rebuild.parse_tasks(args.tasks, args.tasks_file)
+    if not task_ids:
+        print("rebuild: no task ids (use --tasks and/or --tasks-file)")
+        return 1
+    steps = [s.strip() for s in args.steps.split(",") if s.strip()]
+    unknown = [s for s in steps if s not in rebuild.STEPS]
+    if unknown:
+        print(f"rebuild: unknown step(s) {unknown}; choose from {list(rebuild.STEPS)}")
+        return 1
+    hr(f"REBUILD  {len(task_ids)} task(s)  jobs={args.jobs}")
+    return rebuild.run(task_ids, steps=steps, jobs=args.jobs, state_file=args.state_file,
+                       fresh=args.fresh, force=args.force,
+                       ingest_stale_s=args.ingest_stale_s, csv_path=args.csv)
+
+
 def cmd_rerun_ingest(args: argparse.Namespace) -> int:
     hr(f"RERUN INGEST  task_id={args.task_id}")
     engine = get_engine()
@@ -881,7 +923,8 @@ def cmd_eval_player(args: argparse.Namespace) -> int:
                 round(avg(court_x)::numeric, 2)           AS avg_x,
                 round(avg(court_y)::numeric, 2)           AS avg_y,
                 count(court_x)                            AS court_x_pop,
-                count(keypoints)                          AS kp_pop
+                count(*) FILTER (WHERE keypoints_f16 IS NOT NULL
+                                   OR keypoints IS NOT NULL) AS kp_pop
             FROM ml_analysis.player_detections
             WHERE job_id = :j
             GROUP BY player_id
@@ -894,7 +937,8 @@ def cmd_eval_player(args: argparse.Namespace) -> int:
                 count(DISTINCT player_id)                 AS unique_players,
                 count(*)                                  AS total_detections,
                 count(court_x)                            AS court_pop,
-                count(keypoints)                          AS kp_pop
+                count(*) FILTER (WHERE keypoints_f16 IS NOT NULL
+                                   OR keypoints IS NOT NULL) AS kp_pop
             FROM ml_analysis.player_detections
             WHERE job_id = :j
         """), {"j": job_id}).mappings().first()
@@ -1026,10 +1070,8 @@ def cmd_eval_court(args: argparse.Namespace) -> int:
                 count(court_x) FILTER (WHERE court_x IS NOT NULL)    AS frames_with_court_coords,
                 round(avg(
                     CASE WHEN court_x IS NOT NULL
-                    THEN array_length(
-                        ARRAY(
-                            SELECT jsonb_array_elements_text(keypoints)
-                        ), 1)
+                    THEN COALESCE(octet_length(keypoints_f16) / 6,
+                                  jsonb_array_length(keypoints))
                     END
                 )::numeric, 1)                                        AS avg_kp_elements
             FROM ml_analysis.player_detections
@@ -1551,6 +1593,10 @@ def main():
     p_ri = sub.add_parser("rerun-ingest")
     p_ri.add_argument("task_id")
 
+    p_rb = sub.add_parser("rebuild")
+    from ml_pipeline.rebuild import add_arguments as _rebuild_args
+    _rebuild_args(p_rb)
+
     p_ds = sub.add_parser("dual-submit")
     p_ds.add_argument("sportai_task_id", help="Existing SportAI task_id to dual-submit to T5")
 
@@ -1685,6 +1731,8 @@ def main():
         return cmd_rerun_silver(args)
     if args.cmd == "rerun-ingest":
         return cmd_rerun_ingest(args)
+    if args.cmd == "rebuild":
+        return cmd_rebuild(args)
     if args.cmd == "dual-submit":
         return cmd_dual_submit(args)
     if args.cmd == "golden-list":
@@ -72,32 +72,36 @@ def _draw_court(ax):
     ax.set_yticks([])
 
 
-def generate_ball_heatmap(ball_detections, title="Ball Landing Heatmap") -> bytes:
+def _court_points(table, mask: np.ndarray):
+    """(xs, ys) lists of the court_x / court_y of the masked rows that have both."""
+    cx, cy = table["court_x"], table["court_y"]
+    keep = mask & np.isfinite(cx) & np.isfinite(cy)
+    return cx[keep].tolist(), cy[keep].tolist()
+
+
+def generate_ball_heatmap(ball_table, title="Ball Landing Heatmap") -> bytes:
     """
     Generate a ball bounce/landing heatmap on a 2D court diagram.
 
     Args:
-        ball_detections: list of objects with .court_x, .court_y, .is_bounce attributes
+        ball_table: ball DetectionTable (court_x, court_y, is_bounce columns)
         title: plot title
 
     Returns:
         PNG image as bytes
     """
-    bounces = [d for d in ball_detections
-               if d.is_bounce and d.court_x is not None and d.court_y is not None]
+    xs, ys = _court_points(ball_table, ball_table["is_bounce"])
 
     fig, ax = plt.subplots(1, 1, figsize=(6, 12), dpi=150)
     _draw_court(ax)
 
-    if bounces:
-        xs = [b.court_x for b in bounces]
-        ys = [b.court_y for b in bounces]
+    if xs:
 
         # Scatter with transparency
         ax.scatter(xs, ys, c="#ff6600", alpha=0.6, s=40, edgecolors="#cc4400", linewidths=0.5, zorder=5)
 
         # 2D density if enough points
-        if len(bounces) >= 5:
+        if len(xs) >= 5:
             try:
                 from scipy.stats import gaussian_kde
                 xy = np.vstack([xs, ys])
@@ -112,7 +116,7 @@ def generate_ball_heatmap(ball_detections, title="Ball Landing Heatmap") -> byte
             except Exception as e:
                 logger.warning(f"KDE failed, showing scatter only: {e}")
 
-        ax.set_title(f"{title}\n({len(bounces)} bounces)", color="white", fontsize=12, pad=10)
+        ax.set_title(f"{title}\n({len(xs)} bounces)", color="white", fontsize=12, pad=10)
     else:
         ax.set_title(f"{title}\n(no bounce data)", color="white", fontsize=12, pad=10)
 
@@ -126,21 +130,20 @@ def generate_ball_heatmap(ball_detections, title="Ball Landing Heatmap") -> byte
     return buf.read()
 
 
-def generate_player_heatmap(player_detections, player_id: int,
+def generate_player_heatmap(player_table, player_id: int,
                             title: str = None) -> bytes:
     """
     Generate a player position heatmap on a 2D court diagram.
 
     Args:
-        player_detections: list of objects with .player_id, .court_x, .court_y
+        player_table: player DetectionTable (player_id, court_x, court_y columns)
         player_id: which player to filter for
         title: plot title (auto-generated if None)
 
     Returns:
         PNG image as bytes
     """
-    pts = [d for d in player_detections
-           if d.player_id == player_id and d.court_x is not None and d.court_y is not None]
+    xs, ys = _court_points(player_table, player_table["player_id"] == player_id)
 
     if title is None:
         title = f"Player {player_id} Position Heatmap"
@@ -151,13 +154,10 @@ def generate_player_heatmap(player_detections, player_id: int,
     colors = {0: "#00aaff", 1: "#ff4444"}
     color = colors.get(player_id, "#ffaa00")
 
-    if pts:
-        xs = [p.court_x for p in pts]
-        ys = [p.court_y for p in pts]
-
+    if xs:
         ax.scatter(xs, ys, c=color, alpha=0.3, s=15, zorder=5)
 
-        if len(pts) >= 10:
+        if len(xs) >= 10:
             try:
                 from scipy.stats import gaussian_kde
                 xy = np.vstack([xs, ys])
@@ -173,7 +173,7 @@ def generate_player_heatmap(player_detections, player_id: int,
             except Exception as e:
                 logger.warning(f"KDE failed for player {player_id}: {e}")
 
-        ax.set_title(f"{title}\n({len(pts)} positions)", color="white", fontsize=12, pad=10)
+        ax.set_title(f"{title}\n({len(xs)} positions)", color="white", fontsize=12, pad=10)
     else:
         ax.set_title(f"{title}\n(no position data)", color="white", fontsize=12, pad=10)
 
@@ -200,13 +200,13 @@ def generate_all_heatmaps(result) -> Dict[str, bytes]:
     heatmaps = {}
 
     # Ball landing heatmap
-    heatmaps["ball_heatmap.png"] = generate_ball_heatmap(result.ball_detections)
+    heatmaps["ball_heatmap.png"] = generate_ball_heatmap(result.ball_table)
 
     # Player position heatmaps
-    player_ids = sorted(set(d.player_id for d in result.player_detections))
+    player_ids = np.unique(result.player_table["player_id"]).tolist()
     for pid in player_ids:
         key = f"player_heatmap_{pid}.png"
-        heatmaps[key] = generate_player_heatmap(result.player_detections, pid)
+        heatmaps[key] = generate_player_heatmap(result.player_table, pid)
 
     logger.info(f"Generated {len(heatmaps)} heatmap(s)")
     return heatmaps
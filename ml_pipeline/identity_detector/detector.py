@@ -164,6 +164,7 @@ def _load_pose_rows_by_track(
     conn,
     task_id: str,
     tracks: Sequence[int] = (TRACK_NEAR, TRACK_FAR),
+    store=None,
 ) -> Dict[int, List[Tuple[float, Optional[float]]]]:
     """Load (ts, court_y) per track from player_detections.
 
@@ -172,6 +173,8 @@ def _load_pose_rows_by_track(
       - We only need court_y (the side-of-court signal), so we skip the
         keypoints + bbox payload — keeps memory usage tiny on the Render
         512 MB main API.
+      - With a TaskFrameStore the per-track rows come from its player
+        columns (already loaded by the serve detector) — no per-track query.
     """
     fps = conn.execute(sql_text(
         "SELECT COALESCE(video_fps, 25.0) FROM ml_analysis.video_analysis_jobs "
@@ -180,12 +183,16 @@ def _load_pose_rows_by_track(
 
     out: Dict[int, List[Tuple[float, Optional[float]]]] = {t: [] for t in tracks}
     for pid in tracks:
-        rs = conn.execute(sql_text("""
-            SELECT frame_idx, court_y
-            FROM ml_analysis.player_detections
-            WHERE job_id = :tid AND player_id = :pid
-            ORDER BY frame_idx
-        """), {"tid": task_id, "pid": pid}).fetchall()
+        if store is not None:
+            rs = store.rows(store.players, store.select(store.players, player_id=pid),
+                            ("frame_idx", "court_y"))
+        else:
+            rs = conn.execute(sql_text("""
+                SELECT frame_idx, court_y
+                FROM ml_analysis.player_detections
+                WHERE job_id = :tid AND player_id = :pid
+                ORDER BY frame_idx
+            """), {"tid": task_id, "pid": pid}).fetchall()
         out[pid] = [(float(frame_idx) / float(fps), court_y)
                     for (frame_idx, court_y) in rs]
     return out
@@ -230,6 +237,7 @@ def detect_identity_for_task(
     task_id: str,
     *,
     replace: bool = True,
+    store=None,
 ) -> List[IdentitySegment]:
     """Production entry point. Wipes any prior identity segments for the
     task (when replace=True), runs the v1 detector, and persists results.
@@ -248,7 +256,7 @@ def detect_identity_for_task(
     if not serve_events:
         logger.info("identity_detector: no serve_events for %s — skipping", task_id)
         return []
-    pose_by_track = _load_pose_rows_by_track(conn, task_id)
+    pose_by_track = _load_pose_rows_by_track(conn, task_id, store=store)
     a_starts_near = _load_a_starts_near(conn, task_id)
 
     segments = detect_identity_offline(
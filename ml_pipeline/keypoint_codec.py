@@ -0,0 +1,167 @@
+"""Compact binary keypoints for ml_analysis.player_detections(_roi).
+
+Keypoints used to live only in a JSONB `keypoints` column ([[x, y, c] x 17]):
+bronze_ingest_t5 re-nested every flat export row with json.dumps, Postgres
+stored ~1 KB of JSONB text per row (TOASTed on long matches), and every loader
+(_kps_to_array in serve_detector / stroke_detector / build_silver_match_t5,
+task_frame_store) json-parsed it back into NumPy. They now go in
+`keypoints_f16 BYTEA`: 17 x 3 little-endian float16, 102 bytes, decoded with
+np.frombuffer.
+
+float16 keeps 11 significant bits: pixel coordinates round to <= 0.25 px below
+1024 px and <= 0.5 px up to 2048 px, confidences to ~2e-4 — below the pose
+models' own jitter.
+
+Reads go through kp_sql(), which yields ONE bytea column: keypoints_f16 when
+set, else the legacy JSONB as UTF-8 text. kps_to_array() tells them apart by
+length — any JSON that could parse to >= 11 keypoints is longer than 102
+bytes — so rows ingested before the column existed keep loading unchanged.
+
+The JSONB column is a compatibility surface, not the source of truth:
+KEYPOINTS_JSONB=1 dual-writes it for external consumers, and the views
+ml_analysis.player_detections_kp / player_detections_roi_kp expose `keypoints`
+as JSONB for every row (decoded in SQL by ml_analysis.kp_f16_to_jsonb) for ad
+hoc queries and the diag scripts.
+"""
+from __future__ import annotations
+
+import json
+import os
+from typing import Optional
+
+import numpy as np
+
+NUM_KP = 17
+KP_F16_BYTES = NUM_KP * 3 * 2           # 102
+_F16 = np.dtype("<f2")
+
+# Dual-write the legacy JSONB column alongside keypoints_f16 (default off).
+KEYPOINTS_JSONB = (os.getenv("KEYPOINTS_JSONB", "0").strip() == "1")
+
+
+def encode_f16(kps) -> Optional[bytes]:
+    """(17, 3) array / nested list / flat-51 list -> 102-byte float16 blob.
+    None for None/empty/short input (same acceptance as kps_to_array)."""
+    arr = kps if isinstance(kps, np.ndarray) else _from_obj(kps)
+    if arr is None:
+        return None
+    arr = np.asarray(arr, dtype=np.float32).reshape(-1)
+    if arr.size < NUM_KP * 3:
+        return None
+    return arr[:NUM_KP * 3].astype(_F16).tobytes()
+
+
+def decode_f16(buf) -> Optional[np.ndarray]:
+    """102-byte float16 blob -> float32 (17, 3) array (owned, writable)."""
+    if buf is None or len(buf) != KP_F16_BYTES:
+        return None
+    return np.frombuffer(buf, dtype=_F16).astype(np.float32).reshape(NUM_KP, 3)
+
+
+def to_json(kps) -> Optional[str]:
+    """Nested [[x, y, c] x 17] JSON for the legacy column (None when off)."""
+    if not KEYPOINTS_JSONB or kps is None:
+        return None
+    arr = kps if isinstance(kps, np.ndarray) else _from_obj(kps)
+    if arr is None:
+        return None
+    return json.dumps(np.asarray(arr, dtype=np.float64).reshape(-1, 3).tolist())
+
+
+def _from_obj(raw) -> Optional[np.ndarray]:
+    if not raw:
+        return None
+    if isinstance(raw[0], (int, float)):
+        if len(raw) < NUM_KP * 3:
+            return None
+        return np.asarray(raw[:NUM_KP * 3], dtype=np.float32).reshape(NUM_KP, 3)
+    try:
+        arr = np.asarray(raw, dtype=np.float32)
+    except (ValueError, TypeError):
+        return None
+    if arr.ndim != 2 or arr.shape[1] != 3 or arr.shape[0] < 11:
+        return None
+    if arr.shape[0] > NUM_KP:
+        return arr[:NUM_KP]
+    if arr.shape[0] < NUM_KP:
+        pad = np.zeros((NUM_KP - arr.shape[0], 3), dtype=np.float32)
+        return np.vstack([arr, pad])
+    return arr
+
+
+def kps_to_array(raw) -> Optional[np.ndarray]:
+    """Any stored keypoints form -> float32 (17, 3), or None if malformed.
+
+    Accepts the keypoints_f16 blob (bytes / memoryview), the kp_sql() text
+    fallback (JSON as bytes), a JSON string, the JSONB nested list or the
+    flat-51 list."""
+    if raw is None:
+        return None
+    if isinstance(raw, (bytes, bytearray, memoryview)):
+        if len(raw) == KP_F16_BYTES:
+            return decode_f16(raw)
+        raw = bytes(raw).decode("utf-8", "replace")
+    if isinstance(raw, str):
+        try:
+            raw = json.loads(raw)
+        except (json.JSONDecodeError, TypeError):
+            return None
+    return _from_obj(raw)
+
+
+def kp_sql(alias: str = "") -> str:
+    """SELECT expression for a table's keypoints as a single bytea value:
+    keypoints_f16 if present, else the JSONB text. Feed it to kps_to_array."""
+    p = f"{alias}." if alias else ""
+    return (f"COALESCE({p}keypoints_f16, "
+            f"convert_to({p}keypoints::text, 'UTF8'))")
+
+
+def kp_present_sql(alias: str = "") -> str:
+    """WHERE predicate replacing `keypoints IS NOT NULL`."""
+    p = f"{alias}." if alias else ""
+    return f"({p}keypoints_f16 IS NOT NULL OR {p}keypoints IS NOT NULL)"
+
+
+# float16 -> JSONB in SQL, for the compatibility views. IEEE half: 1 sign bit,
+# 5 exponent bits (bias 15), 10 fraction bits; subnormals when exponent = 0.
+# Inf/NaN (exponent 31) never come out of the pose models and map to NULL.
+# Computed in float8, where every half value is exact (numeric's 2.0 ^ -24
+# rounds) — the result equals decode_f16 bit for bit.
+KP_F16_TO_JSONB_SQL = """
+CREATE OR REPLACE FUNCTION ml_analysis.kp_f16_to_jsonb(b BYTEA)
+RETURNS JSONB LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE AS $$
+    SELECT jsonb_agg(jsonb_build_array(v[1], v[2], v[3]) ORDER BY k)
+    FROM (
+        SELECT k, array_agg(val ORDER BY j) AS v
+        FROM (
+            SELECT i / 3 AS k, i % 3 AS j,
+                   CASE
+                       WHEN e = 31 THEN NULL
+                       WHEN e = 0 THEN (1 - 2 * s) * f * 2.0::float8 ^ -24
+                       ELSE (1 - 2 * s) * (1 + f / 1024.0::float8) * 2.0::float8 ^ (e - 15)
+                   END AS val
+            FROM (
+                SELECT i, h >> 15 AS s, (h >> 10) & 31 AS e, h & 1023 AS f
+                FROM (
+                    SELECT i, get_byte(b, 2 * i) | (get_byte(b, 2 * i + 1) << 8) AS h
+                    FROM generate_series(0, octet_length(b) / 2 - 1) AS i
+                ) halves
+            ) parts
+        ) vals
+        GROUP BY k
+    ) kps
+$$
+"""
+
+
+def compat_view_sql(table: str, columns: str) -> str:
+    """CREATE OR REPLACE VIEW ml_analysis.<table>_kp with JSONB `keypoints`
+    for every row (legacy column if written, else decoded from f16)."""
+    return f"""
+        CREATE OR REPLACE VIEW ml_analysis.{table}_kp AS
+        SELECT {columns},
+               COALESCE(keypoints, ml_analysis.kp_f16_to_jsonb(keypoints_f16))
+                   AS keypoints
+        FROM ml_analysis.{table}
+    """
@@ -44,7 +44,9 @@ INTEGRATION (deploy-later — do this WITH a Class-C/D fixture, not before):
        • undistort the calibration keypoint OBSERVATIONS via undistort_points()
          BEFORE fit_calibration (so the homography/radial fit is in
          undistorted space);
-       • undistort the query pixel at the top of to_court_coords();
+       • undistort the query pixel at the top of to_court_coords() and the
+         whole (N,2) batch at the top of to_court_coords_batch() —
+         undistort_points() is already array-in/array-out;
        • the ROI extractors project metric→pixel (project_metres_to_pixel) to
          find scan regions in the DISTORTED frame — those results must be
          RE-distorted (inverse of undistort_points) or the ROI lands wrong.
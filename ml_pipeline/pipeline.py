@@ -27,11 +27,18 @@ from ml_pipeline.config import (
     MOG2_DOWNSCALE,
     BALL_TRACKER,
     PIPELINE_STAGE_OVERLAP,
+    DECODE_PREFETCH,
+    ROI_FRAME_SPILL,
+    ROI_FRAME_SPILL_CHUNK,
+    ROI_FRAME_SPILL_DIR,
+    ROI_FRAME_SPILL_JPEG_QUALITY,
+    ROI_FRAME_SPILL_MAX_GB,
 )
 from ml_pipeline.video_preprocessor import VideoPreprocessor, VideoMetadata
 from ml_pipeline.court_detector import CourtDetector
 from ml_pipeline.ball_tracker import BallTracker, BallDetection
 from ml_pipeline.player_tracker import PlayerTracker, PlayerDetection
+from ml_pipeline.detection_table import DetectionTable
 
 
 def _make_ball_tracker(device: str):
@@ -58,6 +65,12 @@ def _make_ball_tracker(device: str):
 
 logger = logging.getLogger(__name__)
 
+# Stages that run sequentially on the frame-loop thread — their sum is the
+# wall-clock total in the stage_timings log. Every other _stage_seconds key is
+# an overlapped observability counter (motion_mask_compute, decode_compute).
+_WALL_STAGES = ("decode_wait", "court", "ball", "motion_mask", "player", "spill",
+                "postprocess")
+
 # Pipeline stages with approximate progress percentages
 PIPELINE_STAGES = [
     ("downloading",          5),
@@ -88,9 +101,11 @@ class AnalysisResult:
     court_confidence: float = 0.0
     court_used_fallback: bool = False
 
-    # Detections (raw)
-    ball_detections: List[BallDetection] = field(default_factory=list)
-    player_detections: List[PlayerDetection] = field(default_factory=list)
+    # Detections (raw) — the trackers' own DetectionTables, handed over in
+    # _postprocess (no copy). ball_detections / player_detections below are
+    # the iterable compatibility names for the same tables.
+    ball_table: DetectionTable = field(default_factory=lambda: DetectionTable("ball"))
+    player_table: DetectionTable = field(default_factory=lambda: DetectionTable("player"))
 
     # Ball aggregate stats
     ball_detection_rate: float = 0.0       # fraction of frames with ball detected
@@ -109,26 +124,62 @@ class AnalysisResult:
     # Player stats
     player_count: int = 0                  # how many distinct players detected
 
+    # C3 single-decode: the main loop's ROI frame spill (frame_spill.
+    # FrameSpillStore) for the ROI sweep to replay. None unless
+    # ROI_FRAME_SPILL=1 and the spill survived; the caller owns cleanup().
+    frame_spill: Optional[object] = None
+
     # Errors
     frame_errors: int = 0
 
+    @property
+    def ball_detections(self) -> DetectionTable:
+        """ball_table; iterating it yields BallDetection objects."""
+        return self.ball_table
+
+    @property
+    def player_detections(self) -> DetectionTable:
+        """player_table; iterating it yields PlayerDetection objects."""
+        return self.player_table
+
 
 class TennisAnalysisPipeline:
     def __init__(self, device: str = None,
                  progress_callback: Callable[[str, int], None] = None,
-                 practice: bool = False):
+                 practice: bool = False,
+                 telemetry_callback: Callable[[dict], None] = None,
+                 calibration_cache=None,
+                 defer_stroke_classification: bool = False):
         """
         Args:
             device: 'cuda' or 'cpu'
             progress_callback: optional fn(stage: str, progress_pct: int) called at each stage
             practice: if True, use optimised settings (lower FPS, less frequent detection)
+            telemetry_callback: optional fn(snapshot: dict) handed the stage timing
+                snapshot every PROGRESS_LOG_INTERVAL frames and after postprocess
+                (see telemetry_writer.snapshot_rows for the shape)
+            calibration_cache: optional court_calibration_cache.CourtCalibrationCache;
+                lets the court detector reuse a calibration from the same camera
+            defer_stroke_classification: if True, _postprocess leaves swing-type
+                classification to the caller (make_swing_processor +
+                finish_stroke_classification) so its flow windows can ride the
+                unified ROI sweep's decode (SWING_FLOW_FUSED)
         """
         self.device = device or ("cuda" if __import__("torch").cuda.is_available() else "cpu")
         self._progress_cb = progress_callback
+        self._telemetry_cb = telemetry_callback
         self.practice = practice
+        self._defer_strokes = defer_stroke_classification
+        self._swing_planned = False
         self.target_fps = FRAME_SAMPLE_FPS_PRACTICE if practice else FRAME_SAMPLE_FPS
         logger.info(f"Initialising pipeline on device: {self.device} (practice={practice}, fps={self.target_fps})")
-        self.court_detector = CourtDetector(device=self.device)
+        # Swing-classifier Farneback pool: opened first — before the models
+        # initialise CUDA and before process() starts the decode-prefetch /
+        # MOG2 threads — and shared by every classification of the run.
+        self._flow_pool = self._open_flow_pool()
+        self.court_detector = CourtDetector(
+            device=self.device, calibration_cache=calibration_cache,
+        )
         self.ball_tracker = _make_ball_tracker(self.device)
         self.player_tracker = PlayerTracker(device=self.device)
 
@@ -189,6 +240,17 @@ class TennisAnalysisPipeline:
             # this holds the real (overlapped) MOG2 cost — the gap between them
             # is the wall-clock the overlap hid behind the GPU stages.
             "motion_mask_compute": 0.0,
+            # C3: copying each frame's ROI region into the spill store. 0 when
+            # ROI_FRAME_SPILL is off.
+            "spill": 0.0,
+            # Time the loop spent waiting for the next decoded frame. Without
+            # DECODE_PREFETCH this is the full decode cost (it was hidden
+            # inside the loop overhead before); with it, only the residual
+            # wait on the producer queue.
+            "decode_wait": 0.0,
+            # DECODE_PREFETCH observability: the producer thread's true decode
+            # + resize time (overlapped, so NOT part of the wall-clock total).
+            "decode_compute": 0.0,
         }
 
     def _report_progress(self, stage: str, pct: int = None):
@@ -211,11 +273,11 @@ class TennisAnalysisPipeline:
         single most useful number for deciding where to optimise next.
         """
         totals = self._stage_seconds
-        # motion_mask_compute is an OBSERVABILITY counter (TASK 1) that overlaps
-        # the GPU stages in overlap mode — it is NOT a sequential wall-clock
-        # contributor, so exclude it from the grand total / share maths to keep
-        # the percentages meaningful. It is still printed separately below.
-        WALL = ("court", "ball", "motion_mask", "player", "postprocess")
+        # motion_mask_compute / decode_compute are OBSERVABILITY counters that
+        # overlap the GPU stages — they are NOT sequential wall-clock
+        # contributors, so exclude them from the grand total / share maths to
+        # keep the percentages meaningful. They are printed separately below.
+        WALL = _WALL_STAGES
         grand = sum(totals.get(k, 0.0) for k in WALL)
         if grand <= 0 or frame_idx <= 0:
             return
@@ -243,6 +305,20 @@ class TennisAnalysisPipeline:
                 hidden * 1000 / max(1, frame_idx),
             )
 
+        # Same view for the decode prefetcher: decode_compute is what the
+        # producer thread spent decoding + resizing, decode_wait the part the
+        # loop still waited for.
+        dec_compute = totals.get("decode_compute", 0.0)
+        if dec_compute > 0:
+            dec_wait = totals.get("decode_wait", 0.0)
+            hidden = max(0.0, dec_compute - dec_wait)
+            logger.info(
+                "decode_prefetch %s  decode_compute=%.1fs  decode_residual_wait=%.1fs  "
+                "overlapped_hidden=%.1fs (%.1fms/fr saved)",
+                label, dec_compute, dec_wait, hidden,
+                hidden * 1000 / max(1, frame_idx),
+            )
+
         # Player sub-stage breakdown — tells us whether SAHI, full-frame YOLO,
         # or scoring logic is the bottleneck inside the player stage.
         sub = getattr(self.player_tracker, "_sub_seconds", None)
@@ -263,6 +339,37 @@ class TennisAnalysisPipeline:
                     label, player_total, runs, skip, "  ".join(sub_parts),
                 )
 
+    def _report_timings(self, frame_idx: int, final: bool = False,
+                        loop: dict = None):
+        """Hand a copy of the stage accumulators to telemetry_callback.
+
+        Same numbers _log_stage_timings prints, split into wall-clock stages
+        and overlapped observability counters, plus the player sub-stages and
+        the frame-loop diagnostics in `loop`. Cheap dict copies only — the
+        callback must not block (TelemetryWriter just queues it).
+        """
+        if not self._telemetry_cb:
+            return
+        totals = self._stage_seconds
+        snapshot = {
+            "frames": frame_idx,
+            "final": final,
+            "wall": {k: totals.get(k, 0.0) for k in _WALL_STAGES},
+            "overlap": {k: v for k, v in totals.items() if k not in _WALL_STAGES},
+            "loop": dict(loop or {}),
+        }
+        sub = getattr(self.player_tracker, "_sub_seconds", None)
+        if sub:
+            snapshot["player_sub"] = dict(
+                sub,
+                sahi_ran=getattr(self.player_tracker, "_sahi_run_count", 0),
+                sahi_skipped=getattr(self.player_tracker, "_sahi_skip_count", 0),
+            )
+        try:
+            self._telemetry_cb(snapshot)
+        except Exception as e:
+            logger.warning(f"Telemetry callback failed: {e}")
+
     def process(self, video_path: str) -> AnalysisResult:
         """Run the full analysis pipeline on a video file."""
         t0 = time.time()
@@ -280,19 +387,55 @@ class TennisAnalysisPipeline:
             f"~{expected_frames} frames at {FRAME_SAMPLE_FPS}fps"
         )
 
+        spill = self._open_frame_spill(expected_frames)
+
+        # Decode source: the synchronous generator, or (DECODE_PREFETCH>0) a
+        # producer thread decoding + pre-resizing ahead into a bounded queue.
+        # Either way the loop times its wait for the next frame as decode_wait.
+        prefetcher = None
+        if DECODE_PREFETCH > 0:
+            from ml_pipeline.frame_prefetch import FramePrefetcher
+            prefetcher = FramePrefetcher(
+                preprocessor.frames(), depth=DECODE_PREFETCH,
+                resizes=self._prefetch_resizes(),
+            )
+            source = iter(prefetcher)
+            logger.info(
+                "Decode prefetch ENABLED (DECODE_PREFETCH=%d): %s",
+                DECODE_PREFETCH, [k for k, _, _ in self._prefetch_resizes()],
+            )
+        else:
+            source = ((f, None) for f in preprocessor.frames())
+
         # Frame-by-frame processing — report stages based on frame progress
         frame_idx = 0
         court_reported = False
         ball_reported = False
         player_reported = False
-        for frame in preprocessor.frames():
+        while True:
+            t = time.perf_counter()
+            try:
+                frame, prepared = next(source)
+            except StopIteration:
+                break
+            self._stage_seconds["decode_wait"] += time.perf_counter() - t
+            if prefetcher is not None:
+                self._stage_seconds["decode_compute"] = prefetcher.produce_seconds
+
             try:
-                self._process_frame(frame, frame_idx)
+                self._process_frame(frame, frame_idx, prepared)
             except Exception as e:
                 result.frame_errors += 1
                 if result.frame_errors <= 5:
                     logger.warning(f"Frame {frame_idx} error: {e}")
 
+            # C3: spill even when a model stage errored — the ROI sweep needs a
+            # contiguous frame sequence, and the decode itself was fine.
+            if spill is not None:
+                t = time.perf_counter()
+                spill.write(frame, frame_idx)
+                self._stage_seconds["spill"] += time.perf_counter() - t
+
             frame_idx += 1
 
             # Map frame progress to overall pipeline progress (10-80%)
@@ -308,9 +451,20 @@ class TennisAnalysisPipeline:
                 # eating wall-clock as the run progresses (e.g. player
                 # tracker slowing down once MOG2 background stabilises).
                 self._log_stage_timings(frame_idx)
+                self._report_timings(frame_idx, loop={
+                    "elapsed_sec": elapsed, "fps": fps_actual,
+                    "expected_frames": expected_frames,
+                    "frame_errors": result.frame_errors,
+                })
 
         result.total_frames_processed = frame_idx
         logger.info(f"Frame processing complete: {frame_idx} frames, {result.frame_errors} errors")
+        if spill is not None:
+            spill.finish()
+            if spill.usable:
+                result.frame_spill = spill
+            else:
+                spill.cleanup()
         self._log_stage_timings(frame_idx, final=True)
 
         # TASK 1: tear down the MOG2 worker — the per-frame loop is done and
@@ -338,13 +492,62 @@ class TennisAnalysisPipeline:
 
         result.processing_time_sec = time.time() - t0
         result.ms_per_frame = (result.processing_time_sec * 1000 / frame_idx) if frame_idx > 0 else 0
+        self._report_timings(frame_idx, final=True, loop={
+            "elapsed_sec": result.processing_time_sec,
+            "fps": frame_idx / result.processing_time_sec if result.processing_time_sec > 0 else 0,
+            "expected_frames": expected_frames,
+            "frame_errors": result.frame_errors,
+        })
         logger.info(
             f"Pipeline complete in {result.processing_time_sec:.1f}s "
             f"({result.ms_per_frame:.1f} ms/frame)"
         )
         return result
 
-    def _make_motion_mask(self, frame: np.ndarray) -> np.ndarray:
+    def _prefetch_resizes(self) -> list:
+        """The per-frame resizes the decode prefetcher precomputes: the ball
+        model's input (whichever tracker is live) and, when MOG2_DOWNSCALE>1,
+        the MOG2 input. Each matches the inline cv2.resize call exactly."""
+        resizes = []
+        size = getattr(self.ball_tracker, "INPUT_SIZE", None)
+        if size is not None:
+            resizes.append(("ball", tuple(size), cv2.INTER_LINEAR))
+        if MOG2_DOWNSCALE > 1:
+            resizes.append(("mog2", MOG2_DOWNSCALE, cv2.INTER_AREA))
+        return resizes
+
+    def _open_frame_spill(self, expected_frames: int):
+        """C3: create the ROI frame spill for this run, or None.
+
+        Match mode only (the practice path never runs the ROI sweep). The rect
+        callback stays None until the court locks, so the calibration frames
+        spill full-frame and everything after spills only the ROI union."""
+        if not ROI_FRAME_SPILL or self.practice:
+            return None
+        from ml_pipeline.frame_spill import FrameSpillStore, roi_spill_rect
+
+        detector = self.court_detector
+
+        def _rect(frame_shape):
+            if detector._locked_detection is None:
+                return None
+            return roi_spill_rect(detector, frame_shape)
+
+        try:
+            return FrameSpillStore(
+                rect_fn=_rect,
+                root_dir=ROI_FRAME_SPILL_DIR,
+                chunk_frames=ROI_FRAME_SPILL_CHUNK,
+                max_bytes=int(ROI_FRAME_SPILL_MAX_GB * 1024 ** 3),
+                expected_frames=expected_frames,
+                jpeg_quality=ROI_FRAME_SPILL_JPEG_QUALITY,
+            )
+        except Exception as e:
+            logger.warning(f"ROI frame spill unavailable (non-fatal): {e}")
+            return None
+
+    def _make_motion_mask(self, frame: np.ndarray,
+                          small: Optional[np.ndarray] = None) -> np.ndarray:
         """Compute the MOG2 foreground mask for one frame.
 
         Extracted so the overlap path (TASK 1) can run it on the worker thread
@@ -360,11 +563,12 @@ class TennisAnalysisPipeline:
         """
         import time as _t
         _s = _t.perf_counter()
-        mask = self._apply_mog2(frame)
+        mask = self._apply_mog2(frame, small)
         self._stage_seconds["motion_mask_compute"] += _t.perf_counter() - _s
         return mask
 
-    def _apply_mog2(self, frame: np.ndarray) -> np.ndarray:
+    def _apply_mog2(self, frame: np.ndarray,
+                    small: Optional[np.ndarray] = None) -> np.ndarray:
         """MOG2 foreground apply, with optional MOG2_DOWNSCALE (pure compute, no
         timing — callers own the stage counters).
 
@@ -376,21 +580,30 @@ class TennisAnalysisPipeline:
         full-res bbox, so the moving/stationary decision is preserved while
         MOG2.apply() runs on ~1/N^2 the pixels. Every frame uses the same path
         (MOG2_DOWNSCALE is constant), so the background model stays internally
-        consistent. Shared by the inline and overlap-worker paths."""
+        consistent. Shared by the inline and overlap-worker paths.
+
+        `small`: the downscaled frame precomputed by the decode prefetcher
+        (same INTER_AREA resize); recomputed here when absent."""
         if MOG2_DOWNSCALE > 1:
             h, w = frame.shape[:2]
-            small = cv2.resize(
-                frame, (w // MOG2_DOWNSCALE, h // MOG2_DOWNSCALE),
-                interpolation=cv2.INTER_AREA,
-            )
+            if small is None:
+                small = cv2.resize(
+                    frame, (w // MOG2_DOWNSCALE, h // MOG2_DOWNSCALE),
+                    interpolation=cv2.INTER_AREA,
+                )
             small_mask = self._bg_subtractor.apply(
                 small, learningRate=MOG2_LEARNING_RATE,
             )
             return cv2.resize(small_mask, (w, h), interpolation=cv2.INTER_NEAREST)
         return self._bg_subtractor.apply(frame, learningRate=MOG2_LEARNING_RATE)
 
-    def _process_frame(self, frame: np.ndarray, frame_idx: int):
-        """Process a single frame through all three models."""
+    def _process_frame(self, frame: np.ndarray, frame_idx: int,
+                       prepared: Optional[dict] = None):
+        """Process a single frame through all three models.
+
+        `prepared`: buffers the decode prefetcher already resized for this
+        frame ({"ball": ..., "mog2": ...}); None on the synchronous path."""
+        prepared = prepared or {}
         # Keep the raw (distorted) frame. Detectors operate in raw pixel
         # space; projection to metres via court_detector.to_court_coords
         # applies per-point undistortion internally. This keeps all pixel-
@@ -404,7 +617,9 @@ class TennisAnalysisPipeline:
         # we join every frame (see _make_motion_mask / __init__ comment).
         mog2_future = None
         if self._stage_overlap:
-            mog2_future = self._mog2_executor.submit(self._make_motion_mask, frame)
+            mog2_future = self._mog2_executor.submit(
+                self._make_motion_mask, frame, prepared.get("mog2"),
+            )
 
         try:
             # 1. Court detection (runs every N frames, cached otherwise)
@@ -414,7 +629,7 @@ class TennisAnalysisPipeline:
 
             # 2. Ball tracking
             t = pc()
-            self.ball_tracker.detect_frame(frame, frame_idx)
+            self.ball_tracker.detect_frame(frame, frame_idx, resized=prepared.get("ball"))
             self._stage_seconds["ball"] += pc() - t
         except Exception:
             # If court/ball raises in overlap mode, still DRAIN the MOG2 future
@@ -450,7 +665,7 @@ class TennisAnalysisPipeline:
         if mog2_future is not None:
             motion_mask = mog2_future.result()
         else:
-            motion_mask = self._apply_mog2(frame)
+            motion_mask = self._apply_mog2(frame, prepared.get("mog2"))
         self._stage_seconds["motion_mask"] += pc() - t
 
         # 4. Player tracking (with motion mask + court geometry for scoring)
@@ -476,7 +691,7 @@ class TennisAnalysisPipeline:
         # preceding window, matching SportAI's "ball speed at hit" semantic.
         # Non-bounce detections retain their pairwise frame-to-frame speeds.
         self.ball_tracker.assign_peak_flight_speeds()
-        result.ball_detections = self.ball_tracker.detections
+        result.ball_table = balls = self.ball_tracker.detections
 
         # Player post-processing
         self.player_tracker.log_diagnostics()
@@ -485,7 +700,7 @@ class TennisAnalysisPipeline:
         # barely changes over time (these are ball persons / spectators /
         # fixed objects, not real moving players).
         self._filter_stationary_players()
-        result.player_detections = self.player_tracker.detections
+        result.player_table = self.player_tracker.detections
 
         # Court stats
         last_court = self.court_detector._last_detection
@@ -496,27 +711,26 @@ class TennisAnalysisPipeline:
 
         # Ball stats
         n_frames = result.total_frames_processed
-        n_ball = len(result.ball_detections)
+        n_ball = len(balls)
         result.ball_detection_rate = n_ball / n_frames if n_frames > 0 else 0
 
-        bounces = [d for d in result.ball_detections if d.is_bounce]
+        bounce_mask = balls["is_bounce"]
+        bounces = list(balls.take(bounce_mask))
         result.bounce_count = len(bounces)
-        result.bounces_in = sum(1 for b in bounces if b.is_in is True)
-        result.bounces_out = sum(1 for b in bounces if b.is_in is False)
+        result.bounces_in = int(np.count_nonzero(balls["is_in"][bounce_mask] == 1))
+        result.bounces_out = int(np.count_nonzero(balls["is_in"][bounce_mask] == 0))
 
         # Speed aggregates: exclude slow ball rolls (mis-hits, warmup, post-point
         # ball bouncing, ball rolling on court). A real tennis shot is >= 30 km/h
         # at the slowest (soft drop shots, short approaches). Anything below is
         # almost certainly ball-in-transit-not-in-play and dilutes the average.
         MIN_REAL_SHOT_KMH = 30.0
-        real_speeds = [
-            d.speed_kmh for d in result.ball_detections
-            if d.speed_kmh is not None and d.speed_kmh >= MIN_REAL_SHOT_KMH
-        ]
+        speeds = balls["speed_kmh"]        # NaN = no speed (comparisons are False)
+        real_speeds = speeds[speeds >= MIN_REAL_SHOT_KMH]
         # Max speed: use all non-zero speeds (max shouldn't be affected by slow balls)
-        all_speeds = [d.speed_kmh for d in result.ball_detections if d.speed_kmh is not None and d.speed_kmh > 0]
-        result.max_speed_kmh = max(all_speeds) if all_speeds else 0
-        result.avg_speed_kmh = float(np.mean(real_speeds)) if real_speeds else 0
+        all_speeds = speeds[speeds > 0]
+        result.max_speed_kmh = float(all_speeds.max()) if all_speeds.size else 0
+        result.avg_speed_kmh = float(np.mean(real_speeds)) if real_speeds.size else 0
 
         # Rally analysis: a rally = sequence of bounces separated by < BOUNCE_MIN_DIRECTION_CHANGE frames
         if bounces:
@@ -532,11 +746,14 @@ class TennisAnalysisPipeline:
 
         # Swing-type classification (both players) via optical flow → bronze
         # stroke_class. Silver Pass 1 projects this verbatim into swing_type.
-        self._classify_far_player_strokes(result)
+        # Deferred: the caller classifies after the ROI sweep
+        # (finish_stroke_classification).
+        if not self._defer_strokes:
+            self._classify_far_player_strokes(result)
+            self._close_flow_pool()
 
         # Player stats
-        pids = set(d.player_id for d in result.player_detections)
-        result.player_count = len(pids)
+        result.player_count = int(np.unique(result.player_table["player_id"]).size)
 
     def _filter_stationary_players(self) -> None:
         """Reject 'players' whose pixel position is nearly stationary over time.
@@ -566,34 +783,33 @@ class TennisAnalysisPipeline:
         < 5 pixels. Over ~5000 detection frames in a 10-min match, a real
         player's path length is typically > 30,000 px.
         """
-        from collections import defaultdict
-        import numpy as _np
-
         STATIONARY_STD_PX = 50         # both x and y below this → stationary
         MIN_PATH_LENGTH_PX = 10000     # cumulative path length across match
 
-        if not self.player_tracker.detections:
+        table = self.player_tracker.detections
+        if not len(table):
             return
 
-        # Group by (pid, frame_idx) and keep only unique frames per pid, then
-        # sort so path length reflects temporal motion.
-        groups = defaultdict(list)
-        for d in self.player_tracker.detections:
-            cx, cy = d.center
-            groups[d.player_id].append((d.frame_idx, float(cx), float(cy)))
+        # Per pid, rows sorted (stably) by frame_idx so path length reflects
+        # temporal motion. Column views only — no copy of the table.
+        pid_col = table["player_id"]
+        frames = table["frame_idx"]
+        centers = table["center"]
+        uniq, first = np.unique(pid_col, return_index=True)
 
         rejected_ids = set()
-        for pid, entries in groups.items():
-            if len(entries) < 5:
+        for pid in uniq[np.argsort(first)].tolist():     # first-seen order
+            rows = np.flatnonzero(pid_col == pid)
+            if len(rows) < 5:
                 continue  # not enough samples to judge
-            entries.sort(key=lambda e: e[0])
-            xs = _np.array([e[1] for e in entries])
-            ys = _np.array([e[2] for e in entries])
-            std_x = float(_np.std(xs))
-            std_y = float(_np.std(ys))
-            dx = _np.diff(xs)
-            dy = _np.diff(ys)
-            path_len = float(_np.sum(_np.sqrt(dx * dx + dy * dy)))
+            rows = rows[np.argsort(frames[rows], kind="stable")]
+            xs = centers[rows, 0]
+            ys = centers[rows, 1]
+            std_x = float(np.std(xs))
+            std_y = float(np.std(ys))
+            dx = np.diff(xs)
+            dy = np.diff(ys)
+            path_len = float(np.sum(np.sqrt(dx * dx + dy * dy)))
 
             stationary_by_std = (std_x < STATIONARY_STD_PX and std_y < STATIONARY_STD_PX)
             stationary_by_path = (path_len < MIN_PATH_LENGTH_PX)
@@ -607,29 +823,26 @@ class TennisAnalysisPipeline:
                 logger.info(
                     "_filter_stationary_players: REJECT pid=%s n=%d "
                     "std_x=%.1f std_y=%.1f path_len=%.0f reason=%s",
-                    pid, len(entries), std_x, std_y, path_len, "+".join(reason),
+                    pid, len(rows), std_x, std_y, path_len, "+".join(reason),
                 )
                 rejected_ids.add(pid)
             else:
                 logger.info(
                     "_filter_stationary_players: KEEP pid=%s n=%d "
                     "std_x=%.1f std_y=%.1f path_len=%.0f",
-                    pid, len(entries), std_x, std_y, path_len,
+                    pid, len(rows), std_x, std_y, path_len,
                 )
 
         if rejected_ids:
-            self.player_tracker.detections = [
-                d for d in self.player_tracker.detections
-                if d.player_id not in rejected_ids
-            ]
+            table.compact(~np.isin(pid_col, list(rejected_ids)))
             logger.info(
                 "_filter_stationary_players: removed %d player_ids, %d detections remain",
-                len(rejected_ids), len(self.player_tracker.detections),
+                len(rejected_ids), len(table),
             )
 
     def _classify_far_player_strokes(self, result: AnalysisResult):
         """Classify swing type (forehand/backhand/overhead) per hit and write it
-        to PlayerDetection.stroke_class — a BRONZE fact consumed by silver Pass 1.
+        to player_table's stroke_class column — a BRONZE fact consumed by silver Pass 1.
 
         Delegates to the ADR-02 v2 classifier (SwingTypeR2plus1D, optical-flow
         R(2+1)D-18). Covers BOTH players now (the old path was far-only). All the
@@ -643,8 +856,7 @@ class TennisAnalysisPipeline:
         written; SWING_CLASSIFIER_ENABLED=0 disables the model entirely (rollback
         without a rebuild — the env_var_rollback_pattern).
         """
-        if os.environ.get("SWING_CLASSIFIER_ENABLED", "1") not in ("1", "true", "True"):
-            logger.info("SWING_CLASSIFIER_ENABLED=0 — skipping swing classification")
+        if not self._swing_enabled():
             return
         try:
             from ml_pipeline.stroke_classifier.inference_v2 import classify_strokes_v2
@@ -652,18 +864,87 @@ class TennisAnalysisPipeline:
             logger.info("swing_classifier_v2 import failed (%s) — skipping", e)
             return
 
-        try:
-            min_conf = float(os.environ.get("SWING_CLASSIFIER_MIN_CONF", "0.5"))
-        except ValueError:
-            min_conf = 0.5
-
         classify_strokes_v2(
             result,
             target_fps=self.target_fps,
             device=self.device,
-            min_conf=min_conf,
+            min_conf=self._swing_min_conf(),
+            pool=self._flow_pool,
         )
 
+    def _open_flow_pool(self):
+        """inference_v2.make_flow_pool(), or None when the classifier is
+        disabled or the pool cannot start (flow then runs inline)."""
+        if os.environ.get("SWING_CLASSIFIER_ENABLED", "1") not in ("1", "true", "True"):
+            return None
+        try:
+            from ml_pipeline.stroke_classifier.inference_v2 import make_flow_pool
+            return make_flow_pool()
+        except Exception as e:
+            logger.warning("swing_classifier_v2: flow pool setup failed (%s) — flow runs inline", e)
+            return None
+
+    def _close_flow_pool(self) -> None:
+        if self._flow_pool is not None:
+            self._flow_pool.shutdown(wait=True, cancel_futures=True)
+            self._flow_pool = None
+
+    @staticmethod
+    def _swing_enabled() -> bool:
+        if os.environ.get("SWING_CLASSIFIER_ENABLED", "1") not in ("1", "true", "True"):
+            logger.info("SWING_CLASSIFIER_ENABLED=0 — skipping swing classification")
+            return False
+        return True
+
+    @staticmethod
+    def _swing_min_conf() -> float:
+        try:
+            return float(os.environ.get("SWING_CLASSIFIER_MIN_CONF", "0.5"))
+        except ValueError:
+            return 0.5
+
+    def make_swing_processor(self, result: AnalysisResult):
+        """SwingFlowProcessor for the unified ROI sweep (swing=...), or None when
+        the classifier is disabled / unavailable / has nothing to classify.
+        Only meaningful with defer_stroke_classification=True."""
+        self._swing_planned = False
+        if not self._swing_enabled():
+            self._swing_planned = True
+            return None
+        try:
+            from ml_pipeline.stroke_classifier.inference_v2 import SwingFlowProcessor
+            proc = SwingFlowProcessor.create(
+                result, target_fps=self.target_fps, device=self.device,
+                min_conf=self._swing_min_conf(), pool=self._flow_pool,
+            )
+        except Exception as e:
+            logger.warning("swing_classifier_v2: fused setup failed (%s) — seek path after ROI", e)
+            return None
+        self._swing_planned = True
+        return proc
+
+    def finish_stroke_classification(self, result: AnalysisResult, swing=None) -> None:
+        """Deferred half of _postprocess: classify swings into player_table.
+
+        Uses the fused processor when the ROI sweep fed every window; otherwise
+        (spill replay, sweep failure, setup failure) runs the standalone seek
+        path, so the bronze stroke_class never depends on the sweep succeeding.
+        """
+        done = swing is None and self._swing_planned
+        if swing is not None:
+            if swing.completed:
+                try:
+                    swing.finalize()
+                    done = True
+                except Exception as e:
+                    logger.warning("swing_classifier_v2: fused finalize failed (%s) — seek path", e)
+            else:
+                logger.info("swing_classifier_v2: ROI sweep did not feed every window — seek path")
+            swing.close()
+        if not done:
+            self._classify_far_player_strokes(result)
+        self._close_flow_pool()
+
     def _compute_rallies(self, bounces: List[BallDetection]) -> List[List[BallDetection]]:
         """Split bounces into rallies. A gap > BOUNCE_MIN_DIRECTION_CHANGE frames starts a new rally."""
         rallies = []
@@ -699,3 +980,8 @@ class TennisAnalysisPipeline:
                 max_workers=1, thread_name_prefix="mog2",
             )
         self._stage_seconds["motion_mask_compute"] = 0.0
+        # Re-open the flow pool the last run's classification shut down. The
+        # workers still come from the forkserver, not from this (threaded)
+        # process.
+        if self._flow_pool is None:
+            self._flow_pool = self._open_flow_pool()
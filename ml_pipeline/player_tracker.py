@@ -48,6 +48,7 @@ from ml_pipeline.config import (
     COURT_WIDTH_SINGLES_M,
     SERVICE_BOX_DEPTH_M,
 )
+from ml_pipeline.detection_table import DetectionTable
 
 # SAHI — lazy import to avoid startup cost when disabled
 _sahi_detection_model = None
@@ -68,6 +69,33 @@ KP_LEFT_KNEE = 13; KP_RIGHT_KNEE = 14
 KP_LEFT_ANKLE = 15; KP_RIGHT_ANKLE = 16
 
 
+def _project_feet_batch(to_court_coords: Callable, boxes) -> list:
+    """Project each box's feet (center_x, y2) with strict=False.
+
+    Returns a list of (court_x, court_y) or None per box. When the callable is
+    a bound CourtDetector.to_court_coords, the detector's vectorised
+    to_court_coords_batch does all boxes in one call; any other callable (or a
+    batch failure) falls back to the per-box scalar calls.
+    """
+    batch = getattr(getattr(to_court_coords, "__self__", None),
+                    "to_court_coords_batch", None)
+    if batch is not None:
+        try:
+            mx, my = batch([(b[0] + b[2]) / 2 for b in boxes],
+                           [b[3] for b in boxes], strict=False)
+            return [(float(x), float(y)) if np.isfinite(x) and np.isfinite(y) else None
+                    for x, y in zip(mx, my)]
+        except Exception:
+            pass
+    out = []
+    for b in boxes:
+        try:
+            out.append(to_court_coords((b[0] + b[2]) / 2, b[3], strict=False))
+        except Exception:
+            out.append(None)
+    return out
+
+
 @dataclass
 class PlayerDetection:
     frame_idx: int
@@ -137,7 +165,8 @@ class PlayerTracker:
         # lets us expire stale entries — without this a 10-second-old
         # bbox can silently match a new false positive.
         self._prev_players: Dict[int, Tuple[tuple, int]] = {}
-        self.detections: List[PlayerDetection] = []
+        # Every frame's detections, appended per frame as one table chunk.
+        self.detections = DetectionTable("player")
         self._last_result: List[PlayerDetection] = []
         self._detect_interval: int = PLAYER_DETECTION_INTERVAL
         self._last_detect_frame: int = -PLAYER_DETECTION_INTERVAL
@@ -300,7 +329,7 @@ class PlayerTracker:
             )
             for d in self._last_result
         ]
-        self.detections.extend(reused)
+        self.detections.append_detections(reused)
         return reused
 
     def _flush_pending(self) -> None:
@@ -696,7 +725,7 @@ class PlayerTracker:
             candidates, frame_idx, candidate_kps, frame_height=frame.shape[0],
             to_court_coords=to_court_coords,
         )
-        self.detections.extend(frame_detections)
+        self.detections.append_detections(frame_detections)
         self._last_result = frame_detections
 
         # "other" = total time inside _process_after_full_yolo minus the
@@ -1247,8 +1276,12 @@ class PlayerTracker:
             # Real players run wide like this maybe 1-2× per match.
             wide_margin = court_width_px * (2.0 / COURT_WIDTH_DOUBLES_M)
 
+        # Feet projections for every candidate in one batch call.
+        court_xys = (_project_feet_batch(to_court_coords, candidates)
+                     if to_court_coords is not None else [None] * len(candidates))
+
         scored = []
-        for box, kps in zip(candidates, candidate_kps):
+        for box, kps, court_xy in zip(candidates, candidate_kps, court_xys):
             cx = (box[0] + box[2]) / 2
             cy = (box[1] + box[3]) / 2
             y2 = box[3]  # bottom of bbox = feet
@@ -1267,20 +1300,14 @@ class PlayerTracker:
             # Tier 0:        Outside extended zone — spectator/umpire/bench
             # Baseline-closeness tiebreaker (0-500): prefer feet near any
             # baseline; net position (y=11.88) scores lowest.
-            court_xy = None
-            if to_court_coords is not None:
-                try:
-                    # strict=False so we get metric coords even beyond the
-                    # ±5m court-sanity bounds. The far player on MATCHI
-                    # wide-angle projects to y≈-7.8 (tier-2 widened to -10m
-                    # in A0 to accept this). With strict=True the
-                    # projection returns None for y<-5, which short-
-                    # circuits into the "minimal score" branch below and
-                    # tier-2's widening never gets consulted. A0's fix
-                    # only works in combination with strict=False here.
-                    court_xy = to_court_coords(cx, y2, strict=False)
-                except Exception:
-                    court_xy = None
+            #
+            # court_xy (projected above) uses strict=False so we get metric
+            # coords even beyond the ±5m court-sanity bounds. The far player
+            # on MATCHI wide-angle projects to y≈-7.8 (tier-2 widened to -10m
+            # in A0 to accept this). With strict=True the projection returns
+            # None for y<-5, which short-circuits into the "minimal score"
+            # branch below and tier-2's widening never gets consulted. A0's
+            # fix only works in combination with strict=False here.
 
             if court_xy is not None:
                 court_x_m, court_y_m = court_xy
@@ -1664,13 +1691,17 @@ class PlayerTracker:
           - SportAI ground truth, which reports player feet position
           - physical intuition: the player's court location IS their feet
         """
-        for det in self.detections:
-            # bbox = (x1, y1, x2, y2). Feet = (center_x, y2).
-            cx = (det.bbox[0] + det.bbox[2]) / 2.0
-            y_feet = det.bbox[3]
-            coords = court_detector.to_court_coords(cx, y_feet)
-            if coords is not None:
-                det.court_x, det.court_y = coords
+        if not len(self.detections):
+            return
+        # bbox = (x1, y1, x2, y2). Feet = (center_x, y2). One vectorised
+        # projection for the whole match; NaN rows leave court_x/y unset.
+        boxes = self.detections["bbox"]
+        mx, my = court_detector.to_court_coords_batch(
+            (boxes[:, 0] + boxes[:, 2]) / 2.0, boxes[:, 3],
+        )
+        ok = np.isfinite(mx) & np.isfinite(my)
+        self.detections["court_x"][ok] = mx[ok]
+        self.detections["court_y"][ok] = my[ok]
 
     def log_diagnostics(self):
         """Dump cumulative player-detection diagnostics. Call once post-inference.
@@ -1731,7 +1762,9 @@ class PlayerTracker:
 
     def reset(self):
         self._prev_players.clear()
-        self.detections.clear()
+        # Fresh table, not an in-place clear: the previous run's
+        # AnalysisResult.player_table is this same object.
+        self.detections = DetectionTable("player")
         for k in self._diag:
             if isinstance(self._diag[k], list):
                 self._diag[k] = [0] * len(self._diag[k])
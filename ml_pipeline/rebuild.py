@@ -0,0 +1,387 @@
+"""
+ml_pipeline/rebuild.py — Parallel multi-task rebuild of detectors + silver.
+
+After a detector or silver-rule change, dozens of matches need the post-ingest
+chain re-run from the bronze already in ml_analysis.*. `harness rerun-silver`
+does one task at a time in the shell's process; this fans the tasks out over a
+process pool:
+
+    python -m ml_pipeline.harness rebuild --tasks t1,t2,... --jobs 4
+    python -m ml_pipeline.harness rebuild --tasks-file ids.txt --steps serve,silver
+
+Per task, the same chain (and order) as the live T5 ingest in upload_app:
+
+    T5 singles    serve -> identity -> stroke -> silver (build_silver_match_t5) -> gold
+    SportAI       silver (build_silver_v2) -> gold
+    practice      silver (build_silver_practice)
+
+All T5 stages share one TaskFrameStore, exactly like the live ingest. `--steps`
+restricts the chain; steps that do not apply to a task's model are skipped.
+
+Concurrency rules:
+  - Worker processes are SPAWNED, so each imports db_init fresh and owns its own
+    engine (DB_ROLE defaults to "cron": a 1+2 connection pool per worker). Nothing
+    DB-related crosses a process boundary — workers get task ids, return dicts.
+  - Each task runs under a session advisory lock in the ingest_bronze key space
+    (hashtextextended(task_id, 42)), held on a dedicated connection for the whole
+    chain. pg_try_advisory_lock: a task another rebuild (or a SportAI bronze
+    ingest transaction) holds is reported `locked`, never waited on. The live T5
+    post-ingest takes the same key (transaction lock) before its detector chain,
+    so an ingest that starts mid-rebuild waits for the rebuild's task to finish
+    instead of interleaving. Session-level lock: needs a direct / session-mode
+    connection, not PgBouncer transaction mode (see db_engine.py).
+  - A task whose submission_context shows an ingest in flight (started, not
+    finished, no error, younger than --ingest-stale-s) is reported `ingesting`
+    and skipped, unless --force.
+
+Resume: every finished task appends one JSON line to the state file (default
+rebuild_state.jsonl). A re-run skips tasks already recorded `ok`; failed, locked
+and ingesting tasks are retried. --fresh ignores the file.
+
+Output: one progress line per finished task, then a summary table — per task the
+status, total seconds and, per step, "<seconds>s <rows before>-><rows after>".
+--csv writes the same per-step data as rows. Exit code 1 if any task failed.
+"""
+
+import argparse
+import csv
+import json
+import logging
+import multiprocessing
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+STEPS = ("serve", "identity", "stroke", "silver")
+DEFAULT_STATE_FILE = "rebuild_state.jsonl"
+DEFAULT_INGEST_STALE_S = 3600
+
+# Same key space as ingest_bronze._task_lock — one lock identity per task.
+_LOCK_SQL = "SELECT pg_try_advisory_lock(hashtextextended(:t, 42))"
+_UNLOCK_SQL = "SELECT pg_advisory_unlock(hashtextextended(:t, 42))"
+
+# Output table of each step, for the row deltas. {table} is resolved per model.
+_COUNT_SQL = {
+    "serve": "SELECT count(*) FROM ml_analysis.serve_events WHERE task_id = :t",
+    "identity": "SELECT count(*) FROM ml_analysis.player_identity_segments WHERE job_id = :t",
+    "stroke": "SELECT count(*) FROM ml_analysis.stroke_events WHERE task_id = :t",
+    "silver": "SELECT count(*) FROM silver.{table} WHERE task_id = :t",
+}
+
+
+# ============================================================
+# Worker side (runs in the spawned pool processes)
+# ============================================================
+
+_worker_engine = None
+
+
+def _worker_init() -> None:
+    """Pool initializer: one engine per worker process (db_init's, imported fresh)."""
+    global _worker_engine
+    os.environ.setdefault("DB_ROLE", "cron")
+    logging.basicConfig(level=logging.WARNING,
+                        format="%(asctime)s %(processName)s %(levelname)s %(name)s: %(message)s")
+    from db_init import engine
+    _worker_engine = engine
+
+
+def _model_of(sport_type: str) -> str:
+    if sport_type == "tennis_singles_t5":
+        return "t5"
+    if sport_type in ("serve_practice", "rally_practice"):
+        return "practice"
+    return "sportai"
+
+
+def _count(engine, step: str, task_id: str, model: str) -> Optional[int]:
+    sql = _COUNT_SQL[step].format(table="practice_detail" if model == "practice" else "point_detail")
+    from sqlalchemy import text
+    try:
+        with engine.connect() as conn:
+            return int(conn.execute(text(sql), {"t": task_id}).scalar() or 0)
+    except Exception:
+        # Table not created yet on this DB (first run of a detector) — no baseline.
+        return None
+
+
+def _ingest_in_flight(conn, task_id: str, stale_s: int) -> bool:
+    from sqlalchemy import text
+    return bool(conn.execute(text("""
+        SELECT 1 FROM bronze.submission_context
+         WHERE task_id = :t
+           AND ingest_started_at IS NOT NULL
+           AND ingest_finished_at IS NULL
+           AND ingest_error IS NULL
+           AND ingest_started_at > now() - make_interval(secs => :s)
+    """), {"t": task_id, "s": stale_s}).scalar())
+
+
+def _run_step(engine, step: str, task_id: str, model: str, store) -> Any:
+    """Run one stage. Returns a short result for the summary (event count / builder dict)."""
+    if step == "serve":
+        from ml_pipeline.serve_detector import detect_serves_for_task
+        with engine.begin() as conn:
+            return len(detect_serves_for_task(conn, task_id, replace=True, store=store))
+    if step == "identity":
+        from ml_pipeline.identity_detector import detect_identity_for_task
+        with engine.begin() as conn:
+            return len(detect_identity_for_task(conn, task_id, replace=True, store=store))
+    if step == "stroke":
+        from ml_pipeline.stroke_detector import detect_strokes_for_task
+        with engine.begin() as conn:
+            return len(detect_strokes_for_task(conn, task_id, replace=True, store=store))
+    if model == "t5":
+        from ml_pipeline.build_silver_match_t5 import build_silver_match_t5
+        return build_silver_match_t5(task_id=task_id, replace=True, engine=engine, store=store)
+    if model == "practice":
+        from ml_pipeline.build_silver_practice import build_silver_practice
+        return build_silver_practice(task_id=task_id, replace=True, engine=engine)
+    from build_silver_v2 import build_silver_v2
+    return build_silver_v2(task_id, replace=True)
+
+
+def rebuild_task(task_id: str, steps: Sequence[str], force: bool = False,
+                 ingest_stale_s: int = DEFAULT_INGEST_STALE_S) -> Dict[str, Any]:
+    """Rebuild one task in this worker. Never raises — the outcome is in the dict:
+    status ok | failed | locked | ingesting | missing, plus per-step timings/deltas."""
+    from sqlalchemy import text
+
+    engine = _worker_engine
+    if engine is None:
+        _worker_init()
+        engine = _worker_engine
+
+    t0 = time.perf_counter()
+    out: Dict[str, Any] = {"task_id": task_id, "status": "ok", "pid": os.getpid(),
+                           "steps": {}, "error": None}
+    lock_conn = None
+    got = False
+    try:
+        lock_conn = engine.connect()
+        row = lock_conn.execute(text(
+            "SELECT sport_type FROM bronze.submission_context WHERE task_id = :t"
+        ), {"t": task_id}).mappings().first()
+        if row is None:
+            out["status"] = "missing"
+            return out
+        model = _model_of(row["sport_type"] or "")
+        out["model"] = model
+        if not force and _ingest_in_flight(lock_conn, task_id, ingest_stale_s):
+            out["status"] = "ingesting"
+            return out
+        got = lock_conn.execute(text(_LOCK_SQL), {"t": task_id}).scalar()
+        lock_conn.commit()
+        if not got:
+            out["status"] = "locked"
+            return out
+
+        chain = [s for s in STEPS if s in steps and (model == "t5" or s == "silver")]
+        store = None
+        if model == "t5" and len(chain) > 1:
+            try:
+                from ml_pipeline.task_frame_store import TaskFrameStore
+                store = TaskFrameStore.open(engine, task_id)
+            except Exception as e:
+                logger.warning("rebuild %s: frame store unavailable (per-stage queries): %s",
+                               task_id, e)
+
+        for step in chain:
+            before = _count(engine, step, task_id, model)
+            s0 = time.perf_counter()
+            rec: Dict[str, Any] = {"rows_before": before}
+            out["steps"][step] = rec
+            try:
+                result = _run_step(engine, step, task_id, model, store)
+            except Exception as e:
+                rec["seconds"] = round(time.perf_counter() - s0, 2)
+                rec["error"] = f"{e.__class__.__name__}: {e}"
+                out["status"] = "failed"
+                out["error"] = f"{step}: {rec['error']}"
+                logger.warning("rebuild %s step %s failed:\n%s", task_id, step, traceback.format_exc())
+                break
+            rec["seconds"] = round(time.perf_counter() - s0, 2)
+            rec["rows_after"] = _count(engine, step, task_id, model)
+            if isinstance(result, int):
+                rec["result"] = result
+            if step == "silver" and model != "practice":
+                try:
+                    from gold_materialize import refresh_task
+                    out["gold"] = refresh_task(task_id).get("ok")
+                except ImportError:
+                    out["gold"] = None
+    except Exception as e:
+        out["status"] = "failed"
+        out["error"] = f"{e.__class__.__name__}: {e}"
+    finally:
+        if lock_conn is not None and got:
+            try:
+                # A session lock outlives checkin (the pool only rolls back), so
+                # unlock explicitly; if that fails, drop the connection — closing
+                # the server session releases the lock.
+                lock_conn.execute(text(_UNLOCK_SQL), {"t": task_id})
+                lock_conn.commit()
+            except Exception:
+                lock_conn.invalidate()
+            lock_conn.close()
+        out["seconds"] = round(time.perf_counter() - t0, 2)
+    return out
+
+
+# ============================================================
+# Driver side
+# ============================================================
+
+def load_state(path: str) -> Dict[str, Dict[str, Any]]:
+    """Last recorded outcome per task_id from a state file (missing file -> {})."""
+    state: Dict[str, Dict[str, Any]] = {}
+    p = Path(path)
+    if not p.exists():
+        return state
+    for line in p.read_text().splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            rec = json.loads(line)
+        except ValueError:
+            continue  # torn last line from a killed run
+        state[rec.get("task_id")] = rec
+    return state
+
+
+def parse_tasks(tasks: Optional[str], tasks_file: Optional[str]) -> List[str]:
+    ids: List[str] = []
+    if tasks:
+        ids += [t.strip() for t in tasks.split(",")]
+    if tasks_file:
+        for line in Path(tasks_file).read_text().splitlines():
+            line = line.split("#", 1)[0].strip()
+            if line:
+                ids.append(line)
+    out: List[str] = []
+    for t in ids:
+        if t and t not in out:
+            out.append(t)
+    return out
+
+
+def _fmt_step(rec: Optional[Dict[str, Any]]) -> str:
+    if not rec:
+        return "-"
+    if rec.get("error"):
+        return f"{rec.get('seconds', 0):.1f}s FAIL"
+    before = "?" if rec.get("rows_before") is None else rec["rows_before"]
+    after = "?" if rec.get("rows_after") is None else rec["rows_after"]
+    return f"{rec.get('seconds', 0):.1f}s {before}->{after}"
+
+
+def print_summary(results: List[Dict[str, Any]], wall_s: float) -> None:
+    cols = ["task_id", "model", "status", "total"] + list(STEPS)
+    rows = []
+    for r in results:
+        rows.append([r["task_id"], r.get("model", "-"), r["status"],
+                     f"{r.get('seconds', 0):.1f}s"] + [_fmt_step(r["steps"].get(s)) for s in STEPS])
+    widths = [max(len(c), *(len(row[i]) for row in rows)) if rows else len(c)
+              for i, c in enumerate(cols)]
+    line = "  ".join(c.ljust(w) for c, w in zip(cols, widths))
+    print()
+    print(line)
+    print("-" * len(line))
+    for row in rows:
+        print("  ".join(v.ljust(w) for v, w in zip(row, widths)))
+    by_status: Dict[str, int] = {}
+    for r in results:
+        by_status[r["status"]] = by_status.get(r["status"], 0) + 1
+    busy = sum(r.get("seconds", 0) for r in results)
+    print()
+    print(f"{len(results)} task(s) in {wall_s:.1f}s wall ({busy:.1f}s task time) — "
+          + ", ".join(f"{k}={v}" for k, v in sorted(by_status.items())))
+    for r in results:
+        if r.get("error"):
+            print(f"  {r['task_id']}: {r['error']}")
+
+
+def write_csv(results: List[Dict[str, Any]], path: str) -> None:
+    with open(path, "w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["task_id", "model", "status", "step", "seconds",
+                    "rows_before", "rows_after", "error"])
+        for r in results:
+            if not r["steps"]:
+                w.writerow([r["task_id"], r.get("model"), r["status"], "", r.get("seconds"),
+                            "", "", r.get("error") or ""])
+            for step, rec in r["steps"].items():
+                w.writerow([r["task_id"], r.get("model"), r["status"], step, rec.get("seconds"),
+                            rec.get("rows_before"), rec.get("rows_after"), rec.get("error") or ""])
+
+
+def run(task_ids: Sequence[str], *, steps: Sequence[str] = STEPS, jobs: int = 2,
+        state_file: str = DEFAULT_STATE_FILE, fresh: bool = False, force: bool = False,
+        ingest_stale_s: int = DEFAULT_INGEST_STALE_S,
+        csv_path: Optional[str] = None) -> int:
+    """Fan task_ids out over `jobs` spawned workers. Returns the CLI exit code."""
+    done = {} if fresh else {t: r for t, r in load_state(state_file).items()
+                             if r.get("status") == "ok"}
+    todo = [t for t in task_ids if t not in done]
+    skipped = len(task_ids) - len(todo)
+    print(f"rebuild: {len(task_ids)} task(s), {skipped} already ok in {state_file}, "
+          f"{len(todo)} to run on {jobs} worker(s); steps={','.join(steps)}")
+    if not todo:
+        return 0
+
+    os.environ.setdefault("DB_ROLE", "cron")   # inherited by the spawned workers
+    results: List[Dict[str, Any]] = []
+    wall0 = time.perf_counter()
+    ctx = multiprocessing.get_context("spawn")
+    with open(state_file, "w" if fresh else "a") as state, \
+            ProcessPoolExecutor(max_workers=max(1, jobs), mp_context=ctx,
+                                initializer=_worker_init) as pool:
+        futs = {pool.submit(rebuild_task, t, tuple(steps), force, ingest_stale_s): t
+                for t in todo}
+        for i, fut in enumerate(as_completed(futs), 1):
+            tid = futs[fut]
+            try:
+                r = fut.result()
+            except Exception as e:   # worker died (OOM kill, segfault in a C ext)
+                r = {"task_id": tid, "status": "failed", "steps": {},
+                     "error": f"{e.__class__.__name__}: {e}", "seconds": 0}
+            r["finished_at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+            state.write(json.dumps(r, default=str) + "\n")
+            state.flush()
+            results.append(r)
+            elapsed = time.perf_counter() - wall0
+            eta = elapsed / i * (len(todo) - i)
+            print(f"[{i}/{len(todo)}] {tid} {r['status']} {r.get('seconds', 0):.1f}s "
+                  f"(elapsed {elapsed:.0f}s, eta {eta:.0f}s)", flush=True)
+
+    order = {t: n for n, t in enumerate(todo)}
+    results.sort(key=lambda r: order.get(r["task_id"], 0))
+    print_summary(results, time.perf_counter() - wall0)
+    if csv_path:
+        write_csv(results, csv_path)
+        print(f"per-step CSV written to {csv_path}")
+    return 1 if any(r["status"] == "failed" for r in results) else 0
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--tasks", default=None, help="Comma-separated task ids")
+    p.add_argument("--tasks-file", default=None,
+                   help="File with one task id per line (# comments allowed)")
+    p.add_argument("--jobs", type=int, default=2, help="Worker processes (default 2)")
+    p.add_argument("--steps", default=",".join(STEPS),
+                   help=f"Subset of {','.join(STEPS)} (default: all)")
+    p.add_argument("--state-file", default=DEFAULT_STATE_FILE,
+                   help=f"Resume log, one JSON line per finished task (default {DEFAULT_STATE_FILE})")
+    p.add_argument("--fresh", action="store_true",
+                   help="Ignore (and truncate) the state file — rebuild every task")
+    p.add_argument("--force", action="store_true",
+                   help="Rebuild even if submission_context shows an ingest in flight")
+    p.add_argument("--ingest-stale-s", type=int, default=DEFAULT_INGEST_STALE_S,
+                   help="An in-flight ingest older than this is treated as dead")
+    p.add_argument("--csv", default=None, metavar="PATH", help="Write per-step results as CSV")
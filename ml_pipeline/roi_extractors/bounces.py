@@ -50,6 +50,7 @@ import numpy as np
 from sqlalchemy import text as sql_text
 
 from ml_pipeline.config import ROI_BOUNCE_BATCH
+from ml_pipeline.detection_partitions import ensure_job_partition
 
 # Each TrackNet-V2 forward output is (1, out_channels, H*W) — ~118 MB in fp16 for
 # a 360x640 crop. The batched path accumulates ONE output per window frame before
@@ -81,6 +82,10 @@ logger = logging.getLogger("roi_bounces")
 # and within fp-noise on GPU (conv is batch-element-independent, BatchNorm is
 # eval/running-stats, the heatmap postprocess is per-element).
 #
+# With TRACKNET_BATCH_POSTPROCESS (default) the replay shim is bypassed: the
+# argmax runs on-device per batch and BallTracker._postprocess_heatmaps reduces
+# the whole window's class maps in one pass before detect_frame is replayed.
+#
 # Scope: the batched forward is implemented for TrackNet V2 (the production ROI
 # ball model). The window's shared model is always V2 here.
 
@@ -292,24 +297,25 @@ def _windows_from_centroids(
 # ---------------------------------------------------------------------------
 
 def _project_dets_to_court(dets, roi, detector):
-    """Map crop-pixel detections to full-frame pixel + court metres."""
+    """Map a ball DetectionTable's crop-pixel rows to full-frame pixel + court metres."""
     x0, y0, _x1, _y1 = roi
+    full_xs = dets["x"] + float(x0)
+    full_ys = dets["y"] + float(y0)
+    mx, my = detector.to_court_coords_batch(full_xs, full_ys, strict=False)
+    on_court = (np.isfinite(mx) & np.isfinite(my)).tolist()
     out = []
-    for d in dets:
-        full_x = d.x + float(x0)
-        full_y = d.y + float(y0)
-        court = detector.to_court_coords(full_x, full_y, strict=False)
-        if court is None:
-            cx = cy = None
-        else:
-            cx, cy = court
+    for frame_idx, full_x, full_y, cx, cy, ok, is_bounce in zip(
+        dets["frame_idx"].tolist(), full_xs.tolist(), full_ys.tolist(),
+        np.asarray(mx).tolist(), np.asarray(my).tolist(), on_court,
+        dets["is_bounce"].tolist(),
+    ):
         out.append({
-            "frame_idx": d.frame_idx,
+            "frame_idx": frame_idx,
             "x": full_x,
             "y": full_y,
-            "court_x": cx,
-            "court_y": cy,
-            "is_bounce": bool(getattr(d, "is_bounce", False)),
+            "court_x": cx if ok else None,
+            "court_y": cy if ok else None,
+            "is_bounce": is_bounce,
         })
     return out
 
@@ -329,6 +335,7 @@ def _persist_rows(
         return 0
     with engine.begin() as conn:
         _init_schema(conn)
+        ensure_job_partition(conn, "ball_detections", job_id)
         if replace:
             n_del = conn.execute(sql_text("""
                 DELETE FROM ml_analysis.ball_detections
@@ -644,7 +651,10 @@ class RoiBounceProcessor:
         _ReplayModel serving the precomputed slices in order; the real
         _detect_frame_v2 postprocess + sequential frame-delta Hough fallback
         run unchanged, so the resulting detections are identical to the eager
-        path (within fp-noise on GPU).
+        path (within fp-noise on GPU). With TRACKNET_BATCH_POSTPROCESS (the
+        default) phase 2 keeps only on-device argmax maps and phase 3 runs
+        BallTracker._postprocess_heatmaps over the window in one pass, feeding
+        each frame's (x, y) to detect_frame via heatmap_xy.
 
         Returns a populated BallTracker (detections filled, model restored).
         """
@@ -653,6 +663,7 @@ class RoiBounceProcessor:
         from ml_pipeline.ball_tracker import BallTracker
         from ml_pipeline.config import (
             TRACKNET_INPUT_WIDTH, TRACKNET_INPUT_HEIGHT, TRACKNET_BGR2RGB,
+            TRACKNET_BATCH_POSTPROCESS,
         )
 
         # Memory guard: a large window accumulates too many (1, C, H*W) outputs
@@ -690,7 +701,11 @@ class RoiBounceProcessor:
         # single-frame tensors (each (1, 9, H, W)) into one (B, 9, H, W) batch,
         # run ONE forward, and split the output back into per-call (1, C, H*W)
         # slices. testing=True matches _detect_frame_v2's softmax path.
+        # With TRACKNET_BATCH_POSTPROCESS the argmax runs on-device per batch
+        # and only the (B, H*W) uint8 class maps come back to the host — no
+        # (1, C, H*W) slices are held for the replay.
         per_call_outputs: list = []
+        per_batch_maps: list = []
         if call_tensors:
             try:
                 with torch.no_grad():
@@ -698,6 +713,11 @@ class RoiBounceProcessor:
                         chunk = call_tensors[i:i + self._bounce_batch]
                         batched = torch.cat(chunk, dim=0)             # (B, 9, H, W)
                         out = self._shared_model(batched, testing=True)  # (B, C, H*W)
+                        if TRACKNET_BATCH_POSTPROCESS:
+                            per_batch_maps.append(
+                                out.argmax(dim=1).to(torch.uint8).cpu().numpy()
+                            )
+                            continue
                         # Slice per call, keeping the batch dim so the served tensor
                         # is shaped exactly like a single-frame forward output.
                         for b in range(out.shape[0]):
@@ -717,10 +737,24 @@ class RoiBounceProcessor:
                 )
                 return self._run_window_eager(crops)
 
+        tracker = BallTracker(model=self._shared_model)
+        if TRACKNET_BATCH_POSTPROCESS:
+            # Phase 3 (batched postprocess): one _postprocess_heatmaps pass over
+            # the whole window's class maps, then replay detect_frame with each
+            # call's (x, y). Buffer warmup, frame-delta fallback and scaling run
+            # unchanged; the tracker's _diag tiers match the per-frame replay.
+            xys = (tracker._postprocess_heatmaps(np.concatenate(per_batch_maps))
+                   if per_batch_maps else [])
+            for k, (_idx, crop) in enumerate(crops):
+                tracker.detect_frame(
+                    crop, _idx,
+                    heatmap_xy=xys[k - (n - 1)] if k >= n - 1 else None,
+                )
+            return tracker
+
         # Phase 3: replay detect_frame with the precomputed outputs. Swap the
         # tracker's model for a _ReplayModel; everything else (buffer warmup,
         # postprocess, frame-delta fallback, scaling) runs unchanged.
-        tracker = BallTracker(model=self._shared_model)
         tracker.model = _ReplayModel(per_call_outputs)
         for _idx, crop in crops:
             tracker.detect_frame(crop, _idx)
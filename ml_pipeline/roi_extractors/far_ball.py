@@ -27,8 +27,11 @@ import os
 import time
 from typing import List, Optional, Tuple
 
+import numpy as np
 from sqlalchemy import text as sql_text
 
+from ml_pipeline.detection_partitions import ensure_job_partition
+
 # Reuse the proven projection / clustering / persistence helpers.
 from ml_pipeline.roi_extractors.bounces import (
     _project_metres,
@@ -108,6 +111,7 @@ def _persist_far_rows(engine, job_id: str, rows: list, replace: bool) -> int:
         conn.execute(sql_text(
             "ALTER TABLE ml_analysis.ball_detections "
             "ADD COLUMN IF NOT EXISTS source TEXT"))
+        ensure_job_partition(conn, "ball_detections", job_id)
         if replace:
             n_del = conn.execute(sql_text(
                 "DELETE FROM ml_analysis.ball_detections "
@@ -268,6 +272,10 @@ class _NullProjector:
     def to_court_coords(self, x, y, strict=False):
         return None
 
+    def to_court_coords_batch(self, xs, ys, strict=False):
+        n = len(xs)
+        return np.full(n, np.nan), np.full(n, np.nan)
+
 
 # ---------------------------------------------------------------------------
 # Driver (standalone, owns its decode) — local + Batch
@@ -30,6 +30,10 @@ import cv2
 import numpy as np
 from sqlalchemy import text as sql_text
 
+from ml_pipeline.keypoint_codec import (
+    KP_F16_TO_JSONB_SQL, compat_view_sql, encode_f16, to_json as kp_to_json,
+)
+
 logger = logging.getLogger("roi_pose")
 
 COURT_LENGTH_M = 23.77
@@ -77,6 +81,16 @@ def _init_schema(conn):
         CREATE INDEX IF NOT EXISTS idx_player_detections_roi_job_player
             ON ml_analysis.player_detections_roi (job_id, player_id);
     """))
+    conn.execute(sql_text(
+        "ALTER TABLE ml_analysis.player_detections_roi "
+        "ADD COLUMN IF NOT EXISTS keypoints_f16 BYTEA"
+    ))
+    conn.execute(sql_text(KP_F16_TO_JSONB_SQL))
+    conn.execute(sql_text(compat_view_sql(
+        "player_detections_roi",
+        "id, job_id, frame_idx, player_id, bbox_x1, bbox_y1, bbox_x2, bbox_y2, "
+        "center_x, center_y, court_x, court_y, source, created_at",
+    )))
 
 
 def _project(mx, my, detector):
@@ -571,22 +585,14 @@ class FarPoseProcessor:
                 continue
             cx, cy = float(court[0]), float(court[1])
 
-            import json as _json
-            kp_json = [
-                [
-                    float(kp_full[j, 0]),
-                    float(kp_full[j, 1]),
-                    float(kp_full[j, 2]),
-                ]
-                for j in range(kp_full.shape[0])
-            ]
             self.rows_to_write.append({
                 "job_id": self.job_id, "frame_idx": p["idx"], "player_id": 1,
                 "bbox_x1": p["fbx1"], "bbox_y1": p["fby1"],
                 "bbox_x2": p["fbx2"], "bbox_y2": p["fby2"],
                 "center_x": feet_x, "center_y": feet_y,
                 "court_x": cx, "court_y": cy,
-                "keypoints": _json.dumps(kp_json),
+                "keypoints": kp_to_json(kp_full),
+                "keypoints_f16": encode_f16(kp_full),
                 "source": self.source_tag,
             })
 
@@ -632,11 +638,12 @@ class FarPoseProcessor:
             conn.execute(sql_text("""
                 INSERT INTO ml_analysis.player_detections_roi
                   (job_id, frame_idx, player_id, bbox_x1, bbox_y1, bbox_x2, bbox_y2,
-                   center_x, center_y, court_x, court_y, keypoints, source)
+                   center_x, center_y, court_x, court_y, keypoints, keypoints_f16,
+                   source)
                 VALUES
                   (:job_id, :frame_idx, :player_id, :bbox_x1, :bbox_y1, :bbox_x2,
                    :bbox_y2, :center_x, :center_y, :court_x, :court_y,
-                   CAST(:keypoints AS JSONB), :source)
+                   CAST(:keypoints AS JSONB), :keypoints_f16, :source)
             """), self.rows_to_write)
         logger.info("roi_pose: wrote %d rows (source=%s)",
                     len(self.rows_to_write), self.source_tag)
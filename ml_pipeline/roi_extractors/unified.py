@@ -18,12 +18,24 @@ cannot be folded into the main loop because both ROI passes depend on the
 *final* bounce list (pose's rally gate + the bounce windows) which only exists
 after pipeline.process() + _postprocess complete.
 
+With ROI_FRAME_SPILL=1 the main loop spills the ROI region of every sampled
+frame (ml_pipeline/frame_spill.py) and this driver replays that store instead
+of decoding at all — one decode per job. The decode loop below stays as the
+fallback whenever the spill is missing, gave up, or doesn't cover the ROIs.
+
 ZERO accuracy risk: the per-frame cores (FarPoseProcessor / RoiBounceProcessor)
 run the same models on the same frames and emit the same rows as the standalone
 extractors — only the decode scheduling changed. Per-consumer failures are
 isolated: if one processor raises mid-sweep it is dropped (writes nothing,
 matching the old all-or-nothing per-pass try/except in __main__) while the other
 continues.
+
+The optional swing consumer (stroke_classifier.inference_v2.SwingFlowProcessor,
+SWING_FLOW_FUSED=1) rides the same decode: it works in SOURCE-frame space
+(16 consecutive frames per hit window), so the decode loop also retrieves the
+unsampled frames inside its windows. It is never fed from a spill replay (the
+spill only holds sampled frames) — the caller then falls back to the standalone
+seek path.
 """
 from __future__ import annotations
 
@@ -58,6 +70,8 @@ def run_unified_roi(
     cnn_bounce_events: Optional[List[dict]] = None,
     far_ball_window_s: float = 1.5,
     far_ball_cluster_gap_s: float = 0.5,
+    spill=None,
+    swing=None,
 ) -> Tuple[int, int, int]:
     """Decode the video once, drive the ROI extractors, return
     (n_pose, n_bounce, n_far_ball).
@@ -71,6 +85,14 @@ def run_unified_roi(
     far ball on a high-res far-court crop → sharper far trajectory that lifts
     far-bounce candidate recall (40%->80% offline) and far-hit emission. Writes
     source='roi_far_ball'; readers dedup via ml_pipeline.ball_merge.
+
+    spill: an optional finished ml_pipeline.frame_spill.FrameSpillStore from
+    the main loop (ROI_FRAME_SPILL=1). When it covers every active ROI the
+    sweep replays it and never decodes the video; otherwise it is ignored.
+
+    swing: an optional SwingFlowProcessor fed source frames from the decode
+    loop. The caller finalizes it (swing.completed tells whether it saw every
+    window); a feed failure abandons it without touching the ROI passes.
     """
     if not os.path.exists(video_path):
         logger.warning("roi_unified: video not found: %s; skipping", video_path)
@@ -79,6 +101,8 @@ def run_unified_roi(
     t_start = time.time()
 
     # Read the first frame for shape (both processors project their ROI off it).
+    # The capture stays open as the fallback decoder even when a spill exists;
+    # opening it is cheap next to the sweep itself.
     cap = cv2.VideoCapture(video_path)
     ok, first = cap.read()
     if not ok:
@@ -86,6 +110,13 @@ def run_unified_roi(
         logger.warning("roi_unified: cannot read first frame; skipping")
         return (0, 0, 0)
     frame_shape = first.shape
+    if spill is not None and getattr(spill, "usable", False) \
+            and tuple(spill.frame_shape) != tuple(frame_shape):
+        logger.warning(
+            "roi_unified: frame spill shape %s != video %s — ignoring spill",
+            spill.frame_shape, frame_shape,
+        )
+        spill = None
 
     # Build + prepare each processor. A prepare failure (e.g. ROI can't project,
     # no bounce windows) just disables that consumer; the other still runs.
@@ -133,7 +164,7 @@ def run_unified_roi(
             logger.warning("roi_unified: far_ball prepare failed (non-fatal): %s", e)
             far_ball = None
 
-    if pose is None and bounce is None and far_ball is None:
+    if pose is None and bounce is None and far_ball is None and swing is None:
         cap.release()
         logger.info("roi_unified: nothing to do (all processors disabled)")
         return (0, 0, 0)
@@ -150,6 +181,46 @@ def run_unified_roi(
             ends.append(far_ball.last_frame_needed())
         sweep_to = max(ends) if ends else 0
 
+    # Per-frame fan-out, shared by the spill replay and the decode loop.
+    failed = {"pose": False, "bounce": False, "far_ball": False}
+    consumers = (("pose", pose), ("bounce", bounce), ("far_ball", far_ball))
+
+    def _dispatch(frame, idx: int) -> None:
+        for name, proc in consumers:
+            if proc is None or failed[name]:
+                continue
+            try:
+                proc.feed(frame, idx)
+            except Exception as e:
+                logger.error(
+                    "roi_unified: %s.feed raised at frame %d (dropping %s pass, "
+                    "no rows written): %s", name, idx, name, e,
+                )
+                failed[name] = True
+
+    # C3 single-decode path: replay the main loop's frame spill instead of
+    # decoding again — but only if every active consumer's ROI lies inside
+    # what was spilled (a calibration that moved after the lock, or a spill
+    # that gave up, falls back to the decode below).
+    out_idx = 0
+    replayed = False
+    if spill is not None and getattr(spill, "usable", False):
+        rois = [(p.x0, p.y0, p.x1, p.y1) for p in (pose, bounce, far_ball) if p is not None]
+        if rois and all(spill.covers(r) for r in rois):
+            cap.release()
+            for out_idx, frame in spill.frames(stop=sweep_to):
+                _dispatch(frame, out_idx)
+            out_idx = min(spill.n_frames, sweep_to) if sweep_to is not None else spill.n_frames
+            replayed = True
+            logger.info(
+                "roi_unified: replayed %d spilled frames (no second decode)", out_idx,
+            )
+        else:
+            logger.warning(
+                "roi_unified: frame spill rect %s does not cover ROIs %s — "
+                "falling back to a full decode", spill.rect, rois,
+            )
+
     # Single sequential decode, SAMPLED to the bronze frame rate.
     #
     # The ROI passes must index frames in the SAME sampled space as the main
@@ -160,61 +231,50 @@ def run_unified_roi(
     # bronze_export merge AND wasting a 2.4x over-decode. Here we sample the
     # source down to target fps and emit a target-fps-aligned out_idx, and we
     # grab()-skip (no decode) the unsampled frames — the big sweep speedup.
-    source_fps = cap.get(cv2.CAP_PROP_FPS) or float(fps) or 25.0
-    target_fps = float(fps) if fps else source_fps
-    stride = (source_fps / target_fps) if (target_fps and target_fps < source_fps) else 1.0
-    cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
-    pose_failed = False
-    bounce_failed = False
-    far_ball_failed = False
-    src_idx = 0
-    out_idx = 0
-    next_sample_at = 0.0
-    while True:
-        if sweep_to is not None and out_idx >= sweep_to:
-            break
-        if not cap.grab():           # advance decoder; cheap (no full decode)
-            break
-        if src_idx >= next_sample_at:
-            ok, frame = cap.retrieve()   # decode ONLY the sampled frames
-            if not ok:
+    if not replayed:
+        source_fps = cap.get(cv2.CAP_PROP_FPS) or float(fps) or 25.0
+        target_fps = float(fps) if fps else source_fps
+        stride = (source_fps / target_fps) if (target_fps and target_fps < source_fps) else 1.0
+        cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        src_idx = 0
+        next_sample_at = 0.0
+        swing_live = swing is not None
+        while True:
+            roi_done = sweep_to is not None and out_idx >= sweep_to
+            if roi_done and (not swing_live or src_idx > swing.last_src_frame):
                 break
-            if pose is not None and not pose_failed:
-                try:
-                    pose.feed(frame, out_idx)
-                except Exception as e:
-                    logger.error(
-                        "roi_unified: pose.feed raised at frame %d (dropping pose "
-                        "pass, no rows written): %s", out_idx, e,
-                    )
-                    pose_failed = True
-            if bounce is not None and not bounce_failed:
-                try:
-                    bounce.feed(frame, out_idx)
-                except Exception as e:
-                    logger.error(
-                        "roi_unified: bounce.feed raised at frame %d (dropping "
-                        "bounce pass, no rows written): %s", out_idx, e,
-                    )
-                    bounce_failed = True
-            if far_ball is not None and not far_ball_failed:
-                try:
-                    far_ball.feed(frame, out_idx)
-                except Exception as e:
-                    logger.error(
-                        "roi_unified: far_ball.feed raised at frame %d (dropping "
-                        "far_ball pass, no rows written): %s", out_idx, e,
-                    )
-                    far_ball_failed = True
-            next_sample_at += stride
-            out_idx += 1
-        src_idx += 1
-    cap.release()
-    logger.info(
-        "roi_unified: decoded %d sampled frames of %d source (stride=%.2f, "
-        "source_fps=%.1f target_fps=%.1f)",
-        out_idx, src_idx, stride, source_fps, target_fps,
-    )
+            if not cap.grab():           # advance decoder; cheap (no full decode)
+                break
+            sampled = not roi_done and src_idx >= next_sample_at
+            want_swing = swing_live and swing.wants(src_idx)
+            if sampled or want_swing:
+                ok, frame = cap.retrieve()   # decode ONLY sampled / swing-window frames
+                if not ok:
+                    break
+                if want_swing:
+                    try:
+                        swing.feed_source(frame, src_idx)
+                    except Exception as e:
+                        logger.error(
+                            "roi_unified: swing.feed_source raised at source frame %d "
+                            "(falling back to the seek path): %s", src_idx, e,
+                        )
+                        swing.abandon()
+                        swing_live = False
+                if sampled:
+                    _dispatch(frame, out_idx)
+                    next_sample_at += stride
+                    out_idx += 1
+            src_idx += 1
+        cap.release()
+        logger.info(
+            "roi_unified: decoded %d sampled frames of %d source (stride=%.2f, "
+            "source_fps=%.1f target_fps=%.1f)",
+            out_idx, src_idx, stride, source_fps, target_fps,
+        )
+    pose_failed = failed["pose"]
+    bounce_failed = failed["bounce"]
+    far_ball_failed = failed["far_ball"]
 
     # Finalize each surviving consumer independently.
     n_pose = 0
@@ -30,7 +30,6 @@ false positives by timestamp proximity.
 """
 from __future__ import annotations
 
-import json
 import logging
 from typing import List, Optional, Sequence
 
@@ -39,40 +38,18 @@ from sqlalchemy import text as sql_text
 
 
 def _kps_to_array(raw) -> Optional["np.ndarray"]:
-    """Compact keypoints to a float32 (17, 3) numpy array. Accepts the DB's
-    JSONB nested form, the flat-51 form, or a JSON string; None on malformed.
+    """Compact keypoints to a float32 (17, 3) numpy array. Accepts the
+    keypoints_f16 blob (kp_sql), the legacy JSONB nested form, the flat-51
+    form, or a JSON string; None on malformed (keypoint_codec.kps_to_array).
 
     Storing as numpy float32 instead of nested Python lists is ~10x smaller
     (~300B vs ~2.9KB per row) — crucial for the Render 512MB main API which
     OOM'd on 70k+ player_detections rows loaded as nested lists (~210MB)."""
-    if raw is None:
-        return None
-    if isinstance(raw, str):
-        try:
-            raw = json.loads(raw)
-        except (json.JSONDecodeError, TypeError):
-            return None
-    if not raw:
-        return None
-    if isinstance(raw[0], (int, float)):
-        if len(raw) < 51:
-            return None
-        return np.asarray(raw[:51], dtype=np.float32).reshape(17, 3)
-    try:
-        arr = np.asarray(raw, dtype=np.float32)
-    except (ValueError, TypeError):
-        return None
-    if arr.ndim != 2 or arr.shape[1] != 3 or arr.shape[0] < 11:
-        return None
-    if arr.shape[0] > 17:
-        return arr[:17]
-    if arr.shape[0] < 17:
-        pad = np.zeros((17 - arr.shape[0], 3), dtype=np.float32)
-        return np.vstack([arr, pad])
-    return arr
+    return kps_to_array(raw)
 
 from ml_pipeline.ball_merge import merged_ball_subquery
 from ml_pipeline.config import FRAME_SAMPLE_FPS
+from ml_pipeline.keypoint_codec import kp_present_sql, kp_sql, kps_to_array
 from ml_pipeline.serve_detector.ball_toss import detect_ball_toss
 from ml_pipeline.serve_detector.models import ServeEvent, SignalSource
 from ml_pipeline.serve_detector.pose_signal import (
@@ -154,7 +131,7 @@ def _get_dominant_hand(conn, task_id: str) -> bool:
 
 
 def _load_pose_rows(conn, task_id: str, player_id: int,
-                    is_left_handed: bool = False) -> list:
+                    is_left_handed: bool = False, store=None) -> list:
     """Load all pose-carrying detections for one player, ordered by frame.
 
     Augmentation: if ml_analysis.player_detections_roi exists and has rows
@@ -172,59 +149,35 @@ def _load_pose_rows(conn, task_id: str, player_id: int,
     write court_y=0.0 by construction. If both have court_y the bronze
     row wins (canonical). ROI rows for frames where bronze has no row
     at all are appended.
+
+    `store`: an optional TaskFrameStore — the bronze + ROI rows come from its
+    already-loaded columns instead of two more queries; the merge is unchanged.
     """
     # Stream main player_detections server-side (yield_per releases cursor
     # buffer per batch) + compact keypoints to numpy float32 (17, 3) per row
     # — bounds peak memory on the Render 512MB main API which OOM'd on 70k+
     # rows loaded as nested Python lists (~210MB peak vs ~25MB compact).
     rows: list = []
-    _main_stmt = sql_text("""
-        SELECT frame_idx, keypoints, court_x, court_y,
-               bbox_x1, bbox_y1, bbox_x2, bbox_y2
-        FROM ml_analysis.player_detections
-        WHERE job_id = :tid AND player_id = :pid AND keypoints IS NOT NULL
-        ORDER BY frame_idx
-    """).execution_options(stream_results=True, yield_per=5000)
-    for r in conn.execute(_main_stmt, {"tid": task_id, "pid": player_id}).mappings():
-        kp = _kps_to_array(r["keypoints"])
-        if kp is None:
-            continue
-        rows.append({
-            "frame_idx": r["frame_idx"],
-            "keypoints": kp,
-            "court_x": r["court_x"],
-            "court_y": r["court_y"],
-            "bbox_x1": r["bbox_x1"],
-            "bbox_y1": r["bbox_y1"],
-            "bbox_x2": r["bbox_x2"],
-            "bbox_y2": r["bbox_y2"],
-        })
-
-    # Check if ROI table exists (same information_schema guard as _load_ball_rows)
-    table_exists = conn.execute(sql_text("""
-        SELECT EXISTS (
-            SELECT 1 FROM information_schema.tables
-            WHERE table_schema = 'ml_analysis'
-              AND table_name = 'player_detections_roi'
+    if store is not None:
+        _pt = store.players
+        rows = store.dicts(
+            _pt, store.select(_pt, player_id=player_id, has_keypoints=True),
+            ("frame_idx", "keypoints", "court_x", "court_y",
+             "bbox_x1", "bbox_y1", "bbox_x2", "bbox_y2"),
         )
-    """)).scalar()
-
-    roi_rows: list = []
-    if table_exists:
-        # Stream ROI rows + compact keypoints to numpy (same rationale as the
-        # main load — memory-bounds the Render 512MB main API).
-        _roi_stmt = sql_text("""
-            SELECT frame_idx, keypoints, court_x, court_y,
-                   bbox_x1, bbox_y1, bbox_x2, bbox_y2, source
-            FROM ml_analysis.player_detections_roi
-            WHERE job_id = :tid AND player_id = :pid AND keypoints IS NOT NULL
-            ORDER BY frame_idx, source
+    else:
+        _main_stmt = sql_text(f"""
+            SELECT frame_idx, {kp_sql()} AS keypoints, court_x, court_y,
+                   bbox_x1, bbox_y1, bbox_x2, bbox_y2
+            FROM ml_analysis.player_detections
+            WHERE job_id = :tid AND player_id = :pid AND {kp_present_sql()}
+            ORDER BY frame_idx
         """).execution_options(stream_results=True, yield_per=5000)
-        for r in conn.execute(_roi_stmt, {"tid": task_id, "pid": player_id}).mappings():
+        for r in conn.execute(_main_stmt, {"tid": task_id, "pid": player_id}).mappings():
             kp = _kps_to_array(r["keypoints"])
             if kp is None:
                 continue
-            roi_rows.append({
+            rows.append({
                 "frame_idx": r["frame_idx"],
                 "keypoints": kp,
                 "court_x": r["court_x"],
@@ -233,9 +186,52 @@ def _load_pose_rows(conn, task_id: str, player_id: int,
                 "bbox_y1": r["bbox_y1"],
                 "bbox_x2": r["bbox_x2"],
                 "bbox_y2": r["bbox_y2"],
-                "source": r["source"],
             })
 
+    roi_rows: list = []
+    if store is not None:
+        _rt = store.players_roi
+        if _rt is not None:
+            roi_rows = store.dicts(
+                _rt, store.select(_rt, player_id=player_id, has_keypoints=True),
+                ("frame_idx", "keypoints", "court_x", "court_y",
+                 "bbox_x1", "bbox_y1", "bbox_x2", "bbox_y2", "source"),
+            )
+    else:
+        # Check if ROI table exists (same information_schema guard as _load_ball_rows)
+        table_exists = conn.execute(sql_text("""
+            SELECT EXISTS (
+                SELECT 1 FROM information_schema.tables
+                WHERE table_schema = 'ml_analysis'
+                  AND table_name = 'player_detections_roi'
+            )
+        """)).scalar()
+        if table_exists:
+            # Stream ROI rows + compact keypoints to numpy (same rationale as the
+            # main load — memory-bounds the Render 512MB main API).
+            _roi_stmt = sql_text(f"""
+                SELECT frame_idx, {kp_sql()} AS keypoints, court_x, court_y,
+                       bbox_x1, bbox_y1, bbox_x2, bbox_y2, source
+                FROM ml_analysis.player_detections_roi
+                WHERE job_id = :tid AND player_id = :pid AND {kp_present_sql()}
+                ORDER BY frame_idx, source
+            """).execution_options(stream_results=True, yield_per=5000)
+            for r in conn.execute(_roi_stmt, {"tid": task_id, "pid": player_id}).mappings():
+                kp = _kps_to_array(r["keypoints"])
+                if kp is None:
+                    continue
+                roi_rows.append({
+                    "frame_idx": r["frame_idx"],
+                    "keypoints": kp,
+                    "court_x": r["court_x"],
+                    "court_y": r["court_y"],
+                    "bbox_x1": r["bbox_x1"],
+                    "bbox_y1": r["bbox_y1"],
+                    "bbox_x2": r["bbox_x2"],
+                    "bbox_y2": r["bbox_y2"],
+                    "source": r["source"],
+                })
+
     # ROI ensemble (no-dedup): when multiple ROI rows exist at same
     # frame_idx from DIFFERENT source tags, KEEP BOTH. pose_signal
     # scores each row independently; both flow into clustering. The
@@ -357,7 +353,7 @@ def _load_pose_rows(conn, task_id: str, player_id: int,
     return out
 
 
-def _load_ball_rows(conn, task_id: str) -> list:
+def _load_ball_rows(conn, task_id: str, store=None) -> list:
     """Load all ball detections (for ball_toss lookups).
 
     Optionally merges in rows from ml_analysis.ball_detections_roi — the
@@ -377,37 +373,49 @@ def _load_ball_rows(conn, task_id: str) -> list:
     # sharp far-ROI ball wins per far frame; without the dedup the overlapping
     # roi_far_ball + main rows would double far frames in the ball_toss lookups.
     # No-op until roi_* rows exist, so serve behaviour is unchanged today.
-    rows = conn.execute(sql_text(merged_ball_subquery(
-        "frame_idx, x, y, is_bounce, court_x, court_y, speed_kmh"
-    )), {"tid": task_id}).mappings().all()
-    rows = [dict(r) for r in rows]
-
-    # Check table existence via information_schema BEFORE selecting — if the
-    # table doesn't exist, a direct SELECT raises an exception that poisons
-    # the current transaction (Postgres aborts the whole block; all later
-    # queries fail with InFailedSqlTransaction even though we caught the
-    # Python exception). Guarding with information_schema avoids this.
-    table_exists = conn.execute(sql_text("""
-        SELECT EXISTS (
-            SELECT 1 FROM information_schema.tables
-            WHERE table_schema = 'ml_analysis'
-              AND table_name = 'ball_detections_roi'
-        )
-    """)).scalar()
-    if not table_exists:
-        logger.debug("ball_detections_roi table not present — skipping ROI merge")
-        return rows
+    if store is not None:
+        # Same merged SELECT, already loaded by the TaskFrameStore.
+        _bt = store.balls
+        rows = store.dicts(_bt, store.select(_bt), (
+            "frame_idx", "x", "y", "is_bounce", "court_x", "court_y", "speed_kmh"))
+        _rt = store.balls_roi
+        if _rt is None:
+            logger.debug("ball_detections_roi table not present — skipping ROI merge")
+            return rows
+        roi_rows = store.dicts(_rt, store.select(_rt), (
+            "frame_idx", "x", "y", "is_bounce", "court_x", "court_y"))
+    else:
+        rows = conn.execute(sql_text(merged_ball_subquery(
+            "frame_idx, x, y, is_bounce, court_x, court_y, speed_kmh"
+        )), {"tid": task_id}).mappings().all()
+        rows = [dict(r) for r in rows]
+
+        # Check table existence via information_schema BEFORE selecting — if the
+        # table doesn't exist, a direct SELECT raises an exception that poisons
+        # the current transaction (Postgres aborts the whole block; all later
+        # queries fail with InFailedSqlTransaction even though we caught the
+        # Python exception). Guarding with information_schema avoids this.
+        table_exists = conn.execute(sql_text("""
+            SELECT EXISTS (
+                SELECT 1 FROM information_schema.tables
+                WHERE table_schema = 'ml_analysis'
+                  AND table_name = 'ball_detections_roi'
+            )
+        """)).scalar()
+        if not table_exists:
+            logger.debug("ball_detections_roi table not present — skipping ROI merge")
+            return rows
 
-    try:
-        roi_rows = conn.execute(sql_text("""
-            SELECT frame_idx, x, y, is_bounce, court_x, court_y
-            FROM ml_analysis.ball_detections_roi
-            WHERE job_id = :tid
-            ORDER BY frame_idx
-        """), {"tid": task_id}).mappings().all()
-    except Exception as exc:
-        logger.warning("ball_detections_roi query failed (%s) — skipping ROI merge", exc)
-        return rows
+        try:
+            roi_rows = conn.execute(sql_text("""
+                SELECT frame_idx, x, y, is_bounce, court_x, court_y
+                FROM ml_analysis.ball_detections_roi
+                WHERE job_id = :tid
+                ORDER BY frame_idx
+            """), {"tid": task_id}).mappings().all()
+        except Exception as exc:
+            logger.warning("ball_detections_roi query failed (%s) — skipping ROI merge", exc)
+            return rows
 
     if not roi_rows:
         return rows
@@ -1129,10 +1137,14 @@ def _run_pipeline(
     return near_events, far_pose_events, far_bounce_events
 
 
-def detect_serves_for_task(conn, task_id: str, *, replace: bool = True) -> List[ServeEvent]:
+def detect_serves_for_task(conn, task_id: str, *, replace: bool = True,
+                           store=None) -> List[ServeEvent]:
     """Production entry point. Runs pose-first for near player + bounce-first
     for far player. Persists to ml_analysis.serve_events. Returns the
-    events for downstream consumption or logging."""
+    events for downstream consumption or logging.
+
+    `store`: optional ml_pipeline.task_frame_store.TaskFrameStore shared with
+    the other post-ingest stages (bronze read once per run)."""
     init_serve_events_schema(conn)
     if replace:
         deleted = delete_serves_for_task(conn, task_id)
@@ -1161,9 +1173,9 @@ def detect_serves_for_task(conn, task_id: str, *, replace: bool = True) -> List[
         fps = float(FRAME_SAMPLE_FPS)
     is_left_handed = _get_dominant_hand(conn, task_id)
 
-    pose_near = _load_pose_rows(conn, task_id, 0, is_left_handed=is_left_handed)
-    pose_far = _load_pose_rows(conn, task_id, 1, is_left_handed=is_left_handed)
-    ball_rows = _load_ball_rows(conn, task_id)
+    pose_near = _load_pose_rows(conn, task_id, 0, is_left_handed=is_left_handed, store=store)
+    pose_far = _load_pose_rows(conn, task_id, 1, is_left_handed=is_left_handed, store=store)
+    ball_rows = _load_ball_rows(conn, task_id, store=store)
 
     # Bounce source precedence: CNN bounce model (ml_analysis.ball_bounces,
     # Batch rev 66+) > legacy velocity-reversal is_bounce flags. When CNN
@@ -18,6 +18,7 @@ from typing import Dict, List, Tuple
 import numpy as np
 from sqlalchemy import text
 
+from ml_pipeline.keypoint_codec import kp_sql, kps_to_array
 from ml_pipeline.serve_model.candidates import (
     Anchor, bounce_anchors, pose_anchors, merge_anchors,
 )
@@ -65,15 +66,15 @@ def load_task_arrays(conn, tid: str) -> dict:
         FROM ml_analysis.ball_detections WHERE job_id::text = :t
         ORDER BY frame_idx"""), {"t": tid}).mappings().all()
     ball_rows = [dict(r) for r in ball]
-    roi_raw = conn.execute(text("""
-        SELECT frame_idx, keypoints, bbox_y1, bbox_y2
+    roi_raw = conn.execute(text(f"""
+        SELECT frame_idx, {kp_sql()} AS keypoints, bbox_y1, bbox_y2
         FROM ml_analysis.player_detections_roi
         WHERE job_id::text = :t ORDER BY frame_idx"""), {"t": tid}).fetchall()
     roi_ts = sorted(r[0] / fps for r in roi_raw)
     roi_rows = []
     for fi, kp, y1, y2 in roi_raw:
-        if isinstance(kp, str):
-            kp = json.loads(kp)
+        kp = kps_to_array(kp)
+        kp = kp.tolist() if kp is not None else None
         bbox_h = (y2 - y1) if (y1 is not None and y2 is not None) else None
         roi_rows.append({"ts": fi / fps, "kp": kp, "bbox_h": bbox_h})
     far_ts = sorted(r[0] / fps for r in conn.execute(text("""
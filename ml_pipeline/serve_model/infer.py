@@ -19,7 +19,6 @@ rerun.
 """
 from __future__ import annotations
 
-import json
 import logging
 import os
 from dataclasses import dataclass
@@ -27,6 +26,7 @@ from typing import List, Optional, Sequence
 
 import numpy as np
 
+from ml_pipeline.keypoint_codec import kps_to_array
 from ml_pipeline.serve_model.candidates import bounce_anchors, pose_anchors, merge_anchors
 from ml_pipeline.serve_model.features import featurize
 from ml_pipeline.serve_model.model import load, score, DEFAULT_THRESHOLD
@@ -70,8 +70,8 @@ def detect_serve_candidates_offline(
     roi_ts = sorted(fi / fps for fi, _kp, _y1, _y2 in roi_rows_raw)
     roi_rows = []
     for fi, kp, y1, y2 in roi_rows_raw:
-        if isinstance(kp, str):
-            kp = json.loads(kp)
+        kp = kps_to_array(kp)
+        kp = kp.tolist() if kp is not None else None
         bbox_h = (y2 - y1) if (y1 is not None and y2 is not None) else None
         roi_rows.append({"ts": fi / fps, "kp": kp, "bbox_h": bbox_h})
     far_ts = sorted(fi / fps for fi in far_pose_frames)
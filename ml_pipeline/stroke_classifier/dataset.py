@@ -2,7 +2,14 @@
 
 Reads the dataset built by `ml_pipeline.training.build_swing_type_dataset`:
   - manifest.json                       — match list + train/val split + totals
-  - {t5_task_id}.pt                     — per-match (N, 16, 112, 112, 2) flows + metadata
+  - {t5_task_id}.flows.npy              — per-match (N, 16, 112, 112, 2) float32 flows
+  - {t5_task_id}.pt                     — per-match labels + metadata (pre-v2
+                                          builds: the flows tensor too)
+
+v2 flows are memory-mapped (mmap=True, default): the dataset opens in
+milliseconds whatever the corpus size and __getitem__ is a zero-copy slice of
+the page cache. mmap=False loads every match into RAM up front (the old
+behaviour, kept for batch_train --loader-bench comparisons).
 
 Per-hit returns: (flow_tensor, label_idx, role_str, handedness_bit, meta).
 
@@ -36,6 +43,7 @@ import random
 from pathlib import Path
 from typing import Optional
 
+import numpy as np
 import torch
 from torch.utils.data import Dataset
 
@@ -51,10 +59,10 @@ def _handedness_to_bit(handedness: str) -> float:
 
 
 class SwingTypeDataset(Dataset):
-    """One example per (match, hit). Loads all per-match flow tensors into
-    RAM eagerly; the full dataset (368 hits x 16 x 112 x 112 x 2 x 4 bytes)
-    is ~120 MB — fine for a workstation, will rebuild lazily per match if
-    we hit memory pressure post-Corpus-4.
+    """One example per (match, hit). Flows are memory-mapped from each match's
+    .flows.npy (1.6 MB per hit — 368 hits is ~600 MB, the post-Corpus-4 size
+    would not fit in RAM eagerly); pre-v2 .pt files carry the tensor inline
+    and are loaded as before.
     """
 
     def __init__(
@@ -64,6 +72,7 @@ class SwingTypeDataset(Dataset):
         augment: bool = False,
         handedness_overrides: Optional[dict] = None,
         temporal_crop_jitter: int = 2,
+        mmap: bool = True,
     ) -> None:
         super().__init__()
         self.dataset_dir = Path(dataset_dir)
@@ -98,13 +107,20 @@ class SwingTypeDataset(Dataset):
             if not pt_path.is_absolute():
                 pt_path = self.dataset_dir / pt_path.name
             blob = torch.load(pt_path, weights_only=False)
+            if "flows_npy" in blob:
+                # Copy-on-write map: slices are writable views for
+                # torch.from_numpy; nothing is written back.
+                flows = np.load(self.dataset_dir / blob["flows_npy"],
+                                mmap_mode="c" if mmap else None)
+            else:
+                flows = blob["flows"]
             self._matches.append({
                 "t5_task_id": m["t5_task_id"],
-                "flows": blob["flows"],         # (N, 16, 112, 112, 2)
+                "flows": flows,                 # (N, 16, 112, 112, 2) ndarray / memmap / tensor
                 "labels_dict": blob["labels"],  # dict of parallel lists, len N
                 "meta": blob["meta"],
             })
-            n_hits = blob["flows"].shape[0]
+            n_hits = flows.shape[0]
             mi = len(self._matches) - 1
             for hi in range(n_hits):
                 self._index.append((mi, hi))
@@ -129,7 +145,9 @@ class SwingTypeDataset(Dataset):
         m_i, h_i = self._index[idx]
         m = self._matches[m_i]
 
-        flow = m["flows"][h_i]  # (16, 112, 112, 2), float32 torch tensor
+        flow = m["flows"][h_i]  # (16, 112, 112, 2), float32
+        if isinstance(flow, np.ndarray):
+            flow = torch.from_numpy(flow)
         labels = m["labels_dict"]
 
         swing_type = labels["swing_type"][h_i]
@@ -2,7 +2,7 @@
 
 Runs INSIDE the Batch pipeline (bronze stage). For each detected hit it builds
 the same optical-flow input the v2 model was trained on, classifies the swing
-type, and writes the answer to PlayerDetection.stroke_class — a BRONZE fact
+type, and writes the answer to the player_table stroke_class column — a BRONZE fact
 (persisted to ml_analysis.player_detections.stroke_class by db_writer). Silver
 Pass 1 then projects stroke_class -> silver.swing_type verbatim.
 
@@ -14,7 +14,7 @@ which is not shipped in the Batch image) and lives under stroke_classifier/,
 which the Dockerfile already COPYs.
 
 Frame-space (the bug that ate 62% of training hits — feedback_t5_two_frame_spaces):
-  - det.frame_idx is the pipeline's SAMPLED index (target_fps, ~25fps).
+  - a detection's frame_idx is the pipeline's SAMPLED index (target_fps, ~25fps).
   - the optical-flow window is read from the SOURCE-fps video, so the sampled
     index is converted to a source frame via frame_interval = source_fps/target_fps.
   Training read the SOURCE-fps trimmed copy and seeked by the raw SA source
@@ -28,17 +28,36 @@ canonicalising the label set at the bronze write is a bronze concern.
 Handedness: training used the right-handed default (1.0) for every player
 (DEFAULT_HANDEDNESS in stroke_classifier/dataset.py; no overrides were passed),
 so inference matches that distribution with handedness=1.0 for all hits.
+
+Decode + flow scheduling (SWING_FLOW_FUSED / SWING_FLOW_WORKERS):
+  - SwingFlowProcessor is a consumer of the unified ROI sweep
+    (roi_extractors/unified.py): the sweep retrieves the SOURCE frames inside
+    each planned window during its single sequential decode, so the per-hit
+    seek pass is gone. classify_strokes_v2 keeps the seek path as the fallback.
+  - Farneback runs on a forkserver process pool (one worker per vCPU) that the
+    pipeline creates once, before CUDA init and its worker threads
+    (make_flow_pool); finished windows are consumed in order through a bounded
+    in-flight queue and fed to predict_batch in micro-batches. Same crops, same
+    flow params, same model input — only the scheduling changed.
 """
 from __future__ import annotations
 
+import bisect
 import logging
+import multiprocessing as mp
 import os
+from multiprocessing import forkserver
+from collections import defaultdict, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
 from typing import Optional
 
 import cv2
 import numpy as np
 import torch
 
+from ml_pipeline.config import SWING_FLOW_INFLIGHT, SWING_FLOW_WORKERS
+
 logger = logging.getLogger(__name__)
 
 # --- Geometry / window constants — PORTED VERBATIM from
@@ -106,11 +125,11 @@ def _compute_flow_window(crops: list[np.ndarray]) -> np.ndarray:
     return flows
 
 
-def _nearest_det(frames: list[int], dets: list, target: int, window: int):
-    """Nearest detection to `target` frame within ±window. frames is sorted."""
+def _nearest_row(frames: list[int], rows: list[int], target: int, window: int):
+    """Table row of the detection nearest `target` frame within ±window.
+    frames is sorted; rows[i] is the row holding frames[i]."""
     if not frames:
         return None
-    import bisect
     pos = bisect.bisect_left(frames, target)
     best = None
     best_d = window + 1
@@ -119,156 +138,389 @@ def _nearest_det(frames: list[int], dets: list, target: int, window: int):
             d = abs(frames[j] - target)
             if d < best_d:
                 best_d = d
-                best = dets[j]
+                best = rows[j]
     return best if best_d <= window else None
 
 
-def classify_strokes_v2(
-    result,
-    *,
-    target_fps: int,
-    device: str,
-    min_conf: float = 0.5,
-    micro_batch: int = 16,
-) -> int:
-    """Classify swing type for hitter-candidate detections around each bounce.
+@dataclass
+class SwingWindow:
+    """One hitter-candidate's 16-frame SOURCE window and crop ROI."""
+    row: int                                # result.player_table row
+    start: int                              # first source frame (inclusive)
+    roi: tuple[int, int, int, int]          # (x, y, w, h), source pixels
+
+    @property
+    def end(self) -> int:
+        return self.start + WINDOW_TOTAL    # exclusive
+
+
+def _video_props(video_path: str) -> Optional[tuple[float, int, int, int]]:
+    """(source_fps, n_src_frames, width, height) without decoding a frame."""
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        return None
+    try:
+        return (cap.get(cv2.CAP_PROP_FPS) or 0.0,
+                int(cap.get(cv2.CAP_PROP_FRAME_COUNT)),
+                int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+    finally:
+        cap.release()
+
+
+def plan_swing_windows(result, *, target_fps: int, source_fps: float, n_src_frames: int,
+                       video_w: int, video_h: int) -> list[SwingWindow]:
+    """Hitter-candidate detections around each bounce -> source-frame windows.
 
     For every bounce we snap back HIT_BEFORE_BOUNCE (~0.32s) to the estimated
-    contact frame and classify the nearest detection of EACH player_id within a
-    tolerance window — over-classifying the non-hitter is harmless because silver
-    only reads stroke_class off the resolved hitter (and silver carries a wider
-    windowed fallback so exact-frame alignment isn't required). Sets
-    det.stroke_class in the canonical fh/bh/overhead vocabulary. Returns the
-    number of detections classified.
+    contact frame and take the nearest detection of EACH player_id within a
+    tolerance window (deduped — a det can be the nearest candidate for several
+    bounces). Windows that run off the video or whose ROI is degenerate are
+    dropped. Sorted by start frame.
+    """
+    balls = result.ball_table
+    bounce_frames = balls["frame_idx"][balls["is_bounce"]].tolist()
+    # Sampled (frame_idx) -> source frame. Mirrors VideoPreprocessor:
+    # it yields one sampled frame per `frame_interval` source frames.
+    frame_interval = (source_fps / target_fps) if target_fps < source_fps else 1.0
+
+    # Per-player sorted row index for nearest-frame lookup (columns only —
+    # no detection objects).
+    players = result.player_table
+    frames = players["frame_idx"].tolist()
+    pids = players["player_id"].tolist()
+    by_pid_frames: dict = defaultdict(list)
+    by_pid_rows: dict = defaultdict(list)
+    for r in np.argsort(players["frame_idx"], kind="stable").tolist():
+        by_pid_frames[pids[r]].append(frames[r])
+        by_pid_rows[pids[r]].append(r)
+
+    hit_offset = max(1, int(round(target_fps * 0.32)))   # silver HIT_BEFORE_BOUNCE
+    match_window = max(1, int(round(target_fps * 0.60)))  # ±0.6s tolerance
+
+    to_classify: list = []
+    seen: set = set()
+    for bounce_frame in bounce_frames:
+        hit_est = max(0, bounce_frame - hit_offset)
+        for pid in by_pid_frames:
+            row = _nearest_row(by_pid_frames[pid], by_pid_rows[pid], hit_est, match_window)
+            if row is None:
+                continue
+            key = (pids[row], frames[row])
+            if key in seen:
+                continue
+            seen.add(key)
+            to_classify.append(row)
+
+    bboxes = players["bbox"]
+    windows: list[SwingWindow] = []
+    for row in to_classify:
+        src_center = int(round(frames[row] * frame_interval))
+        start = src_center - WINDOW_PRE
+        if start < 0 or start + WINDOW_TOTAL > n_src_frames:
+            continue
+        bx1, by1, bx2, by2 = bboxes[row].tolist()
+        if (bx2 - bx1) < 4 or (by2 - by1) < 4:
+            continue
+        roi = _bbox_to_roi(bx1, by1, bx2, by2, video_w, video_h)
+        if roi[2] < 4 or roi[3] < 4:
+            continue
+        windows.append(SwingWindow(row=row, start=start, roi=roi))
+    windows.sort(key=lambda w: w.start)
+
+    logger.info(
+        "swing_classifier_v2: %d bounces -> %d unique hitter-candidate dets -> %d windows "
+        "(source_fps=%.1f target_fps=%d interval=%.2f)",
+        len(bounce_frames), len(to_classify), len(windows), source_fps, target_fps, frame_interval,
+    )
+    return windows
+
+
+def _crop(frame: np.ndarray, roi: tuple[int, int, int, int]) -> np.ndarray:
+    x, y, w, h = roi
+    crop = frame[y:y + h, x:x + w]
+    if crop.size == 0:
+        crop = np.zeros((h, w, 3), dtype=np.uint8)
+    return cv2.resize(crop, (ROI_SIZE, ROI_SIZE), interpolation=cv2.INTER_AREA)
+
+
+def _flow_worker_init() -> None:
+    # One Farneback per process; OpenCV's own thread pool would oversubscribe.
+    cv2.setNumThreads(1)
+
+
+def _flow_workers() -> int:
+    if SWING_FLOW_WORKERS:
+        return SWING_FLOW_WORKERS
+    try:
+        return len(os.sched_getaffinity(0))   # the Batch job's vCPUs, not the host's
+    except AttributeError:
+        return os.cpu_count() or 1
 
-    STOPGAP-safe: if the v2 weights are absent the classifier reports
-    unavailable and this returns 0, leaving silver's pose/position heuristic as
-    the live fallback.
+
+def make_flow_pool() -> Optional[ProcessPoolExecutor]:
+    """The Farneback process pool, or None with one worker (flow runs inline).
+
+    forkserver, not fork: workers are forked from a single-threaded server
+    process started here, never from the pipeline process — which by the time
+    flow runs has CUDA initialised and decode-prefetch / telemetry / torch
+    threads, any of which may hold a lock (logging, malloc, OpenMP) at fork
+    time. The server preloads this module so each worker starts with cv2 /
+    numpy / torch already imported. The pipeline calls this once in __init__
+    and passes the pool to every classification of the run.
+    """
+    workers = _flow_workers()
+    if workers <= 1:
+        return None
+    ctx = mp.get_context("forkserver")
+    ctx.set_forkserver_preload([__name__])
+    pool = ProcessPoolExecutor(
+        max_workers=workers, mp_context=ctx, initializer=_flow_worker_init,
+    )
+    forkserver.ensure_running()
+    logger.info("swing_classifier_v2: forkserver flow pool, workers=%d", workers)
+    return pool
+
+
+class _FlowClassifier:
+    """Farneback on a process pool -> predict_batch in micro-batches.
+
+    submit() hands a window's crops to `pool` (make_flow_pool; owned by the
+    caller); windows are consumed in submission order once more than
+    SWING_FLOW_INFLIGHT are queued (the bounded queue between the decoder and
+    the model), and finish() drains the rest. With no pool the flow is
+    computed inline. Predictions are written to `players` (the player
+    DetectionTable) by row.
     """
+
+    def __init__(self, classifier, players, pool: Optional[ProcessPoolExecutor], *,
+                 min_conf: float, micro_batch: int):
+        self.classifier = classifier
+        self.players = players
+        self.min_conf = min_conf
+        self.micro_batch = micro_batch
+        self.classified = 0
+        self.submitted = 0
+        self._pool = pool
+        self._inflight: deque = deque()
+        self._batch_rows: list = []
+        self._batch_flows: list = []
+        logger.info(
+            "swing_classifier_v2: flow %s inflight<=%d",
+            "pool" if pool is not None else "inline", SWING_FLOW_INFLIGHT,
+        )
+
+    def submit(self, row: int, crops: np.ndarray) -> None:
+        if self._pool is not None:
+            fut = self._pool.submit(_compute_flow_window, crops)
+        else:
+            fut = Future()
+            fut.set_result(_compute_flow_window(crops))
+        self._inflight.append((row, fut))
+        self.submitted += 1
+        while len(self._inflight) > SWING_FLOW_INFLIGHT:
+            self._take_one()
+
+    def _take_one(self) -> None:
+        row, fut = self._inflight.popleft()
+        self._batch_rows.append(row)
+        self._batch_flows.append(fut.result())
+        if len(self._batch_flows) >= self.micro_batch:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._batch_flows:
+            return
+        arr = np.stack(self._batch_flows, axis=0)                   # (B,16,112,112,2)
+        flows = torch.from_numpy(arr).permute(0, 4, 1, 2, 3).contiguous()  # (B,2,16,112,112)
+        hand = torch.ones((flows.shape[0], 1), dtype=torch.float32)
+        preds = self.classifier.predict_batch(flows, hand)
+        stroke_class = self.players["stroke_class"]
+        for row, (cls_name, conf) in zip(self._batch_rows, preds):
+            if conf >= self.min_conf and cls_name in _VOCAB_MAP:
+                stroke_class[row] = _VOCAB_MAP[cls_name]
+                self.classified += 1
+        self._batch_rows = []
+        self._batch_flows = []
+
+    def finish(self) -> int:
+        try:
+            while self._inflight:
+                self._take_one()
+            self._flush()
+        finally:
+            self.close()
+        return self.classified
+
+    def close(self) -> None:
+        # The pool is the caller's; only drop this classifier's pending work.
+        while self._inflight:
+            _, fut = self._inflight.popleft()
+            fut.cancel()
+
+
+def _load_classifier(result, device: str):
+    """(classifier, video_props) or None when there is nothing to do."""
     from ml_pipeline.stroke_classifier.model_v2 import SwingTypeClassifierV2
 
     classifier = SwingTypeClassifierV2(device=device)
     if not classifier.available:
         logger.info("swing_classifier_v2 weights not present — skipping (silver heuristic stays live)")
-        return 0
-
-    bounces = [d for d in result.ball_detections if d.is_bounce]
-    if not bounces:
+        return None
+    if not result.ball_table["is_bounce"].any():
         logger.info("swing_classifier_v2: no bounces — nothing to classify")
-        return 0
-
+        return None
     video_path = result.video_path
     if not video_path or not os.path.exists(video_path):
         logger.warning("swing_classifier_v2: video not accessible (%s) — skipping", video_path)
-        return 0
-
-    cap = cv2.VideoCapture(video_path)
-    if not cap.isOpened():
+        return None
+    props = _video_props(video_path)
+    if props is None:
         logger.warning("swing_classifier_v2: cannot open video %s — skipping", video_path)
-        return 0
-    try:
-        source_fps = cap.get(cv2.CAP_PROP_FPS) or float(target_fps)
-        n_src_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        video_w = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-        video_h = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-        # Sampled (det.frame_idx) -> source frame. Mirrors VideoPreprocessor:
-        # it yields one sampled frame per `frame_interval` source frames.
-        frame_interval = (source_fps / target_fps) if target_fps < source_fps else 1.0
-
-        # Per-player sorted detection index for nearest-frame lookup.
-        from collections import defaultdict
-        by_pid_frames: dict = defaultdict(list)
-        by_pid_dets: dict = defaultdict(list)
-        for pd in sorted(result.player_detections, key=lambda d: d.frame_idx):
-            by_pid_frames[pd.player_id].append(pd.frame_idx)
-            by_pid_dets[pd.player_id].append(pd)
-
-        hit_offset = max(1, int(round(target_fps * 0.32)))   # silver HIT_BEFORE_BOUNCE
-        match_window = max(1, int(round(target_fps * 0.60)))  # ±0.6s tolerance
-
-        # Collect the unique detections to classify (dedupe — a det can be the
-        # nearest hitter-candidate for several bounces).
-        to_classify: list = []
-        seen: set = set()
-        for b in bounces:
-            hit_est = max(0, b.frame_idx - hit_offset)
-            for pid in by_pid_frames:
-                det = _nearest_det(by_pid_frames[pid], by_pid_dets[pid], hit_est, match_window)
-                if det is None:
-                    continue
-                key = (det.player_id, det.frame_idx)
-                if key in seen:
-                    continue
-                seen.add(key)
-                to_classify.append(det)
-
-        if not to_classify:
-            logger.info("swing_classifier_v2: no hitter-candidate detections near bounces")
-            return 0
+        return None
+    return classifier, props
+
+
+class SwingFlowProcessor:
+    """Unified-ROI-sweep consumer: gathers swing windows from the sweep's decode.
+
+    The sweep calls wants(src_idx) for every SOURCE frame it walks and, when
+    True, retrieves the frame and calls feed_source(). Completed windows go
+    straight to the flow pool. finalize() classifies once the sweep has walked
+    past last_src_frame; if it never did (spill replay, sweep failure) the
+    caller falls back to classify_strokes_v2.
+    """
 
+    def __init__(self, classifier, players, windows: list[SwingWindow], *,
+                 pool: Optional[ProcessPoolExecutor], min_conf: float, micro_batch: int):
+        self.windows = windows
+        self._starts = [w.start for w in windows]
+        self._next = 0
+        self._active: list[tuple[SwingWindow, list]] = []
+        self._flow = _FlowClassifier(classifier, players, pool, min_conf=min_conf,
+                                     micro_batch=micro_batch)
+        self.last_src_frame = max((w.end for w in windows), default=0) - 1
+        self.failed = False
+
+    @classmethod
+    def create(cls, result, *, target_fps: int, device: str, min_conf: float = 0.5,
+               micro_batch: int = 16,
+               pool: Optional[ProcessPoolExecutor] = None) -> Optional["SwingFlowProcessor"]:
+        loaded = _load_classifier(result, device)
+        if loaded is None:
+            return None
+        classifier, (source_fps, n_src_frames, video_w, video_h) = loaded
+        windows = plan_swing_windows(
+            result, target_fps=target_fps, source_fps=source_fps or float(target_fps),
+            n_src_frames=n_src_frames, video_w=video_w, video_h=video_h,
+        )
+        if not windows:
+            logger.info("swing_classifier_v2: no hitter-candidate detections near bounces")
+            return None
+        return cls(classifier, result.player_table, windows, pool=pool,
+                   min_conf=min_conf, micro_batch=micro_batch)
+
+    @property
+    def completed(self) -> bool:
+        return not self.failed and self._next >= len(self.windows) and not self._active
+
+    def abandon(self) -> None:
+        """The sweep could not feed every window — caller uses the seek path."""
+        self.failed = True
+        self.close()
+
+    def wants(self, src_idx: int) -> bool:
+        return bool(self._active) or (
+            self._next < len(self._starts) and self._starts[self._next] <= src_idx)
+
+    def feed_source(self, frame: np.ndarray, src_idx: int) -> None:
+        while self._next < len(self.windows) and self._starts[self._next] <= src_idx:
+            w = self.windows[self._next]
+            self._next += 1
+            if w.start == src_idx:
+                self._active.append((w, []))
+            # start < src_idx: the sweep skipped this window's first frame
+            # (cannot happen in a sequential decode) — the window is dropped.
+        still: list = []
+        for w, crops in self._active:
+            crops.append(_crop(frame, w.roi))
+            if len(crops) == WINDOW_TOTAL:
+                self._flow.submit(w.row, np.stack(crops))
+            else:
+                still.append((w, crops))
+        self._active = still
+
+    def finalize(self) -> int:
+        n = self._flow.finish()
         logger.info(
-            "swing_classifier_v2: %d bounces -> %d unique hitter-candidate dets "
-            "(source_fps=%.1f target_fps=%d interval=%.2f)",
-            len(bounces), len(to_classify), source_fps, target_fps, frame_interval,
+            "swing_classifier_v2: classified %d/%d windows from the ROI sweep decode",
+            n, len(self.windows),
         )
+        return n
 
-        classified = 0
-        batch_dets: list = []
-        batch_flows: list = []
-
-        def _flush():
-            nonlocal classified, batch_dets, batch_flows
-            if not batch_flows:
-                return
-            arr = np.stack(batch_flows, axis=0)                     # (B,16,112,112,2)
-            flows = torch.from_numpy(arr).permute(0, 4, 1, 2, 3).contiguous()  # (B,2,16,112,112)
-            hand = torch.ones((flows.shape[0], 1), dtype=torch.float32)
-            preds = classifier.predict_batch(flows, hand)
-            for det, (cls_name, conf) in zip(batch_dets, preds):
-                if conf >= min_conf and cls_name in _VOCAB_MAP:
-                    det.stroke_class = _VOCAB_MAP[cls_name]
-                    classified += 1
-            batch_dets = []
-            batch_flows = []
-
-        for det in to_classify:
-            src_center = int(round(det.frame_idx * frame_interval))
-            start = src_center - WINDOW_PRE
-            if start < 0 or start + WINDOW_TOTAL > n_src_frames:
-                continue
-            bx1, by1, bx2, by2 = det.bbox
-            if (bx2 - bx1) < 4 or (by2 - by1) < 4:
-                continue
-            roi_x, roi_y, roi_w, roi_h = _bbox_to_roi(bx1, by1, bx2, by2, video_w, video_h)
-            if roi_w < 4 or roi_h < 4:
-                continue
+    def close(self) -> None:
+        self._flow.close()
 
-            cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+
+def classify_strokes_v2(
+    result,
+    *,
+    target_fps: int,
+    device: str,
+    min_conf: float = 0.5,
+    micro_batch: int = 16,
+    pool: Optional[ProcessPoolExecutor] = None,
+) -> int:
+    """Classify swing type for hitter-candidate detections around each bounce.
+
+    Over-classifying the non-hitter is harmless because silver only reads
+    stroke_class off the resolved hitter (and silver carries a wider windowed
+    fallback so exact-frame alignment isn't required). Sets player_table's
+    stroke_class in the canonical fh/bh/overhead vocabulary. Returns the number of detections
+    classified.
+
+    Standalone path: opens its own capture and seeks per window (the fused path
+    is SwingFlowProcessor inside the ROI sweep). Flow still runs on `pool`
+    (make_flow_pool) when one is given.
+
+    STOPGAP-safe: if the v2 weights are absent the classifier reports
+    unavailable and this returns 0, leaving silver's pose/position heuristic as
+    the live fallback.
+    """
+    loaded = _load_classifier(result, device)
+    if loaded is None:
+        return 0
+    classifier, (source_fps, n_src_frames, video_w, video_h) = loaded
+    windows = plan_swing_windows(
+        result, target_fps=target_fps, source_fps=source_fps or float(target_fps),
+        n_src_frames=n_src_frames, video_w=video_w, video_h=video_h,
+    )
+    if not windows:
+        logger.info("swing_classifier_v2: no hitter-candidate detections near bounces")
+        return 0
+
+    cap = cv2.VideoCapture(result.video_path)
+    flow = _FlowClassifier(classifier, result.player_table, pool, min_conf=min_conf,
+                           micro_batch=micro_batch)
+    try:
+        for w in windows:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, w.start)
             crops = []
-            ok = True
             for _ in range(WINDOW_TOTAL):
                 ret, fr = cap.read()
                 if not ret:
-                    ok = False
                     break
-                crop = fr[roi_y:roi_y + roi_h, roi_x:roi_x + roi_w]
-                if crop.size == 0:
-                    crop = np.zeros((roi_h, roi_w, 3), dtype=np.uint8)
-                crop = cv2.resize(crop, (ROI_SIZE, ROI_SIZE), interpolation=cv2.INTER_AREA)
-                crops.append(crop)
-            if not ok or len(crops) < WINDOW_TOTAL:
+                crops.append(_crop(fr, w.roi))
+            if len(crops) < WINDOW_TOTAL:
                 continue
-
-            batch_flows.append(_compute_flow_window(crops))
-            batch_dets.append(det)
-            if len(batch_flows) >= micro_batch:
-                _flush()
-        _flush()
-
-        logger.info(
-            "swing_classifier_v2: classified %d/%d candidate dets (min_conf=%.2f)",
-            classified, len(to_classify), min_conf,
-        )
-        return classified
+            flow.submit(w.row, np.stack(crops))
+        classified = flow.finish()
     finally:
+        flow.close()
         cap.release()
+
+    logger.info(
+        "swing_classifier_v2: classified %d/%d candidate windows (min_conf=%.2f)",
+        classified, len(windows), min_conf,
+    )
+    return classified
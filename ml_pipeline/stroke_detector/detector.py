@@ -30,7 +30,6 @@ threshold or higher saturate at 1.0.
 """
 from __future__ import annotations
 
-import json
 import logging
 from typing import Dict, List, Optional, Sequence, Tuple
 
@@ -38,6 +37,7 @@ import numpy as np
 from sqlalchemy import text as sql_text
 
 from ml_pipeline.config import FRAME_SAMPLE_FPS
+from ml_pipeline.keypoint_codec import kp_present_sql, kp_sql, kps_to_array
 from ml_pipeline.stroke_detector.hit_location import assemble_hit_locations
 from ml_pipeline.stroke_detector.models import StrokeEvent
 from ml_pipeline.stroke_detector.schema import (
@@ -227,40 +227,17 @@ def _run_pipeline(
 
 
 def _kps_to_array(raw) -> Optional["np.ndarray"]:
-    """Compact keypoints to a float32 (17, 3) numpy array. Accepts the DB's
-    JSONB nested form, the flat-51 form, or a JSON string; None on malformed.
+    """Compact keypoints to a float32 (17, 3) numpy array. Accepts the
+    keypoints_f16 blob (kp_sql), the legacy JSONB nested form, the flat-51
+    form, or a JSON string; None on malformed (keypoint_codec.kps_to_array).
 
     Storing as numpy float32 instead of nested Python lists is ~10x smaller
     (~300B vs ~2.9KB per row) — crucial for the Render 512MB main API which
     OOM'd on 70k+ player_detections rows loaded as nested lists (~210MB)."""
-    if raw is None:
-        return None
-    if isinstance(raw, str):
-        try:
-            raw = json.loads(raw)
-        except (json.JSONDecodeError, TypeError):
-            return None
-    if not raw:
-        return None
-    if isinstance(raw[0], (int, float)):
-        if len(raw) < 51:
-            return None
-        return np.asarray(raw[:51], dtype=np.float32).reshape(17, 3)
-    try:
-        arr = np.asarray(raw, dtype=np.float32)
-    except (ValueError, TypeError):
-        return None
-    if arr.ndim != 2 or arr.shape[1] != 3 or arr.shape[0] < 11:
-        return None
-    if arr.shape[0] > 17:
-        return arr[:17]
-    if arr.shape[0] < 17:
-        pad = np.zeros((17 - arr.shape[0], 3), dtype=np.float32)
-        return np.vstack([arr, pad])
-    return arr
-
-
-def _load_pose_rows(conn, task_id: str) -> List[Tuple[int, int, "np.ndarray"]]:
+    return kps_to_array(raw)
+
+
+def _load_pose_rows(conn, task_id: str, store=None) -> List[Tuple[int, int, "np.ndarray"]]:
     """Load all (frame_idx, player_id, keypoints) rows for a task, streamed
     server-side + compact numpy storage so peak memory fits Render's 512MB
     main API (OOM'd on the bulk-loaded nested-list form for long matches).
@@ -268,6 +245,9 @@ def _load_pose_rows(conn, task_id: str) -> List[Tuple[int, int, "np.ndarray"]]:
     Pose-only — we don't need ball/court coordinates here, just the wrist
     keypoint trajectory. Returns tuples (frame_idx, player_id, kps_array)
     where kps_array is a float32 (17, 3) ndarray.
+
+    With a TaskFrameStore the main + ROI rows come from its loaded columns
+    (same rows, same order); the legacy int-FK fallback still queries.
     """
     def _stream_into(stmt, params, out):
         """Stream rows server-side (yield_per batches release cursor buffer)
@@ -282,21 +262,28 @@ def _load_pose_rows(conn, task_id: str) -> List[Tuple[int, int, "np.ndarray"]]:
             out.append((int(row[0]), int(row[1]), kp))
 
     out: List[Tuple[int, int, "np.ndarray"]] = []
-    _stream_into(sql_text("""
-        SELECT frame_idx, player_id, keypoints
-        FROM ml_analysis.player_detections
-        WHERE job_id::text = :tid AND keypoints IS NOT NULL
-        ORDER BY player_id, frame_idx
-    """), {"tid": task_id}, out)
+    if store is not None:
+        _pt = store.players
+        _idx = store.select(_pt, has_keypoints=True)
+        # store rows are frame-ordered; stable sort -> ORDER BY player_id, frame_idx
+        _idx = _idx[np.argsort(_pt["player_id"][_idx], kind="stable")]
+        out = store.rows(_pt, _idx, ("frame_idx", "player_id", "keypoints"))
+    else:
+        _stream_into(sql_text(f"""
+            SELECT frame_idx, player_id, {kp_sql()} AS keypoints
+            FROM ml_analysis.player_detections
+            WHERE job_id::text = :tid AND {kp_present_sql()}
+            ORDER BY player_id, frame_idx
+        """), {"tid": task_id}, out)
 
     # Fallback for the legacy schema where job_id is an int FK
     if not out:
-        _stream_into(sql_text("""
-            SELECT pd.frame_idx, pd.player_id, pd.keypoints
+        _stream_into(sql_text(f"""
+            SELECT pd.frame_idx, pd.player_id, {kp_sql("pd")} AS keypoints
             FROM ml_analysis.player_detections pd
             JOIN ml_analysis.video_analysis_jobs vaj
               ON pd.job_id = vaj.id::text
-            WHERE vaj.task_id::text = :tid AND pd.keypoints IS NOT NULL
+            WHERE vaj.task_id::text = :tid AND {kp_present_sql("pd")}
             ORDER BY pd.player_id, pd.frame_idx
         """), {"tid": task_id}, out)
 
@@ -316,19 +303,27 @@ def _load_pose_rows(conn, task_id: str) -> List[Tuple[int, int, "np.ndarray"]]:
     # global-max attribution — that needs size-normalised velocity, tracked as
     # follow-on. Harmless to live output: stroke_events feed only the gated-off
     # stroke-driven silver path (T5_STROKE_DRIVEN_SILVER).
-    roi_present = conn.execute(sql_text("""
-        SELECT 1 FROM information_schema.tables
-        WHERE table_schema = 'ml_analysis' AND table_name = 'player_detections_roi'
-        LIMIT 1
-    """)).scalar()
+    if store is not None:
+        roi_present = store.players_roi is not None
+    else:
+        roi_present = conn.execute(sql_text("""
+            SELECT 1 FROM information_schema.tables
+            WHERE table_schema = 'ml_analysis' AND table_name = 'player_detections_roi'
+            LIMIT 1
+        """)).scalar()
     if roi_present:
         roi_out: List[Tuple[int, int, "np.ndarray"]] = []
-        _stream_into(sql_text("""
-            SELECT frame_idx, player_id, keypoints
-            FROM ml_analysis.player_detections_roi
-            WHERE job_id::text = :tid AND keypoints IS NOT NULL
-            ORDER BY frame_idx
-        """), {"tid": task_id}, roi_out)
+        if store is not None:
+            _rt = store.players_roi
+            roi_out = store.rows(_rt, store.select(_rt, has_keypoints=True),
+                                 ("frame_idx", "player_id", "keypoints"))
+        else:
+            _stream_into(sql_text(f"""
+                SELECT frame_idx, player_id, {kp_sql()} AS keypoints
+                FROM ml_analysis.player_detections_roi
+                WHERE job_id::text = :tid AND {kp_present_sql()}
+                ORDER BY frame_idx
+            """), {"tid": task_id}, roi_out)
         if roi_out:
             merged = {(pid, f): (f, pid, kp) for f, pid, kp in out}
             won = added = 0
@@ -383,10 +378,13 @@ def detect_strokes_for_task(
     normalize_by_body_scale: bool = DEFAULT_NORMALIZE_BODY_SCALE,
     near_min_swing_path_torsos: float = DEFAULT_NEAR_MIN_SWING_PATH_TORSOS,
     swing_path_window: int = DEFAULT_SWING_PATH_WINDOW,
+    store=None,
 ) -> List[StrokeEvent]:
     """Production entry point. Detects strokes from pose rows + persists
     StrokeEvent rows to ml_analysis.stroke_events.
 
+    `store`: optional TaskFrameStore shared across the post-ingest stages.
+
     Returns the events list for downstream consumption / logging.
     """
     init_stroke_events_schema(conn)
@@ -411,7 +409,7 @@ def detect_strokes_for_task(
     else:
         fps = float(FRAME_SAMPLE_FPS)
 
-    poses = _load_pose_rows(conn, task_id)
+    poses = _load_pose_rows(conn, task_id, store=store)
     if not poses:
         logger.warning("stroke_detector: no pose rows for task %s", task_id)
         return []
@@ -460,6 +458,7 @@ def detect_strokes_for_task(
         locs = assemble_hit_locations(
             conn, task_id, fps,
             [(e.predicted_hit_frame, e.player_id) for e in events],
+            store=store,
         )
         for ev, loc in zip(events, locs):
             ev.ball_hit_location_x = loc["ball_hit_location_x"]
@@ -128,34 +128,45 @@ def _find_nearest(frames: List[int], dets: List[dict], target: int,
     return best
 
 
-def _load_player_court(conn, job_id: str) -> dict:
+def _load_player_court(conn, job_id: str, store=None) -> dict:
     """near/far/any court-position indices + per-canonical-player tracks +
     pid_map. Faithfully mirrors build_silver_match_t5._build_player_buckets:
       (1) merge player_detections_roi (far pid=1 wins wholesale, add ROI-only),
       (2) pid_map: top-2 player_ids by count; everything != top[0] -> top[1],
       (3) dets_by_canonical keyed by the mapped canonical id.
-    Court coords only (the detector needs position, not pose/stroke_class)."""
-    main = conn.execute(sql_text("""
-        SELECT frame_idx, player_id, court_x, court_y
-        FROM ml_analysis.player_detections
-        WHERE job_id::text = :jid
-        ORDER BY frame_idx
-    """), {"jid": job_id}).fetchall()
-    rows = [(int(f), int(pid), cx, cy) for f, pid, cx, cy in main]
-
-    # Merge far ViTPose ROI court positions (pid=1 wins wholesale; add ROI-only),
-    # exactly like _build_player_buckets — the far player is denser/cleaner there.
-    roi_present = conn.execute(sql_text("""
-        SELECT 1 FROM information_schema.tables
-        WHERE table_schema='ml_analysis' AND table_name='player_detections_roi' LIMIT 1
-    """)).scalar()
-    if roi_present:
-        roi = conn.execute(sql_text("""
+    Court coords only (the detector needs position, not pose/stroke_class).
+    A TaskFrameStore, when given, supplies the same rows without querying."""
+    _cols = ("frame_idx", "player_id", "court_x", "court_y")
+    if store is not None:
+        rows = store.rows(store.players, store.select(store.players), _cols)
+    else:
+        main = conn.execute(sql_text("""
             SELECT frame_idx, player_id, court_x, court_y
-            FROM ml_analysis.player_detections_roi
+            FROM ml_analysis.player_detections
             WHERE job_id::text = :jid
             ORDER BY frame_idx
         """), {"jid": job_id}).fetchall()
+        rows = [(int(f), int(pid), cx, cy) for f, pid, cx, cy in main]
+
+    # Merge far ViTPose ROI court positions (pid=1 wins wholesale; add ROI-only),
+    # exactly like _build_player_buckets — the far player is denser/cleaner there.
+    if store is not None:
+        roi_present = store.players_roi is not None
+    else:
+        roi_present = conn.execute(sql_text("""
+            SELECT 1 FROM information_schema.tables
+            WHERE table_schema='ml_analysis' AND table_name='player_detections_roi' LIMIT 1
+        """)).scalar()
+    if roi_present:
+        if store is not None:
+            roi = store.rows(store.players_roi, store.select(store.players_roi), _cols)
+        else:
+            roi = conn.execute(sql_text("""
+                SELECT frame_idx, player_id, court_x, court_y
+                FROM ml_analysis.player_detections_roi
+                WHERE job_id::text = :jid
+                ORDER BY frame_idx
+            """), {"jid": job_id}).fetchall()
         if roi:
             merged = {(pid, f): (f, pid, cx, cy) for f, pid, cx, cy in rows}
             for f, pid, cx, cy in roi:
@@ -196,6 +207,7 @@ def _load_player_court(conn, job_id: str) -> dict:
 
 def assemble_hit_locations(
     conn, job_id: str, fps: float, strokes: Sequence[Tuple[int, int]],
+    store=None,
 ) -> List[dict]:
     """For each (predicted_hit_frame, attributed_player_id), resolve the hitter's
     SIDE and court position at the hit. Returns a list aligned 1:1 to `strokes`
@@ -216,7 +228,7 @@ def assemble_hit_locations(
     bounce_rows = _load_bounce_index(conn, job_id)
     bounce_frames = [b[0] for b in bounce_rows]
     sp_frames, sp_vals = _load_ball_speed_index(conn, job_id)
-    pc = _load_player_court(conn, job_id)
+    pc = _load_player_court(conn, job_id, store=store)
     near_f, near_d = pc["near"]
     far_f, far_d = pc["far"]
     any_f, any_d = pc["any"]
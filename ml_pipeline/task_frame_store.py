@@ -0,0 +1,249 @@
+"""Per-task bronze frame cache shared by the post-ingest detectors + silver.
+
+The T5 post-ingest chain (upload_app: serve -> identity -> stroke -> silver)
+used to re-read the same bronze for one job in every stage: serve_detector
+queried player_detections once PER PLAYER plus ball_detections (+ the ROI
+tables), identity re-read every player row, stroke_detector re-read all pose
+rows and again the court positions for hit assembly, and silver's
+_build_player_buckets read them all once more — and each of those re-parsed the
+JSONB keypoints into (17, 3) arrays. None of those stages writes detections, so
+the bronze is immutable for the whole run.
+
+TaskFrameStore reads each source table ONCE (streamed on its own connection,
+like _build_player_buckets does) into frame-ordered NumPy columns:
+
+    players      ml_analysis.player_detections       (all rows)
+    players_roi  ml_analysis.player_detections_roi   (None if table absent)
+    balls        ball_detections, ball_merge-deduped (one row per frame)
+    balls_roi    ml_analysis.ball_detections_roi     (None if table absent)
+
+Player tables carry every SQL column by name (NaN = NULL for floats) plus a
+(N, 17, 3) float32 `keypoints` block, `kp_present` (keypoints_f16 or the legacy
+JSONB non-NULL) and `has_keypoints` (parsed by keypoint_codec.kps_to_array).
+Ball `is_bounce` is int8 with -1 = NULL.
+
+Consumers do NOT share merged rows: each loader takes `store=` and rebuilds
+exactly the rows its SQL used to return (rows(), with NULLs back to None and
+keypoints copied out of the block), then runs its own ROI merge unchanged —
+the far-pid-wins rule and ball_merge's per-frame source pick stay where they
+are, so output is identical with and without a store. Rows handed out are
+fresh objects: serve_detector re-flags is_bounce in place. Player rows are
+ordered (frame_idx, player_id, stroke_class/source) — a refinement of every
+loader's ORDER BY, which left those ties to Postgres.
+
+Rollback: TASK_FRAME_STORE=0 makes open() return None and every loader falls
+back to its own queries.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import text as sql_text
+
+from ml_pipeline.ball_merge import merged_ball_subquery
+from ml_pipeline.keypoint_codec import kp_sql, kps_to_array
+
+logger = logging.getLogger(__name__)
+
+_PLAYER_FLOAT_COLS = ("court_x", "court_y", "bbox_x1", "bbox_y1", "bbox_x2",
+                      "bbox_y2", "center_x", "center_y")
+_BALL_FLOAT_COLS = ("x", "y", "court_x", "court_y", "speed_kmh")
+
+Table = Dict[str, np.ndarray]
+
+
+def _nullable_float(v) -> float:
+    return np.nan if v is None else float(v)
+
+
+def _nullable_bool(v) -> int:
+    return -1 if v is None else int(bool(v))
+
+
+def _table_exists(conn, name: str) -> bool:
+    return bool(conn.execute(sql_text("""
+        SELECT 1 FROM information_schema.tables
+        WHERE table_schema = 'ml_analysis' AND table_name = :t
+        LIMIT 1
+    """), {"t": name}).scalar())
+
+
+class TaskFrameStore:
+    """Lazily-loaded, read-only bronze columns for one job."""
+
+    def __init__(self, engine, task_id: str):
+        self.engine = engine
+        self.task_id = str(task_id)
+        self._tables: Dict[str, Optional[Table]] = {}
+
+    @classmethod
+    def open(cls, engine, task_id: str) -> Optional["TaskFrameStore"]:
+        """A store for task_id, or None when disabled (TASK_FRAME_STORE=0)."""
+        if os.environ.get("TASK_FRAME_STORE", "1") == "0":
+            return None
+        return cls(engine, task_id)
+
+    # -- tables --------------------------------------------------------------
+
+    @property
+    def players(self) -> Table:
+        return self._get("players")
+
+    @property
+    def players_roi(self) -> Optional[Table]:
+        return self._get("players_roi")
+
+    @property
+    def balls(self) -> Table:
+        return self._get("balls")
+
+    @property
+    def balls_roi(self) -> Optional[Table]:
+        return self._get("balls_roi")
+
+    def _get(self, name: str) -> Optional[Table]:
+        if name not in self._tables:
+            t0 = time.time()
+            with self.engine.connect() as conn:
+                table = getattr(self, "_load_" + name)(conn)
+            self._tables[name] = table
+            logger.info(
+                "task_frame_store: %s loaded %s rows for %s in %.0fms", name,
+                "no table" if table is None else len(table["frame_idx"]),
+                self.task_id, (time.time() - t0) * 1000,
+            )
+        return self._tables[name]
+
+    def _stream(self, conn, sql: str):
+        sconn = conn.execution_options(stream_results=True, yield_per=5000)
+        return sconn.execute(sql_text(sql), {"tid": self.task_id}).mappings()
+
+    def _load_player_table(self, conn, table: str, extra_col: str) -> Table:
+        cols: Dict[str, list] = {c: [] for c in
+                                 ("frame_idx", "player_id") + _PLAYER_FLOAT_COLS}
+        extra: list = []
+        kp_present: list = []
+        kp_rows: list = []
+        kp_arrays: list = []
+        for i, r in enumerate(self._stream(conn, f"""
+            SELECT frame_idx, player_id, {", ".join(_PLAYER_FLOAT_COLS)},
+                   {kp_sql()} AS keypoints, {extra_col}
+            FROM ml_analysis.{table}
+            WHERE job_id = :tid
+            ORDER BY frame_idx, player_id, {extra_col}
+        """)):
+            cols["frame_idx"].append(int(r["frame_idx"]))
+            cols["player_id"].append(int(r["player_id"]))
+            for c in _PLAYER_FLOAT_COLS:
+                cols[c].append(_nullable_float(r[c]))
+            extra.append(r[extra_col])
+            raw = r["keypoints"]
+            kp_present.append(raw is not None)
+            kp = kps_to_array(raw)
+            if kp is not None:
+                kp_rows.append(i)
+                kp_arrays.append(kp)
+        n = len(cols["frame_idx"])
+        out: Table = {
+            "frame_idx": np.asarray(cols["frame_idx"], dtype=np.int64),
+            "player_id": np.asarray(cols["player_id"], dtype=np.int64),
+        }
+        for c in _PLAYER_FLOAT_COLS:
+            out[c] = np.asarray(cols[c], dtype=np.float64)
+        ex = np.empty(n, dtype=object)
+        ex[:] = extra
+        out[extra_col] = ex
+        out["kp_present"] = np.asarray(kp_present, dtype=bool)
+        out["has_keypoints"] = np.zeros(n, dtype=bool)
+        out["keypoints"] = np.zeros((n, 17, 3), dtype=np.float32)
+        if kp_rows:
+            out["has_keypoints"][kp_rows] = True
+            out["keypoints"][kp_rows] = np.stack(kp_arrays)
+        return out
+
+    def _load_players(self, conn) -> Table:
+        return self._load_player_table(conn, "player_detections", "stroke_class")
+
+    def _load_players_roi(self, conn) -> Optional[Table]:
+        if not _table_exists(conn, "player_detections_roi"):
+            return None
+        return self._load_player_table(conn, "player_detections_roi", "source")
+
+    def _load_ball_table(self, conn, sql: str, cols: Sequence[str]) -> Table:
+        lists: Dict[str, list] = {c: [] for c in cols}
+        for r in self._stream(conn, sql):
+            lists["frame_idx"].append(int(r["frame_idx"]))
+            lists["is_bounce"].append(_nullable_bool(r["is_bounce"]))
+            for c in cols:
+                if c in _BALL_FLOAT_COLS:
+                    lists[c].append(_nullable_float(r[c]))
+        out: Table = {
+            "frame_idx": np.asarray(lists["frame_idx"], dtype=np.int64),
+            "is_bounce": np.asarray(lists["is_bounce"], dtype=np.int8),
+        }
+        for c in cols:
+            if c in _BALL_FLOAT_COLS:
+                out[c] = np.asarray(lists[c], dtype=np.float64)
+        return out
+
+    def _load_balls(self, conn) -> Table:
+        cols = ("frame_idx", "x", "y", "court_x", "court_y", "is_bounce", "speed_kmh")
+        return self._load_ball_table(conn, merged_ball_subquery(", ".join(cols)), cols)
+
+    def _load_balls_roi(self, conn) -> Optional[Table]:
+        if not _table_exists(conn, "ball_detections_roi"):
+            return None
+        cols = ("frame_idx", "x", "y", "is_bounce", "court_x", "court_y")
+        try:
+            return self._load_ball_table(conn, f"""
+                SELECT {", ".join(cols)}
+                FROM ml_analysis.ball_detections_roi
+                WHERE job_id = :tid
+                ORDER BY frame_idx
+            """, cols)
+        except Exception as exc:
+            logger.warning("task_frame_store: ball_detections_roi read failed (%s)", exc)
+            return None
+
+    # -- row views -----------------------------------------------------------
+
+    @staticmethod
+    def select(table: Table, *, player_id: Optional[int] = None,
+               kp_present: bool = False, has_keypoints: bool = False) -> np.ndarray:
+        """Frame-ordered row indices matching the filters."""
+        mask = np.ones(len(table["frame_idx"]), dtype=bool)
+        if player_id is not None:
+            mask &= table["player_id"] == player_id
+        if kp_present:
+            mask &= table["kp_present"]
+        if has_keypoints:
+            mask &= table["has_keypoints"]
+        return np.flatnonzero(mask)
+
+    @staticmethod
+    def column(table: Table, name: str, idx: np.ndarray) -> List[Any]:
+        """Python values for one column at idx — NaN / -1 back to None and
+        keypoints as fresh (17, 3) arrays (None where unparsed)."""
+        if name == "keypoints":
+            block = table["keypoints"][idx]     # fancy index -> owned copy
+            has = table["has_keypoints"][idx].tolist()
+            return [block[j] if h else None for j, h in enumerate(has)]
+        col = table[name][idx]
+        if col.dtype == np.float64:
+            return [None if v != v else v for v in col.tolist()]
+        if name == "is_bounce":
+            return [None if v < 0 else bool(v) for v in col.tolist()]
+        return col.tolist()
+
+    def rows(self, table: Table, idx: np.ndarray,
+             names: Sequence[str]) -> List[tuple]:
+        """Tuples of the named columns at idx, in idx order."""
+        return list(zip(*(self.column(table, n, idx) for n in names)))
+
+    def dicts(self, table: Table, idx: np.ndarray,
+              names: Sequence[str]) -> List[Dict[str, Any]]:
+        return [dict(zip(names, r)) for r in self.rows(table, idx, names)]
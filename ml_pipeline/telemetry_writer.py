@@ -0,0 +1,211 @@
+"""Coalescing background writer for Batch job progress + stage telemetry.
+
+_run_batch used to call MLDBWriter.update_job_progress — a synchronous
+UPDATE on its own transaction — for every _report_progress call, on the
+pipeline thread. A slow or reconnecting Postgres stalled the frame loop for
+the duration, and the per-stage timing breakdown (_stage_seconds,
+player_tracker._sub_seconds) only ever reached the log.
+
+TelemetryWriter keeps the LATEST progress (stage, pct) and the latest timing
+snapshot in memory; the caller only swaps them in under a lock. A daemon
+thread writes whatever is pending every TELEMETRY_FLUSH_SEC seconds as ONE
+transaction:
+
+    UPDATE ml_analysis.video_analysis_jobs   (same SET as update_job_progress)
+    INSERT ... ON CONFLICT DO UPDATE ml_analysis.job_stage_timings  (one row
+                                             per stage, cumulative seconds)
+
+Intermediate progress values between flushes are dropped — the dashboard
+only ever shows the latest. Background write failures are logged and the
+payload is retried on the next tick (unless something newer replaced it).
+
+Terminal state is synchronous: progress("complete", ...) flushes on the
+caller's thread and raises on failure, exactly like the old direct UPDATE.
+On failure paths call close() BEFORE MLDBWriter.mark_failed, so no queued
+'processing' write can land after the 'failed' status.
+
+TELEMETRY_FLUSH_SEC=0 restores the legacy behaviour: every progress call is
+written synchronously and timing snapshots are ignored.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text as sql_text
+
+from ml_pipeline.config import TELEMETRY_FLUSH_SEC
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STAGES = ("complete",)
+
+_PROGRESS_SQL = """
+    UPDATE ml_analysis.video_analysis_jobs
+    SET current_stage = :stage,
+        progress_pct = :pct,
+        status = CASE WHEN :stage = 'complete' THEN 'complete' ELSE 'processing' END,
+        updated_at = now()
+    WHERE job_id = :job_id
+"""
+
+_TIMINGS_SQL = """
+    INSERT INTO ml_analysis.job_stage_timings
+        (job_id, stage, kind, seconds, frames, ms_per_frame, is_final, detail, updated_at)
+    VALUES
+        (:job_id, :stage, :kind, :seconds, :frames, :ms_per_frame, :is_final, :detail, now())
+    ON CONFLICT (job_id, stage) DO UPDATE SET
+        kind = EXCLUDED.kind,
+        seconds = EXCLUDED.seconds,
+        frames = EXCLUDED.frames,
+        ms_per_frame = EXCLUDED.ms_per_frame,
+        is_final = EXCLUDED.is_final,
+        detail = EXCLUDED.detail,
+        updated_at = now()
+"""
+
+
+def snapshot_rows(job_id: str, snapshot: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """job_stage_timings rows for one pipeline timing snapshot.
+
+    snapshot = {"frames": int, "final": bool,
+                "wall": {stage: secs}, "overlap": {stage: secs},
+                "player_sub": {name: secs, "sahi_ran": n, "sahi_skipped": n},
+                "loop": {"elapsed_sec": s, ...diagnostics}}
+    """
+    frames = int(snapshot.get("frames") or 0)
+    final = bool(snapshot.get("final"))
+
+    def row(stage, kind, secs, detail=None):
+        secs = float(secs)
+        return {
+            "job_id": job_id, "stage": stage, "kind": kind, "seconds": secs,
+            "frames": frames,
+            "ms_per_frame": secs * 1000 / frames if frames > 0 else None,
+            "is_final": final,
+            "detail": json.dumps(detail) if detail else None,
+        }
+
+    rows = []
+    for kind in ("wall", "overlap"):
+        for stage, secs in (snapshot.get(kind) or {}).items():
+            rows.append(row(stage, kind, secs))
+    sub = dict(snapshot.get("player_sub") or {})
+    counts = {k: int(sub.pop(k)) for k in ("sahi_ran", "sahi_skipped") if k in sub}
+    for name, secs in sub.items():
+        rows.append(row(f"player_sub.{name}", "player_sub", secs,
+                        counts if name == "sahi" else None))
+    loop = dict(snapshot.get("loop") or {})
+    if loop:
+        rows.append(row("frame_loop", "loop", loop.pop("elapsed_sec", 0.0), loop))
+    return rows
+
+
+class TelemetryWriter:
+    """Latest-value-wins progress + timing sink for one Batch job."""
+
+    def __init__(self, engine, job_id: str, flush_sec: Optional[float] = None):
+        self.engine = engine
+        self.job_id = str(job_id)
+        self.flush_sec = TELEMETRY_FLUSH_SEC if flush_sec is None else max(0.0, float(flush_sec))
+        self._lock = threading.Lock()         # guards the pending state
+        self._write_lock = threading.Lock()   # one flush at a time
+        self._progress: Optional[tuple] = None
+        self._rows: Dict[str, Dict[str, Any]] = {}
+        self._terminal = False
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        if self.flush_sec > 0:
+            self._thread = threading.Thread(
+                target=self._run, name="telemetry-writer", daemon=True,
+            )
+            self._thread.start()
+
+    # -- producer side (never blocks on the DB unless terminal / legacy) -----
+
+    def progress(self, stage: str, pct: int) -> None:
+        with self._lock:
+            if self._terminal:
+                return
+            self._progress = (stage, int(pct))
+            terminal = stage in TERMINAL_STAGES
+            if terminal:
+                self._terminal = True
+        if terminal or self._thread is None:
+            self.flush()
+
+    def timings(self, snapshot: Dict[str, Any]) -> None:
+        """Queue a pipeline timing snapshot (see snapshot_rows)."""
+        if self._thread is None:
+            return
+        rows = snapshot_rows(self.job_id, snapshot)
+        with self._lock:
+            for r in rows:
+                self._rows[r["stage"]] = r
+
+    def batch_stage(self, name: str, seconds: float) -> None:
+        """Queue one _run_batch phase duration as stage 'batch.<name>'."""
+        if self._thread is None:
+            return
+        row = {
+            "job_id": self.job_id, "stage": f"batch.{name}", "kind": "batch",
+            "seconds": float(seconds), "frames": None, "ms_per_frame": None,
+            "is_final": True, "detail": None,
+        }
+        with self._lock:
+            self._rows[row["stage"]] = row
+
+    # -- writer side ---------------------------------------------------------
+
+    def _take(self):
+        with self._lock:
+            progress, rows = self._progress, list(self._rows.values())
+            self._progress, self._rows = None, {}
+        return progress, rows
+
+    def _requeue(self, progress, rows) -> None:
+        with self._lock:
+            if self._progress is None:
+                self._progress = progress
+            for r in rows:
+                self._rows.setdefault(r["stage"], r)
+
+    def flush(self) -> None:
+        """Write everything pending now, on the caller's thread. Raises on
+        failure (the payload is re-queued first)."""
+        with self._write_lock:
+            progress, rows = self._take()
+            if progress is None and not rows:
+                return
+            try:
+                with self.engine.begin() as conn:
+                    if progress is not None:
+                        conn.execute(sql_text(_PROGRESS_SQL), {
+                            "job_id": self.job_id, "stage": progress[0], "pct": progress[1],
+                        })
+                    if rows:
+                        conn.execute(sql_text(_TIMINGS_SQL), rows)
+            except Exception:
+                self._requeue(progress, rows)
+                raise
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_sec):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.warning(f"telemetry flush failed (will retry): {e}")
+
+    def close(self) -> None:
+        """Stop the background thread and write what is left. Non-fatal —
+        safe to call on failure paths and more than once."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        try:
+            self.flush()
+        except Exception as e:
+            logger.warning(f"telemetry final flush failed (non-fatal): {e}")
@@ -0,0 +1,318 @@
+"""Per-camera court calibration cache (COURT_CALIB_CACHE, default on).
+
+No pytest in this repo — run with:
+    python -m ml_pipeline.tests.test_court_calibration_cache
+
+Covers the three gates a cached calibration passes before CourtDetector
+locks it: the edge-map fingerprint (frame_fingerprint / hamming) must stay
+close for the same camera and move for a different one; lookup must pick the
+nearest row and honour COURT_CALIB_CACHE_MAX_HAMMING; and
+_validate_cached_calibration must drop a candidate whose keypoints don't
+match the new video. No DB and no weights — the engine and the court model
+are stand-ins.
+"""
+from __future__ import annotations
+
+import sys
+
+import cv2
+import numpy as np
+
+from ml_pipeline import court_detector
+from ml_pipeline.camera_calibration import (
+    CalibrationResult,
+    calibration_from_dict,
+    calibration_to_dict,
+)
+from ml_pipeline.config import (
+    COURT_CALIB_CACHE_MAX_HAMMING,
+    COURT_CALIB_CACHE_MAX_KP_PX,
+    COURT_CALIB_CACHE_VALIDATE_FRAMES,
+)
+from ml_pipeline.court_calibration_cache import (
+    CachedCalibration,
+    CourtCalibrationCache,
+    frame_fingerprint,
+    hamming,
+)
+from ml_pipeline.court_detector import CourtDetection, CourtDetector
+
+FRAME_H, FRAME_W = 1080, 1920
+
+
+def _court_frame(shift=(0, 0), scale=1.0, players=0, gain=1.0, seed=0) -> np.ndarray:
+    """A green court in perspective with white lines, optional 'players'."""
+    rng = np.random.default_rng(seed)
+    frame = np.empty((FRAME_H, FRAME_W, 3), np.uint8)
+    frame[:] = (60, 120, 50)
+    frame = (frame.astype(np.float32)
+             + rng.normal(0, 3, frame.shape)).clip(0, 255).astype(np.uint8)
+    cx, cy = FRAME_W / 2 + shift[0], FRAME_H / 2 + shift[1]
+
+    def p(x, y):   # x in [-1, 1] across, y in [-1, 1] far->near
+        w = (0.25 + 0.15 * (y + 1)) * FRAME_W * scale
+        return (int(cx + x * w), int(cy + y * 0.42 * FRAME_H * scale))
+
+    white = (235, 235, 235)
+    for x in (-1.0, -0.78, 0.78, 1.0):
+        cv2.line(frame, p(x, -1), p(x, 1), white, 3)
+    for y in (-1.0, -0.55, 0.0, 0.55, 1.0):
+        xe = 1.0 if abs(y) in (1.0, 0.0) else 0.78
+        cv2.line(frame, p(-xe, y), p(xe, y), white, 3)
+    cv2.line(frame, p(0, -0.55), p(0, 0.55), white, 3)
+    for _ in range(players):
+        x, y = int(rng.integers(300, FRAME_W - 300)), int(rng.integers(200, FRAME_H - 300))
+        cv2.rectangle(frame, (x, y), (x + 40, y + 110), tuple(int(v) for v in rng.integers(0, 255, 3)), -1)
+    return (frame.astype(np.float32) * gain).clip(0, 255).astype(np.uint8)
+
+
+def _flip_bits(fp: str, n: int) -> str:
+    bits = np.unpackbits(np.frombuffer(bytes.fromhex(fp), dtype=np.uint8))
+    bits[:n] ^= 1
+    return np.packbits(bits).tobytes().hex()
+
+
+def _radial_calibration() -> CalibrationResult:
+    K = np.array([[1500.0, 0, 960], [0, 1500.0, 540], [0, 0, 1]])
+    return CalibrationResult(
+        mode="radial", rms_px=0.8, K=K,
+        dist=np.array([-0.18, 0.03, 0.0, 0.0, 0.0]), new_K=K.copy(),
+        homography_undistorted=np.eye(3), rvec=np.zeros((3, 1)), tvec=np.ones((3, 1)),
+    )
+
+
+def _keypoints(dx=0.0, dy=0.0) -> np.ndarray:
+    base = np.array([[500 + 70 * (i % 4), 200 + 55 * (i // 4)] for i in range(14)], np.float32)
+    return base + np.array([dx, dy], np.float32)
+
+
+class _Result:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def mappings(self):
+        return self
+
+    def all(self):
+        return self._rows
+
+
+class _Engine:
+    """connect()/begin() context manager that serves fixed lookup rows and
+    records every statement's params."""
+
+    def __init__(self, rows=(), fail=False):
+        self.rows = list(rows)
+        self.fail = fail
+        self.executed = []
+
+    def connect(self):
+        if self.fail:
+            raise RuntimeError("db down")
+        return self
+
+    begin = connect
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, stmt, params=None):
+        self.executed.append(params)
+        return _Result(self.rows)
+
+
+def _row(id_, fp, kps=None, calib=None):
+    return {
+        "id": id_, "fingerprint": fp,
+        "calibration": calibration_to_dict(calib or _radial_calibration()),
+        "keypoints": (kps if kps is not None else _keypoints()).tolist(),
+        "homography": np.eye(3).tolist(), "confidence": 0.9,
+    }
+
+
+class _Detector(CourtDetector):
+    """CourtDetector without the keypoint CNN (only the cache gate runs)."""
+
+    def _load_model(self, weights_path):
+        return None
+
+
+class _HitCache:
+    def __init__(self):
+        self.hits = []
+
+    def record_hit(self, entry):
+        self.hits.append(entry.id)
+
+
+def _detector_with_candidate(cached_kps, quality=(0.9, 20.0, 9.0)):
+    cache = _HitCache()
+    det = _Detector(device="cpu", calibration_cache=cache)
+    det._projection_quality = lambda calibration, frame_shape: quality
+    det._cache_candidate = CachedCalibration(
+        id=7, fingerprint="00", distance=3, calibration=_radial_calibration(),
+        keypoints=cached_kps, homography=np.eye(3), confidence=0.9,
+    )
+    return det, cache
+
+
+def _cnn(kps) -> CourtDetection:
+    return CourtDetection(keypoints=kps, homography=np.eye(3), confidence=1.0,
+                          used_fallback=False)
+
+
+# ── fingerprint / hamming ───────────────────────────────────────────────────
+
+def test_fingerprint_shape_and_identity():
+    fp = frame_fingerprint(_court_frame())
+    assert len(fp) == 128 and int(fp, 16) >= 0, fp
+    assert hamming(fp, fp) == 0
+    assert hamming(fp, frame_fingerprint(_court_frame())) == 0, "not deterministic"
+    assert hamming(fp, frame_fingerprint(cv2.cvtColor(_court_frame(), cv2.COLOR_BGR2GRAY))) == 0
+    assert hamming(fp, fp[:64]) == 512, "size mismatch must be max distance"
+    assert hamming(fp, _flip_bits(fp, 37)) == 37
+    print("  fingerprint format / hamming arithmetic: OK")
+
+
+def test_same_camera_within_threshold():
+    ref = frame_fingerprint(_court_frame())
+    for kw in ({"players": 4, "seed": 1}, {"gain": 0.8, "seed": 2},
+               {"players": 2, "gain": 1.15, "seed": 3}):
+        d = hamming(ref, frame_fingerprint(_court_frame(**kw)))
+        assert d <= COURT_CALIB_CACHE_MAX_HAMMING, f"{kw}: same camera at {d} bits"
+    print(f"  same camera (players / exposure) within {COURT_CALIB_CACHE_MAX_HAMMING} bits: OK")
+
+
+def test_other_camera_beyond_threshold():
+    ref = frame_fingerprint(_court_frame())
+    for kw in ({"shift": (420, 0)}, {"shift": (0, 260), "scale": 0.7}, {"scale": 1.6}):
+        d = hamming(ref, frame_fingerprint(_court_frame(**kw)))
+        assert d > COURT_CALIB_CACHE_MAX_HAMMING, f"{kw}: other camera only {d} bits away"
+    print("  moved / zoomed camera beyond the threshold: OK")
+
+
+# ── lookup ──────────────────────────────────────────────────────────────────
+
+def test_lookup_picks_nearest():
+    fp = frame_fingerprint(_court_frame())
+    rows = [_row(1, _flip_bits(fp, 30)), _row(2, _flip_bits(fp, 4)), _row(3, _flip_bits(fp, 60))]
+    hit = CourtCalibrationCache(_Engine(rows)).lookup(fp, (FRAME_H, FRAME_W))
+    assert hit is not None and hit.id == 2 and hit.distance == 4, hit
+    assert hit.keypoints.shape == (14, 2) and hit.homography.shape == (3, 3)
+    assert hit.calibration.mode == "radial"
+    assert hit.calibration.map1 is not None and hit.calibration.map1.shape[:2] == (FRAME_H, FRAME_W)
+    print("  lookup returns the nearest row, maps rebuilt: OK")
+
+
+def test_lookup_threshold():
+    fp = frame_fingerprint(_court_frame())
+    at = CourtCalibrationCache(_Engine([_row(1, _flip_bits(fp, COURT_CALIB_CACHE_MAX_HAMMING))]))
+    hit = at.lookup(fp, (FRAME_H, FRAME_W))
+    assert hit is not None and hit.distance == COURT_CALIB_CACHE_MAX_HAMMING, hit
+    over = CourtCalibrationCache(_Engine([_row(1, _flip_bits(fp, COURT_CALIB_CACHE_MAX_HAMMING + 1))]))
+    assert over.lookup(fp, (FRAME_H, FRAME_W)) is None
+    assert CourtCalibrationCache(_Engine([])).lookup(fp, (FRAME_H, FRAME_W)) is None
+    assert CourtCalibrationCache(_Engine(fail=True)).lookup(fp, (FRAME_H, FRAME_W)) is None
+    print(f"  lookup accepts <= {COURT_CALIB_CACHE_MAX_HAMMING} bits, misses / DB errors -> None: OK")
+
+
+def test_calibration_dict_round_trip():
+    for calib in (_radial_calibration(),
+                  CalibrationResult(mode="piecewise", rms_px=3.2,
+                                    zone_homographies=[np.eye(3) * (i + 1) for i in range(4)],
+                                    net_y_px=410.0, centre_x_px=960.0)):
+        back = calibration_from_dict(calibration_to_dict(calib), (FRAME_H, FRAME_W))
+        assert back.mode == calib.mode and back.rms_px == calib.rms_px
+        for name in ("K", "dist", "new_K", "homography_undistorted", "rvec", "tvec"):
+            a, b = getattr(calib, name), getattr(back, name)
+            assert (a is None) == (b is None) and (a is None or np.array_equal(a, b)), name
+        if calib.zone_homographies is not None:
+            assert all(np.array_equal(a, b) for a, b in
+                       zip(calib.zone_homographies, back.zone_homographies))
+        assert back.net_y_px == calib.net_y_px and back.centre_x_px == calib.centre_x_px
+    print("  calibration_to_dict / calibration_from_dict round trip: OK")
+
+
+# ── _validate_cached_calibration ────────────────────────────────────────────
+
+def test_matching_candidate_locks():
+    det, cache = _detector_with_candidate(_keypoints())
+    frame = np.zeros((FRAME_H, FRAME_W, 3), np.uint8)
+    locked = None
+    for i in range(COURT_CALIB_CACHE_VALIDATE_FRAMES):
+        assert locked is None, f"locked early at run {i}"
+        locked = det._validate_cached_calibration(_cnn(_keypoints(1.5, -1.0)), frame, i * 30)
+    assert locked is not None and det.locked_from_cache
+    assert det._locked_detection is locked and np.array_equal(locked.keypoints, _keypoints())
+    assert cache.hits == [7], cache.hits
+    print(f"  candidate confirmed by {COURT_CALIB_CACHE_VALIDATE_FRAMES} CNN runs locks: OK")
+
+
+def test_wrong_court_rejected():
+    frame = np.zeros((FRAME_H, FRAME_W, 3), np.uint8)
+    off = COURT_CALIB_CACHE_MAX_KP_PX * 3
+    # Cached court sits elsewhere in the frame than the one the CNN sees.
+    det, cache = _detector_with_candidate(_keypoints(off, off))
+    assert det._validate_cached_calibration(_cnn(_keypoints()), frame, 0) is None
+    assert det._cache_candidate is None and det._locked_detection is None
+    assert not det.locked_from_cache and cache.hits == []
+
+    # Agreeing at first, then a run that disagrees, still drops it.
+    det, cache = _detector_with_candidate(_keypoints())
+    if COURT_CALIB_CACHE_VALIDATE_FRAMES > 1:
+        assert det._validate_cached_calibration(_cnn(_keypoints()), frame, 0) is None
+        assert det._cache_candidate is not None
+    assert det._validate_cached_calibration(_cnn(_keypoints(off, 0)), frame, 30) is None
+    assert det._cache_candidate is None and det._locked_detection is None
+
+    # Fewer than 8 shared keypoints is never enough evidence.
+    sparse = _keypoints()
+    sparse[7:] = -1
+    det, cache = _detector_with_candidate(_keypoints())
+    assert det._validate_cached_calibration(_cnn(sparse), frame, 0) is None
+    assert det._cache_candidate is None and det._locked_detection is None
+    print("  wrong court / late disagreement / sparse keypoints rejected: OK")
+
+
+def test_projection_floor_rejects():
+    frame = np.zeros((FRAME_H, FRAME_W, 3), np.uint8)
+    det, cache = _detector_with_candidate(_keypoints(), quality=(0.8, 0.2, 9.0))   # collapsed y
+    for i in range(COURT_CALIB_CACHE_VALIDATE_FRAMES):
+        assert det._validate_cached_calibration(_cnn(_keypoints()), frame, i) is None
+    assert det._cache_candidate is None and det._locked_detection is None and cache.hits == []
+    print("  candidate failing the projection floors is not locked: OK")
+
+
+def main() -> int:
+    tests = [
+        test_fingerprint_shape_and_identity,
+        test_same_camera_within_threshold,
+        test_other_camera_beyond_threshold,
+        test_lookup_picks_nearest,
+        test_lookup_threshold,
+        test_calibration_dict_round_trip,
+        test_matching_candidate_locks,
+        test_wrong_court_rejected,
+        test_projection_floor_rejects,
+    ]
+    print(f"Running {len(tests)} court calibration cache tests:")
+    failures = 0
+    for t in tests:
+        try:
+            t()
+        except AssertionError as e:
+            print(f"  {t.__name__}: FAIL — {e}")
+            failures += 1
+    print()
+    if failures:
+        print(f"{failures} test(s) failed")
+        return 1
+    print("All tests passed.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
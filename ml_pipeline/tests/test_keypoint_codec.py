@@ -0,0 +1,186 @@
+"""keypoint_codec: float16 blob round trip, legacy JSONB fallback, SQL decoder.
+
+No pytest in this repo — run with:
+    python -m ml_pipeline.tests.test_keypoint_codec
+
+kps_to_array() reads whatever kp_sql() returns: the 102-byte keypoints_f16 blob
+or, for rows ingested before the column existed, the JSONB rendered as UTF-8
+text. Length is the only discriminator, so every legacy JSONB text must be
+longer than 102 bytes. test_kp_f16_to_jsonb checks the SQL decoder behind the
+*_kp compatibility views against decode_f16 and needs DATABASE_URL (it runs in
+a transaction that is rolled back); without it that test is skipped.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sys
+
+import numpy as np
+
+from ml_pipeline.keypoint_codec import (
+    KP_F16_BYTES,
+    KP_F16_TO_JSONB_SQL,
+    NUM_KP,
+    decode_f16,
+    encode_f16,
+    kps_to_array,
+)
+
+
+def _pose(seed: int, scale: float = 1920.0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    kps = np.empty((NUM_KP, 3), np.float32)
+    kps[:, 0] = rng.uniform(0, scale, NUM_KP)
+    kps[:, 1] = rng.uniform(0, scale * 9 / 16, NUM_KP)
+    kps[:, 2] = rng.uniform(0, 1, NUM_KP)
+    return kps
+
+
+def _jsonb_text(obj) -> bytes:
+    """What kp_sql() yields for a legacy row: convert_to(keypoints::text).
+    jsonb::text separates array items with ", " — json.dumps' default."""
+    return json.dumps(obj).encode("utf-8")
+
+
+def test_round_trip():
+    for seed in range(50):
+        kps = _pose(seed)
+        nested = kps.tolist()
+        flat = kps.reshape(-1).tolist()
+        blobs = {encode_f16(kps), encode_f16(nested), encode_f16(flat)}
+        assert len(blobs) == 1, f"seed {seed}: ndarray / nested / flat-51 encode differently"
+        blob = blobs.pop()
+        assert len(blob) == KP_F16_BYTES, len(blob)
+        got = decode_f16(blob)
+        assert got.shape == (NUM_KP, 3) and got.dtype == np.float32
+        assert kps_to_array(blob) is not None and np.array_equal(kps_to_array(blob), got)
+        assert np.array_equal(kps_to_array(memoryview(blob)), got)
+        err = np.abs(got - kps)
+        below = kps[:, :2] < 1024
+        assert err[:, :2][below].max(initial=0) <= 0.25, f"seed {seed}: {err[:, :2].max()}"
+        assert err[:, :2].max() <= 0.5, f"seed {seed}: {err[:, :2].max()}"
+        assert err[:, 2].max() <= 2.5e-4, f"seed {seed}: conf err {err[:, 2].max()}"
+        assert encode_f16(got) == blob, f"seed {seed}: decode -> encode is not stable"
+    got[0, 0] = -1.0                          # decoded arrays are owned and writable
+    print("  ndarray / nested / flat-51 round trip: OK")
+
+
+def test_shapes():
+    kps = _pose(1)
+    assert encode_f16(None) is None and encode_f16([]) is None
+    assert encode_f16(kps.reshape(-1)[:50].tolist()) is None, "flat < 51 accepted"
+    assert encode_f16(kps[:10].tolist()) is None, "10 nested keypoints accepted"
+    # 11..16 nested keypoints are zero-padded, > 17 truncated, flat > 51 truncated.
+    padded = decode_f16(encode_f16(kps[:11].tolist()))
+    assert np.array_equal(padded[11:], np.zeros((6, 3), np.float32))
+    assert np.array_equal(padded[:11], kps[:11].astype(np.float16).astype(np.float32))
+    extra = np.vstack([kps, kps[:3]])
+    assert encode_f16(extra.tolist()) == encode_f16(kps)
+    assert encode_f16(extra.reshape(-1).tolist()) == encode_f16(kps)
+    assert decode_f16(encode_f16(kps)[:-2]) is None and decode_f16(None) is None
+    assert kps_to_array([[1, 2]] * 17) is None and kps_to_array("not json") is None
+    print("  short / padded / truncated inputs: OK")
+
+
+def test_legacy_jsonb_never_f16():
+    # Shortest legacy forms: one-character numbers everywhere. Nested needs at
+    # least 11 keypoints to parse; flat needs 51 values.
+    ones11 = np.zeros((NUM_KP, 3), np.float32)
+    ones11[:11] = 1
+    shortest = [   # (name, legacy value, expected (17, 3) array)
+        ("nested x11", [[0, 0, 0]] * 11, np.zeros((NUM_KP, 3))),
+        ("nested x11 ones", [[1, 1, 1]] * 11, ones11),
+        ("nested x17", [[0, 0, 0]] * NUM_KP, np.zeros((NUM_KP, 3))),
+        ("flat 51", [0] * (NUM_KP * 3), np.zeros((NUM_KP, 3))),
+    ]
+    for name, obj, want in shortest:
+        text = _jsonb_text(obj)
+        assert len(text) > KP_F16_BYTES, f"{name}: {len(text)} bytes could pass as f16"
+        got = kps_to_array(text)
+        assert got is not None and np.array_equal(got, want), f"{name}: {got}"
+    for seed in range(20):
+        kps = _pose(seed).astype(np.float64)
+        for obj in (kps.tolist(), kps.reshape(-1).tolist(), np.round(kps, 1).tolist()):
+            text = _jsonb_text(obj)
+            assert len(text) > KP_F16_BYTES
+            got = kps_to_array(text)
+            assert np.array_equal(got, np.asarray(obj, np.float32).reshape(NUM_KP, 3)), seed
+    print(f"  legacy JSONB text (min {len(_jsonb_text([[0, 0, 0]] * 11))} bytes) "
+          f"never read as f16: OK")
+
+
+def _engine():
+    url = os.getenv("DATABASE_URL") or os.getenv("POSTGRES_URL") or os.getenv("DB_URL")
+    if not url:
+        return None
+    from sqlalchemy import create_engine
+    if url.startswith("postgres://"):
+        url = url.replace("postgres://", "postgresql://", 1)
+    if url.startswith("postgresql://") and "+psycopg" not in url:
+        url = url.replace("postgresql://", "postgresql+psycopg://", 1)
+    return create_engine(url, future=True)
+
+
+def test_kp_f16_to_jsonb():
+    engine = _engine()
+    if engine is None:
+        print("  kp_f16_to_jsonb vs decode_f16: skipped (no DATABASE_URL)")
+        return
+    from sqlalchemy import text as sql_text
+
+    special = np.zeros((NUM_KP, 3), np.float32)
+    special[:, 0] = [0.0, -0.0, 1e-7, 6e-8, 6.1e-5, -6.1e-5, 0.5, -1.0, 1023.75, 1024.5,
+                     2047.0, 4095.0, 65504.0, -65504.0, 1 / 3, 0.1, 3.14159]
+    special[:, 1] = np.linspace(-5, 5000, NUM_KP)
+    special[:, 2] = np.linspace(0, 1, NUM_KP)
+    cases = [special] + [_pose(seed) for seed in range(30)]
+    nan = _pose(99)
+    nan[4, 1] = np.nan
+    try:
+        with engine.connect() as conn:
+            trans = conn.begin()
+            try:
+                conn.execute(sql_text("CREATE SCHEMA IF NOT EXISTS ml_analysis"))
+                conn.execute(sql_text(KP_F16_TO_JSONB_SQL))
+                for i, kps in enumerate(cases):
+                    blob = encode_f16(kps)
+                    got = conn.execute(sql_text("SELECT ml_analysis.kp_f16_to_jsonb(:b)"),
+                                       {"b": blob}).scalar()
+                    want = decode_f16(blob).astype(np.float64).tolist()
+                    assert got == want, f"case {i}: SQL {got} != decode_f16 {want}"
+                got = conn.execute(sql_text("SELECT ml_analysis.kp_f16_to_jsonb(:b)"),
+                                   {"b": encode_f16(nan)}).scalar()
+                assert got[4][1] is None and got[4][0] == float(decode_f16(encode_f16(nan))[4, 0])
+            finally:
+                trans.rollback()
+    finally:
+        engine.dispose()
+    print(f"  kp_f16_to_jsonb vs decode_f16: {len(cases)} poses + NaN OK")
+
+
+def main() -> int:
+    tests = [
+        test_round_trip,
+        test_shapes,
+        test_legacy_jsonb_never_f16,
+        test_kp_f16_to_jsonb,
+    ]
+    print(f"Running {len(tests)} keypoint codec tests:")
+    failures = 0
+    for t in tests:
+        try:
+            t()
+        except AssertionError as e:
+            print(f"  {t.__name__}: FAIL — {e}")
+            failures += 1
+    print()
+    if failures:
+        print(f"{failures} test(s) failed")
+        return 1
+    print("All tests passed.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+"""Batched vs per-frame TrackNet heatmap postprocess.
+
+No pytest in this repo — run with:
+    python -m ml_pipeline.tests.test_tracknet_postprocess
+
+TRACKNET_BATCH_POSTPROCESS (default on) swaps BallTracker._postprocess_heatmap
+for _postprocess_heatmaps, which runs Hough + CC on an even-aligned crop of
+the mask and rebuilds the CC centroid from pixel sums. Every fixture below is
+fed through both paths: the (x, y) of every frame and every _diag counter
+must be identical. No weights needed — the model is never called.
+"""
+from __future__ import annotations
+
+import sys
+
+import cv2
+import numpy as np
+
+from ml_pipeline import ball_tracker
+from ml_pipeline.ball_tracker import BallTracker
+from ml_pipeline.config import (
+    TRACKNET_HEATMAP_THRESHOLD,
+    TRACKNET_INPUT_HEIGHT as H,
+    TRACKNET_INPUT_WIDTH as W,
+)
+
+TIERS = ("tier1_hough", "tier2_cc", "tier2_cc_rejected_size", "tier3_argmax", "none_returned")
+
+
+def _blank() -> np.ndarray:
+    return np.zeros((H, W), np.uint8)
+
+
+def _run_both(maps):
+    """(per-frame results, per-frame _diag, batched results, batched _diag)."""
+    ball_tracker.TRACKNET_BATCH_POSTPROCESS = True
+    single = BallTracker(device="cpu", model=object())
+    want = [single._postprocess_heatmap(m.astype(np.int64)) for m in maps]
+    batched = BallTracker(device="cpu", model=object())
+    got = batched._postprocess_heatmaps(np.stack(maps))
+    return want, single._diag, got, batched._diag
+
+
+def _check(name, maps):
+    want, want_diag, got, got_diag = _run_both(maps)
+    for i, (w, g) in enumerate(zip(want, got)):
+        assert w == g, f"{name}: frame {i} per-frame {w} != batched {g}"
+    assert want_diag == got_diag, f"{name}: _diag {want_diag} != {got_diag}"
+    print(f"  {name}: {len(maps)} frames OK "
+          f"({', '.join(f'{k}={want_diag[k]}' for k in TIERS if want_diag[k])})")
+    return want_diag
+
+
+def test_empty_mask():
+    below = _blank()
+    cv2.circle(below, (200, 120), 5, TRACKNET_HEATMAP_THRESHOLD - 1, -1)
+    at = _blank()
+    cv2.circle(at, (420, 240), 4, TRACKNET_HEATMAP_THRESHOLD, -1)   # > threshold only
+    d = _check("empty / sub-threshold masks", [_blank(), below, at])
+    assert d["none_returned"] == 3 and d["heatmap_empty"] == 2, d
+
+
+def test_edge_blobs():
+    maps = []
+    for cx, cy in ((0, 0), (W - 1, 0), (0, H - 1), (W - 1, H - 1), (W // 2, 0),
+                   (0, H // 2), (W - 1, H // 2), (W // 2, H - 1), (1, 1), (W - 2, H - 2)):
+        for r in (1, 3, 6):
+            m = _blank()
+            cv2.circle(m, (cx, cy), r, 255, -1)
+            maps.append(m)
+        sq = _blank()
+        sq[max(0, cy - 1):cy + 1, max(0, cx - 1):cx + 1] = 200
+        maps.append(sq)
+    _check("blobs at the map edges", maps)
+
+
+def test_several_circles():
+    rng = np.random.default_rng(7)
+    maps = []
+    for k in range(40):
+        m = _blank()
+        for _ in range(2 + k % 4):
+            cv2.circle(m, (int(rng.integers(0, W)), int(rng.integers(0, H))),
+                       int(rng.integers(1, 9)), int(rng.integers(128, 256)), -1)
+        maps.append(m)
+    _check("several circles per map", maps)
+
+
+def test_equal_area_components():
+    maps = []
+    for dx in range(4):
+        for dy in range(4):
+            m = _blank()
+            # Three 2x2 blobs (area 4) — the CC winner is whichever label
+            # comes first, which is what the even-aligned crop must preserve.
+            for bx, by in ((31 + dx, 40 + dy), (300 + dy, 41 + dx), (151 + dx, 250 + dy)):
+                m[by:by + 2, bx:bx + 2] = 255
+            maps.append(m)
+            m = _blank()
+            m[dy:dy + 2, 100 + dx:102 + dx] = 255                    # touches row 0
+            m[H - 2 - dy:H - dy, 500 + dx:502 + dx] = 255
+            maps.append(m)
+    d = _check("equal-area components", maps)
+    assert d["tier2_cc"] > 0, d
+
+
+def test_tier3_only():
+    # A mask that is above the threshold everywhere has no edge for Hough and
+    # one component far larger than 200 px, so only the argmax tier fires.
+    maps = []
+    for cy, cx in ((0, 0), (H - 1, W - 1), (17, 333), (200, 1), (359, 320)):
+        m = np.full((H, W), 200, np.uint8)
+        m[cy, cx] = 250
+        maps.append(m)
+    d = _check("tier 3 only", maps)
+    assert d["tier3_argmax"] == len(maps) and d["tier1_hough"] == 0 and d["tier2_cc"] == 0, d
+
+
+def test_random_maps():
+    rng = np.random.default_rng(2026)
+    maps = []
+    for _ in range(300):
+        m = _blank()
+        kind = int(rng.integers(0, 5))
+        if kind == 1:
+            cv2.circle(m, (int(rng.integers(-5, W + 5)), int(rng.integers(-5, H + 5))),
+                       int(rng.integers(1, 12)), int(rng.integers(100, 256)), -1)
+        elif kind == 2:
+            ys, xs = rng.integers(0, H, 6), rng.integers(0, W, 6)
+            m[ys, xs] = rng.integers(100, 256, 6)
+        elif kind == 3:
+            for _ in range(int(rng.integers(1, 4))):
+                x, y = int(rng.integers(0, W - 3)), int(rng.integers(0, H - 3))
+                m[y:y + int(rng.integers(1, 4)), x:x + int(rng.integers(1, 4))] = 255
+        elif kind == 4:
+            m = rng.integers(0, 140, (H, W)).astype(np.uint8)
+        maps.append(m)
+    _check("random maps", maps)
+
+
+def test_flat_input():
+    m = _blank()
+    cv2.circle(m, (77, 301), 4, 255, -1)
+    ball_tracker.TRACKNET_BATCH_POSTPROCESS = True
+    t = BallTracker(device="cpu", model=object())
+    flat = t._postprocess_heatmaps(m.reshape(1, H * W))
+    full = t._postprocess_heatmaps(m[None])
+    assert flat == full, f"(B, H*W) {flat} != (B, H, W) {full}"
+    print("  (B, H*W) input: OK")
+
+
+def main() -> int:
+    tests = [
+        test_empty_mask,
+        test_edge_blobs,
+        test_several_circles,
+        test_equal_area_components,
+        test_tier3_only,
+        test_random_maps,
+        test_flat_input,
+    ]
+    print(f"Running {len(tests)} TrackNet postprocess parity tests:")
+    failures = 0
+    for t in tests:
+        try:
+            t()
+        except AssertionError as e:
+            print(f"  {t.__name__}: FAIL — {e}")
+            failures += 1
+    print()
+    if failures:
+        print(f"{failures} test(s) failed")
+        return 1
+    print("All tests passed.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -16,6 +16,12 @@ dev box for the exact same behaviour:
     # On AWS Batch GPU (the seamless path) — submit via:
     python -m ml_pipeline.training.submit_train_job --fact swing
 
+    # DataLoader samples/sec, JPEG/in-RAM (before) vs packed memmap (after):
+    python -m ml_pipeline.training.batch_train --loader-bench tracknet \\
+        --frames-dir ./frames --labels-json ./labels.json
+    python -m ml_pipeline.training.batch_train --loader-bench swing \\
+        --dataset-dir ml_pipeline/training/datasets/swing_type_v1
+
 The five facts and their trainers (see .claude/training_environment.md):
   serve   coordinate MLP   ml_pipeline.serve_model.train             (reads prod DB)
   hit     coordinate MLP   ml_pipeline.hit_model.train               (reads prod DB)
@@ -197,6 +203,88 @@ def _bench_swing(args, device: str) -> dict:
     return run_bench(dataset_dir=dataset_dir)
 
 
+# ---------------------------------------------------------------------------
+# DataLoader throughput bench (--loader-bench)
+# ---------------------------------------------------------------------------
+
+def _time_loader(dataset, batch_size: int, num_workers: int, max_batches: int,
+                 device: str) -> dict:
+    """Samples/sec of a DataLoader over `dataset`, including the host->device
+    copy (+ uint8 normalisation) the trainer would do. No model."""
+    import torch
+    from torch.utils.data import DataLoader
+    from ml_pipeline.training.frame_pack import to_device_normalized
+
+    loader = DataLoader(dataset, batch_size=batch_size, shuffle=True,
+                        num_workers=num_workers, pin_memory=(device == "cuda"))
+    n = batches = 0
+    t0 = time.perf_counter()
+    for batch in loader:
+        x = batch["flow"] if isinstance(batch, dict) else batch[0]
+        x = to_device_normalized(x, device)
+        n += int(x.shape[0])
+        batches += 1
+        if batches >= max_batches:
+            break
+    if device == "cuda":
+        torch.cuda.synchronize()
+    dt = time.perf_counter() - t0
+    return {"samples": n, "batches": batches, "seconds": round(dt, 3),
+            "samples_per_sec": round(n / dt, 1) if dt > 0 else None}
+
+
+def _loader_bench(args, device: str) -> dict:
+    """Before/after DataLoader throughput for the packed/memory-mapped stores.
+
+    tracknet: JPEG decode per sample (before) vs frame_pack memmap with
+              on-device normalisation (after); the one-off pack time is
+              reported separately.
+    swing:    .flows.npy loaded into RAM up front (before) vs memory-mapped
+              (after); dataset open time included.
+    """
+    batch_size = args.batch_size or 16
+    kw = {"batch_size": batch_size, "num_workers": args.num_workers,
+          "max_batches": args.bench_batches, "device": device}
+    result: dict = {"dataset": args.loader_bench, "device": device,
+                    "batch_size": batch_size, "num_workers": args.num_workers}
+
+    if args.loader_bench == "tracknet":
+        from ml_pipeline.training.frame_pack import pack_frames_dir
+        from ml_pipeline.training.tracknet_dataset import TrackNetDataset
+        if not (args.frames_dir and args.labels_json):
+            raise SystemExit("--loader-bench tracknet needs --frames-dir and --labels-json")
+        jpeg_ds = TrackNetDataset(args.frames_dir, args.labels_json,
+                                  skip_no_label_middle=False)
+        result["n_samples"] = len(jpeg_ds)
+        result["before_jpeg"] = _time_loader(jpeg_ds, **kw)
+        t0 = time.perf_counter()
+        pack_dir = pack_frames_dir(args.frames_dir)
+        result["pack_seconds"] = round(time.perf_counter() - t0, 2)
+        packed_ds = TrackNetDataset(args.frames_dir, args.labels_json,
+                                    skip_no_label_middle=False,
+                                    packed_dir=pack_dir, normalize=False)
+        result["after_packed"] = _time_loader(packed_ds, **kw)
+        before, after = result["before_jpeg"], result["after_packed"]
+    else:
+        from ml_pipeline.stroke_classifier.dataset import SwingTypeDataset
+        dataset_dir = args.dataset_dir or str(
+            Path(__file__).resolve().parent / "datasets" / "swing_type_v1"
+        )
+        for key, mmap in (("before_in_ram", False), ("after_mmap", True)):
+            t0 = time.perf_counter()
+            ds = SwingTypeDataset(dataset_dir, split="train", augment=True, mmap=mmap)
+            open_s = round(time.perf_counter() - t0, 2)
+            result["n_samples"] = len(ds)
+            result[key] = {"open_seconds": open_s, **_time_loader(ds, **kw)}
+            del ds
+        before, after = result["before_in_ram"], result["after_mmap"]
+
+    if before["samples_per_sec"] and after["samples_per_sec"]:
+        result["speedup"] = round(after["samples_per_sec"] / before["samples_per_sec"], 2)
+    logger.info("loader-bench %s: %s", args.loader_bench, result)
+    return result
+
+
 TRAINERS = {
     "serve": (_train_serve, False),   # (fn, require_gpu) — coord MLPs run fine on CPU too
     "hit": (_train_hit, False),
@@ -249,8 +337,8 @@ def _upload_weights(fact: str, filename: str, run_id: str) -> None:
 def main(argv=None) -> int:
     ap = argparse.ArgumentParser(description=__doc__,
                                  formatter_class=argparse.RawDescriptionHelpFormatter)
-    ap.add_argument("--fact", required=True, choices=sorted(TRAINERS),
-                    help="Which fact to train.")
+    ap.add_argument("--fact", choices=sorted(TRAINERS),
+                    help="Which fact to train (required unless --loader-bench).")
     ap.add_argument("--epochs", type=int, default=None,
                     help="Override epochs (defaults per fact).")
     ap.add_argument("--batch-size", type=int, default=None)
@@ -286,8 +374,31 @@ def main(argv=None) -> int:
                          "(swing only — the torchvision R(2+1)D bench needs this "
                          "GPU image; prints the result JSON between "
                          "BENCH_RESULT_JSON_BEGIN/END markers for log scraping).")
+    ap.add_argument("--loader-bench", choices=("tracknet", "swing"), default=None,
+                    help="Measure DataLoader samples/sec before/after the packed "
+                         "frame store (tracknet: JPEG vs frame_pack memmap; swing: "
+                         "in-RAM vs memory-mapped flows) instead of training. "
+                         "Prints LOADER_BENCH_JSON_BEGIN/END.")
+    ap.add_argument("--frames-dir", default=None,
+                    help="loader-bench tracknet: directory of frame_*.jpg.")
+    ap.add_argument("--labels-json", default=None,
+                    help="loader-bench tracknet: ball labels JSON.")
+    ap.add_argument("--bench-batches", type=int, default=50,
+                    help="loader-bench: batches timed per variant.")
+    ap.add_argument("--num-workers", type=int, default=0,
+                    help="loader-bench: DataLoader workers (trainers use 0).")
     args = ap.parse_args(argv)
 
+    if args.loader_bench:
+        device = _preflight(require_gpu=args.require_gpu)
+        result = _loader_bench(args, device)
+        print("LOADER_BENCH_JSON_BEGIN")
+        print(json.dumps(result, indent=2))
+        print("LOADER_BENCH_JSON_END")
+        return 0
+    if not args.fact:
+        ap.error("--fact is required (unless --loader-bench)")
+
     # Bench mode — lock/verify a gate in-image (GPU torchvision). Only swing needs
     # the image; serve/hit/bounce/identity benches are CPU/DB gates run locally.
     if args.bench:
@@ -25,14 +25,17 @@ What this does per corpus row (one per dual-submit match):
           memory `reference_t5_video_retention`).
        c. Centre-pad the bbox to a square, expand by ROI_SCALE (=1.5
           per ADR-02), clip to frame bounds.
-       d. Seek the video to (hit_frame - WINDOW_PRE), read WINDOW_TOTAL
-          consecutive frames (16 = 10 pre + 6 post per ADR-02).
+       d. Take WINDOW_TOTAL consecutive frames from (hit_frame - WINDOW_PRE)
+          (16 = 10 pre + 6 post per ADR-02). All windows of a match are read
+          in ONE sequential decode pass (_read_window_crops).
        e. Crop each frame to the ROI, resize to (112, 112).
        f. Compute dense Farneback optical flow between consecutive frames
           (15 flow fields for 16 input frames). Pad the first frame's
           flow with zeros so output has fixed 16-frame temporal axis.
-  5. Aggregate per-match into a single .pt file containing:
-       flows: torch.float32 tensor of shape (N_hits, 16, 112, 112, 2)
+  5. Aggregate per-match into {t5}.flows.npy — float32 (N_hits, 16, 112,
+     112, 2), memory-mapped by the Dataset — plus a .pt file containing:
+       flows_npy: the .npy file name (pre-v2 builds stored `flows`, a
+               torch tensor, here instead)
        labels: dict of parallel arrays (swing_type, swing_type_raw,
                role, is_serve, player_id, hit_frame, hit_ts, court_x,
                court_y, confidence) -- everything from the corpus JSON
@@ -116,6 +119,10 @@ PIPELINE_RES_HEIGHT = 1080
 VIDEO_RES_HEIGHT = 720
 BBOX_SCALE = VIDEO_RES_HEIGHT / PIPELINE_RES_HEIGHT  # = 0.6667
 
+# _read_window_crops: frame gaps longer than this seek instead of grab()-ing
+# through (a seek re-decodes from the previous keyframe, ~2s of video).
+_SEEK_GAP_FRAMES = 250
+
 HALF_Y_METRES = 11.885  # net midline, matches serve_detector/bounce_validity.py
 BBOX_FALLBACK_RADIUS = 5  # frames; search +/-N if no role-matching det at hit_frame
 # FIX #2 (2026-06-04): the far player's court_y is NULL ~50% of the time on
@@ -132,6 +139,10 @@ FAR_BBOX_MAX_H_PX = 200  # far-player bbox height ceiling (1080p pipeline coords
 
 S3_BUCKET = "nextpoint-prod-uploads"
 
+# v2: flows in a separate <t5>.flows.npy (memory-mapped by SwingTypeDataset)
+# instead of a tensor inside the .pt. SwingTypeDataset reads both layouts.
+BUILDER_VERSION = "v2-2026-10-16"
+
 
 # ---------------------------------------------------------------------------
 # DB helpers
@@ -339,22 +350,58 @@ def _bbox_to_roi(bbox_x1: float, bbox_y1: float, bbox_x2: float, bbox_y2: float,
 # Video / flow
 # ---------------------------------------------------------------------------
 
-def _read_window_frames(video_path: Path, start_frame: int,
-                        n_frames: int) -> list[np.ndarray]:
-    """Read `n_frames` consecutive BGR frames starting at start_frame.
-    Returns a list of length n_frames (may be shorter if EOF)."""
+def _read_window_crops(video_path: Path,
+                       windows: dict[int, tuple[int, tuple[int, int, int, int]]],
+                       n_frames: int) -> dict[int, list[np.ndarray]]:
+    """Crop + resize every hit window of a match in ONE pass over the video.
+
+    `windows` maps key -> (start_frame, (x, y, w, h) ROI). Returns key -> list
+    of up to n_frames ROI_SIZE x ROI_SIZE BGR crops (shorter at EOF).
+
+    Replaces a per-hit open + seek + 16-frame read: hits are seconds apart and
+    their windows often overlap, so each seek re-decoded from the previous
+    keyframe and shared frames were decoded once per hit. Windows are visited
+    in start order; gaps up to _SEEK_GAP_FRAMES are skipped with grab() (no
+    colour conversion), longer ones seek. Only the active windows' crops are
+    held, never full frames.
+    """
+    order = sorted(windows, key=lambda k: windows[k][0])
+    out: dict[int, list[np.ndarray]] = {k: [] for k in windows}
+    if not order:
+        return out
     cap = cv2.VideoCapture(str(video_path))
     if not cap.isOpened():
         raise RuntimeError(f"cannot open video: {video_path}")
     try:
-        cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
-        frames = []
-        for _ in range(n_frames):
+        pos: Optional[int] = None      # index of the frame the next read() returns
+        active: list[int] = []
+        i = 0
+        while i < len(order) or active:
+            if not active:
+                nxt = windows[order[i]][0]
+                if pos is None or nxt < pos or nxt - pos > _SEEK_GAP_FRAMES:
+                    cap.set(cv2.CAP_PROP_POS_FRAMES, nxt)
+                    pos = nxt
+                while pos < nxt:
+                    if not cap.grab():
+                        return out
+                    pos += 1
+            while i < len(order) and windows[order[i]][0] <= pos:
+                active.append(order[i])
+                i += 1
             ok, fr = cap.read()
             if not ok:
                 break
-            frames.append(fr)
-        return frames
+            for k in active:
+                x, y, w, h = windows[k][1]
+                crop = fr[y:y + h, x:x + w]
+                if crop.size == 0:
+                    crop = np.zeros((h, w, 3), dtype=np.uint8)
+                out[k].append(cv2.resize(crop, (ROI_SIZE, ROI_SIZE),
+                                         interpolation=cv2.INTER_AREA))
+            pos += 1
+            active = [k for k in active if len(out[k]) < n_frames]
+        return out
     finally:
         cap.release()
 
@@ -461,6 +508,9 @@ def build_one_match(
     }
     dropped = {"no_role_match_within_radius": 0, "video_eof": 0, "bad_bbox": 0}
 
+    # 4a. Resolve each hit's player + ROI; 4b. read every window in one pass;
+    # 4c. flow + metadata in label order.
+    pending: list[tuple] = []
     for li, lbl in enumerate(labels):
         hit_frame = int(lbl["hit_frame"])        # SOURCE-fps index → video seek (below)
         t5_frame = _bbox_lookup_frame(lbl)       # 25fps index → bbox lookup
@@ -488,25 +538,25 @@ def build_one_match(
             dropped["bad_bbox"] += 1
             continue
 
-        # Read the 16-frame window
+        # The 16-frame window must lie inside the video
         start_frame = hit_frame - WINDOW_PRE
         if start_frame < 0 or start_frame + WINDOW_TOTAL > n_frames_in_video:
             dropped["video_eof"] += 1
             continue
-        frames = _read_window_frames(video_local, start_frame, WINDOW_TOTAL)
-        if len(frames) < WINDOW_TOTAL:
+        pending.append((li, lbl, hit_frame, role, cx, cy, player, frame_delta,
+                        start_frame, (roi_x, roi_y, roi_w, roi_h)))
+
+    crops_by_label = _read_window_crops(
+        video_local, {p[0]: (p[8], p[9]) for p in pending}, WINDOW_TOTAL,
+    )
+
+    for (li, lbl, hit_frame, role, cx, cy, player, frame_delta,
+         _start, (roi_x, roi_y, roi_w, roi_h)) in pending:
+        crops = crops_by_label.pop(li)
+        if len(crops) < WINDOW_TOTAL:
             dropped["video_eof"] += 1
             continue
 
-        # Crop + resize per frame
-        crops = []
-        for fr in frames:
-            crop = fr[roi_y:roi_y + roi_h, roi_x:roi_x + roi_w]
-            if crop.size == 0:
-                crop = np.zeros((roi_h, roi_w, 3), dtype=np.uint8)
-            crop = cv2.resize(crop, (ROI_SIZE, ROI_SIZE), interpolation=cv2.INTER_AREA)
-            crops.append(crop)
-
         flow = _compute_flow_window(crops)  # (16, 112, 112, 2)
         out_flows.append(flow)
 
@@ -530,12 +580,22 @@ def build_one_match(
     if not out_flows:
         raise RuntimeError(f"no usable hits for {t5_task_id} (all dropped: {dropped})")
 
-    flows_tensor = torch.from_numpy(np.stack(out_flows, axis=0))  # (N, 16, 112, 112, 2)
-
     output_dir.mkdir(parents=True, exist_ok=True)
+    # Flows go to a plain .npy so SwingTypeDataset can memory-map them and
+    # slice one hit at a time; the .pt keeps labels + meta and names the file.
+    flows_path = output_dir / f"{t5_task_id}.flows.npy"
+    flows_mm = np.lib.format.open_memmap(
+        str(flows_path), mode="w+", dtype=np.float32,
+        shape=(len(out_flows),) + out_flows[0].shape,        # (N, 16, 112, 112, 2)
+    )
+    for i, f in enumerate(out_flows):
+        flows_mm[i] = f
+    flows_mm.flush()
+    del flows_mm
+
     pt_path = output_dir / f"{t5_task_id}.pt"
     torch.save({
-        "flows": flows_tensor,
+        "flows_npy": flows_path.name,
         "labels": meta_lists,
         "meta": {
             "t5_task_id": t5_task_id,
@@ -549,7 +609,7 @@ def build_one_match(
             "bbox_scale_1080_to_720": BBOX_SCALE,
             "bbox_fallback_radius": BBOX_FALLBACK_RADIUS,
             "flow_method": "cv2.calcOpticalFlowFarneback",
-            "builder_version": "v1-2026-05-28",
+            "builder_version": BUILDER_VERSION,
         },
     }, pt_path)
 
@@ -629,7 +689,7 @@ def build_dataset(
         total_hits += m["n_out"]
 
     manifest = {
-        "builder_version": "v1-2026-05-28",
+        "builder_version": BUILDER_VERSION,
         "n_matches": len(success),
         "total_hits": total_hits,
         "totals_by_class": totals_by_class,
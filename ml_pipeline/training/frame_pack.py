@@ -0,0 +1,197 @@
+"""
+ml_pipeline/training/frame_pack.py — Packed, memory-mapped frame store for training.
+
+TrackNetDataset used to cv2.imread + cv2.resize three JPEGs per sample. Windows
+overlap by two frames, so every frame was decoded three times per epoch and the
+GPU sat waiting on JPEG decode. The packer decodes each frame ONCE, resizes it
+to the model input, and writes all of them into a single uint8 .npy:
+
+    <pack_dir>/frames.npy    uint8 (N, H, W, 3)  BGR, already at model input size
+    <pack_dir>/index.json    {"version", "input_w", "input_h", "n_frames",
+                              "frame_indices": [...], "source_dir"}
+
+frames.npy row i holds frame_indices[i]; the indices are sorted, so a window of
+consecutive frame_idx values is a contiguous run of rows and PackedFrames.window()
+returns it as a zero-copy slice of the memmap. The page cache does the rest —
+after the first epoch the whole pack is RAM-resident.
+
+Normalisation to float [0, 1] can move to the GPU: build the Dataset with
+normalize=False (it then yields uint8) and call to_device_normalized() on each
+batch — 4x less host->device traffic and no per-sample float conversion on the
+CPU.
+
+Example:
+    from ml_pipeline.training.frame_pack import pack_frames_dir
+    pack_dir = pack_frames_dir("./frames")           # ./frames/_packed
+    ds = TrackNetDataset("./frames", "./labels.json", packed_dir=pack_dir,
+                         normalize=False)
+"""
+
+import json
+import logging
+import time
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+import torch
+
+logger = logging.getLogger(__name__)
+
+PACK_VERSION = 1
+_FRAMES_FILE = "frames.npy"
+_INDEX_FILE = "index.json"
+_DEFAULT_SUBDIR = "_packed"
+
+
+def _discover_jpegs(frames_dir: Path) -> List[int]:
+    """Sorted frame indices of frame_*.jpg files (same rule as TrackNetDataset)."""
+    indices = []
+    for f in frames_dir.iterdir():
+        name = f.name
+        if not name.startswith("frame_") or not name.endswith(".jpg"):
+            continue
+        try:
+            indices.append(int(name[len("frame_"):-len(".jpg")]))
+        except ValueError:
+            continue
+    indices.sort()
+    return indices
+
+
+def _read_index(pack_dir: Path) -> Optional[dict]:
+    p = pack_dir / _INDEX_FILE
+    if not p.exists() or not (pack_dir / _FRAMES_FILE).exists():
+        return None
+    try:
+        return json.loads(p.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def pack_frames_dir(
+    frames_dir: str,
+    pack_dir: Optional[str] = None,
+    input_size: Tuple[int, int] = (640, 360),
+    overwrite: bool = False,
+) -> str:
+    """Decode + resize every frame_*.jpg in frames_dir into one uint8 memmap.
+
+    Reuses an existing pack when its version, input size and frame index list
+    still match the directory (re-running is free). Returns the pack dir.
+
+    Args:
+        frames_dir: Directory of frame_000000.jpg … (extract_frames.py output).
+        pack_dir:   Output directory (default: <frames_dir>/_packed).
+        input_size: (width, height) the frames are resized to.
+        overwrite:  Rebuild even if an up-to-date pack exists.
+    """
+    src = Path(frames_dir)
+    if not src.is_dir():
+        raise FileNotFoundError(f"frames_dir not found: {frames_dir}")
+    out = Path(pack_dir) if pack_dir else src / _DEFAULT_SUBDIR
+    input_w, input_h = int(input_size[0]), int(input_size[1])
+
+    indices = _discover_jpegs(src)
+    if not indices:
+        raise ValueError(f"No frame_*.jpg files found in {frames_dir}")
+
+    idx = _read_index(out)
+    if (not overwrite and idx is not None
+            and idx.get("version") == PACK_VERSION
+            and idx.get("input_w") == input_w and idx.get("input_h") == input_h
+            and idx.get("frame_indices") == indices):
+        logger.info("frame_pack: reusing %s (%d frames)", out, len(indices))
+        return str(out)
+
+    out.mkdir(parents=True, exist_ok=True)
+    # Drop a stale index first: a half-written pack must never look valid.
+    (out / _INDEX_FILE).unlink(missing_ok=True)
+
+    t0 = time.time()
+    mm = np.lib.format.open_memmap(
+        str(out / _FRAMES_FILE), mode="w+", dtype=np.uint8,
+        shape=(len(indices), input_h, input_w, 3),
+    )
+    for row, frame_idx in enumerate(indices):
+        path = src / f"frame_{frame_idx:06d}.jpg"
+        frame = cv2.imread(str(path))
+        if frame is None:
+            raise FileNotFoundError(f"Cannot read frame file: {path}")
+        if frame.shape[1] != input_w or frame.shape[0] != input_h:
+            frame = cv2.resize(frame, (input_w, input_h))
+        mm[row] = frame
+    mm.flush()
+    del mm
+
+    (out / _INDEX_FILE).write_text(json.dumps({
+        "version": PACK_VERSION,
+        "input_w": input_w,
+        "input_h": input_h,
+        "n_frames": len(indices),
+        "frame_indices": indices,
+        "source_dir": str(src.resolve()),
+    }))
+    size_mb = (out / _FRAMES_FILE).stat().st_size / 1e6
+    logger.info("frame_pack: packed %d frames (%dx%d, %.0f MB) -> %s in %.1fs",
+                len(indices), input_w, input_h, size_mb, out, time.time() - t0)
+    return str(out)
+
+
+class PackedFrames:
+    """Read side of a pack. Cheap to construct; the memmap is opened lazily so
+    the object pickles small into DataLoader workers (each worker maps the
+    file itself instead of receiving a copy of the array)."""
+
+    def __init__(self, pack_dir: str):
+        self.pack_dir = Path(pack_dir)
+        idx = _read_index(self.pack_dir)
+        if idx is None:
+            raise FileNotFoundError(f"no frame pack at {pack_dir} (run pack_frames_dir)")
+        if idx.get("version") != PACK_VERSION:
+            raise ValueError(f"frame pack {pack_dir} is version {idx.get('version')}, "
+                             f"expected {PACK_VERSION} — re-pack")
+        self.input_w = int(idx["input_w"])
+        self.input_h = int(idx["input_h"])
+        self.frame_indices: List[int] = [int(i) for i in idx["frame_indices"]]
+        self._row = {f: r for r, f in enumerate(self.frame_indices)}
+        self._mm: Optional[np.ndarray] = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_mm"] = None
+        return state
+
+    def __len__(self) -> int:
+        return len(self.frame_indices)
+
+    def __contains__(self, frame_idx: int) -> bool:
+        return frame_idx in self._row
+
+    @property
+    def frames(self) -> np.ndarray:
+        if self._mm is None:
+            # Copy-on-write map: slices are writable views (torch.from_numpy
+            # accepts them without a copy or a read-only warning) and nothing
+            # is ever written back to the pack.
+            self._mm = np.load(str(self.pack_dir / _FRAMES_FILE), mmap_mode="c")
+        return self._mm
+
+    def window(self, frame_indices: Sequence[int]) -> np.ndarray:
+        """(n, H, W, 3) uint8 for the given frame indices. Consecutive indices
+        (every TrackNet window) come back as a zero-copy slice of the map."""
+        rows = [self._row[f] for f in frame_indices]
+        r0 = rows[0]
+        if rows[-1] - r0 == len(rows) - 1:
+            return self.frames[r0:r0 + len(rows)]
+        return np.stack([self.frames[r] for r in rows], axis=0)
+
+
+def to_device_normalized(frames: torch.Tensor, device: str) -> torch.Tensor:
+    """Move a batch to `device` and scale uint8 -> float32 [0, 1] there.
+    Float batches (normalize=True datasets) are just moved."""
+    frames = frames.to(device, non_blocking=True)
+    if frames.dtype == torch.uint8:
+        return frames.float().div_(255.0)
+    return frames
@@ -18,6 +18,11 @@ Label JSON format (produced by export_labels.py):
 x, y must be in pixel coordinates relative to the 640×360 model input space.
 If your source labels are in a different resolution, rescale before saving.
 
+Packed frames (ml_pipeline/training/frame_pack.py): pass packed_dir= to read
+each window as a slice of one uint8 memmap instead of decoding three JPEGs per
+sample. normalize=False yields uint8 (9, H, W) so the [0, 1] scaling can run on
+the GPU (frame_pack.to_device_normalized).
+
 Example:
     from ml_pipeline.training.tracknet_dataset import TrackNetDataset
     ds = TrackNetDataset("./frames", "./labels.json")
@@ -37,6 +42,8 @@ import numpy as np
 import torch
 from torch.utils.data import Dataset
 
+from ml_pipeline.training.frame_pack import PackedFrames
+
 logger = logging.getLogger(__name__)
 
 # Default model input size — must match TrackNet V2 training resolution
@@ -130,6 +137,12 @@ class TrackNetDataset(Dataset):
             ball label.  This avoids training on sequences where the ball
             trajectory is completely absent during the window.  The last-frame
             label is always used regardless.
+        packed_dir:
+            Frame pack built by frame_pack.pack_frames_dir (default None: read
+            the JPEGs).  Its input size must equal input_size.
+        normalize:
+            If True (default), frames are float32 [0, 1].  If False, uint8
+            [0, 255] — normalise on the device with to_device_normalized.
     """
 
     def __init__(
@@ -140,6 +153,8 @@ class TrackNetDataset(Dataset):
         input_size: Tuple[int, int] = (_DEFAULT_INPUT_W, _DEFAULT_INPUT_H),
         sigma: float = _DEFAULT_SIGMA,
         skip_no_label_middle: bool = True,
+        packed_dir: Optional[str] = None,
+        normalize: bool = True,
     ):
         self.frames_dir = frames_dir
         self.labels_json = labels_json
@@ -147,6 +162,16 @@ class TrackNetDataset(Dataset):
         self.input_w, self.input_h = input_size
         self.sigma = sigma
         self.skip_no_label_middle = skip_no_label_middle
+        self.normalize = normalize
+
+        self._packed: Optional[PackedFrames] = None
+        if packed_dir is not None:
+            self._packed = PackedFrames(packed_dir)
+            if (self._packed.input_w, self._packed.input_h) != (self.input_w, self.input_h):
+                raise ValueError(
+                    f"frame pack {packed_dir} is {self._packed.input_w}x{self._packed.input_h}, "
+                    f"dataset input_size is {self.input_w}x{self.input_h} — re-pack"
+                )
 
         # Load label lookup: frame_idx -> (x, y)
         self._labels = _load_labels(labels_json)
@@ -158,12 +183,18 @@ class TrackNetDataset(Dataset):
         self._samples = self._build_samples()
 
         logger.info(
-            "TrackNetDataset: frames_dir=%s  frames=%d  labels=%d  samples=%d",
+            "TrackNetDataset: frames_dir=%s  frames=%d  labels=%d  samples=%d  packed=%s",
             frames_dir, len(self._frame_indices), len(self._labels), len(self._samples),
+            packed_dir,
         )
 
     def _discover_frames(self) -> List[int]:
         """Scan frames_dir and return sorted list of available frame indices."""
+        if self._packed is not None:
+            if not self._packed.frame_indices:
+                raise ValueError(f"Frame pack for {self.frames_dir} is empty")
+            return list(self._packed.frame_indices)
+
         frames_dir = Path(self.frames_dir)
         if not frames_dir.is_dir():
             raise FileNotFoundError(f"frames_dir not found: {self.frames_dir}")
@@ -225,25 +256,31 @@ class TrackNetDataset(Dataset):
         """Return (frames_tensor, heatmap_tensor) for sample idx.
 
         frames_tensor: float32 (9, H, W) — 3 frames × 3 BGR channels, /255
+                       (uint8, unscaled, when normalize=False)
         heatmap_tensor: float32 (H, W)   — Gaussian at ball pos, or zeros
         """
         window = self._samples[idx]
 
-        # Load and resize all frames in the window
-        frames_chw = []
-        for frame_idx in window:
-            path = _frame_path(self.frames_dir, frame_idx)
-            frame = cv2.imread(path)
-            if frame is None:
-                raise FileNotFoundError(f"Cannot read frame file: {path}")
-            # Resize to model input size (W, H)
-            frame = cv2.resize(frame, (self.input_w, self.input_h))
-            # (H, W, 3) uint8 → float32 [0, 1], then (3, H, W)
-            arr = frame.astype(np.float32) / 255.0
-            frames_chw.append(torch.from_numpy(arr).permute(2, 0, 1))
-
-        # Stack along channel dim: (9, H, W) for 3-frame V2 input
-        frames_tensor = torch.cat(frames_chw, dim=0)
+        if self._packed is not None:
+            # (n, H, W, 3) slice of the memmap — no decode, no resize
+            frames_nhwc = torch.from_numpy(self._packed.window(window))
+        else:
+            # Load and resize all frames in the window
+            decoded = []
+            for frame_idx in window:
+                path = _frame_path(self.frames_dir, frame_idx)
+                frame = cv2.imread(path)
+                if frame is None:
+                    raise FileNotFoundError(f"Cannot read frame file: {path}")
+                # Resize to model input size (W, H)
+                decoded.append(cv2.resize(frame, (self.input_w, self.input_h)))
+            frames_nhwc = torch.from_numpy(np.stack(decoded, axis=0))
+
+        # (n, H, W, 3) → (n*3, H, W): 9 channels for 3-frame V2 input
+        frames_tensor = frames_nhwc.permute(0, 3, 1, 2).reshape(
+            -1, self.input_h, self.input_w)
+        if self.normalize:
+            frames_tensor = frames_tensor.float().div_(255.0)
 
         # Label: Gaussian heatmap centred on ball in the LAST frame of window
         last_frame_idx = window[-1]
@@ -16,7 +16,8 @@ Usage:
         --frames-dir ./frames \\
         --labels ./labels.json \\
         --epochs 20 \\
-        --batch-size 4
+        --batch-size 4 \\
+        [--pack]          # decode once into a uint8 memmap (frame_pack.py)
 
 Output:
     - ml_pipeline/models/tracknet_v2_finetuned.pt  (best checkpoint)
@@ -132,6 +133,7 @@ def train(
     weights_path: str = None,
     output_path: str = None,
     device: str = None,
+    pack: bool = False,
 ) -> Dict[str, float]:
     """
     Fine-tune BallTrackerNet (V2) on the provided frames and labels.
@@ -146,11 +148,15 @@ def train(
         weights_path: Path to pretrained weights. Defaults to tracknet_v2.pt.
         output_path:  Save path for best model. Defaults to tracknet_v2_finetuned.pt.
         device:       'cuda', 'cpu', or None for auto-detect.
+        pack:         Pack the frames into a uint8 memmap first (frame_pack.py)
+                      and normalise batches on the device instead of decoding
+                      JPEGs per sample.
 
     Returns:
         Dict with final metrics: train_loss, val_loss, val_precision, val_recall.
     """
     from ml_pipeline.ball_tracker import BallTrackerNet
+    from ml_pipeline.training.frame_pack import pack_frames_dir, to_device_normalized
     from ml_pipeline.training.tracknet_dataset import TrackNetDataset
 
     weights_path = weights_path or str(_DEFAULT_WEIGHTS)
@@ -168,8 +174,11 @@ def train(
     # t-1, t]). The middle frame is never labeled — dropping samples
     # whose middle is unlabeled would discard every single training
     # sample. The last-frame-label contract still holds regardless.
+    packed_dir = pack_frames_dir(frames_dir) if pack else None
     full_dataset = TrackNetDataset(frames_dir, labels_json,
-                                    skip_no_label_middle=False)
+                                    skip_no_label_middle=False,
+                                    packed_dir=packed_dir,
+                                    normalize=not pack)
     stats = full_dataset.label_stats()
     logger.info(
         "Dataset: total=%d  with_ball=%d  without_ball=%d",
@@ -254,7 +263,7 @@ def train(
         train_batches = 0
 
         for frames, heatmaps in train_loader:
-            frames = frames.to(device)    # (B, 9, H, W)
+            frames = to_device_normalized(frames, device)    # (B, 9, H, W) float [0, 1]
             heatmaps = heatmaps.to(device)  # (B, H, W)
 
             optimizer.zero_grad()
@@ -300,7 +309,7 @@ def train(
 
         with torch.no_grad():
             for frames, heatmaps in val_loader:
-                frames = frames.to(device)
+                frames = to_device_normalized(frames, device)
                 heatmaps = heatmaps.to(device)
 
                 logits = model(frames, testing=False)
@@ -399,6 +408,9 @@ def main():
     p.add_argument("--weights", default=None, help="Pretrained weights path (default: tracknet_v2.pt)")
     p.add_argument("--output", default=None, help="Output path for fine-tuned model (default: tracknet_v2_finetuned.pt)")
     p.add_argument("--device", default=None, choices=["cuda", "cpu"], help="Device (default: auto)")
+    p.add_argument("--pack", action="store_true",
+                   help="Read frames from a packed uint8 memmap (built on first use under "
+                        "<frames-dir>/_packed) and normalise on the device")
 
     args = p.parse_args()
 
@@ -413,6 +425,7 @@ def main():
             weights_path=args.weights,
             output_path=args.output,
             device=args.device,
+            pack=args.pack,
         )
         print(f"\nFinal metrics: {metrics}")
     except (FileNotFoundError, ValueError) as exc:
@@ -18,10 +18,10 @@ Output contract (matches BallTracker — DROP-IN COMPATIBLE):
   - detect_frame returns Optional[BallDetection] (was: Optional[dict] pre-2026-05-21
     refactor; archived diag tools in ml_pipeline/diag/_archive/ depend on the
     old dict format — bench tools work with both formats via _normalise_detection)
-  - self.detections: List[BallDetection], same shape as BallTracker.detections
+  - self.detections: ball DetectionTable, same shape as BallTracker.detections
   - Post-processing methods (interpolate_gaps, _filter_outliers, detect_bounces,
     compute_speeds, assign_peak_flight_speeds, log_diagnostics, reset) match
-    BallTracker semantics. They operate on self.detections — tracker-agnostic.
+    BallTracker semantics — the shared column functions in ball_tracker.py.
 
 The pipeline.TennisAnalysisPipeline picks between BallTracker and WASBBallTracker
 via the BALL_TRACKER env var. Default is `tracknet_v2` in code; set
@@ -42,18 +42,16 @@ import cv2
 import numpy as np
 import torch
 
-from ml_pipeline.ball_tracker import BallDetection
-from ml_pipeline.config import (
-    BALL_MAX_INTERPOLATION_GAP,
-    BALL_MAX_DIST_BETWEEN_FRAMES,
-    BALL_MAX_DIST_GAP,
-    BALL_FILTER_REANCHOR_RUN,
-    BALL_BATCH_SIZE,
-    BOUNCE_VELOCITY_WINDOW,
-    COURT_LENGTH_M,
-    COURT_WIDTH_DOUBLES_M,
-    FRAME_SAMPLE_FPS,
+from ml_pipeline.ball_tracker import (
+    BallDetection,
+    assign_ball_peak_speeds,
+    compute_ball_speeds,
+    detect_ball_bounces,
+    filter_ball_outliers,
+    interpolate_ball_gaps,
 )
+from ml_pipeline.config import BALL_BATCH_SIZE
+from ml_pipeline.detection_table import DetectionTable
 from ml_pipeline.wasb_hrnet import HRNet
 
 logger = logging.getLogger(__name__)
@@ -136,6 +134,9 @@ class WASBBallTracker:
     TrackNetV2's permissive 4-tier strategy.
     """
 
+    # (width, height) detect_frame resizes every frame to (see BallTracker).
+    INPUT_SIZE = (WASB_INPUT_W, WASB_INPUT_H)
+
     def __init__(
         self,
         weights_path: Optional[str] = None,
@@ -174,8 +175,8 @@ class WASBBallTracker:
         # when it reaches _batch_size, and by flush() at end-of-video.
         self._pending: list = []
 
-        # BallTracker-compatible: list of BallDetection in original frame coords.
-        self.detections: List[BallDetection] = []
+        # BallTracker-compatible: ball DetectionTable in original frame coords.
+        self.detections = DetectionTable("ball")
         # WASB-specific diagnostic: parallel list of peak heatmap scores per
         # detection, for log_diagnostics. Cleared/reset alongside detections.
         self._scores: List[float] = []
@@ -198,6 +199,7 @@ class WASBBallTracker:
 
     def detect_frame(
         self, frame: np.ndarray, frame_idx: int,
+        resized: Optional[np.ndarray] = None,
     ) -> Optional[BallDetection]:
         """Feed one BGR frame (any HxW). Returns the BallDetection for this
         frame when batch_size==1 (per-frame, original behaviour). When
@@ -205,11 +207,15 @@ class WASBBallTracker:
         detections are produced in arrears by the batched flush and read from
         self.detections (the pipeline ignores the return value). flush() drains
         the final partial batch — the pipeline calls it before post-processing.
+
+        `resized`: the frame already resized to INPUT_SIZE by the decode
+        prefetcher; used only when it has that shape (same cv2.resize).
         """
         if self._frame_orig_shape is None:
             self._frame_orig_shape = frame.shape[:2]
 
-        resized = cv2.resize(frame, (WASB_INPUT_W, WASB_INPUT_H))
+        if resized is None or resized.shape[:2] != (WASB_INPUT_H, WASB_INPUT_W):
+            resized = cv2.resize(frame, (WASB_INPUT_W, WASB_INPUT_H))
         self._buffer.append(resized)
         if len(self._buffer) > WASB_FRAMES_IN:
             self._buffer.pop(0)
@@ -271,10 +277,10 @@ class WASBBallTracker:
                 x=float(peak_x_m * scale_x),
                 y=float(peak_y_m * scale_y),
             )
-            self.detections.append(det)
             self._scores.append(peak_val)
             self._diag["detected"] += 1
             made.append(det)
+        self.detections.append_detections(made)
         return made
 
     def flush(self) -> None:
@@ -283,176 +289,43 @@ class WASBBallTracker:
         self._flush_pending()
 
     # ------------------------------------------------------------------
-    # Post-processing (copied verbatim from BallTracker — tracker-agnostic;
-    # they operate purely on self.detections and config constants).
+    # Post-processing (shared with BallTracker — tracker-agnostic column
+    # functions in ball_tracker.py operating on self.detections).
     # ------------------------------------------------------------------
 
     def interpolate_gaps(self):
         """Fill missing detections with linear interpolation for gaps ≤ BALL_MAX_INTERPOLATION_GAP."""
-        if len(self.detections) < 2:
-            return
-        by_frame = {d.frame_idx: d for d in self.detections}
-        frames = sorted(by_frame.keys())
-
-        interpolated = []
-        for i in range(len(frames) - 1):
-            f_start = frames[i]
-            f_end = frames[i + 1]
-            gap = f_end - f_start - 1
-            if 0 < gap <= BALL_MAX_INTERPOLATION_GAP:
-                d1 = by_frame[f_start]
-                d2 = by_frame[f_end]
-                dist = np.hypot(d2.x - d1.x, d2.y - d1.y)
-                if dist > BALL_MAX_DIST_GAP:
-                    continue
-                for g in range(1, gap + 1):
-                    t = g / (gap + 1)
-                    interpolated.append(BallDetection(
-                        frame_idx=f_start + g,
-                        x=d1.x + t * (d2.x - d1.x),
-                        y=d1.y + t * (d2.y - d1.y),
-                    ))
-
-        self.detections.extend(interpolated)
-        self.detections.sort(key=lambda d: d.frame_idx)
-        self._filter_outliers()
+        self.detections = interpolate_ball_gaps(self.detections)
 
     def _filter_outliers(self):
-        """Remove pixel-jump outliers but re-anchor on a coherent post-gap cluster.
+        """Remove pixel-jump outliers with post-gap re-anchoring.
 
-        See BallTracker._filter_outliers in ml_pipeline/ball_tracker.py for the
-        algorithm rationale. Identical implementation here so both trackers
+        See filter_ball_outliers in ml_pipeline/ball_tracker.py for the
+        algorithm rationale. Same implementation for both trackers so they
         emit the same shape into ml_analysis.ball_detections.
         """
-        if len(self.detections) < 2:
-            return
-        filtered = [self.detections[0]]
-        pending: list[BallDetection] = []
-        for d in self.detections[1:]:
-            anchor = filtered[-1]
-            if np.hypot(d.x - anchor.x, d.y - anchor.y) <= BALL_MAX_DIST_BETWEEN_FRAMES:
-                pending = []
-                filtered.append(d)
-                continue
-            if pending and np.hypot(d.x - pending[-1].x, d.y - pending[-1].y) <= BALL_MAX_DIST_BETWEEN_FRAMES:
-                pending.append(d)
-            else:
-                pending = [d]
-            if len(pending) >= BALL_FILTER_REANCHOR_RUN:
-                filtered.extend(pending)
-                pending = []
-        self.detections = filtered
+        self.detections = filter_ball_outliers(self.detections)
 
     def detect_bounces(self, court_detector=None):
-        """Detect bounces via velocity reversal in y-coordinate. Optionally map to court coords.
+        """Detect bounces via velocity reversal in y-coordinate.
 
         Mirrors BallTracker.detect_bounces — see that method for the
         validation criteria (sign-flip + magnitude + spacing).
         """
-        if len(self.detections) < BOUNCE_VELOCITY_WINDOW * 2:
-            return
-
-        ys = np.array([d.y for d in self.detections])
-        vel = np.convolve(
-            np.diff(ys), np.ones(BOUNCE_VELOCITY_WINDOW) / BOUNCE_VELOCITY_WINDOW,
-            mode="valid",
-        )
-
-        MIN_VEL_MAG = 2.0
-        MIN_BOUNCE_SPACING = 8
-        last_bounce_idx = -MIN_BOUNCE_SPACING
-        bounce_count = 0
-
-        for i in range(len(vel) - 1):
-            sign_flip = (vel[i] > 0 and vel[i + 1] < 0) or (vel[i] < 0 and vel[i + 1] > 0)
-            if not sign_flip:
-                continue
-            if abs(vel[i]) < MIN_VEL_MAG or abs(vel[i + 1]) < MIN_VEL_MAG:
-                continue
-
-            det_idx = i + BOUNCE_VELOCITY_WINDOW
-            if det_idx >= len(self.detections):
-                continue
-            if det_idx - last_bounce_idx < MIN_BOUNCE_SPACING:
-                continue
-            last_bounce_idx = det_idx
-
-            self.detections[det_idx].is_bounce = True
-            bounce_count += 1
-
-            if court_detector is not None:
-                coords = court_detector.to_court_coords(
-                    self.detections[det_idx].x, self.detections[det_idx].y,
-                )
-                if coords is not None:
-                    cx, cy = coords
-                    self.detections[det_idx].court_x = cx
-                    self.detections[det_idx].court_y = cy
-                    self.detections[det_idx].is_in = (
-                        0 <= cx <= COURT_WIDTH_DOUBLES_M and
-                        0 <= cy <= COURT_LENGTH_M
-                    )
-        logger.info("detect_bounces (wasb): found %d bounces (after validation)", bounce_count)
+        detect_ball_bounces(self.detections, court_detector, tag=" (wasb)")
 
     def compute_speeds(self, court_detector=None, fps: float = None):
         """Compute ball speed in km/h using court-coordinate distances between frames.
 
         Same semantics as BallTracker.compute_speeds.
         """
-        if court_detector is None or len(self.detections) < 2:
-            return
-        sample_fps = fps or FRAME_SAMPLE_FPS
-        none_count = 0
-        ok_count = 0
-        for i in range(1, len(self.detections)):
-            d_prev = self.detections[i - 1]
-            d_curr = self.detections[i]
-            c_prev = court_detector.to_court_coords(d_prev.x, d_prev.y)
-            c_curr = court_detector.to_court_coords(d_curr.x, d_curr.y)
-            if c_prev is None or c_curr is None:
-                none_count += 1
-                continue
-            ok_count += 1
-            dist_m = np.hypot(c_curr[0] - c_prev[0], c_curr[1] - c_prev[1])
-            dt_sec = (d_curr.frame_idx - d_prev.frame_idx) / sample_fps
-            if dt_sec > 0:
-                speed_ms = dist_m / dt_sec
-                speed_kmh = speed_ms * 3.6
-                if speed_kmh <= 250:
-                    d_curr.speed_kmh = speed_kmh
-                d_curr.court_x = c_curr[0]
-                d_curr.court_y = c_curr[1]
-        if none_count > 0:
-            logger.warning(
-                "compute_speeds (wasb): %d/%d pairs had None court coords",
-                none_count, none_count + ok_count,
-            )
+        compute_ball_speeds(self.detections, court_detector, fps, tag=" (wasb)")
 
     def assign_peak_flight_speeds(self, window_frames: int = 15):
         """Overwrite each bounce's speed_kmh with the p75 of pairwise speeds
         in the preceding window. Identical semantics to BallTracker — see
         ball_tracker.py for the full rationale."""
-        n_updated = 0
-        for bi, det in enumerate(self.detections):
-            if not det.is_bounce:
-                continue
-            low_frame = det.frame_idx - window_frames
-            speeds = []
-            for j in range(bi - 1, -1, -1):
-                d = self.detections[j]
-                if d.frame_idx < low_frame:
-                    break
-                if d.speed_kmh is not None and d.speed_kmh > 0:
-                    speeds.append(d.speed_kmh)
-            if speeds:
-                speeds.sort()
-                k = max(0, min(len(speeds) - 1, int(len(speeds) * 0.75)))
-                det.speed_kmh = speeds[k]
-                n_updated += 1
-        logger.info(
-            "assign_peak_flight_speeds (wasb): set p75 on %d/%d bounces (window=%d)",
-            n_updated, sum(1 for d in self.detections if d.is_bounce), window_frames,
-        )
+        assign_ball_peak_speeds(self.detections, window_frames, tag=" (wasb)")
 
     def log_diagnostics(self):
         """WASB-specific diagnostics — score distribution + detection/threshold counts.
@@ -492,7 +365,9 @@ class WASBBallTracker:
     def reset(self):
         self._buffer.clear()
         self._pending.clear()
-        self.detections.clear()
+        # Fresh table, not an in-place clear: the previous run's
+        # AnalysisResult.ball_table is this same object.
+        self.detections = DetectionTable("ball")
         self._scores.clear()
         self._frame_orig_shape = None
         for k in self._diag:
@@ -319,6 +319,8 @@ _BILLING_RAW_DDL = [
     "ON billing.payment (provider, provider_payment_id) WHERE provider_payment_id IS NOT NULL",
     "CREATE INDEX IF NOT EXISTS ix_payment_account ON billing.payment (account_id, occurred_at)",
     "CREATE INDEX IF NOT EXISTS ix_payment_email ON billing.payment (buyer_email, occurred_at)",
+    # backoffice customers list: keyset order (client_api.backoffice_customers)
+    "CREATE INDEX IF NOT EXISTS ix_account_created ON billing.account (created_at DESC, id DESC)",
 ]
 
 # vw_customer_usage — matches_remaining = grants - consumption. Created only if missing
@@ -7,7 +7,8 @@ match could be re-validated or re-ingested. This archives every payload to S3
 SportAI adds data "somewhere we never had", we find out immediately instead of
 silently dropping it.
 
-Wired into ingest_worker_app._do_ingest right after the payload is downloaded.
+Wired into ingest_worker_app._do_ingest right after the payload is downloaded
+(archive_raw_file when the result was spooled to disk — the default).
 Everything here is BEST-EFFORT: a failure logs and returns, never breaking an
 ingest.
 """
@@ -85,6 +86,45 @@ def archive_raw(task_id: str, payload: dict, *, bucket: str | None = None) -> st
         return None
 
 
+def archive_raw_file(task_id: str, path: str, *, bucket: str | None = None) -> str | None:
+    """archive_raw() for a result spooled to disk (ingest_bronze.spool_result):
+    same key, uploaded from the file — a gzip body as-is, a plain one gzipped to
+    a sibling temp file in chunks. Nothing is held in memory. Never raises."""
+    if not RAW_ARCHIVE_ENABLED:
+        return None
+    bucket = bucket or os.getenv("S3_BUCKET")
+    if not bucket:
+        log.warning("RAW ARCHIVE skipped task_id=%s: no S3_BUCKET", task_id)
+        return None
+    gz_path = None
+    try:
+        import boto3
+        import shutil
+        with open(path, "rb") as f:
+            is_gz = f.read(2) == b"\x1f\x8b"
+        if not is_gz:
+            gz_path = path + ".gz"
+            with open(path, "rb") as src, gzip.open(gz_path, "wb") as dst:
+                shutil.copyfileobj(src, dst, 1 << 20)
+        key = f"{RAW_ARCHIVE_PREFIX}/{task_id}.json.gz"
+        boto3.client("s3", region_name=os.getenv("AWS_REGION", "eu-north-1")).upload_file(
+            gz_path or path, bucket, key,
+            ExtraArgs={"ContentType": "application/json", "ContentEncoding": "gzip"},
+        )
+        log.info("RAW ARCHIVE stored task_id=%s key=%s bytes=%d",
+                 task_id, key, os.path.getsize(gz_path or path))
+        return key
+    except Exception as e:  # noqa: BLE001
+        log.warning("RAW ARCHIVE failed task_id=%s: %s", task_id, e)
+        return None
+    finally:
+        if gz_path:
+            try:
+                os.unlink(gz_path)
+            except OSError:
+                pass
+
+
 def detect_drift(task_id: str, payload: dict) -> list[str]:
     """Return top-level keys not in KNOWN_TOPLEVEL; alert on any. Never raises."""
     try:
@@ -84,19 +84,8 @@ def ingest_technique_bronze(
 
     # ── 2. Features ────────────────────────────────────────────
     features = result.get("features") or []
-    for feat in features:
-        conn.execute(sql_text("""
-            INSERT INTO bronze.technique_features
-                (task_id, feature_name, feature_human_readable, level, score,
-                 value, observation, suggestion, feature_categories,
-                 highlight_joints, highlight_limbs, event_name,
-                 event_timestamp, event_frame_nr, score_ranges, value_ranges)
-            VALUES
-                (:task_id, :feature_name, :feature_human_readable, :level, :score,
-                 :value, :observation, :suggestion, :feature_categories,
-                 :highlight_joints, :highlight_limbs, :event_name,
-                 :event_timestamp, :event_frame_nr, :score_ranges, :value_ranges)
-        """), {
+    feature_rows = [
+        {
             "task_id": task_id,
             "feature_name": feat.get("feature_name"),
             "feature_human_readable": feat.get("feature_human_readable"),
@@ -113,12 +102,26 @@ def ingest_technique_bronze(
             "event_frame_nr": _as_int(feat.get("event_frame_nr")),
             "score_ranges": json.dumps(feat.get("score_ranges")) if feat.get("score_ranges") else None,
             "value_ranges": json.dumps(feat.get("value_ranges")) if feat.get("value_ranges") else None,
-        })
+        }
+        for feat in features
+    ]
+    _insert_many(conn, """
+        INSERT INTO bronze.technique_features
+            (task_id, feature_name, feature_human_readable, level, score,
+             value, observation, suggestion, feature_categories,
+             highlight_joints, highlight_limbs, event_name,
+             event_timestamp, event_frame_nr, score_ranges, value_ranges)
+        VALUES
+            (:task_id, :feature_name, :feature_human_readable, :level, :score,
+             :value, :observation, :suggestion, :feature_categories,
+             :highlight_joints, :highlight_limbs, :event_name,
+             :event_timestamp, :event_frame_nr, :score_ranges, :value_ranges)
+    """, feature_rows)
     counts["technique_features"] = len(features)
 
     # ── 3. Feature categories ──────────────────────────────────
     feature_categories = result.get("feature_categories") or {}
-    cat_count = 0
+    cat_rows = []
     for cat_name, cat_data in feature_categories.items():
         cat_score = None
         cat_features = None
@@ -132,24 +135,24 @@ def ingest_technique_bronze(
             cat_score = float(cat_data)
             raw = {"score": cat_data}
 
-        conn.execute(sql_text("""
-            INSERT INTO bronze.technique_feature_categories
-                (task_id, category_name, category_score, feature_names, raw_data)
-            VALUES (:task_id, :category_name, :category_score, :feature_names, :raw_data)
-        """), {
+        cat_rows.append({
             "task_id": task_id,
             "category_name": cat_name,
             "category_score": cat_score,
             "feature_names": json.dumps(cat_features) if cat_features else None,
             "raw_data": json.dumps(raw),
         })
-        cat_count += 1
-    counts["technique_feature_categories"] = cat_count
+    _insert_many(conn, """
+        INSERT INTO bronze.technique_feature_categories
+            (task_id, category_name, category_score, feature_names, raw_data)
+        VALUES (:task_id, :category_name, :category_score, :feature_names, :raw_data)
+    """, cat_rows)
+    counts["technique_feature_categories"] = len(cat_rows)
 
     # ── 4. Kinetic chain ───────────────────────────────────────
     kinetic_chain = result.get("kinetic_chain") or {}
     speed_dict = kinetic_chain.get("speed_dict") or kinetic_chain
-    seg_count = 0
+    seg_rows = []
 
     if isinstance(speed_dict, dict):
         for seg_name, seg_data in speed_dict.items():
@@ -167,11 +170,7 @@ def ingest_technique_bronze(
             elif isinstance(seg_data, (int, float)):
                 peak_speed = float(seg_data)
 
-            conn.execute(sql_text("""
-                INSERT INTO bronze.technique_kinetic_chain
-                    (task_id, segment_name, peak_speed, peak_timestamp, plot_values, raw_data)
-                VALUES (:task_id, :segment_name, :peak_speed, :peak_timestamp, :plot_values, :raw_data)
-            """), {
+            seg_rows.append({
                 "task_id": task_id,
                 "segment_name": seg_name,
                 "peak_speed": peak_speed,
@@ -179,8 +178,12 @@ def ingest_technique_bronze(
                 "plot_values": json.dumps(plot_vals) if plot_vals else None,
                 "raw_data": json.dumps(seg_data) if seg_data else None,
             })
-            seg_count += 1
-    counts["technique_kinetic_chain"] = seg_count
+    _insert_many(conn, """
+        INSERT INTO bronze.technique_kinetic_chain
+            (task_id, segment_name, peak_speed, peak_timestamp, plot_values, raw_data)
+        VALUES (:task_id, :segment_name, :peak_speed, :peak_timestamp, :plot_values, :raw_data)
+    """, seg_rows)
+    counts["technique_kinetic_chain"] = len(seg_rows)
 
     # ── 5. Wrist speed ─────────────────────────────────────────
     wrist_speed = result.get("wrist_speed")
@@ -213,6 +216,13 @@ def ingest_technique_bronze(
     return {"task_id": task_id, "counts": counts}
 
 
+def _insert_many(conn, stmt: str, rows) -> None:
+    """One executemany per table (psycopg pipelines the parameter sets)
+    instead of a round trip per row."""
+    if rows:
+        conn.execute(sql_text(stmt), rows)
+
+
 def _as_float(v) -> float | None:
     if v is None:
         return None
@@ -433,13 +433,17 @@ def build_silver_technique(task_id: str, engine, replace: bool = True) -> Dict[s
 
 
 def _build_pose_timeline(conn, task_id: str) -> int:
-    """Build per-frame pose timeline from bronze 2D + 3D pose data."""
+    """Build per-frame pose timeline from bronze 2D + 3D pose data.
+
+    raw_data is read as JSONB text and parsed one frame at a time
+    (_parse_pose_frames), and the merged rows go in as one COPY instead of an
+    INSERT round trip per frame."""
     pose_2d_row = conn.execute(sql_text(
-        "SELECT raw_data FROM bronze.technique_pose_2d WHERE task_id = :t"
+        "SELECT raw_data::text AS raw_data FROM bronze.technique_pose_2d WHERE task_id = :t"
     ), {"t": task_id}).mappings().first()
 
     pose_3d_row = conn.execute(sql_text(
-        "SELECT raw_data FROM bronze.technique_pose_3d WHERE task_id = :t"
+        "SELECT raw_data::text AS raw_data FROM bronze.technique_pose_3d WHERE task_id = :t"
     ), {"t": task_id}).mappings().first()
 
     if not pose_2d_row and not pose_3d_row:
@@ -449,70 +453,134 @@ def _build_pose_timeline(conn, task_id: str) -> int:
     frames_2d = _parse_pose_frames(pose_2d_row["raw_data"] if pose_2d_row else None)
     frames_3d = _parse_pose_frames(pose_3d_row["raw_data"] if pose_3d_row else None)
 
-    # Merge frame numbers from both sources
-    all_frames = sorted(set(list(frames_2d.keys()) + list(frames_3d.keys())))
+    return _copy_pose_timeline(conn, _pose_timeline_rows(task_id, frames_2d, frames_3d))
 
-    count = 0
-    for frame_nr in all_frames:
+
+_POSE_TIMELINE_COLS = [
+    "task_id", "frame_nr", "has_2d", "has_3d",
+    "confidence_2d", "confidence_3d",
+    "bbox_2d", "bbox_3d", "keypoints_2d", "keypoints_3d",
+]
+_POSE_INSERT_BATCH = 1000
+
+
+def _pose_timeline_rows(task_id: str, frames_2d: dict, frames_3d: dict):
+    """Yield one timeline row per frame number present in either source."""
+    # Merge frame numbers from both sources
+    for frame_nr in sorted(frames_2d.keys() | frames_3d.keys()):
         f2d = frames_2d.get(frame_nr)
         f3d = frames_3d.get(frame_nr)
-
-        conn.execute(sql_text("""
-            INSERT INTO silver.technique_pose_timeline
-                (task_id, frame_nr, has_2d, has_3d,
-                 confidence_2d, confidence_3d,
-                 bbox_2d, bbox_3d, keypoints_2d, keypoints_3d)
-            VALUES
-                (:task_id, :frame_nr, :has_2d, :has_3d,
-                 :confidence_2d, :confidence_3d,
-                 :bbox_2d, :bbox_3d, :keypoints_2d, :keypoints_3d)
-        """), {
+        yield {
             "task_id": task_id,
             "frame_nr": frame_nr,
             "has_2d": f2d is not None,
             "has_3d": f3d is not None,
-            "confidence_2d": _extract_confidence(f2d),
-            "confidence_3d": _extract_confidence(f3d),
-            "bbox_2d": json.dumps(f2d.get("bbox")) if f2d and f2d.get("bbox") else None,
-            "bbox_3d": json.dumps(f3d.get("bbox")) if f3d and f3d.get("bbox") else None,
-            "keypoints_2d": json.dumps(f2d.get("keypoints")) if f2d and f2d.get("keypoints") else None,
-            "keypoints_3d": json.dumps(f3d.get("keypoints")) if f3d and f3d.get("keypoints") else None,
-        })
-        count += 1
+            "confidence_2d": f2d[0] if f2d else None,
+            "confidence_3d": f3d[0] if f3d else None,
+            "bbox_2d": f2d[1] if f2d else None,
+            "bbox_3d": f3d[1] if f3d else None,
+            "keypoints_2d": f2d[2] if f2d else None,
+            "keypoints_3d": f3d[2] if f3d else None,
+        }
 
-    return count
+
+def _copy_pose_timeline(conn, rows) -> int:
+    """COPY timeline rows into silver.technique_pose_timeline on the build
+    transaction's connection (JSONB columns take JSON text). Falls back to
+    batched executemany when the driver has no COPY."""
+    col_sql = ", ".join(_POSE_TIMELINE_COLS)
+    n = 0
+    raw = conn.connection
+    dbapi = getattr(raw, "driver_connection", None) or raw
+    with dbapi.cursor() as cur:
+        if hasattr(cur, "copy"):
+            with cur.copy(f"COPY silver.technique_pose_timeline ({col_sql}) FROM STDIN") as cp:
+                for r in rows:
+                    cp.write_row([r[c] for c in _POSE_TIMELINE_COLS])
+                    n += 1
+            return n
+    stmt = sql_text(
+        f"INSERT INTO silver.technique_pose_timeline ({col_sql}) "
+        f"VALUES ({', '.join(':' + c for c in _POSE_TIMELINE_COLS)})"
+    )
+    batch = []
+    for r in rows:
+        batch.append(r)
+        if len(batch) >= _POSE_INSERT_BATCH:
+            conn.execute(stmt, batch)
+            n += len(batch)
+            batch = []
+    if batch:
+        conn.execute(stmt, batch)
+        n += len(batch)
+    return n
 
 
 def _parse_pose_frames(raw_data) -> dict:
-    """Parse pose data into {frame_nr: frame_data} dict."""
-    if raw_data is None:
+    """Parse pose data into {frame_nr: (confidence, bbox_json, keypoints_json)}.
+
+    Each frame is reduced to its timeline columns as soon as it is parsed, so
+    the pose blob is never held as a full Python object tree. Malformed JSON
+    yields {}."""
+    import ijson
+
+    result = {}
+    try:
+        for frame_nr, frame in _iter_pose_frames(raw_data):
+            result[frame_nr] = (
+                _extract_confidence(frame),
+                json.dumps(frame.get("bbox")) if frame.get("bbox") else None,
+                json.dumps(frame.get("keypoints")) if frame.get("keypoints") else None,
+            )
+    except (ijson.JSONError, json.JSONDecodeError, TypeError):
         return {}
+    return result
 
+
+def _iter_pose_frames(raw_data):
+    """Yield (frame_nr, frame_dict) from pose JSON text (incrementally, via
+    ijson) or an already-decoded dict / list."""
+    import ijson
+
+    if raw_data is None:
+        return
     data = raw_data
+    if isinstance(data, memoryview):
+        data = bytes(data)
     if isinstance(data, str):
-        try:
-            data = json.loads(data)
-        except (json.JSONDecodeError, TypeError):
-            return {}
-
-    if isinstance(data, dict):
-        # Keyed by frame number (string keys)
-        result = {}
-        for k, v in data.items():
+        data = data.encode("utf-8")
+    if isinstance(data, bytes):
+        head = data[:64].lstrip()[:1]
+        if head == b'"':
+            # JSONB string holding the JSON document
+            yield from _iter_pose_frames(json.loads(data))
+            return
+        if head == b"{":
+            items = ijson.kvitems(data, "", use_float=True)
+        elif head == b"[":
+            items = enumerate(ijson.items(data, "item", use_float=True))
+        else:
+            return
+    elif isinstance(data, dict):
+        items = data.items()
+    elif isinstance(data, list):
+        items = enumerate(data)
+    else:
+        return
+
+    for k, v in items:
+        if isinstance(k, int):
+            # Indexed by frame position
+            if v is None:
+                continue
+            frame_nr = k
+        else:
+            # Keyed by frame number (string keys)
             try:
                 frame_nr = int(k)
-                result[frame_nr] = v if isinstance(v, dict) else {"keypoints": v}
             except (ValueError, TypeError):
                 continue
-        return result
-    elif isinstance(data, list):
-        # Indexed by frame position
-        return {
-            i: (item if isinstance(item, dict) else {"keypoints": item})
-            for i, item in enumerate(data)
-            if item is not None
-        }
-    return {}
+        yield frame_nr, (v if isinstance(v, dict) else {"keypoints": v})
 
 
 def _extract_confidence(frame_data) -> float | None:
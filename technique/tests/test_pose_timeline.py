@@ -0,0 +1,191 @@
+"""Streamed pose parsing vs the old json.loads-based timeline rows. No DB.
+
+No pytest in this repo — run with:
+    python -m technique.tests.test_pose_timeline
+
+_build_pose_timeline used to SELECT raw_data as JSONB (psycopg hands back the
+decoded value), json.loads it again when it was a JSONB string, and build
+every timeline column from the full frame dicts. It now SELECTs raw_data::text
+and _parse_pose_frames walks it frame by frame with ijson. For each fixture the
+old path gets the decoded value and the new one the JSONB text; the rows of
+silver.technique_pose_timeline must be identical.
+"""
+from __future__ import annotations
+
+import json
+import sys
+
+from technique.silver_technique import (
+    _extract_confidence,
+    _parse_pose_frames,
+    _pose_timeline_rows,
+)
+
+
+def _legacy_parse(raw_data) -> dict:
+    """_parse_pose_frames before the streaming change, verbatim."""
+    if raw_data is None:
+        return {}
+
+    data = raw_data
+    if isinstance(data, str):
+        try:
+            data = json.loads(data)
+        except (json.JSONDecodeError, TypeError):
+            return {}
+
+    if isinstance(data, dict):
+        result = {}
+        for k, v in data.items():
+            try:
+                frame_nr = int(k)
+                result[frame_nr] = v if isinstance(v, dict) else {"keypoints": v}
+            except (ValueError, TypeError):
+                continue
+        return result
+    elif isinstance(data, list):
+        return {
+            i: (item if isinstance(item, dict) else {"keypoints": item})
+            for i, item in enumerate(data)
+            if item is not None
+        }
+    return {}
+
+
+def _legacy_rows(task_id, frames_2d, frames_3d):
+    """The per-frame INSERT parameters of the old _build_pose_timeline."""
+    for frame_nr in sorted(set(list(frames_2d.keys()) + list(frames_3d.keys()))):
+        f2d = frames_2d.get(frame_nr)
+        f3d = frames_3d.get(frame_nr)
+        yield {
+            "task_id": task_id,
+            "frame_nr": frame_nr,
+            "has_2d": f2d is not None,
+            "has_3d": f3d is not None,
+            "confidence_2d": _extract_confidence(f2d),
+            "confidence_3d": _extract_confidence(f3d),
+            "bbox_2d": json.dumps(f2d.get("bbox")) if f2d and f2d.get("bbox") else None,
+            "bbox_3d": json.dumps(f3d.get("bbox")) if f3d and f3d.get("bbox") else None,
+            "keypoints_2d": json.dumps(f2d.get("keypoints")) if f2d and f2d.get("keypoints") else None,
+            "keypoints_3d": json.dumps(f3d.get("keypoints")) if f3d and f3d.get("keypoints") else None,
+        }
+
+
+def _kp_list(i, n=17):
+    return [[10.5 + i + j, 20.25 - j, round(0.5 + j / 40, 3)] for j in range(n)]
+
+
+def _kp_dicts(i, n=17):
+    return [{"x": 100 + i, "y": 0.1 * j, "z": -j, "confidence": 0.9 - j / 100} for j in range(n)]
+
+
+def _frame(i):
+    kind = i % 6
+    if kind == 0:
+        return {"keypoints": _kp_list(i), "bbox": [i, i + 1, i + 50.5, i + 120], "confidence": 0.87}
+    if kind == 1:
+        return {"keypoints": _kp_dicts(i), "bbox": {"x1": 1, "y1": 2, "x2": 3.5, "y2": 4}}
+    if kind == 2:
+        return _kp_list(i)                        # bare keypoint list
+    if kind == 3:
+        return {"keypoints": [], "bbox": None, "confidence": "high", "extra": {"a": [1, 2]}}
+    if kind == 4:
+        return {"keypoints": [["x", "y", "bad"], [1, 2], {"confidence": None}], "confidence": 1}
+    return {}
+
+
+DICT_KEYED = {str(i): _frame(i) for i in range(0, 60, 2)}
+DICT_KEYED.update({"meta": {"fps": 30}, "12": None, "007": _frame(7), "-3": _frame(3), "x1": [1]})
+LIST_INDEXED = [None if i % 9 == 4 else _frame(i) for i in range(45)]
+
+# (name, value JSONB holds): old path sees it decoded, new path as raw_data::text.
+CASES = [
+    ("dict-keyed", DICT_KEYED),
+    ("list-indexed", LIST_INDEXED),
+    ("double-encoded dict", json.dumps(DICT_KEYED)),
+    ("double-encoded list", json.dumps(LIST_INDEXED)),
+    ("empty dict", {}),
+    ("empty list", []),
+    ("only nulls", [None, None]),
+    ("unicode", {"1": {"keypoints": _kp_list(1), "label": "Zoë — café"}}),
+    ("large ints / exponents", [{"keypoints": [[1e-7, 2.5e10, 12345678901234], [0, -0.0, 3]]}]),
+]
+
+MALFORMED = [
+    ("double-encoded, not JSON", "{not json"),
+    ("double-encoded, truncated", json.dumps(LIST_INDEXED)[:500]),
+    ("double-encoded scalar", "42"),
+    ("scalar number", 7),
+    ("scalar bool", True),
+    ("JSON null", None),
+]
+
+
+def _jsonb_text(value) -> str:
+    """raw_data::text — psycopg json.loads()es the same text for the old path."""
+    return json.dumps(value)
+
+
+def _rows_old(v2d, v3d):
+    text2d, text3d = _jsonb_text(v2d), _jsonb_text(v3d)
+    return list(_legacy_rows("t", _legacy_parse(json.loads(text2d)),
+                             _legacy_parse(json.loads(text3d))))
+
+
+def _rows_new(v2d, v3d):
+    return list(_pose_timeline_rows("t", _parse_pose_frames(_jsonb_text(v2d)),
+                                    _parse_pose_frames(_jsonb_text(v3d))))
+
+
+def test_rows_match_legacy():
+    for name, value in CASES:
+        for other_name, other in (("same", value), ("list-indexed", LIST_INDEXED), ("absent", {})):
+            want, got = _rows_old(value, other), _rows_new(value, other)
+            assert got == want, f"{name} + 3D {other_name}: first diff " + next(
+                (f"{w} != {g}" for w, g in zip(want, got) if w != g), f"{len(want)} vs {len(got)} rows")
+        print(f"  {name}: {len(_rows_new(value, {}))} rows OK")
+
+
+def test_decoded_input():
+    # Callers passing an already-decoded value keep working.
+    for name, value in CASES[:2]:
+        want = list(_legacy_rows("t", _legacy_parse(value), {}))
+        got = list(_pose_timeline_rows("t", _parse_pose_frames(value), {}))
+        assert got == want, name
+    assert _parse_pose_frames(None) == {} and _parse_pose_frames(memoryview(b"[]")) == {}
+    bytes_rows = _parse_pose_frames(_jsonb_text(LIST_INDEXED).encode("utf-8"))
+    assert bytes_rows == _parse_pose_frames(_jsonb_text(LIST_INDEXED))
+    print("  decoded / bytes / memoryview input: OK")
+
+
+def test_malformed():
+    for name, value in MALFORMED:
+        want = _legacy_parse(json.loads(_jsonb_text(value)))
+        got = _parse_pose_frames(_jsonb_text(value))
+        assert want == {} and got == {}, f"{name}: old {want!r}, new {got!r}"
+    for text in ("", "   ", "{", '[{"keypoints": [1, 2', "nonsense", '{"1": {"keypoints": [1,]}}'):
+        assert _parse_pose_frames(text) == {}, f"{text!r} produced frames"
+    assert _parse_pose_frames(None) == {}
+    print(f"  {len(MALFORMED) + 6} malformed inputs yield no frames: OK")
+
+
+def main() -> int:
+    tests = [test_rows_match_legacy, test_decoded_input, test_malformed]
+    print(f"Running {len(tests)} pose timeline parity tests:")
+    failures = 0
+    for t in tests:
+        try:
+            t()
+        except AssertionError as e:
+            print(f"  {t.__name__}: FAIL — {e}")
+            failures += 1
+    print()
+    if failures:
+        print(f"{failures} test(s) failed")
+        return 1
+    print("All tests passed.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
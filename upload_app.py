@@ -143,11 +143,22 @@ SPORTAI_STATUS_PATHS = [
 
 # ---------- DB engine / bronze ingest ----------
 from db_init import engine, log_task_event  # noqa: E402
-from ingest_bronze import ingest_bronze, ingest_bronze_strict, _run_bronze_init  # noqa: E402
+from ingest_bronze import (  # noqa: E402
+    ingest_bronze, ingest_bronze_strict, _run_bronze_init,
+    BRONZE_STREAM_INGEST, spool_result, read_payload_file,
+)
 from build_silver_v2 import build_silver_v2 as build_silver_point_detail, DEFAULT_SPORT_TYPE  # noqa: E402
 from billing_import_from_bronze import sync_usage_for_task_id  # noqa: E402
 app.register_blueprint(ingest_bronze, url_prefix="")
 
+# ---------- Boot DDL registry ----------
+# Every init below REGISTERS its DDL with ddl_registry instead of running it;
+# apply_registered(engine) (after the identity_detector block) compares one
+# SHA per object against meta.ddl_applied in a single query and re-applies
+# only what changed. Registration order is apply order. Full rebuild:
+# POST /ops/ddl-rebuild or DDL_FORCE_REBUILD=1.
+from ddl_registry import register_init, apply_registered  # noqa: E402
+
 # ---------- ml_analysis schema (idempotent on boot) ----------
 # Creates ml_analysis.video_analysis_jobs, ball_detections, player_detections,
 # match_analytics, training_corpus (Phase 5c.2). Previously called lazily from
@@ -156,7 +167,10 @@ app.register_blueprint(ingest_bronze, url_prefix="")
 # training_corpus from the very first deploy without waiting for a T5 submit.
 try:
     from ml_pipeline.db_schema import ml_analysis_init  # noqa: E402
-    ml_analysis_init(engine)
+    register_init("ml_analysis_init", lambda: ml_analysis_init(engine, strict_partitions=True),
+                  sources=["ml_pipeline.db_schema", "ml_pipeline.keypoint_codec",
+                           "ml_pipeline.detection_partitions"],
+                  env=["ML_DETECTION_PARTITIONS"])
 except Exception:
     app.logger.exception("ml_analysis_init() failed on boot — T5 / corpus tables may be missing")
 
@@ -167,35 +181,50 @@ except Exception:
 # live DB. Column additions stay owned by the existing _ensure_* functions.
 try:
     from models_billing import billing_init  # noqa: E402
-    billing_init(engine)
+    register_init("billing_init", lambda: billing_init(engine), sources=["models_billing"])
 except Exception:
     app.logger.exception("billing_init() failed on boot — billing tables may be missing on a fresh DB")
 
 # ---------- Gold presentation views (idempotent on boot) ----------
 # Creates gold.vw_player, gold.vw_point, and all match_* presentation views
 # used by the match analysis dashboards and the upcoming LLM coach.
-# Each view is individually try/except'd inside gold_init_presentation() so
-# a single failure cannot kill the service.
+# Registered one view at a time so an unchanged view is never dropped; a
+# changed one is re-created (with everything after it) in one transaction.
 try:
-    from gold_init import gold_init_presentation  # noqa: E402
-    gold_init_presentation()
+    from gold_init import register_gold_views  # noqa: E402
+    register_gold_views()
 except Exception:
-    app.logger.exception("gold_init_presentation() failed on boot — gold views may be stale")
+    app.logger.exception("register_gold_views() failed on boot — gold views may be stale")
 
 # Legacy gold.vw_client_match_summary (feeds /api/client/matches sidebar). Will
 # eventually be replaced by gold.match_kpi but currently live. Wrapped so a
 # single view failure doesn't kill the service.
 try:
     from db_init import gold_init as _gold_init_legacy  # noqa: E402
-    _gold_init_legacy()
+    register_init("db_init.gold_init", _gold_init_legacy, sources=["db_init"])
 except Exception:
     app.logger.exception("legacy gold_init() (vw_client_match_summary) failed on boot")
 
+# ---------- Materialised gold summaries (gold_materialize.py) ----------
+# Tables + facades for match_kpi / player_match_kpis / player_performance. Re-runs
+# when the live view SQL it materialises or GOLD_MATERIALIZED changes — not on
+# every gold_init / db_init edit. A needed full rebuild runs on a background
+# thread (facades read the live views until it commits); per-task refresh
+# happens after each silver build. POST /ops/gold-rebuild forces one.
+try:
+    from gold_materialize import init_gold_materialized, live_view_sql  # noqa: E402
+    register_init("gold_materialize", init_gold_materialized,
+                  sources=["gold_materialize"], sql=live_view_sql(),
+                  env=["GOLD_MATERIALIZED"])
+except Exception:
+    app.logger.exception("gold_materialize registration failed on boot")
+
 # ---------- LLM Tennis Coach (idempotent on boot) ----------
 try:
     from tennis_coach.coach_api import coach_bp
     from tennis_coach.init import init_tennis_coach
-    init_tennis_coach()
+    register_init("init_tennis_coach", init_tennis_coach,
+                  sources=["tennis_coach.init", "tennis_coach.coach_views", "tennis_coach.db"])
     app.register_blueprint(coach_bp)
 except Exception:
     app.logger.exception("tennis_coach init failed on boot")
@@ -204,7 +233,8 @@ except Exception:
 try:
     from support_bot.init import init_support_bot
     from support_bot.support_api import support_bp
-    init_support_bot()
+    register_init("init_support_bot", init_support_bot,
+                  sources=["support_bot.init", "support_bot.db", "support_bot.faq_loader"])
     app.register_blueprint(support_bp)
 except Exception:
     app.logger.exception("support_bot init failed on boot")
@@ -240,7 +270,8 @@ try:
     from marketing_crm.backoffice import register as register_cockpit
     if register_cockpit(app):
         from marketing_crm.backoffice import init_cockpit_views
-        init_cockpit_views()
+        register_init("init_cockpit_views", init_cockpit_views,
+                      sources=["marketing_crm.backoffice.views"])
         app.logger.info("marketing_crm cockpit registered")
 except Exception:
     app.logger.exception("marketing_crm cockpit register failed on boot")
@@ -299,7 +330,7 @@ except Exception:
 try:
     from offline_conversions.schema import init as _offline_conv_init
     from offline_conversions import register as register_offline_conv
-    _offline_conv_init()                 # auto-resolves the core_db engine
+    register_init("offline_conversions.schema", _offline_conv_init)  # auto-resolves the core_db engine
     register_offline_conv(app)
     app.logger.info("offline_conversions feed registered (/feeds/google-ads/offline-conversions.csv)")
 except Exception:
@@ -321,28 +352,46 @@ try:
     from technique.db_schema import technique_bronze_init
     from technique.silver_technique import ensure_silver_schema
     from technique.gold_technique import init_technique_gold_views
-    technique_bronze_init(engine)
-    ensure_silver_schema(engine)
-    init_technique_gold_views()
+    register_init("technique_bronze_init", lambda: technique_bronze_init(engine),
+                  sources=["technique.db_schema"])
+    register_init("technique.ensure_silver_schema", lambda: ensure_silver_schema(engine),
+                  sources=["technique.silver_technique"])
+    register_init("init_technique_gold_views", init_technique_gold_views,
+                  sources=["technique.gold_technique"])
 except Exception:
     app.logger.exception("technique init failed on boot")
 
 # ---------- Bounce detector schema (ADR-01, idempotent on boot) ----------
 try:
     from ml_pipeline.bounce_detector.db import init_bounce_schema
-    with engine.begin() as conn:
-        init_bounce_schema(conn)
+
+    def _init_bounce_schema():
+        with engine.begin() as conn:
+            init_bounce_schema(conn)
+    register_init("init_bounce_schema", _init_bounce_schema,
+                  sources=["ml_pipeline.bounce_detector.db"])
 except Exception:
     app.logger.exception("bounce_detector init failed on boot")
 
 # ---------- Identity detector schema (ADR-03, idempotent on boot) ----------
 try:
     from ml_pipeline.identity_detector.db import init_identity_schema
-    with engine.begin() as conn:
-        init_identity_schema(conn)
+
+    def _init_identity_schema():
+        with engine.begin() as conn:
+            init_identity_schema(conn)
+    register_init("init_identity_schema", _init_identity_schema,
+                  sources=["ml_pipeline.identity_detector.db"])
 except Exception:
     app.logger.exception("identity_detector init failed on boot")
 
+# ---------- Apply registered boot DDL ----------
+# Unchanged deploy: one SELECT against meta.ddl_applied, no DDL, no locks.
+try:
+    apply_registered(engine)
+except Exception:
+    app.logger.exception("ddl_registry apply failed on boot — schema may be stale")
+
 
 # ---------- S3 config (MANDATORY) ----------
 AWS_REGION = os.getenv("AWS_REGION", "").strip() or None
@@ -1390,6 +1439,8 @@ def _technique_run_pipeline(task_id: str, s3_key: str, technique_meta: dict):
     app.logger.info("TECHNIQUE task_id=%s step=silver_build", task_id)
     from technique.silver_technique import build_silver_technique
     build_silver_technique(task_id=task_id, engine=engine, replace=True)
+    from gold_materialize import bump_task_version
+    bump_task_version(task_id)  # technique gold views changed — dashboard caches re-fetch
 
     # ── STEP 5: Privacy (scope v2) — technique video is NOT retained: delete it ──
     # The biometric source is processed-then-deleted: stats are derived (steps 3-4), so the video +
@@ -1951,6 +2002,7 @@ def _s3_list_multipart_parts(key: str, upload_id: str) -> list[dict]:
 # ==========================
 def _do_ingest(task_id: str, result_url: str) -> bool:
     sid = None
+    result_path = None
 
     try:
         app.logger.info("INGEST START task_id=%s result_url=%s", task_id, result_url)
@@ -1989,7 +2041,11 @@ def _do_ingest(task_id: str, result_url: str) -> bool:
             content_encoding,
         )
 
-        if "gzip" in content_encoding:
+        if BRONZE_STREAM_INGEST:
+            # Spool to disk; big arrays stream into COPY (ingest_bronze).
+            result_path = spool_result(r)
+            payload = read_payload_file(result_path)
+        elif "gzip" in content_encoding:
             payload = json.load(gzip.GzipFile(fileobj=r.raw))
         else:
             payload = json.load(r.raw)
@@ -2041,6 +2097,9 @@ def _do_ingest(task_id: str, result_url: str) -> bool:
 
         app.logger.info("INGEST STEP task_id=%s step=silver_build_done", task_id)
 
+        from gold_materialize import refresh_task as _refresh_gold
+        _refresh_gold(task_id)
+
         # -------------------------
         # STEP 4: VIDEO TRIM TRIGGER (ASYNC / NON-BLOCKING)
         # Must NOT fail ingest if trim trigger fails
@@ -2114,6 +2173,12 @@ def _do_ingest(task_id: str, result_url: str) -> bool:
         # do NOT send "completed" Wix notify on failure
         # leave failed handling to ops / later explicit failure-email design
         return False
+    finally:
+        if result_path:
+            try:
+                os.unlink(result_path)
+            except OSError:
+                pass
 
 INGEST_STALE_AFTER_S = int(os.getenv("INGEST_STALE_AFTER_S", "1800"))  # 30 minutes
 
@@ -2817,6 +2882,28 @@ def _do_ingest_t5(task_id: str) -> bool:
             except Exception as e:
                 app.logger.warning("T5 INGEST task_id=%s silver build failed (non-fatal): %s", task_id, e)
         elif is_singles_t5:
+            # One bronze read for the whole post-ingest chain: serve, identity,
+            # stroke and silver all take the same TaskFrameStore instead of each
+            # re-querying player/ball detections and re-parsing keypoints.
+            # None (TASK_FRAME_STORE=0 or import failure) = per-stage queries.
+            frame_store = None
+            try:
+                from ml_pipeline.task_frame_store import TaskFrameStore
+                frame_store = TaskFrameStore.open(engine, task_id)
+            except Exception as e:
+                app.logger.warning("T5 INGEST task_id=%s frame store unavailable (non-fatal): %s", task_id, e)
+
+            # Wait out a `harness rebuild` of this task (ml_pipeline/rebuild.py holds
+            # the same per-task advisory key for its whole chain) so the two never
+            # interleave detector/silver writes. Transaction lock: taken and released
+            # here — a barrier, not held through the chain.
+            try:
+                with engine.begin() as conn:
+                    conn.execute(sql_text("SELECT pg_advisory_xact_lock(hashtextextended(:t, 42))"),
+                                 {"t": task_id})
+            except Exception as e:
+                app.logger.warning("T5 INGEST task_id=%s rebuild lock wait failed (non-fatal): %s", task_id, e)
+
             # Pose-first serve detection — runs between bronze ingest and
             # silver build, consumes ml_analysis.player_detections + ball_
             # detections, persists ml_analysis.serve_events. Failure here
@@ -2825,7 +2912,8 @@ def _do_ingest_t5(task_id: str) -> bool:
             try:
                 from ml_pipeline.serve_detector import detect_serves_for_task
                 with engine.begin() as conn:
-                    serve_events = detect_serves_for_task(conn, task_id, replace=True)
+                    serve_events = detect_serves_for_task(conn, task_id, replace=True,
+                                                          store=frame_store)
                 app.logger.info(
                     "T5 INGEST task_id=%s serve detector fired %d events",
                     task_id, len(serve_events),
@@ -2843,7 +2931,8 @@ def _do_ingest_t5(task_id: str) -> bool:
             try:
                 from ml_pipeline.identity_detector import detect_identity_for_task
                 with engine.begin() as conn:
-                    identity_segments = detect_identity_for_task(conn, task_id, replace=True)
+                    identity_segments = detect_identity_for_task(conn, task_id, replace=True,
+                                                                 store=frame_store)
                 app.logger.info(
                     "T5 INGEST task_id=%s identity detector produced %d segments",
                     task_id, len(identity_segments),
@@ -2861,7 +2950,8 @@ def _do_ingest_t5(task_id: str) -> bool:
             try:
                 from ml_pipeline.stroke_detector import detect_strokes_for_task
                 with engine.begin() as conn:
-                    stroke_events = detect_strokes_for_task(conn, task_id, replace=True)
+                    stroke_events = detect_strokes_for_task(conn, task_id, replace=True,
+                                                            store=frame_store)
                 app.logger.info(
                     "T5 INGEST task_id=%s stroke detector fired %d events",
                     task_id, len(stroke_events),
@@ -2880,9 +2970,12 @@ def _do_ingest_t5(task_id: str) -> bool:
 
             try:
                 from ml_pipeline.build_silver_match_t5 import build_silver_match_t5
-                silver_result = build_silver_match_t5(task_id=task_id, replace=True, engine=engine)
+                silver_result = build_silver_match_t5(task_id=task_id, replace=True, engine=engine,
+                                                      store=frame_store)
                 app.logger.info("T5 INGEST task_id=%s silver match built: %s", task_id, silver_result)
                 silver_built = True
+                from gold_materialize import refresh_task as _refresh_gold
+                _refresh_gold(task_id)
             except ImportError:
                 app.logger.warning("T5 INGEST task_id=%s silver match builder not available (ml deps missing)", task_id)
             except Exception as e:
@@ -4586,6 +4679,62 @@ def ops_read_klaviyo_flow():
         return jsonify({"ok": False, "error": str(e)}), 500
 
 
+@app.post("/ops/ddl-rebuild")
+def ops_ddl_rebuild():
+    """Force a full re-apply of every registered boot DDL unit (all gold views dropped +
+    re-created, every init re-run) and re-record meta.ddl_applied. Use after a manual schema
+    change or when an init swallowed its own error. Header-only auth (OPS_KEY)."""
+    if not _guard():
+        return Response("Forbidden", 403)
+    try:
+        out = apply_registered(engine, force=True)
+        return jsonify({"ok": not out["failed"], **out})
+    except Exception as e:
+        app.logger.exception("ops_ddl_rebuild failed")
+        return jsonify({"ok": False, "error": str(e)}), 500
+
+
+@app.post("/ops/gold-rebuild")
+def ops_gold_rebuild():
+    """Full rebuild of the materialised gold tables (gold_materialize.rebuild_all), then the
+    facades are pointed at them. Normally started in the background when boot finds the tables
+    stale; use this when that failed. Synchronous. Header-only auth (OPS_KEY)."""
+    if not _guard():
+        return Response("Forbidden", 403)
+    try:
+        from gold_materialize import rebuild_all
+        return jsonify({"ok": True, "rows": rebuild_all()})
+    except Exception as e:
+        app.logger.exception("ops_gold_rebuild failed")
+        return jsonify({"ok": False, "error": str(e)}), 500
+
+
+@app.get("/ops/auth-cache-stats")
+def ops_auth_cache_stats():
+    """This worker's auth_v2 cache counters (verified-token + principal hit/miss, per-request
+    outcomes). Per process — each gunicorn worker has its own caches. Header-only auth (OPS_KEY)."""
+    if not _guard():
+        return Response("Forbidden", 403)
+    try:
+        from auth_v2 import cache as auth_cache
+        return jsonify({"ok": True, "pid": os.getpid(), **auth_cache.stats()})
+    except Exception as e:
+        return jsonify({"ok": False, "error": str(e)}), 500
+
+
+@app.get("/ops/db-pool-stats")
+def ops_db_pool_stats():
+    """This worker's SQLAlchemy pool status + checkout-latency / hold-time histograms and
+    timeout counts (db_engine.pool_stats). Per process. Header-only auth (OPS_KEY)."""
+    if not _guard():
+        return Response("Forbidden", 403)
+    try:
+        from db_engine import pool_stats
+        return jsonify({"ok": True, **pool_stats()})
+    except Exception as e:
+        return jsonify({"ok": False, "error": str(e)}), 500
+
+
 @app.post("/ops/load-retention-rules")
 def ops_load_retention_rules():
     """Idempotently load the interim retention policy into core.retention_rule (the values in
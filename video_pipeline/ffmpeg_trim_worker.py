@@ -14,6 +14,9 @@
 #      decodes only the footage we keep — not the whole source.
 #   5. Above TRIM_SEEK_INPUTS_PER_PASS segments this runs as several passes
 #      producing part files, then joins them with the concat demuxer (-c copy).
+#      Passes are independent, so they run concurrently (TRIM_PARALLEL_PASSES,
+#      sized from the container's CPU quota and free /tmp); the join always
+#      lists the parts in EDL order.
 #   6. Upload the final file to S3 as trimmed/{task_id}/review.mp4.
 #   7. The caller (video_worker_app) POSTs the completion callback.
 #
@@ -49,7 +52,9 @@ import os
 import shutil
 import subprocess
 import tempfile
+import threading
 import time
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
@@ -108,6 +113,19 @@ TRIM_MAX_HEIGHT = int(os.getenv("TRIM_MAX_HEIGHT", "0"))
 # must also hold the output.
 TRIM_LOCAL_COPY_MAX_MB = int(os.getenv("TRIM_LOCAL_COPY_MAX_MB", "1500"))
 
+# Concurrent ffmpeg passes. 0 = auto: one pass per TRIM_CPUS_PER_PASS of the
+# container's CPU quota, capped by what /tmp can hold (see _pass_workers);
+# 1 = the serial loop. Each pass runs the exact command the serial path would
+# run — only the scheduling changes — and the parts are joined in EDL order, so
+# the output is the same file either way. Auto resolves to 1 on the 0.5-CPU
+# Render box (where 8 concurrent inputs were OOM-killed), so it only fans out
+# on a multi-core worker such as the 16-vCPU Fargate job-def.
+TRIM_PARALLEL_PASSES = int(os.getenv("TRIM_PARALLEL_PASSES", "0"))
+TRIM_CPUS_PER_PASS = float(os.getenv("TRIM_CPUS_PER_PASS", "2"))
+# Conservative part-size estimate (MB per kept second) for the /tmp cap;
+# veryfast/CRF 28 1080p lands well under this.
+TRIM_PART_MB_PER_S = float(os.getenv("TRIM_PART_MB_PER_S", "1.0"))
+
 s3 = boto3.client("s3")
 
 
@@ -115,25 +133,39 @@ s3 = boto3.client("s3")
 # Low-level process helpers
 # ============================================================
 
-def _run(cmd: List[str], *, timeout: int | None = None) -> str:
+def _run(cmd: List[str], *, timeout: int | None = None,
+         live: Optional[_LiveProcs] = None) -> str:
     """
     Run a subprocess and return stdout.
     Raise RuntimeError with full stderr/stdout context on failure.
+
+    `live` registers the process while it runs, so a concurrent pass that fails
+    can kill its siblings (see _LiveProcs).
     """
     effective_timeout = timeout or FFMPEG_TIMEOUT_S
-    try:
-        p = subprocess.run(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            timeout=effective_timeout,
-        )
-    except subprocess.TimeoutExpired:
-        raise RuntimeError(
-            f"Command timed out after {effective_timeout}s\n"
-            f"cmd={_redact(cmd)}"
-        )
+    with subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    ) as proc:
+        if live is not None and not live.add(proc):
+            proc.kill()
+            proc.communicate()
+            raise RuntimeError(f"Command cancelled\ncmd={_redact(cmd)}")
+        try:
+            stdout, stderr = proc.communicate(timeout=effective_timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.communicate()
+            raise RuntimeError(
+                f"Command timed out after {effective_timeout}s\n"
+                f"cmd={_redact(cmd)}"
+            )
+        finally:
+            if live is not None:
+                live.discard(proc)
+        p = subprocess.CompletedProcess(cmd, proc.returncode, stdout, stderr)
 
     if p.returncode != 0:
         raise RuntimeError(
@@ -146,6 +178,38 @@ def _run(cmd: List[str], *, timeout: int | None = None) -> str:
     return p.stdout.strip()
 
 
+class _LiveProcs:
+    """Running ffmpeg processes of one trim. kill_all() stops every running
+    pass and refuses new ones — the first failing pass cancels the rest instead
+    of letting them encode footage nobody will join."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._procs: set = set()
+        self._closed = False
+
+    def add(self, proc: subprocess.Popen) -> bool:
+        with self._lock:
+            if self._closed:
+                return False
+            self._procs.add(proc)
+            return True
+
+    def discard(self, proc: subprocess.Popen) -> None:
+        with self._lock:
+            self._procs.discard(proc)
+
+    def kill_all(self) -> None:
+        with self._lock:
+            self._closed = True
+            procs = list(self._procs)
+        for proc in procs:
+            try:
+                proc.kill()
+            except Exception:
+                pass
+
+
 def _redact(cmd: Sequence[str]) -> str:
     """Collapse presigned URLs (long, credential-bearing, and repeated once per
     seek input) so a failure message stays readable and keeps the signature out
@@ -240,6 +304,60 @@ def _chunk(items: Sequence[Any], size: int) -> Iterator[List[Any]]:
         yield list(items[i:i + size])
 
 
+# ============================================================
+# Pass concurrency
+# ============================================================
+
+def _available_cpus() -> float:
+    """CPUs this container may actually use. os.cpu_count() reports the HOST on
+    Render / Fargate, so read the cgroup CPU quota (v2 cpu.max, then v1
+    cfs_quota/period) and the affinity mask, and take the smallest."""
+    try:
+        cpus = float(len(os.sched_getaffinity(0)))
+    except (AttributeError, OSError):
+        cpus = float(os.cpu_count() or 1)
+    quota: Optional[float] = None
+    try:
+        q, period = Path("/sys/fs/cgroup/cpu.max").read_text().split()[:2]
+        if q != "max":
+            quota = float(q) / float(period)
+    except (OSError, ValueError):
+        try:
+            q = float(Path("/sys/fs/cgroup/cpu/cpu.cfs_quota_us").read_text())
+            period = float(Path("/sys/fs/cgroup/cpu/cpu.cfs_period_us").read_text())
+            if q > 0 and period > 0:
+                quota = q / period
+        except (OSError, ValueError):
+            pass
+    return min(cpus, quota) if quota else cpus
+
+
+def _pass_workers(
+    n_passes: int,
+    *,
+    cpus: float,
+    free_mb: float,
+    max_part_mb: float,
+    requested: int = 0,
+) -> int:
+    """How many passes to run at once.
+
+    requested > 0 is an explicit cap (TRIM_PARALLEL_PASSES). Auto (0) allows one
+    pass per TRIM_CPUS_PER_PASS CPUs. Either way, never more passes writing at
+    once than /tmp can take at the largest part size on top of the
+    MIN_DISK_FREE_MB reserve, and never more than there are passes."""
+    if n_passes <= 1:
+        return 1
+    if requested > 0:
+        n = requested
+    else:
+        n = int(cpus // max(0.1, TRIM_CPUS_PER_PASS))
+    room_mb = free_mb - MIN_DISK_FREE_MB
+    if max_part_mb > 0:
+        n = min(n, int(room_mb // max_part_mb))
+    return max(1, min(n, n_passes))
+
+
 # ============================================================
 # S3 helpers
 # ============================================================
@@ -665,7 +783,27 @@ def run_ffmpeg_trim(*, task_id: str, s3_bucket: str, s3_key: str, edl: dict) ->
         # --------------------------
         # Encode: N seek inputs per pass → concat
         # --------------------------
-        def _check_budget(done: int, encoded_s: float) -> None:
+        cpus = _available_cpus()
+        workers = _pass_workers(
+            len(batches),
+            cpus=cpus,
+            free_mb=shutil.disk_usage(td).free / (1024 * 1024),
+            max_part_mb=max(_sum_segment_durations(b) for b in batches) * TRIM_PART_MB_PER_S,
+            requested=TRIM_PARALLEL_PASSES,
+        )
+        if multipass:
+            log.info("FFMPEG TRIM task_id=%s running %d passes %d at a time "
+                     "(cpus=%.1f TRIM_PARALLEL_PASSES=%d)",
+                     task_id, len(batches), workers, cpus,
+                     TRIM_PARALLEL_PASSES)
+
+        # Progress shared by every pass: the budget check and the rate /
+        # projection below read the aggregate across concurrent passes.
+        progress = {"done": 0, "encoded_s": 0.0}
+        progress_lock = threading.Lock()
+        live = _LiveProcs()
+
+        def _check_budget() -> None:
             """Abort before starting a pass we cannot afford, and make the error
             itself the measurement: how far we got, the achieved encode rate, and
             the projected total. That turns a budget failure into the diagnostic
@@ -673,6 +811,8 @@ def run_ffmpeg_trim(*, task_id: str, s3_bucket: str, s3_key: str, edl: dict) ->
             left = deadline - time.monotonic()
             if left > 0:
                 return
+            with progress_lock:
+                done, encoded_s = progress["done"], progress["encoded_s"]
             spent = time.monotonic() - started
             rate = (encoded_s / spent) if spent > 0 else 0.0
             projected = (total_keep / rate / 60.0) if rate > 0 else float("inf")
@@ -686,10 +826,8 @@ def run_ffmpeg_trim(*, task_id: str, s3_bucket: str, s3_key: str, edl: dict) ->
                 f"VIDEO_PRESET. Raising the timeout alone just moves the failure."
             )
 
-        parts: List[Path] = []
-        encoded_s = 0.0
-        for i, batch in enumerate(batches):
-            _check_budget(i, encoded_s)
+        def _encode_pass(i: int, batch: List[Tuple[float, float]]) -> Path:
+            _check_budget()
             target = out if not multipass else (td / f"part_{i:04d}.mp4")
             fscript = td / f"filter_{i:04d}.txt"
             fscript.write_text(
@@ -704,12 +842,15 @@ def run_ffmpeg_trim(*, task_id: str, s3_bucket: str, s3_key: str, edl: dict) ->
             )
 
             t0 = time.monotonic()
-            _run(cmd, timeout=_remaining())
+            _run(cmd, timeout=_remaining(), live=live)
             if not target.exists() or target.stat().st_size == 0:
                 raise RuntimeError(f"pass {i + 1}/{len(batches)} produced no output")
 
             batch_keep = _sum_segment_durations(batch)
-            encoded_s += batch_keep
+            with progress_lock:
+                progress["done"] += 1
+                progress["encoded_s"] += batch_keep
+                encoded_s = progress["encoded_s"]
             pass_s = time.monotonic() - t0
             elapsed = time.monotonic() - started
             # Log the running rate + projection every pass: on a slow box this
@@ -726,7 +867,29 @@ def run_ffmpeg_trim(*, task_id: str, s3_bucket: str, s3_key: str, edl: dict) ->
                 shutil.disk_usage(td).free / (1024 * 1024),
                 int(deadline - time.monotonic()),
             )
-            parts.append(target)
+            return target
+
+        # Parts are indexed by pass number, never by completion order, so the
+        # concat list (and the joined file) is the same as the serial path's.
+        parts: List[Optional[Path]] = [None] * len(batches)
+        if workers <= 1:
+            for i, batch in enumerate(batches):
+                parts[i] = _encode_pass(i, batch)
+        else:
+            with ThreadPoolExecutor(max_workers=workers,
+                                    thread_name_prefix="trim_pass") as pool:
+                futures = {pool.submit(_encode_pass, i, b): i
+                           for i, b in enumerate(batches)}
+                finished, _ = wait(futures, return_when=FIRST_EXCEPTION)
+                failed = [f for f in finished if f.exception() is not None]
+                if failed:
+                    # Stop the siblings now rather than at the budget deadline.
+                    live.kill_all()
+                    for f in futures:
+                        f.cancel()
+                    raise failed[0].exception()
+                for f, i in futures.items():
+                    parts[i] = f.result()
 
         # --------------------------
         # Join parts (stream copy — no second encode)
@@ -769,9 +932,9 @@ def run_ffmpeg_trim(*, task_id: str, s3_bucket: str, s3_key: str, edl: dict) ->
 
         log.info(
             "FFMPEG TRIM DONE task_id=%s source=%.1fs trimmed=%.1fs removed=%.1fs "
-            "segments=%d passes=%d elapsed=%.1fs",
+            "segments=%d passes=%d workers=%d elapsed=%.1fs",
             task_id, info.duration_s, trimmed_duration_s, seconds_removed,
-            len(valid_segments), len(batches), time.monotonic() - started,
+            len(valid_segments), len(batches), workers, time.monotonic() - started,
         )
 
         return {
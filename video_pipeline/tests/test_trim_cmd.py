@@ -22,8 +22,10 @@ from video_pipeline.ffmpeg_trim_worker import (
     _build_concat_filter,
     _build_pass_cmd,
     _chunk,
+    _LiveProcs,
     _normalize_segments,
     _parse_fps,
+    _pass_workers,
     _redact,
     _sum_segment_durations,
     _write_concat_list,
@@ -103,6 +105,35 @@ def test_chunk() -> None:
     eq(sum(len(c) for c in _chunk(list(range(86)), 4)), 86, "chunking loses no segments")
 
 
+# ============================================================
+# Pass concurrency
+# ============================================================
+
+def test_pass_workers() -> None:
+    print("_pass_workers")
+    from video_pipeline.ffmpeg_trim_worker import MIN_DISK_FREE_MB, TRIM_CPUS_PER_PASS
+
+    roomy = MIN_DISK_FREE_MB + 100_000.0
+    eq(_pass_workers(1, cpus=16, free_mb=roomy, max_part_mb=50), 1,
+       "single pass is never parallel")
+    eq(_pass_workers(22, cpus=0.5, free_mb=roomy, max_part_mb=50), 1,
+       "0.5-CPU box stays serial (the measured OOM box)")
+    eq(_pass_workers(22, cpus=16, free_mb=roomy, max_part_mb=50),
+       int(16 // TRIM_CPUS_PER_PASS), "auto = one pass per TRIM_CPUS_PER_PASS")
+    eq(_pass_workers(3, cpus=16, free_mb=roomy, max_part_mb=50), 3,
+       "never more workers than passes")
+    eq(_pass_workers(22, cpus=16, free_mb=roomy, max_part_mb=50, requested=5), 5,
+       "explicit TRIM_PARALLEL_PASSES wins over the CPU sizing")
+    eq(_pass_workers(22, cpus=16, free_mb=MIN_DISK_FREE_MB + 120, max_part_mb=50), 2,
+       "capped by parts /tmp can hold above the reserve")
+    eq(_pass_workers(22, cpus=16, free_mb=MIN_DISK_FREE_MB + 10, max_part_mb=50), 1,
+       "tight /tmp falls back to serial, never 0")
+
+    live = _LiveProcs()
+    live.kill_all()
+    check(not live.add(object()), "no new pass starts after a sibling failed")
+
+
 # ============================================================
 # Filtergraph
 # ============================================================
@@ -267,6 +298,7 @@ def main() -> int:
         tmp = Path(td)
         test_normalize()
         test_chunk()
+        test_pass_workers()
         test_concat_filter()
         test_pass_cmd()
         test_concat_demuxer(tmp)